@@ -62,6 +62,7 @@ Fields
 
   fields.Fields
   fields.TimeFields
+  fields.ChunkedStorage
 
 Mappings
 --------
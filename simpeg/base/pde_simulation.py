@@ -5,6 +5,7 @@ import scipy.sparse as sp
 from discretize.utils import Zero, TensorType
 import discretize.base
 from ..simulation import BaseSimulation
+from ..fields import ChunkedStorage
 from .. import props
 from scipy.constants import mu_0
 
@@ -434,16 +435,22 @@ class BasePDESimulation(BaseSimulation):
         pairs of keyword arguments and parameter values for the solver. Please visit
         `pymatsolver <https://pymatsolver.readthedocs.io/en/latest/>`__ to learn more
         about solvers and their parameters.
+    fields_storage : simpeg.fields.ChunkedStorage, optional
+        Storage for the field solutions computed by the simulation. If ``None``,
+        the field solutions are stored in memory.
 
     """
 
-    def __init__(self, mesh, solver=None, solver_opts=None, **kwargs):
+    def __init__(
+        self, mesh, solver=None, solver_opts=None, fields_storage=None, **kwargs
+    ):
         self.mesh = mesh
         super().__init__(**kwargs)
         self.solver = solver
         if solver_opts is None:
             solver_opts = {}
         self.solver_opts = solver_opts
+        self.fields_storage = fields_storage
 
     @property
     def mesh(self):
@@ -479,6 +486,13 @@ class BasePDESimulation(BaseSimulation):
         is used to create solver objects. Parameters specific to each solver
         can be set manually using the ``solver_opts`` property.
 
+        Meshes too large to be factored by direct solvers can use the
+        iterative :class:`simpeg.utils.solver_utils.BlockKrylovSolver`, whose
+        memory scales linearly with the mesh. Passing a
+        :class:`simpeg.utils.solver_utils.SolutionCache` as its
+        ``warm_start`` in ``solver_opts`` starts the solves of each model
+        from the solutions of the previous one.
+
         Returns
         -------
         type[pymatsolver.solvers.Base]
@@ -522,6 +536,27 @@ class BasePDESimulation(BaseSimulation):
     def solver_opts(self, value):
         self._solver_opts = validate_type("solver_opts", value, dict, cast=False)
 
+    @property
+    def fields_storage(self):
+        """Storage for the field solutions computed by the simulation.
+
+        Large field solutions, e.g. of time domain simulations with many time
+        steps, can be stored on disk with a :class:`simpeg.fields.ChunkedStorage`
+        that only keeps the most recently used solutions in memory.
+
+        Returns
+        -------
+        simpeg.fields.ChunkedStorage or None
+            Storage for the field solutions, ``None`` if they are stored in memory.
+        """
+        return self._fields_storage
+
+    @fields_storage.setter
+    def fields_storage(self, value):
+        if value is not None:
+            value = validate_type("fields_storage", value, ChunkedStorage, cast=False)
+        self._fields_storage = value
+
     @property
     def Vol(self):
         return self.Mcc
@@ -377,6 +377,41 @@ class Data:
         v = mkvc(v)
         self.dobs = v
 
+    def save(self, file):
+        """Save the data and its survey to a binary file.
+
+        The observed data, the uncertainties and all the arrays of the survey
+        are stored in a few columns of a single ``.npz`` file. See
+        :meth:`simpeg.survey.BaseSurvey.save`.
+
+        Parameters
+        ----------
+        file : str or pathlib.Path or file-like
+            File where the data is saved. The ``.npz`` extension is appended to
+            file names that don't have it.
+        """
+        from .utils.io_utils._columnar import save_columnar
+
+        save_columnar(file, self)
+
+    @classmethod
+    def load(cls, file):
+        """Load data saved with :meth:`save`.
+
+        Parameters
+        ----------
+        file : str or pathlib.Path or file-like
+            File where the data was saved.
+
+        Returns
+        -------
+        simpeg.data.Data
+            The data, with the same class as the saved one, and its survey.
+        """
+        from .utils.io_utils._columnar import load_columnar
+
+        return load_columnar(file, cls)
+
 
 class SyntheticData(Data):
     r"""Synthetic data class.
@@ -1,6 +1,5 @@
 from typing import TYPE_CHECKING
 import numpy as np
-import matplotlib.pyplot as plt
 import warnings
 import os
 import scipy.sparse as sp
@@ -1909,6 +1908,8 @@ class SaveOutputEveryIteration(SaveEveryIteration):
                 i_target += 1
             self.i_target = i_target
 
+        import matplotlib.pyplot as plt
+
         fig = plt.figure(figsize=(5, 2))
         ax = plt.subplot(111)
         ax_1 = ax.twinx()
@@ -1963,6 +1964,8 @@ class SaveOutputEveryIteration(SaveEveryIteration):
                 i_target += 1
             self.i_target = i_target
 
+        import matplotlib.pyplot as plt
+
         fig = plt.figure(figsize=(5, 8))
         ax1 = plt.subplot(311)
         ax2 = plt.subplot(312)
@@ -2463,9 +2466,9 @@ class UpdatePreconditioner(InversionDirective):
 
         for reg in self.reg.objfcts:
             # Check if regularization has a projection
-            rdg = reg.deriv2(m)
+            rdg = reg.deriv2_diagonal(m)
             if not isinstance(rdg, Zero):
-                regDiag += rdg.diagonal()
+                regDiag += rdg
 
         JtJdiag = np.zeros_like(self.invProb.model)
         for sim, dmisfit in zip(self.simulation, self.dmisfit.objfcts):
@@ -2495,7 +2498,9 @@ class UpdatePreconditioner(InversionDirective):
 
         for reg in self.reg.objfcts:
             # Check if he has wire
-            regDiag += reg.deriv2(m).diagonal()
+            rdg = reg.deriv2_diagonal(m)
+            if not isinstance(rdg, Zero):
+                regDiag += rdg
 
         JtJdiag = np.zeros_like(self.invProb.model)
         for sim, dmisfit in zip(self.simulation, self.dmisfit.objfcts):
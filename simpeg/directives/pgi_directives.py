@@ -15,13 +15,7 @@ from ..regularization import (
     SmoothnessFirstOrder,
     SparseSmoothness,
 )
-from ..utils import (
-    GaussianMixtureWithNonlinearRelationships,
-    GaussianMixtureWithNonlinearRelationshipsWithPrior,
-    GaussianMixtureWithPrior,
-    WeightedGaussianMixture,
-    mkvc,
-)
+from ..utils import mkvc
 
 
 class PGI_UpdateParameters(InversionDirective):
@@ -60,6 +54,14 @@ class PGI_UpdateParameters(InversionDirective):
         self.pgi_reg = pgi_reg[0]
 
     def endIter(self):
+        # imported here, as importing scikit-learn is slow
+        from ..utils.pgi_utils import (
+            GaussianMixtureWithNonlinearRelationships,
+            GaussianMixtureWithNonlinearRelationshipsWithPrior,
+            GaussianMixtureWithPrior,
+            WeightedGaussianMixture,
+        )
+
         if self.opt.iter > 0 and self.opt.iter % self.update_rate == 0:
             m = self.invProb.model
             modellist = self.pgi_reg.wiresmap * m
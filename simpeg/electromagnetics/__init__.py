@@ -33,11 +33,32 @@ those functions directly from that package.
 
 """
 
+import importlib
+
 from scipy.constants import mu_0, epsilon_0
 
-from . import time_domain
-from . import frequency_domain
-from . import natural_source
-from . import analytics
-from . import utils
-from .static import resistivity, induced_polarization, spectral_induced_polarization
+# The EM subpackages are imported when first accessed, so that using one of
+# them doesn't import the others (and their plotting dependencies).
+_LAZY_SUBPACKAGES = {
+    "time_domain": ".time_domain",
+    "frequency_domain": ".frequency_domain",
+    "natural_source": ".natural_source",
+    "analytics": ".analytics",
+    "utils": ".utils",
+    "static": ".static",
+    "resistivity": ".static.resistivity",
+    "induced_polarization": ".static.induced_polarization",
+    "spectral_induced_polarization": ".static.spectral_induced_polarization",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_SUBPACKAGES:
+        module = importlib.import_module(_LAZY_SUBPACKAGES[name], __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_SUBPACKAGES))
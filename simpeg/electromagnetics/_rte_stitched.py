@@ -0,0 +1,224 @@
+"""
+Reflection coefficients of the TE mode for many 1D soundings at once.
+
+The soundings share their layer thicknesses, frequencies and wavenumbers, and
+have non-magnetic layers with real conductivities. If numba is installed, the
+coefficients are computed by compiled kernels parallelized over the soundings,
+otherwise they are computed with numpy for all the soundings at once.
+"""
+
+import numpy as np
+from scipy.constants import mu_0
+
+try:
+    import numba
+except ImportError:
+    # Define dummy jit decorator
+    def jit(*args, **kwargs):
+        return lambda f: f
+
+    numba = None
+    prange = range
+else:
+    from numba import jit, prange
+
+
+def _rTE_forward_numpy(frequencies, lamb, sigma, thicknesses):
+    """Reflection coefficients with numpy, see :func:`rTE_forward_stitched`."""
+    iwm = (1j * 2 * np.pi * frequencies * mu_0)[:, None]
+    l2 = lamb**2
+    u = np.sqrt(l2 + iwm * sigma[:, -1, None, None])
+    Yh = u / iwm
+    for k in range(sigma.shape[1] - 2, -1, -1):
+        u = np.sqrt(l2 + iwm * sigma[:, k, None, None])
+        Y = u / iwm
+        tanh = np.tanh(u * thicknesses[k])
+        Yh = Y * (Yh + Y * tanh) / (Y + Yh * tanh)
+    Y0 = lamb / iwm
+    return (Y0 - Yh) / (Y0 + Yh)
+
+
+def _rTE_sigma_gradient_numpy(frequencies, lamb, sigma, thicknesses):
+    """Gradient with numpy, see :func:`rTE_sigma_gradient_stitched`."""
+    n_layer = sigma.shape[1]
+    iwm = (1j * 2 * np.pi * frequencies * mu_0)[:, None]
+    u = np.sqrt(lamb**2 + iwm * sigma[:, :, None, None])
+    Y = u / iwm
+    tanh = np.tanh(u[:, :-1] * thicknesses[:, None, None])
+    Yh = np.empty_like(u)
+    Yh[:, -1] = Y[:, -1]
+    for k in range(n_layer - 2, -1, -1):
+        Yh[:, k] = (
+            Y[:, k]
+            * (Yh[:, k + 1] + Y[:, k] * tanh[:, k])
+            / (Y[:, k] + Yh[:, k + 1] * tanh[:, k])
+        )
+    Y0 = lamb / iwm
+
+    rTE_dsigma = np.empty_like(u)
+    gyh0 = -2.0 * Y0 / ((Y0 + Yh[:, 0]) * (Y0 + Yh[:, 0]))
+    for k in range(n_layer - 1):
+        Yk, Yb, t = Y[:, k], Yh[:, k + 1], tanh[:, k]
+        bot = (Yk + Yb * t) * (Yk + Yb * t)
+        gy = gyh0 * t * (2.0 * t * Yk * Yb + Yk * Yk + Yb * Yb) / bot
+        gtanh = gyh0 * (Yk * Yk * Yk - Yk * Yb * Yb) / bot
+        gyh0 = gyh0 * -(t * t - 1.0) * Yk * Yk / bot
+        gu = gtanh * thicknesses[k] * (1.0 - t * t) + gy / iwm
+        rTE_dsigma[:, k] = gu * 0.5 / u[:, k] * iwm
+    rTE_dsigma[:, -1] = gyh0 * 0.5 / u[:, -1]
+    return rTE_dsigma
+
+
+@jit(nopython=True)
+def _tanh(z):
+    """Hyperbolic tangent of a complex number with a non-negative real part.
+
+    Written with ``exp(-2 z)``, which doesn't overflow for large arguments.
+    """
+    e = np.exp(-2.0 * z)
+    return (1.0 - e) / (1.0 + e)
+
+
+@jit(nopython=True, parallel=True)
+def _rTE_forward_kernel(omega_mu, lamb, sigma, thicknesses, out):
+    """
+    Fill the reflection coefficients of each sounding.
+
+    Parameters
+    ----------
+    omega_mu : (n_frequency,) numpy.ndarray
+        Angular frequencies times the permeability of free space.
+    lamb : (n_lambda,) numpy.ndarray
+        Spatial wavenumbers (1/m).
+    sigma : (n_sounding, n_layer) numpy.ndarray
+        Conductivity (S/m) of the layers of each sounding.
+    thicknesses : (n_layer - 1,) numpy.ndarray
+        Thicknesses (m) of the layers.
+    out : (n_sounding, n_frequency, n_lambda) numpy.ndarray of complex
+        Array where the reflection coefficients will be stored.
+    """
+    n_sounding, n_layer = sigma.shape
+    for i in prange(n_sounding):
+        for f in range(omega_mu.size):
+            iwm = 1j * omega_mu[f]
+            for j in range(lamb.size):
+                l2 = lamb[j] * lamb[j]
+                Yh = np.sqrt(l2 + iwm * sigma[i, n_layer - 1]) / iwm
+                for k in range(n_layer - 2, -1, -1):
+                    u = np.sqrt(l2 + iwm * sigma[i, k])
+                    Y = u / iwm
+                    t = _tanh(u * thicknesses[k])
+                    Yh = Y * (Yh + Y * t) / (Y + Yh * t)
+                Y0 = lamb[j] / iwm
+                out[i, f, j] = (Y0 - Yh) / (Y0 + Yh)
+
+
+@jit(nopython=True, parallel=True)
+def _rTE_sigma_gradient_kernel(omega_mu, lamb, sigma, thicknesses, out):
+    """
+    Fill the gradient of the reflection coefficients of each sounding.
+
+    Parameters
+    ----------
+    omega_mu, lamb, sigma, thicknesses
+        See :func:`_rTE_forward_kernel`.
+    out : (n_sounding, n_layer, n_frequency, n_lambda) numpy.ndarray of complex
+        Array where the gradient will be stored.
+    """
+    n_sounding, n_layer = sigma.shape
+    for i in prange(n_sounding):
+        u = np.empty(n_layer, dtype=np.complex128)
+        Y = np.empty(n_layer, dtype=np.complex128)
+        Yh = np.empty(n_layer, dtype=np.complex128)
+        tanh = np.empty(n_layer, dtype=np.complex128)
+        for f in range(omega_mu.size):
+            iwm = 1j * omega_mu[f]
+            for j in range(lamb.size):
+                l2 = lamb[j] * lamb[j]
+                for k in range(n_layer):
+                    u[k] = np.sqrt(l2 + iwm * sigma[i, k])
+                    Y[k] = u[k] / iwm
+                Yh[n_layer - 1] = Y[n_layer - 1]
+                for k in range(n_layer - 2, -1, -1):
+                    tanh[k] = _tanh(u[k] * thicknesses[k])
+                    Yh[k] = (
+                        Y[k]
+                        * (Yh[k + 1] + Y[k] * tanh[k])
+                        / (Y[k] + Yh[k + 1] * tanh[k])
+                    )
+                Y0 = lamb[j] / iwm
+
+                gyh0 = -2.0 * Y0 / ((Y0 + Yh[0]) * (Y0 + Yh[0]))
+                for k in range(n_layer - 1):
+                    Yk = Y[k]
+                    Yb = Yh[k + 1]
+                    t = tanh[k]
+                    bot = (Yk + Yb * t) * (Yk + Yb * t)
+                    gy = gyh0 * t * (2.0 * t * Yk * Yb + Yk * Yk + Yb * Yb) / bot
+                    gtanh = gyh0 * (Yk * Yk * Yk - Yk * Yb * Yb) / bot
+                    gyh0 = gyh0 * -(t * t - 1.0) * Yk * Yk / bot
+                    gu = gtanh * thicknesses[k] * (1.0 - t * t) + gy / iwm
+                    out[i, k, f, j] = gu * 0.5 / u[k] * iwm
+                out[i, n_layer - 1, f, j] = gyh0 * 0.5 / u[n_layer - 1]
+
+
+def rTE_forward_stitched(frequencies, lamb, sigma, thicknesses):
+    """
+    Reflection coefficients of the TE mode for many soundings at once.
+
+    Parameters
+    ----------
+    frequencies : (n_frequency,) numpy.ndarray
+        Frequencies (Hz).
+    lamb : (n_lambda,) numpy.ndarray
+        Spatial wavenumbers (1/m).
+    sigma : (n_sounding, n_layer) numpy.ndarray
+        Conductivity (S/m) of the layers of each sounding, from the top layer.
+    thicknesses : (n_layer - 1,) numpy.ndarray
+        Thicknesses (m) of the layers, shared by all the soundings.
+
+    Returns
+    -------
+    (n_sounding, n_frequency, n_lambda) numpy.ndarray of complex
+    """
+    frequencies = np.atleast_1d(np.asarray(frequencies, dtype=np.float64))
+    sigma = np.ascontiguousarray(sigma, dtype=np.float64)
+    if numba is None:
+        return _rTE_forward_numpy(frequencies, lamb, sigma, thicknesses)
+    out = np.empty((sigma.shape[0], frequencies.size, lamb.size), dtype=np.complex128)
+    _rTE_forward_kernel(
+        2 * np.pi * frequencies * mu_0,
+        np.ascontiguousarray(lamb, dtype=np.float64),
+        sigma,
+        np.ascontiguousarray(thicknesses, dtype=np.float64),
+        out,
+    )
+    return out
+
+
+def rTE_sigma_gradient_stitched(frequencies, lamb, sigma, thicknesses):
+    """
+    Gradient of the TE reflection coefficients with respect to conductivity.
+
+    Parameters
+    ----------
+    frequencies, lamb, sigma, thicknesses
+        See :func:`rTE_forward_stitched`.
+
+    Returns
+    -------
+    (n_sounding, n_layer, n_frequency, n_lambda) numpy.ndarray of complex
+    """
+    frequencies = np.atleast_1d(np.asarray(frequencies, dtype=np.float64))
+    sigma = np.ascontiguousarray(sigma, dtype=np.float64)
+    if numba is None:
+        return _rTE_sigma_gradient_numpy(frequencies, lamb, sigma, thicknesses)
+    out = np.empty(sigma.shape + (frequencies.size, lamb.size), dtype=np.complex128)
+    _rTE_sigma_gradient_kernel(
+        2 * np.pi * frequencies * mu_0,
+        np.ascontiguousarray(lamb, dtype=np.float64),
+        sigma,
+        np.ascontiguousarray(thicknesses, dtype=np.float64),
+        out,
+    )
+    return out
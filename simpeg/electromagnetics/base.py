@@ -1,5 +1,6 @@
 from ..survey import BaseSrc
-from ..utils import Zero, validate_type
+from ..utils import Zero, validate_float, validate_string, validate_type
+from ..utils.solver_utils import MixedPrecisionSolver
 from ..base import BaseElectricalPDESimulation, BaseMagneticPDESimulation
 
 __all__ = ["BaseEMSimulation", "BaseEMSrc"]
@@ -13,11 +14,40 @@ __all__ = ["BaseEMSimulation", "BaseEMSrc"]
 
 
 class BaseEMSimulation(BaseElectricalPDESimulation, BaseMagneticPDESimulation):
-    """Base electromagnetic simulation class"""
+    """Base electromagnetic simulation class
 
-    def __init__(self, mesh, storeInnerProduct=True, **kwargs):
+    Parameters
+    ----------
+    mesh : discretize.base.BaseMesh
+        Mesh on which the forward problem is discretized.
+    storeInnerProduct : bool, optional
+        Whether to store inner product matrices.
+    field_precision : {"double", "single"}
+        Precision of the stored field solutions. Single precision halves the
+        memory used by the fields, the systems are still solved in the
+        precision set by `solver_precision`.
+    solver_precision : {"double", "mixed"}
+        Precision of the factorizations of the system matrices. Mixed precision
+        factors the matrices in single precision and refines every solve in
+        double precision.
+    mixed_precision_rtol : float, optional
+        Relative tolerance of the refinement of the solves in mixed precision.
+    """
+
+    def __init__(
+        self,
+        mesh,
+        storeInnerProduct=True,
+        field_precision="double",
+        solver_precision="double",
+        mixed_precision_rtol=1e-10,
+        **kwargs,
+    ):
         super().__init__(mesh=mesh, **kwargs)
         self.storeInnerProduct = storeInnerProduct
+        self.field_precision = field_precision
+        self.solver_precision = solver_precision
+        self.mixed_precision_rtol = mixed_precision_rtol
 
     @property
     def storeInnerProduct(self):
@@ -33,6 +63,82 @@ class BaseEMSimulation(BaseElectricalPDESimulation, BaseMagneticPDESimulation):
     def storeInnerProduct(self, value):
         self._storeInnerProduct = validate_type("storeInnerProduct", value, bool)
 
+    @property
+    def field_precision(self):
+        """Precision of the stored field solutions.
+
+        With ``"single"``, the field solutions are stored as ``float32`` or
+        ``complex64`` arrays, and quantities computed from them are returned in
+        double precision.
+
+        Returns
+        -------
+        {"double", "single"}
+        """
+        return self._field_precision
+
+    @field_precision.setter
+    def field_precision(self, value):
+        self._field_precision = validate_string(
+            "field_precision", value, ["double", "single"]
+        )
+
+    @property
+    def solver_precision(self):
+        """Precision of the factorizations of the system matrices.
+
+        With ``"mixed"``, the system matrices are factored in single precision
+        with the `solver`, which must support single precision matrices, and
+        each solve is refined against the double precision system up to
+        `mixed_precision_rtol`. Matrices for which the refinement does not
+        converge are factored again in double precision.
+
+        Returns
+        -------
+        {"double", "mixed"}
+        """
+        return self._solver_precision
+
+    @solver_precision.setter
+    def solver_precision(self, value):
+        self._solver_precision = validate_string(
+            "solver_precision", value, ["double", "mixed"]
+        )
+
+    @property
+    def mixed_precision_rtol(self):
+        """Relative tolerance of the refinement of the solves in mixed precision.
+
+        Returns
+        -------
+        float
+        """
+        return self._mixed_precision_rtol
+
+    @mixed_precision_rtol.setter
+    def mixed_precision_rtol(self, value):
+        self._mixed_precision_rtol = validate_float(
+            "mixed_precision_rtol", value, min_val=0.0, inclusive_min=False
+        )
+
+    def _factor(self, A):
+        """Factor a system matrix with the solver, in the solver precision.
+
+        Parameters
+        ----------
+        A : scipy.sparse.spmatrix
+            The system matrix.
+
+        Returns
+        -------
+        pymatsolver.solvers.Base or simpeg.utils.solver_utils.MixedPrecisionSolver
+        """
+        if self.solver_precision == "mixed":
+            return MixedPrecisionSolver(
+                self.solver, A, rtol=self.mixed_precision_rtol, **self.solver_opts
+            )
+        return self.solver(A, **self.solver_opts)
+
     ####################################################
     # Make A Symmetric
     ####################################################
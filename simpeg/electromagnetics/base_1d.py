@@ -16,6 +16,7 @@ from ..utils import (
     validate_ndarray_with_shape,
     validate_type,
     validate_integer,
+    jtj_diagonal,
 )
 from .. import props
 import libdlf
@@ -609,15 +610,15 @@ class BaseEM1DSimulation(BaseSimulation):
             out = 0.0
             if self.hMap is not None:
                 J = Js["dh"] @ self.hDeriv
-                out = out + np.einsum("i,ij,ij->j", W, J, J)
+                out = out + jtj_diagonal(J, weights=W)
             if self.sigmaMap is not None:
                 J = Js["ds"] @ self.sigmaDeriv
-                out = out + np.einsum("i,ij,ij->j", W, J, J)
+                out = out + jtj_diagonal(J, weights=W)
             if self.muMap is not None:
                 J = Js["dmu"] @ self.muDeriv
-                out = out + np.einsum("i,ij,ij->j", W, J, J)
+                out = out + jtj_diagonal(J, weights=W)
             if self.thicknessesMap is not None:
                 J = Js["dthick"] @ self.thicknessesDeriv
-                out = out + np.einsum("i,ij,ij->j", W, J, J)
+                out = out + jtj_diagonal(J, weights=W)
             self._gtgdiag = out
         return self._gtgdiag
@@ -0,0 +1,487 @@
+from collections import namedtuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from .. import maps, props
+from ..simulation import BaseSimulation
+from ..utils import validate_ndarray_with_shape, validate_string, validate_type
+from ._rte_stitched import rTE_forward_stitched, rTE_sigma_gradient_stitched
+from .base_1d import HANKEL_FILTERS
+
+__all__ = ["BaseStitchedEM1DSimulation"]
+
+# Soundings sharing the same system geometry, simulated with the coefficients
+# of the single sounding simulation of the first of them
+_SoundingGroup = namedtuple(
+    "SoundingGroup",
+    "simulation soundings heights data_index P_real P_imag d_primary",
+)
+
+
+def _hashable(value):
+    """Value usable as part of a dictionary key."""
+    if isinstance(value, np.ndarray):
+        return (value.shape, value.tobytes())
+    return value
+
+
+class BaseStitchedEM1DSimulation(BaseSimulation):
+    """
+    Base simulation class for the EM response of many 1D layered soundings.
+
+    The soundings of airborne surveys are simulated together: the layered
+    conductivity models of the soundings are stacked as a 2D array, and the
+    reflection coefficients and the Hankel (and Fourier) filters are
+    evaluated for blocks of soundings in vectorized passes. The sources of
+    `survey` are split into soundings, a sounding being a run of consecutive
+    sources at the same location, and the filter coefficients are only
+    computed once for all the soundings with the same system geometry (the
+    same sources and receivers at the same positions relative to the
+    sources), the height of the sources above the topography being applied
+    separately for each sounding.
+
+    The model is the conductivity of the layers of all the soundings, with
+    the layers of a sounding ordered from the top layer and the soundings
+    ordered as in the survey. The sensitivity matrix is sparse and block
+    diagonal, each sounding only depending on its own layers.
+
+    Parameters
+    ----------
+    survey : simpeg.survey.BaseSurvey
+        The survey of all the soundings. Only ``MagDipole`` and
+        ``CircularLoop`` sources are supported.
+    sigma, rho : (n_sounding * n_layer,) numpy.ndarray, optional
+        Conductivity (S/m) or resistivity (Ohm m) of the layers.
+    sigmaMap, rhoMap : simpeg.maps.IdentityMap, optional
+        Mappings from the model to the conductivity or resistivity.
+    thicknesses : (n_layer - 1,) numpy.ndarray, optional
+        Thicknesses (m) of the layers, shared by all the soundings. A
+        halfspace is simulated if empty.
+    topo : (3,) or (n_sounding, 3) numpy.ndarray, optional
+        Location of the surface of the layered Earth below each sounding, or
+        below all of them. Defaults to an elevation of 0.
+    hankel_filter : str, optional
+        Name of the Hankel filter, see
+        :attr:`~simpeg.electromagnetics.base_1d.BaseEM1DSimulation.hankel_filter`.
+    max_chunk_size : float, optional
+        Maximum size in MB of the arrays of reflection coefficients evaluated
+        at once. The soundings are processed in blocks of this size.
+    """
+
+    _formulation = "1D"
+    _simulation_1d_class = None  # single sounding simulation, set by subclasses
+    _coefficients_set = False
+
+    sigma, sigmaMap, sigmaDeriv = props.Invertible(
+        "Electrical conductivity of the layers (S/m)"
+    )
+    rho, rhoMap, rhoDeriv = props.Invertible(
+        "Electrical resistivity of the layers (Ohm m)"
+    )
+    props.Reciprocal(sigma, rho)
+
+    def __init__(
+        self,
+        survey=None,
+        sigma=None,
+        sigmaMap=None,
+        rho=None,
+        rhoMap=None,
+        thicknesses=None,
+        topo=None,
+        hankel_filter="key_101_2009",
+        max_chunk_size=128.0,
+        **kwargs,
+    ):
+        super().__init__(survey=survey, **kwargs)
+        self.sigma = sigma
+        self.rho = rho
+        self.sigmaMap = sigmaMap
+        self.rhoMap = rhoMap
+        if thicknesses is None:
+            thicknesses = np.array([])
+        self.thicknesses = thicknesses
+        if topo is None:
+            topo = np.r_[0.0, 0.0, 0.0]
+        self.topo = topo
+        self.hankel_filter = hankel_filter
+        self.max_chunk_size = max_chunk_size
+
+    @property
+    def thicknesses(self):
+        """Thicknesses of the layers, shared by all the soundings.
+
+        Returns
+        -------
+        (n_layer - 1,) numpy.ndarray
+        """
+        return self._thicknesses
+
+    @thicknesses.setter
+    def thicknesses(self, value):
+        self._thicknesses = validate_ndarray_with_shape(
+            "thicknesses", value, shape=("*",)
+        )
+        self._coefficients_set = False
+
+    @property
+    def topo(self):
+        """Location of the surface below each sounding, or below all of them.
+
+        Returns
+        -------
+        (3,) or (n_sounding, 3) numpy.ndarray
+        """
+        return self._topo
+
+    @topo.setter
+    def topo(self, value):
+        self._topo = validate_ndarray_with_shape("topo", value, shape=[(3,), ("*", 3)])
+        self._coefficients_set = False
+
+    @property
+    def hankel_filter(self):
+        """The Hankel filter used.
+
+        Returns
+        -------
+        str
+        """
+        return self._hankel_filter
+
+    @hankel_filter.setter
+    def hankel_filter(self, value):
+        self._hankel_filter = validate_string(
+            "hankel_filter", value, list(HANKEL_FILTERS.keys())
+        )
+        self._coefficients_set = False
+
+    @property
+    def max_chunk_size(self):
+        """Maximum size in MB of the arrays evaluated at once.
+
+        Returns
+        -------
+        float
+        """
+        return self._max_chunk_size
+
+    @max_chunk_size.setter
+    def max_chunk_size(self, value):
+        value = validate_type("max_chunk_size", value, float)
+        if value <= 0:
+            raise ValueError(f"max_chunk_size must be positive, got {value}.")
+        self._max_chunk_size = value
+
+    @property
+    def n_layer(self):
+        """Number of layers of each sounding.
+
+        Returns
+        -------
+        int
+        """
+        return int(self.thicknesses.size + 1)
+
+    @property
+    def n_sounding(self):
+        """Number of soundings of the survey.
+
+        Returns
+        -------
+        int
+        """
+        self._compute_coefficients()
+        return self._n_sounding
+
+    def _simulation_1d_kwargs(self):
+        """Keyword arguments of the single sounding simulations."""
+        return {"thicknesses": self.thicknesses, "hankel_filter": self.hankel_filter}
+
+    def _source_key(self, src):
+        """Properties of a source that must be shared by grouped soundings."""
+        class_name = type(src).__name__
+        if class_name not in ("MagDipole", "CircularLoop"):
+            raise TypeError(
+                f"Unsupported source type of {type(src)}. Must be a CircularLoop "
+                "or MagDipole"
+            )
+        return (
+            class_name,
+            _hashable(src.orientation),
+            src.moment,
+            getattr(src, "radius", None),
+        )
+
+    def _receiver_key(self, src, rx):
+        """Properties of a receiver that must be shared by grouped soundings."""
+        if rx.use_source_receiver_offset:
+            offsets = rx.locations
+        else:
+            offsets = rx.locations - src.location
+        key = [type(rx).__name__, _hashable(offsets)]
+        for name in ("orientation", "component", "data_type", "times"):
+            key.append(_hashable(getattr(rx, name, None)))
+        return tuple(key)
+
+    def _split_soundings(self):
+        """Split the sources in runs of consecutive sources at the same location."""
+        soundings = []
+        for src in self.survey.source_list:
+            if soundings and np.array_equal(src.location, soundings[-1][0].location):
+                soundings[-1].append(src)
+            else:
+                soundings.append([src])
+        return soundings
+
+    def _compute_coefficients(self):
+        if self._coefficients_set:
+            return
+        soundings = self._split_soundings()
+        n_sounding = len(soundings)
+        topo = self.topo
+        if topo.ndim == 2 and topo.shape[0] != n_sounding:
+            raise ValueError(
+                f"topo must have one row for each of the {n_sounding} soundings, "
+                f"got {topo.shape[0]}."
+            )
+        topo = np.broadcast_to(topo, (n_sounding, 3))
+
+        groups = {}
+        for i, sources in enumerate(soundings):
+            key = tuple(
+                (self._source_key(src),)
+                + tuple(self._receiver_key(src, rx) for rx in src.receiver_list)
+                for src in sources
+            )
+            groups.setdefault(key, []).append(i)
+
+        source_start = np.r_[0, np.cumsum([len(s) for s in soundings])[:-1]]
+        data_start = np.r_[0, np.cumsum(self.survey.vnD)[:-1]][source_start]
+        source_heights = np.array([src.location[2] for src in self.survey.source_list])
+
+        self._sounding_groups = []
+        for indices in groups.values():
+            indices = np.array(indices)
+            sources = soundings[indices[0]]
+            # The heights of the sources are applied separately for each
+            # sounding, so the coefficients of the single sounding simulation
+            # are computed with the sources on the surface (as when the height
+            # is inverted for).
+            simulation = self._simulation_1d_class(
+                survey=type(self.survey)(sources),
+                topo=np.r_[0.0, 0.0, -np.inf],
+                hMap=maps.IdentityMap(),
+                **self._simulation_1d_kwargs(),
+            )
+            simulation._compute_coefficients()
+
+            row_source = []
+            row_dz = []
+            for i_src, src in enumerate(sources):
+                for rx in src.receiver_list:
+                    row_source.append(np.full(rx.locations.shape[0], i_src))
+                    dz = rx.locations[:, 2]
+                    if not rx.use_source_receiver_offset:
+                        dz = dz - src.location[2]
+                    row_dz.append(dz)
+            row_source = np.concatenate(row_source)
+            row_dz = np.concatenate(row_dz)
+
+            heights = source_heights[source_start[indices][:, None] + row_source]
+            heights = heights - topo[indices, 2:]
+            if np.any(heights < 0.0):
+                raise ValueError("Source must be located above the topography")
+            if np.any(heights + row_dz < 0.0):
+                raise ValueError("Receiver must be located above the topography")
+
+            # Linear map from the responses of a sounding to its data, and the
+            # primary fields added to them
+            shape = self._response_shape(simulation)
+            n_response = int(np.prod(shape))
+            basis = np.eye(n_response, dtype=complex).reshape(shape + (n_response,))
+            P_real = simulation._project_to_data(basis.copy())
+            P_imag = simulation._project_to_data(1j * basis)
+            d_primary = simulation._project_to_data(np.zeros(shape, dtype=complex))
+
+            n_data = P_real.shape[0]
+            data_index = data_start[indices][:, None] + np.arange(n_data)
+            self._sounding_groups.append(
+                _SoundingGroup(
+                    simulation,
+                    indices,
+                    heights,
+                    data_index,
+                    P_real,
+                    P_imag,
+                    d_primary,
+                )
+            )
+        self._n_sounding = n_sounding
+        self._coefficients_set = True
+
+    def _response_shape(self, simulation):
+        """Shape of the responses of a sounding projected to its data."""
+        raise NotImplementedError
+
+    def _response(self, simulation, rTE, C0s, C1s):
+        """
+        Responses of soundings for their reflection coefficients.
+
+        Parameters
+        ----------
+        simulation : simpeg.electromagnetics.base_1d.BaseEM1DSimulation
+            Single sounding simulation holding the coefficients.
+        rTE : (n_sounding, ..., n_frequency, n_lambda) numpy.ndarray
+            Reflection coefficients at the unique wavenumbers.
+        C0s, C1s : (n_sounding, ..., n_row, n_filter) numpy.ndarray
+            Coefficients of the Hankel transform of each sounding.
+
+        Returns
+        -------
+        (n_sounding, ..., n_response) numpy.ndarray of complex
+        """
+        raise NotImplementedError
+
+    def _chunks(self, group, n_values):
+        """Blocks of soundings of a group, with ``n_values`` per sounding."""
+        n_per_chunk = max(int(self.max_chunk_size * 1e6 // (16 * n_values)), 1)
+        for start in range(0, group.soundings.size, n_per_chunk):
+            yield slice(start, start + n_per_chunk)
+
+    def _height_coefficients(self, group, chunk):
+        """Hankel coefficients with the source heights of a block of soundings."""
+        simulation = group.simulation
+        lambs = simulation._lambs
+        attenuation = np.exp(-2.0 * lambs * group.heights[chunk][..., None])
+        return simulation._C0s * attenuation, simulation._C1s * attenuation
+
+    def _n_values(self, simulation):
+        """Number of reflection coefficients evaluated for each sounding."""
+        n_frequency = len(np.atleast_1d(self._response_frequencies(simulation)))
+        return n_frequency * max(simulation._unique_lambs.size, simulation._lambs.size)
+
+    def _response_frequencies(self, simulation):
+        """Frequencies at which the reflection coefficients are evaluated."""
+        raise NotImplementedError
+
+    def fields(self, m):
+        """
+        Predicted data of all the soundings.
+
+        Parameters
+        ----------
+        m : (n_param,) numpy.ndarray
+            The model parameters.
+
+        Returns
+        -------
+        (n_data,) numpy.ndarray
+        """
+        self._compute_coefficients()
+        self.model = m
+        sigma = self.sigma.reshape(-1, self.n_layer)
+
+        out = np.empty(self.survey.nD)
+        for group in self._sounding_groups:
+            simulation = group.simulation
+            frequencies = self._response_frequencies(simulation)
+            for chunk in self._chunks(group, self._n_values(simulation)):
+                rTE = rTE_forward_stitched(
+                    frequencies,
+                    simulation._unique_lambs,
+                    sigma[group.soundings[chunk]],
+                    self.thicknesses,
+                )
+                C0s, C1s = self._height_coefficients(group, chunk)
+                v = self._response(simulation, rTE, C0s, C1s)
+                out[group.data_index[chunk]] = (
+                    v.real @ group.P_real.T + v.imag @ group.P_imag.T + group.d_primary
+                )
+        return out
+
+    def dpred(self, m, f=None):
+        """
+        Return predicted data.
+        Predicted data, (`_pred`) are computed when
+        self.fields is called.
+        """
+        if f is None:
+            f = self.fields(m)
+        return f
+
+    def getJ(self, m, f=None):
+        r"""Get the sparse Jacobian matrix.
+
+        The sensitivities of the data of each sounding to its layers are
+        computed for blocks of soundings at once, and assembled as a sparse
+        block diagonal matrix which is stored until the model changes.
+
+        Parameters
+        ----------
+        m : (n_param,) numpy.ndarray
+            The model parameters.
+        f : Ignored
+            Not used, present here for API consistency by convention.
+
+        Returns
+        -------
+        (n_data, n_param) scipy.sparse.csr_matrix
+            The Jacobian matrix.
+        """
+        self.model = m
+        if getattr(self, "_J", None) is None:
+            self._compute_coefficients()
+            n_layer = self.n_layer
+            sigma = self.sigma.reshape(-1, n_layer)
+            n_data = self.survey.nD
+
+            values = np.empty((n_data, n_layer))
+            columns = np.empty((n_data, n_layer), dtype=np.int64)
+            for group in self._sounding_groups:
+                simulation = group.simulation
+                frequencies = self._response_frequencies(simulation)
+                n_values = n_layer * self._n_values(simulation)
+                for chunk in self._chunks(group, n_values):
+                    soundings = group.soundings[chunk]
+                    rTE_ds = rTE_sigma_gradient_stitched(
+                        frequencies,
+                        simulation._unique_lambs,
+                        sigma[soundings],
+                        self.thicknesses,
+                    )
+                    C0s, C1s = self._height_coefficients(group, chunk)
+                    v = self._response(simulation, rTE_ds, C0s[:, None], C1s[:, None])
+                    J = v.real @ group.P_real.T + v.imag @ group.P_imag.T
+                    data_index = group.data_index[chunk]
+                    values[data_index] = np.swapaxes(J, 1, 2)
+                    first_column = soundings[:, None, None] * n_layer
+                    columns[data_index] = first_column + np.arange(n_layer)
+            indptr = np.arange(0, n_data * n_layer + 1, n_layer)
+            J = sp.csr_matrix(
+                (values.ravel(), columns.ravel(), indptr),
+                shape=(n_data, self._n_sounding * n_layer),
+            )
+            self._J = sp.csr_matrix(J @ self.sigmaDeriv)
+        return self._J
+
+    def Jvec(self, m, v, f=None):
+        return self.getJ(m, f=f) @ v
+
+    def Jtvec(self, m, v, f=None):
+        return self.getJ(m, f=f).T @ v
+
+    def getJtJdiag(self, m, W=None, f=None, method=None, **kwargs):
+        if method in (None, "exact"):
+            self.model = m
+            if getattr(self, "_gtgdiag", None) is None:
+                J = self.getJ(m, f=f)
+                weights = np.ones(J.shape[0]) if W is None else W.diagonal() ** 2
+                self._gtgdiag = np.asarray(J.multiply(J).T @ weights).ravel()
+            return self._gtgdiag
+        return super().getJtJdiag(m, W=W, f=f, method=method, **kwargs)
+
+    @property
+    def _delete_on_model_update(self):
+        return super()._delete_on_model_update + ["_J"]
@@ -30,6 +30,7 @@ Simulations
   :toctree: generated/
 
   Simulation1DLayered
+  Simulation1DLayeredStitched
   Simulation3DElectricField
   Simulation3DMagneticFluxDensity
   Simulation3DCurrentDensity
@@ -102,6 +103,7 @@ from .simulation import (
     Simulation3DMagneticField,
 )
 from .simulation_1d import Simulation1DLayered
+from .simulation_1d_stitched import Simulation1DLayeredStitched
 from .fields import (
     Fields3DElectricField,
     Fields3DMagneticFluxDensity,
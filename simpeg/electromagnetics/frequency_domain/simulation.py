@@ -1,9 +1,22 @@
+from collections.abc import Sequence
+from contextlib import contextmanager
+
 import numpy as np
 import scipy.sparse as sp
 from discretize.utils import Zero
 
 from ... import props
-from ...utils import mkvc, validate_type
+from ...utils import (
+    mkvc,
+    validate_type,
+    validate_float,
+    validate_integer,
+)
+from ...utils.solver_utils import (
+    SolverCache,
+    SolverThreadPool,
+    solve_with_approximate_solver,
+)
 from ..base import BaseEMSimulation
 from ..utils import omega
 from .survey import Survey
@@ -54,6 +67,25 @@ class BaseFDEMSimulation(BaseEMSimulation):
         If ``True``, the factorization for the inverse of the system matrix at each
         frequency is discarded after the fields are computed at that frequency.
         If ``False``, the factorizations of the system matrices for all frequencies are stored.
+    max_factor_memory : float, optional
+        Approximate memory budget, in GB, for the factorizations of the system
+        matrices stored for each frequency. If ``None``, the factorizations for
+        all frequencies are stored.
+    factor_reuse_rtol : float, optional
+        If set, the factorizations for the previous model are kept when the
+        model is updated, and :meth:`fields` first tries to solve each system by
+        iterative refinement with them, up to this relative tolerance. The
+        system matrix is only factored if the refinement does not converge.
+        If ``None``, the systems are factored again after every model update.
+    factor_reuse_maxiter : int, optional
+        Maximum number of refinement iterations with the factorizations for the
+        previous model.
+    n_threads : int, optional
+        Number of threads used to factor and solve the systems of different
+        frequencies concurrently.
+    max_concurrent_factorizations : int, optional
+        Maximum number of frequencies factored at the same time. If ``None``,
+        it is equal to `n_threads`.
     permittivity : (n_cells,) numpy.ndarray, optional
         Dielectric permittivity (F/m) defined on the entire mesh. If ``None``, electric displacement
         is ignored. Please note that `permittivity` is not an invertible property, and that future
@@ -70,12 +102,22 @@ class BaseFDEMSimulation(BaseEMSimulation):
         mesh,
         survey=None,
         forward_only=False,
+        max_factor_memory=None,
+        factor_reuse_rtol=None,
+        factor_reuse_maxiter=10,
+        n_threads=1,
+        max_concurrent_factorizations=None,
         permittivity=None,
         storeJ=False,
         **kwargs,
     ):
         super().__init__(mesh=mesh, survey=survey, **kwargs)
         self.forward_only = forward_only
+        self.max_factor_memory = max_factor_memory
+        self.factor_reuse_rtol = factor_reuse_rtol
+        self.factor_reuse_maxiter = factor_reuse_maxiter
+        self.n_threads = n_threads
+        self.max_concurrent_factorizations = max_concurrent_factorizations
         if permittivity is not None:
             warnings.warn(
                 "Simulations using permittivity have not yet been thoroughly tested and derivatives are not implemented. Contributions welcome!",
@@ -138,6 +180,262 @@ class BaseFDEMSimulation(BaseEMSimulation):
     def forward_only(self, value):
         self._forward_only = validate_type("forward_only", value, bool)
 
+    @property
+    def max_factor_memory(self):
+        """Approximate memory budget for the stored factorizations in GB.
+
+        The factorization of the system matrix for each frequency is stored and
+        reused by :meth:`fields`, :meth:`Jvec` and :meth:`Jtvec`. When the
+        stored factors exceed this budget, the least recently used ones are
+        discarded, starting with the ones kept from a previous model.
+        If ``None``, the factors for all frequencies are kept.
+
+        Returns
+        -------
+        float or None
+            Approximate memory budget for the stored factorizations in GB.
+        """
+        return self._max_factor_memory
+
+    @max_factor_memory.setter
+    def max_factor_memory(self, value):
+        if value is not None:
+            value = validate_float("max_factor_memory", value, min_val=0.0)
+        self._max_factor_memory = value
+        if getattr(self, "_factor_cache", None) is not None:
+            self._factor_cache.max_memory = value
+
+    @property
+    def factor_reuse_rtol(self):
+        """Relative tolerance of the solves with the factors of a previous model.
+
+        Line searches only change the model slightly, so the factorizations
+        for the previous model are good approximate solvers for the new system
+        matrices. If set, :meth:`fields` solves each system by iterative
+        refinement with them, and only factors the new system matrix if the
+        refinement does not converge to this tolerance. :meth:`Jvec` and
+        :meth:`Jtvec` always use the factors for the current model.
+        If ``None``, the factors are discarded on every model update.
+
+        Returns
+        -------
+        float or None
+            Relative tolerance of the solves with the factors of a previous model.
+        """
+        return self._factor_reuse_rtol
+
+    @factor_reuse_rtol.setter
+    def factor_reuse_rtol(self, value):
+        if value is not None:
+            value = validate_float(
+                "factor_reuse_rtol", value, min_val=0.0, inclusive_min=False
+            )
+        self._factor_reuse_rtol = value
+
+    @property
+    def factor_reuse_maxiter(self):
+        """Maximum number of refinement iterations with the factors of a previous model.
+
+        Returns
+        -------
+        int
+            Maximum number of refinement iterations.
+        """
+        return self._factor_reuse_maxiter
+
+    @factor_reuse_maxiter.setter
+    def factor_reuse_maxiter(self, value):
+        self._factor_reuse_maxiter = validate_integer(
+            "factor_reuse_maxiter", value, min_val=1
+        )
+
+    @property
+    def n_threads(self):
+        """Number of threads used to process the frequencies concurrently.
+
+        :meth:`fields`, :meth:`Jvec` and :meth:`Jtvec` factor and solve the
+        systems of each frequency independently, so they can run in a pool of
+        threads sharing the mesh and the survey. This is only effective with
+        solvers that release the GIL, like the direct solvers in pymatsolver.
+
+        Returns
+        -------
+        int
+            Number of threads.
+        """
+        return self._n_threads
+
+    @n_threads.setter
+    def n_threads(self, value):
+        self._n_threads = validate_integer("n_threads", value, min_val=1)
+
+    @property
+    def max_concurrent_factorizations(self):
+        """Maximum number of frequencies factored at the same time.
+
+        Caps the peak memory used by the factorizations when
+        :py:attr:`n_threads` is larger than 1. If ``None``, every thread can
+        factor a system at the same time.
+
+        Returns
+        -------
+        int or None
+            Maximum number of concurrent factorizations.
+        """
+        return self._max_concurrent_factorizations
+
+    @max_concurrent_factorizations.setter
+    def max_concurrent_factorizations(self, value):
+        if value is not None:
+            value = validate_integer("max_concurrent_factorizations", value, min_val=1)
+        self._max_concurrent_factorizations = value
+
+    def _thread_pool(self):
+        """Pool of threads to process the frequencies."""
+        return SolverThreadPool(
+            n_threads=min(self.n_threads, len(self.survey.frequencies)),
+            max_concurrent_factorizations=self.max_concurrent_factorizations,
+        )
+
+    @property
+    def Ainv(self):
+        """Solvers for the system matrices at each frequency.
+
+        The system matrices are factored on demand and stored, within
+        :py:attr:`max_factor_memory`, until the model is updated.
+
+        Returns
+        -------
+        Sequence of pymatsolver.solvers.Base
+            Solvers for the system matrices, in the order of the survey's
+            frequencies.
+        """
+        return _FrequencySolvers(self)
+
+    @property
+    def _factors(self):
+        """Cache of the factored system matrices keyed by frequency."""
+        if getattr(self, "_factor_cache", None) is None:
+            self._factor_cache = SolverCache(max_memory=self.max_factor_memory)
+        if not getattr(self, "_factors_are_current", False):
+            # the model was updated since the factors were computed
+            if self.factor_reuse_rtol is None:
+                self._factor_cache.clean()
+            else:
+                self._factor_cache.retire()
+            self._factors_are_current = True
+        return self._factor_cache
+
+    def _clean_factors(self):
+        """Clean and discard all stored factorizations."""
+        if getattr(self, "_factor_cache", None) is not None:
+            self._factor_cache.clean()
+            self._factor_cache = None
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in [
+            "sigma",
+            "rho",
+            "mu",
+            "mui",
+            "permittivity",
+            "solver",
+            "solver_opts",
+        ]:
+            self._clean_factors()
+
+    def _get_Ainv(self, freq, A=None, pool=None, pin=False):
+        """Return the factored system matrix for a frequency.
+
+        Parameters
+        ----------
+        freq : float
+            The frequency in Hz.
+        A : scipy.sparse.spmatrix, optional
+            The system matrix, if it has already been built.
+        pool : simpeg.utils.solver_utils.SolverThreadPool, optional
+            Pool of the threads processing the frequencies.
+        pin : bool, optional
+            Whether to pin the solver in the factor cache, so it isn't cleaned
+            if other threads evict it. Pinned solvers must be released with
+            ``self._factors.unpin``.
+
+        Returns
+        -------
+        pymatsolver.solvers.Base
+            The solver for the system matrix.
+        """
+        if pool is None:
+            pool = SolverThreadPool()
+        factors = self._factors
+        with pool.lock:
+            if freq in factors:
+                Ainv = factors.get(freq, None)
+                return factors.pin(Ainv) if pin else Ainv
+        if A is None:
+            A = self.getA(freq)
+        if self.verbose:
+            print("Factoring...   (f = {:e} Hz)".format(freq))
+        Ainv = pool.factor(self._factor, A)
+        with pool.lock:
+            # another thread may have factored the same frequency meanwhile
+            Ainv = factors.add(freq, Ainv)
+            return factors.pin(Ainv) if pin else Ainv
+
+    @contextmanager
+    def _pinned_Ainv(self, freq, A=None, pool=None):
+        """Context manager pinning the factored system matrix for a frequency.
+
+        The solver isn't cleaned, even if it is evicted from the factor cache
+        by another thread, until the context exits.
+        """
+        if pool is None:
+            pool = SolverThreadPool()
+        factors = self._factors
+        Ainv = self._get_Ainv(freq, A=A, pool=pool, pin=True)
+        try:
+            yield Ainv
+        finally:
+            with pool.lock:
+                factors.unpin(Ainv)
+
+    def _solve(self, freq, A, rhs, pool=None):
+        """Solve the system at a frequency for the fields.
+
+        Uses the factors for the current model if they are stored. Otherwise,
+        tries an iterative refinement with the factors for a previous model
+        before factoring the system matrix.
+        """
+        if pool is None:
+            pool = SolverThreadPool()
+        factors = self._factors
+        if self.factor_reuse_rtol is not None:
+            with pool.lock:
+                previous = None if freq in factors else factors.get_retired(freq)
+                if previous is not None:
+                    factors.pin(previous)
+            if previous is not None:
+                try:
+                    u, converged = solve_with_approximate_solver(
+                        A,
+                        previous,
+                        rhs,
+                        rtol=self.factor_reuse_rtol,
+                        maxiter=self.factor_reuse_maxiter,
+                    )
+                finally:
+                    with pool.lock:
+                        factors.unpin(previous)
+                if converged:
+                    return u
+        with self._pinned_Ainv(freq, A=A, pool=pool) as Ainv:
+            u = Ainv * rhs
+        if self.forward_only and self.factor_reuse_rtol is None:
+            with pool.lock:
+                factors.pop(freq)
+        return u
+
     def _get_admittivity(self, freq):
         if self.permittivity is not None:
             return self.sigma + 1j * self.permittivity * omega(freq)
@@ -184,21 +482,17 @@ class BaseFDEMSimulation(BaseEMSimulation):
         if m is not None:
             self.model = m
 
-        try:
-            self.Ainv
-        except AttributeError:
-            self.Ainv = len(self.survey.frequencies) * [None]
-
         f = self.fieldsPair(self)
+        # check for model updates before starting the threads
+        self._factors
 
-        for i_f, freq in enumerate(self.survey.frequencies):
-            A = self.getA(freq)
-            rhs = self.getRHS(freq)
-            Ainv = self.solver(A, **self.solver_opts)
-            u = Ainv * rhs
-            if not self.forward_only:
-                self.Ainv[i_f] = Ainv
+        def solve(freq):
+            return self._solve(freq, self.getA(freq), self.getRHS(freq), pool)
 
+        with self._thread_pool() as pool:
+            solutions = pool.map(solve, self.survey.frequencies)
+
+        for freq, u in zip(self.survey.frequencies, solutions):
             Srcs = self.survey.get_sources_by_frequency(freq)
             f[Srcs, self._solutionType] = u
         return f
@@ -242,19 +536,36 @@ class BaseFDEMSimulation(BaseEMSimulation):
 
         survey_slices = self.survey.get_all_slices()
         Jv = np.full(self.survey.nD, fill_value=np.nan)
+        # check for model updates before starting the threads
+        self._factors
 
-        for nf, freq in enumerate(self.survey.frequencies):
-            for src in self.survey.get_sources_by_frequency(freq):
-                u_src = f[src, self._solutionType]
-                dA_dm_v = self.getADeriv(freq, u_src, v, adjoint=False)
-                dRHS_dm_v = self.getRHSDeriv(freq, src, v)
-                du_dm_v = self.Ainv[nf] * (-dA_dm_v + dRHS_dm_v)
-                for rx in src.receiver_list:
-                    src_rx_slice = survey_slices[src, rx]
-                    Jv[src_rx_slice] = mkvc(
-                        rx.evalDeriv(src, self.mesh, f, du_dm_v=du_dm_v, v=v)
-                    )
+        def jvec_frequency(freq):
+            blocks = []
+            with self._pinned_Ainv(freq, pool=pool) as Ainv:
+                for src in self.survey.get_sources_by_frequency(freq):
+                    u_src = f[src, self._solutionType]
+                    dA_dm_v = self.getADeriv(freq, u_src, v, adjoint=False)
+                    dRHS_dm_v = self.getRHSDeriv(freq, src, v)
+                    du_dm_v = Ainv * (-dA_dm_v + dRHS_dm_v)
+                    for rx in src.receiver_list:
+                        blocks.append(
+                            (
+                                survey_slices[src, rx],
+                                mkvc(
+                                    rx.evalDeriv(
+                                        src, self.mesh, f, du_dm_v=du_dm_v, v=v
+                                    )
+                                ),
+                            )
+                        )
+            return blocks
 
+        with self._thread_pool() as pool:
+            results = pool.map(jvec_frequency, self.survey.frequencies)
+
+        for blocks in results:
+            for src_rx_slice, block in blocks:
+                Jv[src_rx_slice] = block
         return Jv
 
     def Jtvec(self, m, v, f=None):
@@ -288,6 +599,12 @@ class BaseFDEMSimulation(BaseEMSimulation):
             The adjoint sensitivity matrix times a vector.
         """
 
+        return mkvc(self._Jtvec_block(m, v, f=f))
+
+    def _Jtvec_block(self, m, V, f=None):
+        # Docstring inherited from BaseSimulation
+        # The adjoint problems of all the vectors share the factorization of
+        # each frequency, and are solved at once as a multiple right hand side.
         if f is None:
             f = self.fields(m)
 
@@ -296,33 +613,40 @@ class BaseFDEMSimulation(BaseEMSimulation):
         # Get dict of flat array slices for each source-receiver pair in the survey
         survey_slices = self.survey.get_all_slices()
 
-        Jtv = np.zeros(m.size)
-
-        for nf, freq in enumerate(self.survey.frequencies):
-            for src in self.survey.get_sources_by_frequency(freq):
-                u_src = f[src, self._solutionType]
-                df_duT_sum = 0
-                df_dmT_sum = 0
-                for rx in src.receiver_list:
-                    src_rx_slice = survey_slices[src, rx]
-                    df_duT, df_dmT = rx.evalDeriv(
-                        src, self.mesh, f, v=v[src_rx_slice], adjoint=True
-                    )
-                    if not isinstance(df_duT, Zero):
-                        df_duT_sum += df_duT
-                    if not isinstance(df_dmT, Zero):
-                        df_dmT_sum += df_dmT
+        Jtv = np.zeros((m.size,) + V.shape[1:])
+        # check for model updates before starting the threads
+        self._factors
+
+        def jtvec_frequency(freq):
+            with self._pinned_Ainv(freq, pool=pool) as Ainv:
+                for src in self.survey.get_sources_by_frequency(freq):
+                    u_src = f[src, self._solutionType]
+                    df_duT_sum = 0
+                    df_dmT_sum = 0
+                    for rx in src.receiver_list:
+                        src_rx_slice = survey_slices[src, rx]
+                        df_duT, df_dmT = rx.evalDeriv(
+                            src, self.mesh, f, v=V[src_rx_slice], adjoint=True
+                        )
+                        if not isinstance(df_duT, Zero):
+                            df_duT_sum += df_duT
+                        if not isinstance(df_dmT, Zero):
+                            df_dmT_sum += df_dmT
 
-                ATinvdf_duT = self.Ainv[nf] * df_duT_sum
+                    ATinvdf_duT = Ainv * df_duT_sum
 
-                dA_dmT = self.getADeriv(freq, u_src, ATinvdf_duT, adjoint=True)
-                dRHS_dmT = self.getRHSDeriv(freq, src, ATinvdf_duT, adjoint=True)
-                du_dmT = -dA_dmT + dRHS_dmT
+                    dA_dmT = self.getADeriv(freq, u_src, ATinvdf_duT, adjoint=True)
+                    dRHS_dmT = self.getRHSDeriv(freq, src, ATinvdf_duT, adjoint=True)
+                    du_dmT = -dA_dmT + dRHS_dmT
 
-                df_dmT_sum += du_dmT
-                Jtv += np.real(df_dmT_sum)
+                    df_dmT_sum += du_dmT
+                    with pool.lock:
+                        Jtv[:] += np.real(df_dmT_sum)
 
-        return mkvc(Jtv)
+        with self._thread_pool() as pool:
+            pool.map(jtvec_frequency, self.survey.frequencies)
+
+        return Jtv
 
     def getJ(self, m, f=None):
         r"""Generate the full sensitivity matrix.
@@ -394,50 +718,6 @@ class BaseFDEMSimulation(BaseEMSimulation):
 
         return self._Jmatrix
 
-    def getJtJdiag(self, m, W=None, f=None):
-        r"""Return the diagonal of :math:`\mathbf{J^T J}`.
-
-        Where :math:`\mathbf{d}` are the data and :math:`\mathbf{m}` are the model parameters,
-        the sensitivity matrix :math:`\mathbf{J}` is defined as:
-
-        .. math::
-            \mathbf{J} = \dfrac{\partial \mathbf{d}}{\partial \mathbf{m}}
-
-        This method returns the diagonals of :math:`\mathbf{J^T J}`. When the
-        *W* input argument is used to include a diagonal weighting matrix
-        :math:`\mathbf{W}`, this method returns the diagonal of
-        :math:`\mathbf{W^T J^T J W}`.
-
-        Parameters
-        ----------
-        m : (n_param,) numpy.ndarray
-            The model parameters.
-        W : (n_param, n_param) scipy.sparse.csr_matrix
-            A diagonal weighting matrix.
-        f : .frequency_domain.fields.FieldsFDEM, optional
-            Fields solved for all sources.
-
-        Returns
-        -------
-        (n_param,) numpy.ndarray
-            The diagonals.
-        """
-        self.model = m
-
-        if getattr(self, "_gtgdiag", None) is None:
-            J = self.getJ(m, f=f)
-
-            if W is None:
-                W = np.ones(J.shape[0])
-            else:
-                W = W.diagonal() ** 2
-
-            diag = np.einsum("i,ij,ij->j", W, J, J)
-
-            self._gtgdiag = diag
-
-        return self._gtgdiag
-
     # @profile
     def getSourceTerm(self, freq):
         r"""Returns the discrete source terms for the frequency provided.
@@ -503,7 +783,23 @@ class BaseFDEMSimulation(BaseEMSimulation):
             List of the model-dependent attributes to clean upon model update.
         """
         toDelete = super()._delete_on_model_update
-        return toDelete + ["_Jmatrix", "_gtgdiag"]
+        return toDelete + ["_Jmatrix", "_gtgdiag", "_factors_are_current"]
+
+
+class _FrequencySolvers(Sequence):
+    """Solvers of a FDEM simulation, indexed like the survey's frequencies."""
+
+    def __init__(self, simulation):
+        self._simulation = simulation
+
+    def __len__(self):
+        return len(self._simulation.survey.frequencies)
+
+    def __getitem__(self, index):
+        frequencies = self._simulation.survey.frequencies
+        if isinstance(index, slice):
+            return [self._simulation._get_Ainv(freq) for freq in frequencies[index]]
+        return self._simulation._get_Ainv(frequencies[index])
 
 
 ###############################################################################
@@ -529,6 +825,25 @@ class Simulation3DElectricField(BaseFDEMSimulation):
         If ``True``, the factorization for the inverse of the system matrix at each
         frequency is discarded after the fields are computed at that frequency.
         If ``False``, the factorizations of the system matrices for all frequencies are stored.
+    max_factor_memory : float, optional
+        Approximate memory budget, in GB, for the factorizations of the system
+        matrices stored for each frequency. If ``None``, the factorizations for
+        all frequencies are stored.
+    factor_reuse_rtol : float, optional
+        If set, the factorizations for the previous model are kept when the
+        model is updated, and :meth:`fields` first tries to solve each system by
+        iterative refinement with them, up to this relative tolerance. The
+        system matrix is only factored if the refinement does not converge.
+        If ``None``, the systems are factored again after every model update.
+    factor_reuse_maxiter : int, optional
+        Maximum number of refinement iterations with the factorizations for the
+        previous model.
+    n_threads : int, optional
+        Number of threads used to factor and solve the systems of different
+        frequencies concurrently.
+    max_concurrent_factorizations : int, optional
+        Maximum number of frequencies factored at the same time. If ``None``,
+        it is equal to `n_threads`.
     permittivity : (n_cells,) numpy.ndarray, optional
         Dielectric permittivity (F/m) defined on the entire mesh. If ``None``, electric displacement
         is ignored. Please note that `permittivity` is not an invertible property, and that future
@@ -919,6 +1234,25 @@ class Simulation3DMagneticFluxDensity(BaseFDEMSimulation):
         If ``True``, the factorization for the inverse of the system matrix at each
         frequency is discarded after the fields are computed at that frequency.
         If ``False``, the factorizations of the system matrices for all frequencies are stored.
+    max_factor_memory : float, optional
+        Approximate memory budget, in GB, for the factorizations of the system
+        matrices stored for each frequency. If ``None``, the factorizations for
+        all frequencies are stored.
+    factor_reuse_rtol : float, optional
+        If set, the factorizations for the previous model are kept when the
+        model is updated, and :meth:`fields` first tries to solve each system by
+        iterative refinement with them, up to this relative tolerance. The
+        system matrix is only factored if the refinement does not converge.
+        If ``None``, the systems are factored again after every model update.
+    factor_reuse_maxiter : int, optional
+        Maximum number of refinement iterations with the factorizations for the
+        previous model.
+    n_threads : int, optional
+        Number of threads used to factor and solve the systems of different
+        frequencies concurrently.
+    max_concurrent_factorizations : int, optional
+        Maximum number of frequencies factored at the same time. If ``None``,
+        it is equal to `n_threads`.
     permittivity : (n_cells,) numpy.ndarray, optional
         Dielectric permittivity (F/m) defined on the entire mesh. If ``None``, electric displacement
         is ignored. Please note that `permittivity` is not an invertible property, and that future
@@ -1363,6 +1697,25 @@ class Simulation3DCurrentDensity(BaseFDEMSimulation):
         If ``True``, the factorization for the inverse of the system matrix at each
         frequency is discarded after the fields are computed at that frequency.
         If ``False``, the factorizations of the system matrices for all frequencies are stored.
+    max_factor_memory : float, optional
+        Approximate memory budget, in GB, for the factorizations of the system
+        matrices stored for each frequency. If ``None``, the factorizations for
+        all frequencies are stored.
+    factor_reuse_rtol : float, optional
+        If set, the factorizations for the previous model are kept when the
+        model is updated, and :meth:`fields` first tries to solve each system by
+        iterative refinement with them, up to this relative tolerance. The
+        system matrix is only factored if the refinement does not converge.
+        If ``None``, the systems are factored again after every model update.
+    factor_reuse_maxiter : int, optional
+        Maximum number of refinement iterations with the factorizations for the
+        previous model.
+    n_threads : int, optional
+        Number of threads used to factor and solve the systems of different
+        frequencies concurrently.
+    max_concurrent_factorizations : int, optional
+        Maximum number of frequencies factored at the same time. If ``None``,
+        it is equal to `n_threads`.
     permittivity : (n_cells,) numpy.ndarray, optional
         Dielectric permittivity (F/m) defined on the entire mesh. If ``None``, electric displacement
         is ignored. Please note that `permittivity` is not an invertible property, and that future
@@ -1806,6 +2159,25 @@ class Simulation3DMagneticField(BaseFDEMSimulation):
         If ``True``, the factorization for the inverse of the system matrix at each
         frequency is discarded after the fields are computed at that frequency.
         If ``False``, the factorizations of the system matrices for all frequencies are stored.
+    max_factor_memory : float, optional
+        Approximate memory budget, in GB, for the factorizations of the system
+        matrices stored for each frequency. If ``None``, the factorizations for
+        all frequencies are stored.
+    factor_reuse_rtol : float, optional
+        If set, the factorizations for the previous model are kept when the
+        model is updated, and :meth:`fields` first tries to solve each system by
+        iterative refinement with them, up to this relative tolerance. The
+        system matrix is only factored if the refinement does not converge.
+        If ``None``, the systems are factored again after every model update.
+    factor_reuse_maxiter : int, optional
+        Maximum number of refinement iterations with the factorizations for the
+        previous model.
+    n_threads : int, optional
+        Number of threads used to factor and solve the systems of different
+        frequencies concurrently.
+    max_concurrent_factorizations : int, optional
+        Maximum number of frequencies factored at the same time. If ``None``,
+        it is equal to `n_threads`.
     permittivity : (n_cells,) numpy.ndarray, optional
         Dielectric permittivity (F/m) defined on the entire mesh. If ``None``, electric displacement
         is ignored. Please note that `permittivity` is not an invertible property, and that future
@@ -0,0 +1,51 @@
+import numpy as np
+
+from ...utils import validate_type
+from ..base_1d_stitched import BaseStitchedEM1DSimulation
+from .simulation_1d import Simulation1DLayered
+from .survey import Survey
+
+
+class Simulation1DLayeredStitched(BaseStitchedEM1DSimulation):
+    """
+    Simulation class for simulating the FEM response of many soundings, each
+    over its own 1D layered Earth.
+
+    See :class:`~simpeg.electromagnetics.base_1d_stitched.BaseStitchedEM1DSimulation`
+    for how the survey is split into soundings and how the model is ordered.
+    """
+
+    _simulation_1d_class = Simulation1DLayered
+
+    @property
+    def survey(self):
+        """The simulations survey.
+
+        Returns
+        -------
+        simpeg.electromagnetics.frequency_domain.survey.Survey
+        """
+        if self._survey is None:
+            raise AttributeError("Simulation must have a survey set")
+        return self._survey
+
+    @survey.setter
+    def survey(self, value):
+        if value is not None:
+            value = validate_type("survey", value, Survey, cast=False)
+        self._survey = value
+        self._coefficients_set = False
+
+    def _source_key(self, src):
+        return super()._source_key(src) + (src.frequency,)
+
+    def _response_shape(self, simulation):
+        return (simulation._W.shape[0],)
+
+    def _response_frequencies(self, simulation):
+        return np.array(simulation.survey.frequencies)
+
+    def _response(self, simulation, rTE, C0s, C1s):
+        rTE = rTE[..., simulation._i_freq[:, None], simulation._inv_lambs]
+        v = (C0s * rTE) @ simulation._fhtfilt.j0 + (C1s * rTE) @ simulation._fhtfilt.j1
+        return v @ simulation._W.T.toarray()
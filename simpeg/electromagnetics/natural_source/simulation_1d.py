@@ -3,7 +3,7 @@ from scipy.constants import mu_0
 
 from ...simulation import BaseSimulation
 from ... import props
-from ...utils import validate_type
+from ...utils import validate_type, jtj_diagonal
 from ..frequency_domain.survey import Survey
 from .receivers import Impedance
 
@@ -326,10 +326,10 @@ class Simulation1DRecursive(BaseSimulation):
             gtgdiag = 0
             if self.sigmaMap is not None:
                 J = Js["sigma"] @ self.sigmaDeriv
-                gtgdiag += np.einsum("i,ij,ij->j", W, J, J)
+                gtgdiag += jtj_diagonal(J, weights=W)
             if self.thicknessesMap is not None:
                 J = Js["thick"] @ self.thicknessesDeriv
-                gtgdiag += np.einsum("i,ij,ij->j", W, J, J)
+                gtgdiag += jtj_diagonal(J, weights=W)
             self._gtgdiag = gtgdiag
         return self._gtgdiag
 
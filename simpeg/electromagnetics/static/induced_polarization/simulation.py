@@ -5,7 +5,7 @@ import scipy.sparse as sp
 
 from .... import maps, props
 from ....base import BasePDESimulation
-from ....utils import mkvc
+from ....utils import mkvc, jtj_diagonal
 from ..resistivity import Simulation2DCellCentered as DC_2D_CC
 from ..resistivity import Simulation2DNodal as DC_2D_N
 from ..resistivity import Simulation3DCellCentered as DC_3D_CC
@@ -120,7 +120,7 @@ class BaseIPSimulation(BasePDESimulation):
             else:
                 W = (self._scale * W.diagonal()) ** 2
 
-            self._gtgdiag = np.einsum("i,ij,ij->j", W, J, J)
+            self._gtgdiag = jtj_diagonal(J, weights=W)
 
         return self._gtgdiag
 
@@ -133,6 +133,10 @@ class BaseIPSimulation(BasePDESimulation):
     def Jtvec(self, m, v, f=None):
         return super().Jtvec(m, v * self._scale, f)
 
+    def _Jtvec_block(self, m, V, f=None):
+        # Docstring inherited from BaseSimulation
+        return super()._Jtvec_block(m, V * self._scale[:, None], f)
+
     @property
     def _delete_on_model_update(self):
         toDelete = []
@@ -242,7 +242,7 @@ class BaseRx(BaseSimPEGRx):
             return v
         elif adjoint:
             if factor is not None:
-                v = factor * v
+                v = sdiag(factor) @ v
             return P.T @ v
 
 
@@ -6,6 +6,7 @@ from ....utils import (
     Zero,
     validate_type,
     validate_string,
+    validate_integer,
     validate_active_indices,
 )
 from ....data import Data
@@ -19,6 +20,22 @@ from discretize.utils import make_boundary_bool
 class BaseDCSimulation(BaseElectricalPDESimulation):
     """
     Base DC Problem
+
+    Parameters
+    ----------
+    mesh : discretize.base.BaseMesh
+        The mesh.
+    survey : .resistivity.survey.Survey, optional
+        The DC resistivity survey.
+    storeJ : bool, optional
+        Whether to compute and store the sensitivity matrix.
+    miniaturize : bool, optional
+        Whether to simplify dipole sources into their unique pole sources.
+    surface_faces : (n_bf,) numpy.ndarray of bool, optional
+        Boundary faces to interpret as the surface of the Neumann boundary.
+    rhs_chunk_size : int or None, optional
+        Maximum number of right-hand sides solved together when computing
+        sensitivities. If ``None``, all sources are solved in a single block.
     """
 
     _mini_survey = None
@@ -32,11 +49,13 @@ class BaseDCSimulation(BaseElectricalPDESimulation):
         storeJ=False,
         miniaturize=False,
         surface_faces=None,
+        rhs_chunk_size=32,
         **kwargs,
     ):
         super().__init__(mesh=mesh, survey=survey, **kwargs)
         self.storeJ = storeJ
         self.surface_faces = surface_faces
+        self.rhs_chunk_size = rhs_chunk_size
         # Do stuff to simplify the forward and JTvec operation if number of dipole
         # sources is greater than the number of unique pole sources
         miniaturize = validate_type("miniaturize", miniaturize, bool)
@@ -75,6 +94,62 @@ class BaseDCSimulation(BaseElectricalPDESimulation):
     def storeJ(self, value):
         self._storeJ = validate_type("storeJ", value, bool)
 
+    @property
+    def rhs_chunk_size(self):
+        """Maximum number of right-hand sides solved together for sensitivities.
+
+        ``Jvec`` and ``Jtvec`` assemble the right-hand sides of several sources
+        into a single dense block and solve them with one call to the solver,
+        which is much faster than one solve per source for direct solvers.
+        The block holds one column per source (or one column per datum when
+        forming the full sensitivity matrix), so this bounds its memory: each
+        block uses ``n_nodes * rhs_chunk_size`` values. Sources with more
+        data than `rhs_chunk_size` are solved in a block of their own. If
+        ``None``, all sources are solved in a single block, which can use a
+        lot of memory for large surveys.
+
+        Returns
+        -------
+        int or None
+        """
+        return self._rhs_chunk_size
+
+    @rhs_chunk_size.setter
+    def rhs_chunk_size(self, value):
+        if value is not None:
+            value = validate_integer("rhs_chunk_size", value, min_val=1)
+        self._rhs_chunk_size = value
+
+    def _source_chunks(self, source_list, n_rhs=None):
+        """Split sources into chunks of at most `rhs_chunk_size` right-hand sides.
+
+        Parameters
+        ----------
+        source_list : list of .resistivity.sources.BaseSrc
+        n_rhs : list of int, optional
+            Number of right-hand sides contributed by each source. Defaults to one
+            per source.
+
+        Yields
+        ------
+        list of .resistivity.sources.BaseSrc
+        """
+        if n_rhs is None:
+            n_rhs = [1] * len(source_list)
+        chunk, size = [], 0
+        for source, n in zip(source_list, n_rhs):
+            if (
+                chunk
+                and self.rhs_chunk_size is not None
+                and size + n > self.rhs_chunk_size
+            ):
+                yield chunk
+                chunk, size = [], 0
+            chunk.append(source)
+            size += n
+        if chunk:
+            yield chunk
+
     @property
     def surface_faces(self):
         """Array defining which boundary faces to interpret as surfaces of Neumann boundary
@@ -133,25 +208,6 @@ class BaseDCSimulation(BaseElectricalPDESimulation):
 
         return self._mini_survey_data(data)
 
-    def getJtJdiag(self, m, W=None, f=None):
-        """
-        Return the diagonal of JtJ
-        """
-        if getattr(self, "_gtgdiag", None) is None:
-            J = self.getJ(m, f=f)
-
-            if W is None:
-                W = np.ones(J.shape[0])
-            else:
-                W = W.diagonal() ** 2
-
-            diag = np.zeros(J.shape[1])
-            for i in range(J.shape[0]):
-                diag += (W[i]) * (J[i] * J[i])
-
-            self._gtgdiag = diag
-        return self._gtgdiag
-
     def Jvec(self, m, v, f=None):
         """
         Compute sensitivity matrix (J) and vector (v) product.
@@ -173,15 +229,22 @@ class BaseDCSimulation(BaseElectricalPDESimulation):
             survey = self.survey
 
         Jv = []
-        for source in survey.source_list:
-            u_source = f[source, self._solutionType]  # solution vector
-            dA_dm_v = self.getADeriv(u_source, v)
-            dRHS_dm_v = self.getRHSDeriv(source, v)
-            du_dm_v = self.Ainv * (-dA_dm_v + dRHS_dm_v)
-            for rx in source.receiver_list:
-                df_dmFun = getattr(f, "_{0!s}Deriv".format(rx.projField), None)
-                df_dm_v = df_dmFun(source, du_dm_v, v, adjoint=False)
-                Jv.append(rx.evalDeriv(source, self.mesh, f, df_dm_v))
+        for sources in self._source_chunks(survey.source_list):
+            # assemble the right-hand sides of the chunk and solve them together
+            rhs = []
+            for source in sources:
+                u_source = f[source, self._solutionType]  # solution vector
+                dA_dm_v = self.getADeriv(u_source, v)
+                dRHS_dm_v = self.getRHSDeriv(source, v)
+                rhs.append(-dA_dm_v + dRHS_dm_v)
+            rhs = np.column_stack(rhs)
+            du_dm_v = np.reshape(self.Ainv * rhs, rhs.shape)
+
+            for i, source in enumerate(sources):
+                for rx in source.receiver_list:
+                    df_dmFun = getattr(f, "_{0!s}Deriv".format(rx.projField), None)
+                    df_dm_v = df_dmFun(source, du_dm_v[:, i], v, adjoint=False)
+                    Jv.append(rx.evalDeriv(source, self.mesh, f, df_dm_v))
         Jv = np.hstack(Jv)
         return self._mini_survey_data(Jv)
 
@@ -201,10 +264,27 @@ class BaseDCSimulation(BaseElectricalPDESimulation):
 
         return self._Jtvec(m, v=v, f=f)
 
+    def _Jtvec_block(self, m, V, f=None):
+        # Docstring inherited from BaseSimulation
+        # The adjoint problems of all the vectors are solved at once with the
+        # factorization, as multiple right hand sides.
+        if f is None:
+            f = self.fields(m)
+
+        self.model = m
+
+        if self.storeJ:
+            J = self.getJ(m, f=f)
+            return np.asarray(J.T.dot(V))
+
+        return self._Jtvec(m, v=V, f=f)
+
     def _Jtvec(self, m, v=None, f=None):
         """
         Compute adjoint sensitivity matrix (J^T) and vector (v) product.
-        Full J matrix can be computed by inputing v=None
+        The vector can also be a (n_data, n_vectors) array, whose columns
+        are multiplied together. Full J matrix can be computed by inputing
+        v=None
         """
 
         if self._mini_survey is not None:
@@ -216,7 +296,7 @@ class BaseDCSimulation(BaseElectricalPDESimulation):
             if isinstance(v, Data):
                 v = v.dobs
             v = self._mini_survey_dataT(v)
-            Jtv = np.zeros(m.size)
+            Jtv = np.zeros((m.size,) + v.shape[1:])
         else:
             # This is for forming full sensitivity matrix
             Jtv = np.zeros((self.model.size, survey.nD), order="F")
@@ -226,29 +306,74 @@ class BaseDCSimulation(BaseElectricalPDESimulation):
         # Get dict of flat array slices for each source-receiver pair in the survey
         survey_slices = survey.get_all_slices()
 
-        for source in survey.source_list:
-            u_source = f[source, self._solutionType].copy()
-            for rx in source.receiver_list:
-                # wrt f, need possibility wrt m
+        if v is not None:
+            # one right-hand side per source and column of v
+            n_cols = 1 if v.ndim == 1 else v.shape[1]
+            n_rhs = [n_cols] * len(survey.source_list)
+        else:
+            n_rhs = [source.nD for source in survey.source_list]
+
+        for sources in self._source_chunks(survey.source_list, n_rhs=n_rhs):
+            # assemble the adjoint right-hand sides of the chunk, keeping track
+            # of the columns belonging to each source
+            df_duT_block = []
+            df_dmT_sources = []
+            for source in sources:
+                df_duT_source = []
+                df_dmT_source = []
+                for rx in source.receiver_list:
+                    # wrt f, need possibility wrt m
+                    if v is not None:
+                        src_rx_slice = survey_slices[source, rx]
+                        PTv = rx.evalDeriv(
+                            source, self.mesh, f, v[src_rx_slice], adjoint=True
+                        )
+                    else:
+                        PTv = rx.evalDeriv(source, self.mesh, f).toarray().T
+
+                    df_duTFun = getattr(f, "_{0!s}Deriv".format(rx.projField), None)
+                    df_duT, df_dmT = df_duTFun(source, None, PTv, adjoint=True)
+                    df_duT_source.append(df_duT)
+                    df_dmT_source.append(df_dmT)
+
                 if v is not None:
-                    src_rx_slice = survey_slices[source, rx]
-                    PTv = rx.evalDeriv(
-                        source, self.mesh, f, v[src_rx_slice], adjoint=True
-                    )
+                    # the solve is linear, so sum the receivers of a source first
+                    df_duT = sum(df_duT_source)
+                    df_duT_block.append(np.reshape(df_duT, (df_duT.shape[0], -1)))
                 else:
-                    PTv = rx.evalDeriv(source, self.mesh, f).toarray().T
-
-                df_duTFun = getattr(f, "_{0!s}Deriv".format(rx.projField), None)
-                df_duT, df_dmT = df_duTFun(source, None, PTv, adjoint=True)
+                    df_duT_block.extend(
+                        np.reshape(df_duT, (df_duT.shape[0], -1))
+                        for df_duT in df_duT_source
+                    )
+                df_dmT_sources.append(df_dmT_source)
 
-                ATinvdf_duT = self.Ainv * df_duT
+            df_duT_block = np.column_stack(df_duT_block)
+            ATinvdf_duT_block = np.reshape(self.Ainv * df_duT_block, df_duT_block.shape)
 
-                dA_dmT = self.getADeriv(u_source, ATinvdf_duT, adjoint=True)
-                dRHS_dmT = self.getRHSDeriv(source, ATinvdf_duT, adjoint=True)
-                du_dmT = -dA_dmT + dRHS_dmT
+            icol = 0
+            for source, df_dmT_source in zip(sources, df_dmT_sources):
+                u_source = f[source, self._solutionType].copy()
                 if v is not None:
-                    Jtv += (df_dmT + du_dmT).astype(float)
-                else:
+                    ATinvdf_duT = ATinvdf_duT_block[:, icol : icol + n_cols]
+                    if v.ndim == 1:
+                        ATinvdf_duT = ATinvdf_duT[:, 0]
+                    icol += n_cols
+
+                    dA_dmT = self.getADeriv(u_source, ATinvdf_duT, adjoint=True)
+                    dRHS_dmT = self.getRHSDeriv(source, ATinvdf_duT, adjoint=True)
+                    du_dmT = -dA_dmT + dRHS_dmT
+                    Jtv += (sum(df_dmT_source) + du_dmT).astype(float)
+                    continue
+
+                for rx, df_dmT in zip(source.receiver_list, df_dmT_source):
+                    ATinvdf_duT = ATinvdf_duT_block[:, icol : icol + rx.nD]
+                    if rx.nD == 1:
+                        ATinvdf_duT = ATinvdf_duT[:, 0]
+                    icol += rx.nD
+
+                    dA_dmT = self.getADeriv(u_source, ATinvdf_duT, adjoint=True)
+                    dRHS_dmT = self.getRHSDeriv(source, ATinvdf_duT, adjoint=True)
+                    du_dmT = -dA_dmT + dRHS_dmT
                     iend = istrt + rx.nD
                     if rx.nD == 1:
                         Jtv[:, istrt] = df_dmT + du_dmT
@@ -257,7 +382,7 @@ class BaseDCSimulation(BaseElectricalPDESimulation):
                     istrt += rx.nD
 
         if v is not None:
-            return mkvc(Jtv)
+            return mkvc(Jtv) if v.ndim == 1 else Jtv
         else:
             return (self._mini_survey_data(Jtv.T)).T
 
@@ -304,7 +429,7 @@ class BaseDCSimulation(BaseElectricalPDESimulation):
 
     def _mini_survey_dataT(self, v):
         if self._mini_survey is not None:
-            out = np.zeros(self._mini_survey.nD)
+            out = np.zeros((self._mini_survey.nD,) + v.shape[1:])
             # Need to use ufunc.at because there could be repeated indices
             # That need to be properly handled.
             np.add.at(out, self._invs[0], v)  # AM
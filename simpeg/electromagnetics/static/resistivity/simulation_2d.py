@@ -12,6 +12,7 @@ from ....utils import (
     validate_integer,
     validate_active_indices,
 )
+from ....utils.solver_utils import SolverThreadPool
 from ....base import BaseElectricalPDESimulation
 from ....data import Data
 
@@ -27,6 +28,32 @@ import discretize.base
 class BaseDCSimulation2D(BaseElectricalPDESimulation):
     """
     Base 2.5D DC problem
+
+    Parameters
+    ----------
+    mesh : discretize.base.BaseMesh
+        2D mesh.
+    survey : simpeg.electromagnetics.static.resistivity.survey.Survey, optional
+        The DC survey.
+    nky : int, optional
+        Number of wavenumbers used to transform the fields back to space.
+    storeJ : bool, optional
+        Whether to store the sensitivity matrix.
+    miniaturize : bool, optional
+        Whether to simulate the dipole sources as combinations of unique poles.
+    do_trap : bool, optional
+        Whether to use the trapezoidal rule instead of the optimized
+        quadrature for the wavenumbers.
+    fix_Jmatrix : bool, optional
+        Whether to keep the sensitivity matrix between model updates.
+    surface_faces : numpy.ndarray of bool, optional
+        Boundary faces on the surface of the earth.
+    n_threads : int, optional
+        Number of threads used to factor and solve the systems of different
+        wavenumbers concurrently.
+    max_concurrent_factorizations : int, optional
+        Maximum number of wavenumbers factored at the same time. If ``None``,
+        it is equal to `n_threads`.
     """
 
     fieldsPair = Fields2D  # simpeg.EM.Static.Fields_2D
@@ -44,6 +71,8 @@ class BaseDCSimulation2D(BaseElectricalPDESimulation):
         do_trap=False,
         fix_Jmatrix=False,
         surface_faces=None,
+        n_threads=1,
+        max_concurrent_factorizations=None,
         **kwargs,
     ):
         super().__init__(mesh=mesh, survey=survey, **kwargs)
@@ -51,6 +80,8 @@ class BaseDCSimulation2D(BaseElectricalPDESimulation):
         self.storeJ = storeJ
         self.fix_Jmatrix = fix_Jmatrix
         self.surface_faces = surface_faces
+        self.n_threads = n_threads
+        self.max_concurrent_factorizations = max_concurrent_factorizations
 
         do_trap = validate_type("do_trap", do_trap, bool)
         if not do_trap:
@@ -219,6 +250,68 @@ class BaseDCSimulation2D(BaseElectricalPDESimulation):
             value = validate_active_indices("surface_faces", value, n_bf)
         self._surface_faces = value
 
+    @property
+    def n_threads(self):
+        """Number of threads used to process the wavenumbers concurrently.
+
+        :meth:`fields`, :meth:`Jvec` and :meth:`Jtvec` factor and solve the
+        systems of each wavenumber independently, so they can run in a pool of
+        threads sharing the mesh and the survey. The factors of every
+        wavenumber are kept in ``Ainv`` for the sensitivities. This is only
+        effective with solvers that release the GIL, like the direct solvers
+        in pymatsolver.
+
+        Returns
+        -------
+        int
+            Number of threads.
+        """
+        return self._n_threads
+
+    @n_threads.setter
+    def n_threads(self, value):
+        self._n_threads = validate_integer("n_threads", value, min_val=1)
+
+    @property
+    def max_concurrent_factorizations(self):
+        """Maximum number of wavenumbers factored at the same time.
+
+        Caps the peak memory used by the factorizations when
+        :py:attr:`n_threads` is larger than 1. If ``None``, every thread can
+        factor a system at the same time.
+
+        Returns
+        -------
+        int or None
+            Maximum number of concurrent factorizations.
+        """
+        return self._max_concurrent_factorizations
+
+    @max_concurrent_factorizations.setter
+    def max_concurrent_factorizations(self, value):
+        if value is not None:
+            value = validate_integer("max_concurrent_factorizations", value, min_val=1)
+        self._max_concurrent_factorizations = value
+
+    def _thread_pool(self):
+        """Pool of threads to process the wavenumbers."""
+        pool = SolverThreadPool(
+            n_threads=min(self.n_threads, self.nky),
+            max_concurrent_factorizations=self.max_concurrent_factorizations,
+        )
+        if pool.n_threads > 1:
+            self._prepare_wavenumbers()
+        return pool
+
+    def _prepare_wavenumbers(self):
+        """Build the boundary conditions of all the wavenumbers.
+
+        The boundary conditions are cached lazily in dictionaries, so they are
+        built here before the wavenumbers are shared between threads.
+        """
+        for ky in self._quad_points:
+            self.setBC(ky=ky)
+
     def fields(self, m=None):
         if self.verbose:
             print(">> Compute fields")
@@ -230,13 +323,22 @@ class BaseDCSimulation2D(BaseElectricalPDESimulation):
         f = self.fieldsPair(self)
         kys = self._quad_points
         f._quad_weights = self._quad_weights
-        for iky, ky in enumerate(kys):
-            A = self.getA(ky)
-            if self.Ainv[iky] is not None:
-                self.Ainv[iky].clean()
-            self.Ainv[iky] = self.solver(A, **self.solver_opts)
-            RHS = self.getRHS(ky)
-            u = self.Ainv[iky] * RHS
+
+        with self._thread_pool() as pool:
+
+            def solve(iky):
+                # free the previous factors before factoring again
+                if self.Ainv[iky] is not None:
+                    self.Ainv[iky].clean()
+                    self.Ainv[iky] = None
+                A = self.getA(kys[iky])
+                Ainv = pool.factor(self.solver, A, **self.solver_opts)
+                return Ainv, Ainv * self.getRHS(kys[iky])
+
+            solutions = pool.map(solve, range(self.nky))
+
+        for iky, (Ainv, u) in enumerate(solutions):
+            self.Ainv[iky] = Ainv
             f[:, self._solutionType, iky] = u
         return f
 
@@ -309,13 +411,12 @@ class BaseDCSimulation2D(BaseElectricalPDESimulation):
         kys = self._quad_points
         weights = self._quad_weights
 
-        Jv = np.zeros(survey.nD)
         # Assume y=0.
         # This needs some thoughts to implement in general when src is dipole
-
-        # TODO: this loop is pretty slow .. (Parellize)
-        for iky, ky in enumerate(kys):
+        def jvec_wavenumber(iky):
+            ky = kys[iky]
             u_ky = f[:, self._solutionType, iky]
+            Jv = np.zeros(survey.nD)
             count = 0
             for i_src, src in enumerate(survey.source_list):
                 u_src = u_ky[:, i_src]
@@ -329,6 +430,10 @@ class BaseDCSimulation2D(BaseElectricalPDESimulation):
                     # Trapezoidal intergration
                     Jv[count : count + len(Jv1_temp)] += weights[iky] * Jv1_temp
                     count += len(Jv1_temp)
+            return Jv
+
+        with self._thread_pool() as pool:
+            Jv = sum(pool.map(jvec_wavenumber, range(self.nky)))
 
         return self._mini_survey_data(Jv)
 
@@ -348,10 +453,27 @@ class BaseDCSimulation2D(BaseElectricalPDESimulation):
 
         return self._Jtvec(m, v=v, f=f)
 
+    def _Jtvec_block(self, m, V, f=None):
+        # Docstring inherited from BaseSimulation
+        # The adjoint problems of all the vectors are solved at once with the
+        # factorization of each wavenumber, as multiple right hand sides.
+        if self.storeJ:
+            J = self.getJ(m, f=f)
+            return np.asarray(J.T @ V)
+
+        self.model = m
+
+        if f is None:
+            f = self.fields(m)
+
+        return self._Jtvec(m, v=V, f=f)
+
     def _Jtvec(self, m, v=None, f=None):
         """
         Compute adjoint sensitivity matrix (J^T) and vector (v) product.
-        Full J matrix can be computed by inputing v=None
+        The vector can also be a (n_data, n_vectors) array, whose columns
+        are multiplied together. Full J matrix can be computed by inputing
+        v=None
         """
         kys = self._quad_points
         weights = self._quad_weights
@@ -365,12 +487,13 @@ class BaseDCSimulation2D(BaseElectricalPDESimulation):
             if isinstance(v, Data):
                 v = v.dobs
             v = self._mini_survey_dataT(v)
-            Jtv = np.zeros(m.size, dtype=float)
+            Jtv = np.zeros((m.size,) + v.shape[1:], dtype=float)
 
             # Get dict of flat array slices for each source-receiver pair in the survey
             survey_slices = survey.get_all_slices()
 
-            for iky, ky in enumerate(kys):
+            def jtvec_wavenumber(iky):
+                ky = kys[iky]
                 u_ky = f[:, self._solutionType, iky]
                 for i_src, src in enumerate(survey.source_list):
                     u_src = u_ky[:, i_src]
@@ -392,13 +515,19 @@ class BaseDCSimulation2D(BaseElectricalPDESimulation):
                     # dRHS_dmT = self.getRHSDeriv(ky, src, ATinvdf_duT,
                     #                            adjoint=True)
                     du_dmT = -dA_dmT  # + dRHS_dmT=0
-                    Jtv += weights[iky] * (df_dmT + du_dmT).astype(float)
-            return mkvc(Jtv)
+                    with pool.lock:
+                        Jtv[:] += weights[iky] * (df_dmT + du_dmT).astype(float)
+
+            with self._thread_pool() as pool:
+                pool.map(jtvec_wavenumber, range(self.nky))
+            return mkvc(Jtv) if v.ndim == 1 else Jtv
 
         else:
             # This is for forming full sensitivity matrix
             Jt = np.zeros((self.model.size, survey.nD), order="F")
-            for iky, ky in enumerate(kys):
+
+            def jt_wavenumber(iky):
+                ky = kys[iky]
                 u_ky = f[:, self._solutionType, iky]
                 istrt = 0
                 for i_src, src in enumerate(survey.source_list):
@@ -411,11 +540,15 @@ class BaseDCSimulation2D(BaseElectricalPDESimulation):
                         dA_dmT = self.getADeriv(ky, u_src, ATinvdf_duT, adjoint=True)
                         Jtv = -weights[iky] * dA_dmT  # RHS=0
                         iend = istrt + rx.nD
-                        if rx.nD == 1:
-                            Jt[:, istrt] += Jtv
-                        else:
-                            Jt[:, istrt:iend] += Jtv
+                        with pool.lock:
+                            if rx.nD == 1:
+                                Jt[:, istrt] += Jtv
+                            else:
+                                Jt[:, istrt:iend] += Jtv
                         istrt += rx.nD
+
+            with self._thread_pool() as pool:
+                pool.map(jt_wavenumber, range(self.nky))
             return (self._mini_survey_data(Jt.T)).T
 
     def getSourceTerm(self, ky):
@@ -451,7 +584,7 @@ class BaseDCSimulation2D(BaseElectricalPDESimulation):
         toDelete = super()._delete_on_model_update
         if self.fix_Jmatrix:
             return toDelete
-        return toDelete + ["_Jmatrix"]
+        return toDelete + ["_Jmatrix", "_gtgdiag"]
 
     def _mini_survey_data(self, d_mini):
         if self._mini_survey is not None:
@@ -465,7 +598,7 @@ class BaseDCSimulation2D(BaseElectricalPDESimulation):
 
     def _mini_survey_dataT(self, v):
         if self._mini_survey is not None:
-            out = np.zeros(self._mini_survey.nD)
+            out = np.zeros((self._mini_survey.nD,) + v.shape[1:])
             # Need to use ufunc.at because there could be repeated indices
             # That need to be properly handled.
             np.add.at(out, self._invs[0], v)  # AM
@@ -689,6 +822,12 @@ class Simulation2DNodal(BaseDCSimulation2D):
                     raise err
         return A
 
+    def _prepare_wavenumbers(self):
+        super()._prepare_wavenumbers()
+        if self.bc_type != "Neumann" and self.sigmaMap is not None:
+            if getattr(self, "_MBC_sigma", None) is None:
+                self._MBC_sigma = {}
+
     def getADeriv(self, ky, u, v, adjoint=False):
         Grad = self.mesh.nodal_gradient
 
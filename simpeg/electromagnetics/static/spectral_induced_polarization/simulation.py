@@ -4,7 +4,7 @@ import gc
 
 from .... import props
 from .data import Data
-from ....utils import sdiag, validate_type, validate_active_indices
+from ....utils import sdiag, validate_type, validate_active_indices, jtj_diagonal
 import scipy.sparse as sp
 
 from ..induced_polarization.simulation import BaseIPSimulation
@@ -418,9 +418,9 @@ class BaseSIPSimulation(BaseIPSimulation):
             t = self.survey.unique_times[tind]
             Jtv = self._P * J.T * sdiag(wd[:, tind])
             JtJdiag += (
-                (self.PetaEtaDeriv(t, Jtv, adjoint=True) ** 2).sum(axis=1)
-                + (self.PetaTauiDeriv(t, Jtv, adjoint=True) ** 2).sum(axis=1)
-                + (self.PetaCDeriv(t, Jtv, adjoint=True) ** 2).sum(axis=1)
+                jtj_diagonal(self.PetaEtaDeriv(t, Jtv, adjoint=True).T)
+                + jtj_diagonal(self.PetaTauiDeriv(t, Jtv, adjoint=True).T)
+                + jtj_diagonal(self.PetaCDeriv(t, Jtv, adjoint=True).T)
             )
         return JtJdiag
 
@@ -536,6 +536,13 @@ class BaseSIPSimulation(BaseIPSimulation):
 
             return np.hstack(Jv)
 
+    def _Jtvec_block(self, m, V, f=None):
+        # Docstring inherited from BaseSimulation
+        # The adjoint of the time channels isn't batched, multiply each column
+        if f is None:
+            f = self.fields(m)
+        return np.column_stack([self.Jtvec(m, v, f=f) for v in V.T])
+
     def Jtvec(self, m, v, f=None):
         self.model = m
 
@@ -30,6 +30,7 @@ Simulations
   :toctree: generated/
 
   Simulation1DLayered
+  Simulation1DLayeredStitched
   Simulation3DMagneticFluxDensity
   Simulation3DElectricField
   Simulation3DMagneticField
@@ -92,6 +93,13 @@ Fields
   Fields3DMagneticField
   Fields3DCurrentDensity
 
+Caches
+======
+.. autosummary::
+  :toctree: generated/
+
+  TimeTransformCache
+
 Base Classes
 ============
 
@@ -114,7 +122,8 @@ from .simulation import (
     Simulation3DMagneticField,
     Simulation3DCurrentDensity,
 )
-from .simulation_1d import Simulation1DLayered
+from .simulation_1d import Simulation1DLayered, TimeTransformCache
+from .simulation_1d_stitched import Simulation1DLayeredStitched
 from .fields import (
     Fields3DMagneticFluxDensity,
     Fields3DElectricField,
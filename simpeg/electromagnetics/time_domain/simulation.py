@@ -3,6 +3,7 @@ import scipy.sparse as sp
 
 from ...simulation import BaseTimeSimulation
 from ...utils import mkvc, sdiag, speye, Zero, validate_type, validate_float
+from ...utils.solver_utils import SolverCache, _transposed_solver
 from ..base import BaseEMSimulation
 from .survey import Survey
 from .fields import (
@@ -49,11 +50,29 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
         The time-domain EM survey.
     dt_threshold : float
         Threshold used when determining the unique time-step lengths.
+    max_factor_memory : float, optional
+        Approximate memory budget, in GB, for the factorizations of the system
+        matrices stored for each unique time-step length. If ``None``, the
+        factorizations for all unique time-step lengths are stored.
+    store_factors : bool, optional
+        Whether to keep the factorizations between calls to :meth:`fields`,
+        :meth:`Jvec` and :meth:`Jtvec`. If ``False``, they are cleaned at the
+        end of each call.
     """
 
-    def __init__(self, mesh, survey=None, dt_threshold=1e-8, **kwargs):
+    def __init__(
+        self,
+        mesh,
+        survey=None,
+        dt_threshold=1e-8,
+        max_factor_memory=None,
+        store_factors=False,
+        **kwargs,
+    ):
         super().__init__(mesh=mesh, survey=survey, **kwargs)
         self.dt_threshold = dt_threshold
+        self.max_factor_memory = max_factor_memory
+        self.store_factors = store_factors
         if self.muMap is not None:
             raise NotImplementedError(
                 "Time domain EM simulations do not support magnetic permeability "
@@ -98,6 +117,119 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
     @dt_threshold.setter
     def dt_threshold(self, value):
         self._dt_threshold = validate_float("dt_threshold", value, min_val=0.0)
+        self._clean_factors()
+
+    @property
+    def max_factor_memory(self):
+        """Approximate memory budget for the stored factorizations in GB.
+
+        The factorization of the system matrix for each unique time-step
+        length is stored and reused by all the time-steps of the same length.
+        When the stored factors exceed this budget, the least recently used
+        ones are discarded. If ``None``, the factors for all unique time-step
+        lengths are kept.
+
+        The memory of the factors of solvers that don't expose them, like
+        ``Pardiso`` or ``Mumps``, is estimated from the size of the system
+        matrix. This is a lower bound, so the actual memory used by the stored
+        factors can be several times larger than the budget.
+
+        Returns
+        -------
+        float or None
+            Approximate memory budget for the stored factorizations in GB.
+        """
+        return self._max_factor_memory
+
+    @max_factor_memory.setter
+    def max_factor_memory(self, value):
+        if value is not None:
+            value = validate_float("max_factor_memory", value, min_val=0.0)
+        self._max_factor_memory = value
+        if getattr(self, "_factor_cache", None) is not None:
+            self._factor_cache.max_memory = value
+
+    @property
+    def store_factors(self):
+        """Whether to keep the factorizations between calls.
+
+        If ``True``, the factorizations are kept until the model is updated,
+        so :meth:`fields`, :meth:`Jvec` and :meth:`Jtvec` for the same model
+        share them. If ``False``, they are cleaned at the end of each call.
+
+        Returns
+        -------
+        bool
+            Whether to keep the factorizations between calls.
+        """
+        return self._store_factors
+
+    @store_factors.setter
+    def store_factors(self, value):
+        self._store_factors = validate_type("store_factors", value, bool)
+
+    @property
+    def _factors(self):
+        """Cache of the factored system matrices keyed by time-step length."""
+        if getattr(self, "_factor_cache", None) is None:
+            self._factor_cache = SolverCache(max_memory=self.max_factor_memory)
+        return self._factor_cache
+
+    def _clean_factors(self):
+        """Clean and discard all stored factorizations."""
+        if getattr(self, "_factor_cache", None) is not None:
+            self._factor_cache.clean()
+            self._factor_cache = None
+
+    def _release_factors(self):
+        """Clean the factorizations at the end of a call, unless they are stored."""
+        if not self.store_factors:
+            self._clean_factors()
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in ["sigma", "rho", "mu", "mui", "solver", "solver_opts"]:
+            self._clean_factors()
+
+    def _get_Adiag_solver(self, tInd, adjoint=False):
+        """Return the factored diagonal system matrix for a time-step index.
+
+        Factorizations are shared between all time-steps whose lengths differ
+        by less than :py:attr:`dt_threshold`.
+
+        Parameters
+        ----------
+        tInd : int
+            The time-step index; between ``[0, n_steps-1]``.
+        adjoint : bool
+            Whether to return the solver for the transposed system matrix. It
+            shares the factors of the system matrix.
+
+        Returns
+        -------
+        pymatsolver.solvers.Base
+            The solver for the diagonal system matrix.
+        """
+        dt = self.time_steps[tInd]
+        key = dt
+        for dt_key in self._factors.keys():
+            if abs(dt - dt_key) <= self.dt_threshold:
+                key = dt_key
+                break
+
+        def factor():
+            A = self.getAdiag(tInd)
+            if self.verbose:
+                print("Factoring...   (dt = {:e})".format(dt))
+            Ainv = self._factor(A)
+            if self.verbose:
+                print("Done")
+            return Ainv
+
+        Ainv = self._factors.get(key, factor)
+        if adjoint:
+            return _transposed_solver(Ainv)
+        return Ainv
 
     def fields(self, m):
         """Compute and return the fields for the model provided.
@@ -124,23 +256,9 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
             print("{}\nCalculating fields(m)\n{}".format("*" * 50, "*" * 50))
 
         # timestep to solve forward
-        Ainv = None
-        for tInd, dt in enumerate(self.time_steps):
-            # keep factors if dt is the same as previous step b/c A will be the
-            # same
-            if Ainv is not None and (
-                tInd > 0 and abs(dt - self.time_steps[tInd - 1]) > self.dt_threshold
-            ):
-                Ainv.clean()
-                Ainv = None
-
-            if Ainv is None:
-                A = self.getAdiag(tInd)
-                if self.verbose:
-                    print("Factoring...   (dt = {:e})".format(dt))
-                Ainv = self.solver(A, **self.solver_opts)
-                if self.verbose:
-                    print("Done")
+        for tInd in range(self.nT):
+            # factors are shared between steps of the same length
+            Ainv = self._get_Adiag_solver(tInd)
 
             rhs = self.getRHS(tInd + 1)  # this is on the nodes of the time mesh
             Asubdiag = self.getAsubdiag(tInd)
@@ -162,7 +280,7 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
             print("{}\nDone calculating fields(m)\n{}".format("*" * 50, "*" * 50))
 
         # clean factors and return
-        Ainv.clean()
+        self._release_factors()
         return f
 
     def Jvec(self, m, v, f=None):
@@ -224,19 +342,8 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
         # store the field derivs we need to project to calc full deriv
         df_dm_v = self.Fields_Derivs(self)
 
-        Adiaginv = None
-
-        for tInd, dt in zip(range(self.nT), self.time_steps):
-            # keep factors if dt is the same as previous step b/c A will be the
-            # same
-            if Adiaginv is not None and (tInd > 0 and dt != self.time_steps[tInd - 1]):
-                Adiaginv.clean()
-                Adiaginv = None
-
-            if Adiaginv is None:
-                A = self.getAdiag(tInd)
-                Adiaginv = self.solver(A, **self.solver_opts)
-
+        for tInd in range(self.nT):
+            Adiaginv = self._get_Adiag_solver(tInd)
             Asubdiag = self.getAsubdiag(tInd)
 
             for i, src in enumerate(self.survey.source_list):
@@ -278,7 +385,7 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
                         mkvc(df_dm_v[src, "%sDeriv" % rx.projField, :]),
                     )
                 )
-        Adiaginv.clean()
+        self._release_factors()
         # del df_dm_v, dun_dm_v, Asubdiag
         # return mkvc(Jv)
         return np.hstack(Jv)
@@ -374,24 +481,9 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
 
         del PT_v  # no longer need this
 
-        AdiagTinv = None
-
         # Do the back-solve through time
-        # if the previous timestep is the same: no need to refactor the matrix
-        # for tInd, dt in zip(range(self.nT), self.time_steps):
-
         for tInd in reversed(range(self.nT)):
-            # tInd = tIndP - 1
-            if AdiagTinv is not None and (
-                tInd <= self.nT and self.time_steps[tInd] != self.time_steps[tInd + 1]
-            ):
-                AdiagTinv.clean()
-                AdiagTinv = None
-
-            # refactor if we need to
-            if AdiagTinv is None:  # and tInd > -1:
-                Adiag = self.getAdiag(tInd)
-                AdiagTinv = self.solver(Adiag.T.tocsr(), **self.solver_opts)
+            AdiagTinv = self._get_Adiag_solver(tInd, adjoint=True)
 
             if tInd < self.nT - 1:
                 Asubdiag = self.getAsubdiag(tInd + 1)
@@ -429,9 +521,7 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
         # Treat the initial condition
 
         # del df_duT_v, ATinv_df_duT_v, A, Asubdiag
-        if AdiagTinv is not None:
-            AdiagTinv.clean()
-
+        self._release_factors()
         return mkvc(JTv).astype(float)
 
     def getSourceTerm(self, tInd):
@@ -622,7 +712,7 @@ class BaseTDEMSimulation(BaseTimeSimulation, BaseEMSimulation):
         if self.sigmaMap is not None:
             items = items + ["_Adcinv"]  #: clear DC matrix factors on any model updates
             # if there is a sigmaMap
-        return items
+        return items + ["_factor_cache"]
 
 
 ###############################################################################
@@ -1263,24 +1353,9 @@ class Simulation3DElectricField(BaseTDEMSimulation):
         # no longer need this
         del PT_v
 
-        AdiagTinv = None
-
         # Do the back-solve through time
-        # if the previous timestep is the same: no need to refactor the matrix
-        # for tInd, dt in zip(range(self.nT), self.time_steps):
-
         for tInd in reversed(range(self.nT)):
-            # tInd = tIndP - 1
-            if AdiagTinv is not None and (
-                tInd <= self.nT and self.time_steps[tInd] != self.time_steps[tInd + 1]
-            ):
-                AdiagTinv.clean()
-                AdiagTinv = None
-
-            # refactor if we need to
-            if AdiagTinv is None:  # and tInd > -1:
-                Adiag = self.getAdiag(tInd)
-                AdiagTinv = self.solver(Adiag.T, **self.solver_opts)
+            AdiagTinv = self._get_Adiag_solver(tInd, adjoint=True)
 
             if tInd < self.nT - 1:
                 Asubdiag = self.getAsubdiag(tInd + 1)
@@ -1349,9 +1424,7 @@ class Simulation3DElectricField(BaseTDEMSimulation):
                 JTv = JTv + mkvc(-dAT_dm_v + dRHST_dm_v)
 
         # del df_duT_v, ATinv_df_duT_v, A, Asubdiag
-        if AdiagTinv is not None:
-            AdiagTinv.clean()
-
+        self._release_factors()
         return mkvc(JTv).astype(float)
 
     def getAdiag(self, tInd):
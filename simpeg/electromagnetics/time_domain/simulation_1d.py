@@ -1,4 +1,6 @@
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
+import hashlib
+import pathlib
 
 from ..base_1d import BaseEM1DSimulation
 from .sources import StepOffWaveform
@@ -11,7 +13,7 @@ import numpy as np
 
 from .survey import Survey
 from scipy.constants import mu_0
-from scipy.interpolate import InterpolatedUnivariateSpline as iuSpline
+from scipy.interpolate import make_interp_spline
 from scipy.special import roots_legendre
 
 import libdlf
@@ -19,7 +21,7 @@ import libdlf
 from geoana.kernels.tranverse_electric_reflections import rTE_forward, rTE_gradient
 
 from ..utils.em1d_utils import get_splined_dlf_points
-from ...utils import validate_type, validate_string
+from ...utils import validate_float, validate_type, validate_string
 
 COS_FILTERS = {}
 for filter_name in libdlf.fourier.__all__:
@@ -28,16 +30,201 @@ for filter_name in libdlf.fourier.__all__:
         COS_FILTERS[filter_name] = fourier_filter
 
 
+class TimeTransformCache:
+    """Content-addressed cache of the time transforms of 1D TDEM receivers.
+
+    The matrices transforming the frequency responses of 1D layered
+    simulations into the time data of a receiver depend only on the cosine
+    filter, the frequencies, the waveform, the time gates and the type of
+    the receiver. They are stored under a digest of these, so the soundings
+    of the same system reuse one computation, even across simulations. When
+    the memory used by the stored matrices exceeds ``max_memory``, the least
+    recently used ones are evicted. If a ``directory`` is given, the matrices
+    are also saved there and reloaded by later sessions.
+
+    Parameters
+    ----------
+    max_memory : float, optional
+        Approximate memory budget for the matrices kept in memory in GB. If
+        ``None``, the size of the cache is unbounded.
+    directory : str or pathlib.Path, optional
+        Directory where the matrices are saved as ``.npy`` files. It is
+        created if it doesn't exist.
+
+    Examples
+    --------
+    Share a cache stored on disk between the simulations of many soundings:
+
+    >>> from simpeg.electromagnetics import time_domain as tdem
+    >>> cache = tdem.TimeTransformCache(directory="time_transforms")  # doctest: +SKIP
+    >>> simulation = tdem.Simulation1DLayered(
+    ...     survey, time_transform_cache=cache
+    ... )  # doctest: +SKIP
+    """
+
+    def __init__(self, max_memory=0.25, directory=None):
+        self._transforms = OrderedDict()
+        self.max_memory = max_memory
+        self.directory = directory
+
+    @property
+    def max_memory(self):
+        """Approximate memory budget for the matrices kept in memory in GB.
+
+        Returns
+        -------
+        float or None
+        """
+        return self._max_memory
+
+    @max_memory.setter
+    def max_memory(self, value):
+        if value is not None:
+            value = validate_float("max_memory", value, min_val=0.0)
+        self._max_memory = value
+        self._evict()
+
+    @property
+    def directory(self):
+        """Directory where the matrices are saved.
+
+        Returns
+        -------
+        pathlib.Path or None
+        """
+        return self._directory
+
+    @directory.setter
+    def directory(self, value):
+        if value is not None:
+            value = pathlib.Path(value)
+            value.mkdir(parents=True, exist_ok=True)
+        self._directory = value
+
+    @property
+    def nbytes(self):
+        """Memory used by the matrices kept in memory in bytes.
+
+        Returns
+        -------
+        int
+        """
+        return sum(A.nbytes for A in self._transforms.values())
+
+    def __len__(self):
+        return len(self._transforms)
+
+    @staticmethod
+    def _key(content):
+        digest = hashlib.blake2b(digest_size=16)
+        for item in content:
+            if isinstance(item, np.ndarray):
+                item = np.ascontiguousarray(item)
+                digest.update(f"{item.dtype.str}{item.shape}".encode())
+                digest.update(item.view(np.uint8).ravel())
+            else:
+                digest.update(repr(item).encode())
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def get(self, content):
+        """Return the matrix stored for the content, if any.
+
+        Parameters
+        ----------
+        content : tuple
+            Strings, numbers and arrays defining the matrix.
+
+        Returns
+        -------
+        numpy.ndarray or None
+        """
+        key = self._key(content)
+        if key in self._transforms:
+            self._transforms.move_to_end(key)
+            return self._transforms[key]
+        if self.directory is not None:
+            file = self.directory / f"{key}.npy"
+            if file.exists():
+                A = np.load(file)
+                A.flags.writeable = False
+                self._store(key, A)
+                return A
+        return None
+
+    def set(self, content, A):
+        """Store the matrix for the content.
+
+        Parameters
+        ----------
+        content : tuple
+            Strings, numbers and arrays defining the matrix.
+        A : numpy.ndarray
+            The matrix, which must not be modified afterwards.
+        """
+        key = self._key(content)
+        A.flags.writeable = False
+        if self.directory is not None:
+            np.save(self.directory / f"{key}.npy", A)
+        self._store(key, A)
+
+    def clear(self):
+        """Remove all the matrices kept in memory.
+
+        The matrices saved in ``directory`` are kept.
+        """
+        self._transforms.clear()
+
+    def _store(self, key, A):
+        self._transforms[key] = A
+        self._transforms.move_to_end(key)
+        self._evict()
+
+    def _evict(self):
+        if self.max_memory is None:
+            return
+        max_bytes = self.max_memory * 1024**3
+        while self._transforms and self.nbytes > max_bytes:
+            self._transforms.popitem(last=False)
+
+
+# Cache shared by the simulations that are not given one
+_DEFAULT_TIME_TRANSFORM_CACHE = TimeTransformCache()
+
+
 class Simulation1DLayered(BaseEM1DSimulation):
     """
     Simulation class for simulating the TEM response over a 1D layered Earth
     for a single sounding.
+
+    The matrices transforming the frequency responses into the time data of
+    each receiver are looked up in a :class:`TimeTransformCache`, so the
+    simulations of soundings of the same system only compute them once.
+
+    Parameters
+    ----------
+    survey : simpeg.electromagnetics.time_domain.survey.Survey
+        The survey of the sounding.
+    time_filter : str, optional
+        Name of the cosine filter used for the transform to the time domain.
+    time_transform_cache : TimeTransformCache, optional
+        Cache of the time transforms of the receivers. If ``None``, a cache
+        shared by all the simulations is used.
+    **kwargs
+        See :class:`~simpeg.electromagnetics.base_1d.BaseEM1DSimulation`.
     """
 
-    def __init__(self, survey=None, time_filter="key_81_2009", **kwargs):
+    def __init__(
+        self,
+        survey=None,
+        time_filter="key_81_2009",
+        time_transform_cache=None,
+        **kwargs,
+    ):
         super().__init__(survey=survey, **kwargs)
         self._coefficients_set = False
         self.time_filter = time_filter
+        self.time_transform_cache = time_transform_cache
 
     @property
     def survey(self):
@@ -77,6 +264,24 @@ class Simulation1DLayered(BaseEM1DSimulation):
         self._fftfilt = cos_filt(filt[0], filt[-1])
         self._coefficients_set = False
 
+    @property
+    def time_transform_cache(self):
+        """Cache of the time transforms of the receivers.
+
+        Returns
+        -------
+        TimeTransformCache
+        """
+        return self._time_transform_cache
+
+    @time_transform_cache.setter
+    def time_transform_cache(self, value):
+        if value is None:
+            value = _DEFAULT_TIME_TRANSFORM_CACHE
+        self._time_transform_cache = validate_type(
+            "time_transform_cache", value, TimeTransformCache, cast=False
+        )
+
     def get_coefficients(self):
         if self._coefficients_set is False:
             self._compute_coefficients()
@@ -134,6 +339,7 @@ class Simulation1DLayered(BaseEM1DSimulation):
                         )
 
         omegas, t_spline_points = get_splined_dlf_points(self._fftfilt, t_min, t_max)
+        self._frequencies = omegas / (2 * np.pi)
 
         n_omega = len(omegas)
         n_t = len(t_spline_points)
@@ -144,71 +350,72 @@ class Simulation1DLayered(BaseEM1DSimulation):
             A_dft[i, i : i + n_base] = self._fftfilt.cos * (-2.0 / np.pi)
         A_dft = A_dft[::-1]  # shuffle these back
 
-        # Calculate the interpolating spline basis functions for each spline point
-        splines = []
-        for i in range(n_t):
-            e = np.zeros(n_t)
-            e[i] = 1.0
-            sp = iuSpline(np.log(t_spline_points[::-1]), e, k=5)
-            splines.append(sp)
+        # The interpolating spline basis functions of the spline points are
+        # only built when a transform is missing from the cache
+        spline_basis = None
+
+        def splines(t):
+            # spline basis functions divided by the times, at positive times
+            out = np.zeros(t.shape + (n_t,))
+            positive = t > 0.0
+            # constant at very low ts
+            t = np.maximum(t[positive], t_spline_points.min())
+            out[positive] = spline_basis(np.log(t)) / t[:, None]
+            return out
+
         # As will go from frequency to time domain
+        cache = self.time_transform_cache
         As = []
         for src in survey.source_list:
+            wave = src.waveform
             for rx in src.receiver_list:
                 #######
                 # Fourier Transform coefficients
                 ######
-                wave = src.waveform
-
-                def func(t, i):
-                    out = np.zeros_like(t)
-                    t = t.copy()
-                    t[(t > 0.0) & (t <= t_spline_points.min())] = (
-                        t_spline_points.min()
-                    )  # constant at very low ts
-                    out[t > 0.0] = splines[i](np.log(t[t > 0.0])) / t[t > 0.0]
-                    return out
-
-                # Then calculate the values at each time
-                A = np.zeros((len(rx.times), n_t))
-                if isinstance(wave, StepOffWaveform):
-                    # do not need to do too much fancy here, just need to interpolate
-                    # from t_spline_points to rx.times (at positive times)...
-                    for i in range(n_t):
-                        A[:, i] = func(rx.times, i)
-                else:
-                    # loop over pairs of nodes and use gaussian quadrature to integrate
-
+                content = [self.time_filter, t_spline_points, type(rx).__name__]
+                content += [rx.times, type(wave).__name__]
+                if not isinstance(wave, StepOffWaveform):
+                    # loop over pairs of nodes and use gaussian quadrature to
+                    # integrate, the waveform enters the transform through its
+                    # derivative at the quadrature points
                     time_nodes = wave.time_nodes
-                    n_interval = len(time_nodes) - 1
                     quad_times = []
-                    for i in range(n_interval):
-                        b = rx.times - time_nodes[i]
-                        b = np.maximum(b, 0.0)
-                        a = rx.times - time_nodes[i + 1]
-                        a = np.maximum(a, 0.0)
-                        quad_times = (b - a)[:, None] * (x + 1) / 2.0 + a[:, None]
-                        quad_scale = (b - a) / 2
-                        wave_eval = wave.eval_deriv(rx.times[:, None] - quad_times)
-                        for i in range(n_t):
-                            A[:, i] -= np.sum(
-                                quad_scale[:, None]
-                                * w
-                                * wave_eval
-                                * func(quad_times, i),
-                                axis=-1,
-                            )
-                if isinstance(rx, (PointMagneticFluxDensity, PointMagneticField)):
-                    As.append(A @ (A_dft / omegas))
-                else:
-                    As.append(A @ A_dft)
-                if isinstance(
-                    rx, (PointMagneticFluxTimeDerivative, PointMagneticFluxDensity)
-                ):
-                    As[-1] *= mu_0
-
-            self._frequencies = omegas / (2 * np.pi)
-            self._As = As
+                    quad_weights = []
+                    for i in range(len(time_nodes) - 1):
+                        b = np.maximum(rx.times - time_nodes[i], 0.0)
+                        a = np.maximum(rx.times - time_nodes[i + 1], 0.0)
+                        times = (b - a)[:, None] * (x + 1) / 2.0 + a[:, None]
+                        wave_eval = wave.eval_deriv(rx.times[:, None] - times)
+                        quad_times.append(times)
+                        quad_weights.append(((b - a) / 2)[:, None] * w * wave_eval)
+                    content += [time_nodes] + quad_weights
+
+                A = cache.get(content)
+                if A is None:
+                    if spline_basis is None:
+                        spline_basis = make_interp_spline(
+                            np.log(t_spline_points[::-1]), np.eye(n_t), k=5
+                        )
+                    if isinstance(wave, StepOffWaveform):
+                        # do not need to do too much fancy here, just need to
+                        # interpolate from t_spline_points to rx.times (at
+                        # positive times)...
+                        A = splines(rx.times)
+                    else:
+                        A = np.zeros((len(rx.times), n_t))
+                        for times, weights in zip(quad_times, quad_weights):
+                            A -= np.einsum("ij,ijk->ik", weights, splines(times))
+                    if isinstance(rx, (PointMagneticFluxDensity, PointMagneticField)):
+                        A = A @ (A_dft / omegas)
+                    else:
+                        A = A @ A_dft
+                    if isinstance(
+                        rx, (PointMagneticFluxTimeDerivative, PointMagneticFluxDensity)
+                    ):
+                        A *= mu_0
+                    cache.set(content, A)
+                As.append(A)
+        self._As = As
         self._coefficients_set = True
 
     def dpred(self, m, f=None):
@@ -0,0 +1,98 @@
+import numpy as np
+
+from ...utils import validate_string, validate_type
+from ..base_1d_stitched import BaseStitchedEM1DSimulation
+from .simulation_1d import COS_FILTERS, Simulation1DLayered
+from .survey import Survey
+
+
+class Simulation1DLayeredStitched(BaseStitchedEM1DSimulation):
+    """
+    Simulation class for simulating the TEM response of many soundings, each
+    over its own 1D layered Earth.
+
+    See :class:`~simpeg.electromagnetics.base_1d_stitched.BaseStitchedEM1DSimulation`
+    for how the survey is split into soundings and how the model is ordered.
+    Soundings only share their coefficients if their sources use the same
+    waveform object.
+
+    Parameters
+    ----------
+    survey : simpeg.electromagnetics.time_domain.survey.Survey
+        The survey of all the soundings.
+    time_filter : str, optional
+        Name of the cosine filter used for the transform to the time domain.
+    **kwargs
+        See :class:`~simpeg.electromagnetics.base_1d_stitched.BaseStitchedEM1DSimulation`.
+    """
+
+    _simulation_1d_class = Simulation1DLayered
+
+    def __init__(self, survey=None, time_filter="key_81_2009", **kwargs):
+        super().__init__(survey=survey, **kwargs)
+        self.time_filter = time_filter
+
+    @property
+    def survey(self):
+        """The survey for the simulation
+
+        Returns
+        -------
+        simpeg.electromagnetics.time_domain.survey.Survey
+        """
+        if self._survey is None:
+            raise AttributeError("Simulation must have a survey set")
+        return self._survey
+
+    @survey.setter
+    def survey(self, value):
+        if value is not None:
+            value = validate_type("survey", value, Survey, cast=False)
+        self._survey = value
+        self._coefficients_set = False
+
+    @property
+    def time_filter(self):
+        """The cosine filter used for the transform to the time domain.
+
+        Returns
+        -------
+        str
+        """
+        return self._time_filter
+
+    @time_filter.setter
+    def time_filter(self, value):
+        # translate old accepted keys to the names in libdlf for compatibility.
+        if value in [
+            "key_81_CosSin_2009",
+            "key_201_CosSin_2012",
+            "key_601_CosSin_2009",
+        ]:
+            value = value.replace("CosSin_", "")
+        self._time_filter = validate_string(
+            "time_filter", value, list(COS_FILTERS.keys())
+        )
+        self._coefficients_set = False
+
+    def _simulation_1d_kwargs(self):
+        kwargs = super()._simulation_1d_kwargs()
+        kwargs["time_filter"] = self.time_filter
+        return kwargs
+
+    def _source_key(self, src):
+        return super()._source_key(src) + (id(src.waveform),)
+
+    def _response_shape(self, simulation):
+        return (simulation._W.shape[0], simulation._frequencies.size)
+
+    def _response_frequencies(self, simulation):
+        return simulation._frequencies
+
+    def _response(self, simulation, rTE, C0s, C1s):
+        rTE = rTE[..., simulation._inv_lambs]
+        C0s = C0s[..., None, :, :]
+        C1s = C1s[..., None, :, :]
+        v = (C0s * rTE) @ simulation._fhtfilt.j0 + (C1s * rTE) @ simulation._fhtfilt.j1
+        v = np.swapaxes(v @ simulation._W.T.toarray(), -1, -2)
+        return v.reshape(v.shape[:-2] + (-1,))
@@ -0,0 +1,304 @@
+"""
+Numba functions for the geometry operator of VRM simulations.
+
+Cells are given by the corner with the smallest coordinates and the widths of
+their sub-cells, so refined cells are split into ``n_sub**3`` sub-cells on the
+fly instead of storing the expanded arrays of sub-cells.
+"""
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    # Define dummy jit decorator
+    def jit(*args, **kwargs):
+        return lambda f: f
+
+    numba = None
+    prange = range
+else:
+    from numba import jit, prange
+
+# Tolerance constants for numerical stability
+TOL = 1e-10
+TOL2 = 1000.0
+
+
+@jit(nopython=True)
+def _replace_small(distance, replacement):
+    """Replace distances that are too close to zero."""
+    if np.abs(distance) < TOL:
+        return replacement
+    return distance
+
+
+@jit(nopython=True)
+def _geometry_terms(u1, u2, v1, v2, w1, w2, component):
+    """
+    Geometry terms of a single prism for one component of the receiver.
+
+    Parameters
+    ----------
+    u1, u2, v1, v2, w1, w2 : float
+        Distances from the faces of the prism to the observation point.
+    component : int
+        Component of the receiver: 0, 1 or 2 for x, y or z.
+
+    Returns
+    -------
+    tuple of float
+        Terms multiplying the x, y and z components of the magnetization.
+    """
+    d111 = np.sqrt(u1**2 + v1**2 + w1**2)
+    d211 = np.sqrt(u2**2 + v1**2 + w1**2)
+    d221 = np.sqrt(u2**2 + v2**2 + w1**2)
+    d121 = np.sqrt(u1**2 + v2**2 + w1**2)
+    d122 = np.sqrt(u1**2 + v2**2 + w2**2)
+    d112 = np.sqrt(u1**2 + v1**2 + w2**2)
+    d212 = np.sqrt(u2**2 + v1**2 + w2**2)
+    d222 = np.sqrt(u2**2 + v2**2 + w2**2)
+
+    # the sums of logarithms are evaluated as the logarithm of a ratio of
+    # products, all the factors are non-negative
+    log_w = np.log(
+        ((d111 - w1) * (d221 - w1) * (d122 - w2) * (d212 - w2))
+        / ((d211 - w1) * (d121 - w1) * (d112 - w2) * (d222 - w2))
+    )
+    log_v = np.log(
+        ((d111 - v1) * (d221 - v2) * (d122 - v2) * (d212 - v1))
+        / ((d211 - v1) * (d121 - v2) * (d112 - v1) * (d222 - v2))
+    )
+    log_u = np.log(
+        ((d111 - u1) * (d221 - u2) * (d122 - u1) * (d212 - u2))
+        / ((d211 - u2) * (d121 - u1) * (d112 - u1) * (d222 - u2))
+    )
+    if component == 1:
+        atan_v = (
+            np.arctan((u1 * w1) / (v1 * d111 + TOL))
+            - np.arctan((u2 * w1) / (v1 * d211 + TOL))
+            + np.arctan((u2 * w1) / (v2 * d221 + TOL))
+            - np.arctan((u1 * w1) / (v2 * d121 + TOL))
+            + np.arctan((u1 * w2) / (v2 * d122 + TOL))
+            - np.arctan((u1 * w2) / (v1 * d112 + TOL))
+            + np.arctan((u2 * w2) / (v1 * d212 + TOL))
+            - np.arctan((u2 * w2) / (v2 * d222 + TOL))
+        )
+        return log_w, atan_v, log_u
+    atan_u = (
+        np.arctan((v1 * w1) / (u1 * d111 + TOL))
+        - np.arctan((v1 * w1) / (u2 * d211 + TOL))
+        + np.arctan((v2 * w1) / (u2 * d221 + TOL))
+        - np.arctan((v2 * w1) / (u1 * d121 + TOL))
+        + np.arctan((v2 * w2) / (u1 * d122 + TOL))
+        - np.arctan((v1 * w2) / (u1 * d112 + TOL))
+        + np.arctan((v1 * w2) / (u2 * d212 + TOL))
+        - np.arctan((v2 * w2) / (u2 * d222 + TOL))
+    )
+    if component == 0:
+        return atan_u, log_w, log_v
+    atan_v = (
+        np.arctan((u1 * w1) / (v1 * d111 + TOL))
+        - np.arctan((u2 * w1) / (v1 * d211 + TOL))
+        + np.arctan((u2 * w1) / (v2 * d221 + TOL))
+        - np.arctan((u1 * w1) / (v2 * d121 + TOL))
+        + np.arctan((u1 * w2) / (v2 * d122 + TOL))
+        - np.arctan((u1 * w2) / (v1 * d112 + TOL))
+        + np.arctan((u2 * w2) / (v1 * d212 + TOL))
+        - np.arctan((u2 * w2) / (v2 * d222 + TOL))
+    )
+    return log_v, log_u, -atan_u - atan_v
+
+
+@jit(nopython=True)
+def _cell_sensitivity(
+    receiver, offsets, weights, component, corner, widths, n_sub, h_min, h0, first
+):
+    """
+    Sensitivity of a receiver to the magnetization of a (refined) cell.
+
+    Parameters
+    ----------
+    receiver : (3,) numpy.ndarray
+        Location of the receiver.
+    offsets : (n_quad, 3) numpy.ndarray
+        Offsets of the quadrature points of the receiver.
+    weights : (n_quad,) numpy.ndarray
+        Weights of the quadrature points of the receiver.
+    component : int
+        Component of the receiver: 0, 1 or 2 for x, y or z.
+    corner : (3,) numpy.ndarray
+        Corner of the cell with the smallest coordinates.
+    widths : (3,) numpy.ndarray
+        Widths of the sub-cells.
+    n_sub : int
+        Number of sub-cells along each direction.
+    h_min : (3,) numpy.ndarray
+        Minimum widths of all the cells, used to regularize the distances that
+        are too close to zero.
+    h0 : (n_cells * n_sub**3, 3) numpy.ndarray
+        Inducing field at the center of every sub-cell.
+    first : int
+        Row of ``h0`` of the first sub-cell of this cell.
+
+    Returns
+    -------
+    float
+    """
+    total = 0.0
+    for s in range(n_sub**3):
+        # sub-cell centers, x changing faster than y, and y faster than z
+        cx = corner[0] + widths[0] * (s % n_sub + 0.5)
+        cy = corner[1] + widths[1] * ((s // n_sub) % n_sub + 0.5)
+        cz = corner[2] + widths[2] * (s // n_sub**2 + 0.5)
+        ax, bx = cx - widths[0] / 2, cx + widths[0] / 2
+        ay, by = cy - widths[1] / 2, cy + widths[1] / 2
+        az, bz = cz - widths[2] / 2, cz + widths[2] / 2
+        gx = gy = gz = 0.0
+        for q in range(offsets.shape[0]):
+            u1 = _replace_small(receiver[0] - ax + offsets[q, 0], h_min[0] / TOL2)
+            u2 = _replace_small(receiver[0] - bx + offsets[q, 0], -h_min[0] / TOL2)
+            v1 = _replace_small(receiver[1] - ay + offsets[q, 1], h_min[1] / TOL2)
+            v2 = _replace_small(receiver[1] - by + offsets[q, 1], -h_min[1] / TOL2)
+            w1 = _replace_small(receiver[2] - az + offsets[q, 2], h_min[2] / TOL2)
+            w2 = _replace_small(receiver[2] - bz + offsets[q, 2], -h_min[2] / TOL2)
+            tx, ty, tz = _geometry_terms(u1, u2, v1, v2, w1, w2, component)
+            gx += weights[q] * tx
+            gy += weights[q] * ty
+            gz += weights[q] * tz
+        k = first + s
+        total += gx * h0[k, 0] + gy * h0[k, 1] + gz * h0[k, 2]
+    return total
+
+
+def _sensitivity_vrm(
+    receivers,
+    offsets,
+    weights,
+    component,
+    corners,
+    widths,
+    n_sub,
+    h_min,
+    h0,
+    sensitivity_matrix,
+    constant_factor,
+):
+    """
+    Fill the columns of the VRM sensitivity matrix for a group of cells.
+
+    This function should be used with a `numba.jit` decorator, for example:
+
+    .. code::
+
+        from numba import jit
+
+        jit_sensitivity = jit(nopython=True, parallel=True)(_sensitivity_vrm)
+
+    Parameters
+    ----------
+    receivers : (n_receivers, 3) numpy.ndarray
+        Locations of the receivers.
+    offsets : (n_quad, 3) numpy.ndarray
+        Offsets of the quadrature points of the receivers.
+    weights : (n_quad,) numpy.ndarray
+        Weights of the quadrature points of the receivers.
+    component : int
+        Component of the receivers: 0, 1 or 2 for x, y or z.
+    corners : (n_cells, 3) numpy.ndarray
+        Corners of the cells with the smallest coordinates.
+    widths : (n_cells, 3) numpy.ndarray
+        Widths of the sub-cells of each cell.
+    n_sub : int
+        Number of sub-cells of each cell along each direction.
+    h_min : (3,) numpy.ndarray
+        Minimum widths of the cells, used to regularize small distances.
+    h0 : (n_cells * n_sub**3, 3) numpy.ndarray
+        Inducing field at the center of every sub-cell.
+    sensitivity_matrix : (n_receivers, n_cells) numpy.ndarray
+        Array where the sensitivities will be stored. This could be a
+        preallocated array or a slice of it.
+    constant_factor : float
+        Constant factor multiplying every element of the matrix.
+    """
+    n_receivers = receivers.shape[0]
+    n_cells = corners.shape[0]
+    for i in prange(n_receivers):
+        for j in range(n_cells):
+            sensitivity_matrix[i, j] = constant_factor * _cell_sensitivity(
+                receivers[i],
+                offsets,
+                weights,
+                component,
+                corners[j],
+                widths[j],
+                n_sub,
+                h_min,
+                h0,
+                j * n_sub**3,
+            )
+
+
+def _forward_vrm(
+    receivers,
+    offsets,
+    weights,
+    component,
+    corners,
+    widths,
+    n_sub,
+    h_min,
+    h0,
+    model,
+    fields,
+    constant_factor,
+):
+    """
+    Add the product of the VRM sensitivities of a group of cells with a model.
+
+    The sensitivities are computed on the fly and are not stored. This
+    function should be used with a `numba.jit` decorator, for example:
+
+    .. code::
+
+        from numba import jit
+
+        jit_forward = jit(nopython=True, parallel=True)(_forward_vrm)
+
+    Parameters
+    ----------
+    receivers, offsets, weights, component, corners, widths, n_sub, h_min, h0
+        See :func:`_sensitivity_vrm`.
+    model : (n_cells, n_columns) numpy.ndarray
+        Model, or several models as columns, on the cells.
+    fields : (n_receivers, n_columns) numpy.ndarray
+        Array where the product will be added. This could be a preallocated
+        array or a slice of it.
+    constant_factor : float
+        Constant factor multiplying every sensitivity.
+    """
+    n_receivers = receivers.shape[0]
+    n_cells = corners.shape[0]
+    n_columns = model.shape[1]
+    for i in prange(n_receivers):
+        for j in range(n_cells):
+            sensitivity = constant_factor * _cell_sensitivity(
+                receivers[i],
+                offsets,
+                weights,
+                component,
+                corners[j],
+                widths[j],
+                n_sub,
+                h_min,
+                h0,
+                j * n_sub**3,
+            )
+            for k in range(n_columns):
+                fields[i, k] += sensitivity * model[j, k]
+
+
+_sensitivity_vrm_parallel = jit(nopython=True, parallel=True)(_sensitivity_vrm)
+_sensitivity_vrm_serial = jit(nopython=True, parallel=False)(_sensitivity_vrm)
+_forward_vrm_parallel = jit(nopython=True, parallel=True)(_forward_vrm)
+_forward_vrm_serial = jit(nopython=True, parallel=False)(_forward_vrm)
@@ -9,15 +9,43 @@ from ... import maps
 from ...utils import (
     mkvc,
     validate_type,
+    validate_string,
     validate_ndarray_with_shape,
     validate_active_indices,
 )
 
 from .survey import SurveyVRM
 from .receivers import Point, SquareLoop
+from ._numba_functions import (
+    numba,
+    _sensitivity_vrm_parallel,
+    _sensitivity_vrm_serial,
+    _forward_vrm_parallel,
+    _forward_vrm_serial,
+)
 
 from ...utils.code_utils import deprecate_property
 
+# Gaussian quadrature weights and locations on [-1, 1] for square loops
+_QUADRATURE_WEIGHTS = [
+    np.r_[2.0],
+    np.r_[1.0, 1.0],
+    np.r_[0.555556, 0.888889, 0.555556],
+    np.r_[0.347855, 0.652145, 0.652145, 0.347855],
+    np.r_[0.236927, 0.478629, 0.568889, 0.478629, 0.236927],
+    np.r_[0.171324, 0.467914, 0.360762, 0.360762, 0.467914, 0.171324],
+    np.r_[0.129485, 0.279705, 0.381830, 0.417959, 0.381830, 0.279705, 0.129485],
+]
+_QUADRATURE_POINTS = [
+    np.r_[0.0],
+    np.r_[-0.57735, 0.57735],
+    np.r_[-0.774597, 0.0, 0.774597],
+    np.r_[-0.861136, -0.339981, 0.339981, 0.861136],
+    np.r_[-0.906180, -0.538469, 0, 0.538469, 0.906180],
+    np.r_[-0.932470, -0.238619, -0.661209, 0.661209, 0.238619, 0.932470],
+    np.r_[-0.949108, -0.741531, -0.405845, 0.0, 0.405845, 0.741531, 0.949108],
+]
+
 ############################################
 # BASE VRM PROBLEM CLASS
 ############################################
@@ -27,6 +55,8 @@ class BaseVRMSimulation(BaseSimulation):
     """"""
 
     _AisSet = False
+    # maximum number of sub-cells whose inducing field is evaluated at once
+    _max_sub_cells = 2**16
 
     def __init__(
         self,
@@ -36,10 +66,16 @@ class BaseVRMSimulation(BaseSimulation):
         refinement_distance=None,
         active_cells=None,
         indActive=None,
+        engine="numpy",
+        numba_parallel=True,
+        forward_only=False,
         **kwargs,
     ):
         self.mesh = mesh
         super().__init__(survey=survey, **kwargs)
+        self.engine = engine
+        self.numba_parallel = numba_parallel
+        self.forward_only = forward_only
 
         if refinement_distance is None:
             if refinement_factor is None:
@@ -164,6 +200,69 @@ class BaseVRMSimulation(BaseSimulation):
         error=False,
     )
 
+    @property
+    def engine(self):
+        """Engine used to compute the geometry operator.
+
+        - ``"numpy"``: the operator is computed with vectorized numpy
+          operations for each receiver location.
+        - ``"numba"``: the operator is computed with compiled kernels running
+          in parallel over the receivers. Refined cells are split in
+          sub-cells on the fly, and their inducing field is evaluated in
+          chunks of cells.
+
+        Returns
+        -------
+        {"numpy", "numba"}
+        """
+        return self._engine
+
+    @engine.setter
+    def engine(self, value):
+        value = validate_string("engine", value, ["numpy", "numba"])
+        if value == "numba" and numba is None:
+            raise ImportError(
+                "The numba package couldn't be found. "
+                "Running a VRM simulation with 'engine=\"numba\"' needs "
+                "numba to be installed."
+            )
+        self._engine = value
+
+    @property
+    def numba_parallel(self):
+        """Whether the numba kernels run in parallel over the receivers.
+
+        Only used if :py:attr:`engine` is ``"numba"``.
+
+        Returns
+        -------
+        bool
+        """
+        return self._numba_parallel
+
+    @numba_parallel.setter
+    def numba_parallel(self, value):
+        self._numba_parallel = validate_type("numba_parallel", value, bool)
+
+    @property
+    def forward_only(self):
+        """Whether the fields are computed without storing the geometry operator.
+
+        If ``True``, :meth:`fields` computes the products of the geometry
+        operator of each source with the model on the fly. The operator is only
+        built if it is explicitly needed, for example to compute
+        sensitivities.
+
+        Returns
+        -------
+        bool
+        """
+        return self._forward_only
+
+    @forward_only.setter
+    def forward_only(self, value):
+        self._forward_only = validate_type("forward_only", value, bool)
+
     def _getH0matrix(self, xyz, pp):
         """
                 Creates sparse matrix containing inducing field components
@@ -431,25 +530,7 @@ class BaseVRMSimulation(BaseSimulation):
                         COUNT = COUNT + 1
 
             elif isinstance(rxObj, SquareLoop):
-                # Gaussian quadrature weights
-                wt = [
-                    np.r_[2.0],
-                    np.r_[1.0, 1.0],
-                    np.r_[0.555556, 0.888889, 0.555556],
-                    np.r_[0.347855, 0.652145, 0.652145, 0.347855],
-                    np.r_[0.236927, 0.478629, 0.568889, 0.478629, 0.236927],
-                    np.r_[0.171324, 0.467914, 0.360762, 0.360762, 0.467914, 0.171324],
-                    np.r_[
-                        0.129485,
-                        0.279705,
-                        0.381830,
-                        0.417959,
-                        0.381830,
-                        0.279705,
-                        0.129485,
-                    ],
-                ]
-                wt = wt[rxObj.quadrature_order - 1]
+                wt = _QUADRATURE_WEIGHTS[rxObj.quadrature_order - 1]
                 nw = len(wt)
                 wt = (
                     rxObj.n_turns
@@ -457,26 +538,7 @@ class BaseVRMSimulation(BaseSimulation):
                     * np.reshape(np.outer(wt, wt), (1, nw**2))
                 )
 
-                # Gaussian quadrature locations on [-1,1]
-                ds = [
-                    np.r_[0.0],
-                    np.r_[-0.57735, 0.57735],
-                    np.r_[-0.774597, 0.0, 0.774597],
-                    np.r_[-0.861136, -0.339981, 0.339981, 0.861136],
-                    np.r_[-0.906180, -0.538469, 0, 0.538469, 0.906180],
-                    np.r_[
-                        -0.932470, -0.238619, -0.661209, 0.661209, 0.238619, 0.932470
-                    ],
-                    np.r_[
-                        -0.949108,
-                        -0.741531,
-                        -0.405845,
-                        0.0,
-                        0.405845,
-                        0.741531,
-                        0.949108,
-                    ],
-                ]
+                ds = _QUADRATURE_POINTS
 
                 s1 = (
                     0.5
@@ -740,6 +802,15 @@ class BaseVRMSimulation(BaseSimulation):
     def _getAMatricies(self):
         """Returns the full geometric operator"""
 
+        # GET LIST OF A MATRICIES
+        return [self._getAMatrix(pp) for pp in range(0, self.survey.nSrc)]
+
+    def _getAMatrix(self, pp):
+        """Returns the geometric operator for source pp"""
+
+        if self.engine == "numba":
+            return self._getAMatrixNumba(pp)
+
         active_cells = self.active_cells
 
         # GET CELL INFORMATION FOR FORWARD MODELING
@@ -747,32 +818,207 @@ class BaseVRMSimulation(BaseSimulation):
         xyzc = meshObj.gridCC[active_cells, :]
         xyzh = meshObj.h_gridded[active_cells, :]
 
-        # GET LIST OF A MATRICIES
-        A = []
-        for pp in range(0, self.survey.nSrc):
-            # Create initial A matrix
-            G = self._getGeometryMatrix(xyzc, xyzh, pp)
-            H0 = self._getH0matrix(xyzc, pp)
-            A.append(G * H0)
-
-            # Refine A matrix
-            refinement_factor = self.refinement_factor
-            refinement_distance = self.refinement_distance
-
-            if refinement_factor > 0:
-                srcObj = self.survey.source_list[pp]
-                refFlag = srcObj._getRefineFlags(
-                    xyzc, refinement_factor, refinement_distance
-                )
+        # Create initial A matrix
+        G = self._getGeometryMatrix(xyzc, xyzh, pp)
+        H0 = self._getH0matrix(xyzc, pp)
+        A = G * H0
 
-                for qq in range(1, refinement_factor + 1):
-                    if len(refFlag[refFlag == qq]) != 0:
-                        A[pp][:, refFlag == qq] = self._getSubsetAcolumns(
-                            xyzc, xyzh, pp, qq, refFlag
-                        )
+        # Refine A matrix
+        refinement_factor = self.refinement_factor
+        refinement_distance = self.refinement_distance
+
+        if refinement_factor > 0:
+            srcObj = self.survey.source_list[pp]
+            refFlag = srcObj._getRefineFlags(
+                xyzc, refinement_factor, refinement_distance
+            )
 
+            for qq in range(1, refinement_factor + 1):
+                if len(refFlag[refFlag == qq]) != 0:
+                    A[:, refFlag == qq] = self._getSubsetAcolumns(
+                        xyzc, xyzh, pp, qq, refFlag
+                    )
+
+        return A
+
+    def _receiver_quadrature(self, rx):
+        """
+        Quadrature of a receiver for the numba kernels.
+
+        Parameters
+        ----------
+        rx : simpeg.electromagnetics.viscous_remanent_magnetization.receivers.Point
+            The receiver.
+
+        Returns
+        -------
+        offsets : (n_quad, 3) numpy.ndarray
+            Offsets of the quadrature points from the receiver locations.
+        weights : (n_quad,) numpy.ndarray
+            Weights of the quadrature points.
+        component : int
+            Component of the receiver: 0, 1 or 2 for x, y or z.
+        """
+        component = "xyz".index(rx.orientation.lower())
+        if not isinstance(rx, SquareLoop):
+            return np.zeros((1, 3)), np.ones(1), component
+
+        points = 0.5 * rx.width * _QUADRATURE_POINTS[rx.quadrature_order - 1]
+        weights = _QUADRATURE_WEIGHTS[rx.quadrature_order - 1]
+        nw = len(weights)
+        # the loop lies on the plane normal to the receiver component
+        offsets = np.zeros((nw**2, 3))
+        first, second = [axis for axis in range(3) if axis != component]
+        offsets[:, first] = np.kron(points, np.ones(nw))
+        offsets[:, second] = np.kron(np.ones(nw), points)
+        weights = rx.n_turns * (rx.width / 2) ** 2 * np.outer(weights, weights).ravel()
+        return offsets, weights, component
+
+    def _cell_blocks(self, pp):
+        """
+        Generate the blocks of active cells of source pp for the numba kernels.
+
+        Cells with the same refinement are grouped in chunks, so that the
+        inducing field is evaluated at most at ``_max_sub_cells`` sub-cells at
+        once.
+
+        Parameters
+        ----------
+        pp : int
+            Source index.
+
+        Yields
+        ------
+        columns : numpy.ndarray of int
+            Indices of the active cells in the block.
+        corners : (n_cells, 3) numpy.ndarray
+            Corners of the cells with the smallest coordinates.
+        widths : (n_cells, 3) numpy.ndarray
+            Widths of the sub-cells.
+        n_sub : int
+            Number of sub-cells along each direction.
+        h_min : (3,) numpy.ndarray
+            Minimum widths used to regularize small distances.
+        h0 : (n_cells * n_sub**3, 3) numpy.ndarray
+            Inducing field at the center of every sub-cell.
+        """
+        srcObj = self.survey.source_list[pp]
+        xyzc = self.mesh.cell_centers[self.active_cells, :]
+        xyzh = self.mesh.h_gridded[self.active_cells, :]
+        corners = xyzc - xyzh / 2
+
+        refinement_factor = self.refinement_factor
+        if refinement_factor > 0:
+            refFlag = srcObj._getRefineFlags(
+                xyzc, refinement_factor, self.refinement_distance
+            )
+        else:
+            refFlag = np.zeros(xyzc.shape[0], dtype=int)
+
+        for qq in range(0, refinement_factor + 1):
+            columns = np.flatnonzero(refFlag == qq)
+            if columns.size == 0:
+                continue
+            n_sub = 2**qq
+            if qq == 0:
+                h_min = np.min(xyzh, axis=0)
+            else:
+                h_min = np.min(xyzh[columns], axis=0) / n_sub
+            # offsets of the sub-cell centers, x changing faster than y and z
+            s = np.arange(n_sub**3)
+            sub_cells = np.c_[s % n_sub, (s // n_sub) % n_sub, s // n_sub**2] + 0.5
+
+            chunk_size = max(self._max_sub_cells // n_sub**3, 1)
+            for start in range(0, columns.size, chunk_size):
+                block = columns[start : start + chunk_size]
+                widths = xyzh[block] / n_sub
+                centers = corners[block, None, :] + widths[:, None, :] * sub_cells
+                h0 = srcObj.getH0(centers.reshape(-1, 3))
+                yield block, corners[block], widths, n_sub, h_min, h0
+
+    def _getAMatrixNumba(self, pp):
+        """Geometry operator of source pp computed with the numba kernels."""
+        srcObj = self.survey.source_list[pp]
+        sensitivity_vrm = (
+            _sensitivity_vrm_parallel
+            if self.numba_parallel
+            else _sensitivity_vrm_serial
+        )
+        A = np.empty((srcObj.nRx, int(np.sum(self.active_cells))))
+        for block, corners, widths, n_sub, h_min, h0 in self._cell_blocks(pp):
+            row = 0
+            for rxObj in srcObj.receiver_list:
+                offsets, weights, component = self._receiver_quadrature(rxObj)
+                locs = np.asarray(rxObj.locations, dtype=np.float64)
+                A_block = np.empty((locs.shape[0], block.size))
+                sensitivity_vrm(
+                    locs,
+                    offsets,
+                    weights,
+                    component,
+                    corners,
+                    widths,
+                    n_sub,
+                    h_min,
+                    h0,
+                    A_block,
+                    -1 / (4 * np.pi),
+                )
+                A[row : row + locs.shape[0], block] = A_block
+                row += locs.shape[0]
         return A
 
+    def _getAdot(self, pp, x):
+        """
+        Product of the geometry operator of source pp with x.
+
+        With the numba engine, the operator is computed on the fly and never
+        stored.
+
+        Parameters
+        ----------
+        pp : int
+            Source index.
+        x : (n_active,) or (n_active, n_columns) numpy.ndarray
+            Vector, or vectors as columns, on the active cells.
+
+        Returns
+        -------
+        (n_rx,) or (n_rx, n_columns) numpy.ndarray
+        """
+        if self.engine == "numpy":
+            return self._getAMatrix(pp) @ x
+
+        srcObj = self.survey.source_list[pp]
+        forward_vrm = (
+            _forward_vrm_parallel if self.numba_parallel else _forward_vrm_serial
+        )
+        x = np.asarray(x, dtype=np.float64)
+        model = x.reshape(x.shape[0], -1)
+        out = np.zeros((srcObj.nRx, model.shape[1]))
+        for block, corners, widths, n_sub, h_min, h0 in self._cell_blocks(pp):
+            model_block = np.ascontiguousarray(model[block])
+            row = 0
+            for rxObj in srcObj.receiver_list:
+                offsets, weights, component = self._receiver_quadrature(rxObj)
+                locs = np.asarray(rxObj.locations, dtype=np.float64)
+                forward_vrm(
+                    locs,
+                    offsets,
+                    weights,
+                    component,
+                    corners,
+                    widths,
+                    n_sub,
+                    h_min,
+                    h0,
+                    model_block,
+                    out[row : row + locs.shape[0]],
+                    -1 / (4 * np.pi),
+                )
+                row += locs.shape[0]
+        return out.reshape((srcObj.nRx,) + x.shape[1:])
+
     def _getSubsetAcolumns(self, xyzc, xyzh, pp, qq, refFlag):
         """
                 This method returns the refined sensitivities for columns that will be
@@ -941,8 +1187,15 @@ class Simulation3DLinear(BaseVRMSimulation):
         # Project to active mesh cells
         m = self.xiMap * m
 
+        if self.forward_only:
+            Am = np.concatenate(
+                [self._getAdot(pp, m) for pp in range(0, self.survey.nSrc)]
+            )
+        else:
+            Am = np.dot(self.A, m)
+
         # Must return as a numpy array
-        return mkvc(sp.coo_matrix.dot(self.T, np.dot(self.A, m)))
+        return mkvc(sp.coo_matrix.dot(self.T, Am))
 
     def Jvec(self, m, v, f=None):
         """Compute Pd*T*A*dxidm*v"""
@@ -1053,17 +1306,31 @@ class Simulation3DLogUniform(BaseVRMSimulation):
             nRx = len(receiver_list)
             waveObj = source_list[pp].waveform
 
+            eta = []
             for qq in range(0, nRx):
                 times = receiver_list[qq].times
-                eta = waveObj.getLogUniformDecay(
-                    receiver_list[qq].field_type,
-                    times,
-                    self.chi0,
-                    self.dchi,
-                    self.tau1,
-                    self.tau2,
+                eta.append(
+                    waveObj.getLogUniformDecay(
+                        receiver_list[qq].field_type,
+                        times,
+                        self.chi0,
+                        self.dchi,
+                        self.tau1,
+                        self.tau2,
+                    )
                 )
 
-                f.append(mkvc(self.A[qq] @ eta))
+            # Rows of A and columns of the decays for each receiver
+            rows = np.cumsum([0] + [rx.locations.shape[0] for rx in receiver_list])
+            cols = np.cumsum([0] + [eta_qq.shape[1] for eta_qq in eta])
+            if self.forward_only:
+                A_eta = self._getAdot(pp, np.hstack(eta))
+
+            for qq in range(0, nRx):
+                if self.forward_only:
+                    f_qq = A_eta[rows[qq] : rows[qq + 1], cols[qq] : cols[qq + 1]]
+                else:
+                    f_qq = self.A[pp][rows[qq] : rows[qq + 1]] @ eta[qq]
+                f.append(mkvc(f_qq))
 
         return np.array(np.hstack(f))
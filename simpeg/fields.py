@@ -1,7 +1,204 @@
+import os
+import tempfile
+import weakref
+from collections import OrderedDict
+
 import numpy as np
 
 from .simulation import BaseSimulation, BaseTimeSimulation
-from .utils import mkvc, validate_type
+from .utils import mkvc, validate_float, validate_type
+from .utils.solver_utils import _single_precision_dtype
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class ChunkedStorage:
+    """On-disk, chunked storage for the solutions held by fields objects.
+
+    Instead of holding every field solution in memory, the solution for
+    each source (and each time step of a :class:`TimeFields`) is stored as a
+    separate chunk of a memory-mapped file, and only the most recently used
+    chunks are kept in memory. Modified chunks are written to the file when
+    they are evicted from memory.
+
+    Parameters
+    ----------
+    directory : str, optional
+        Directory where the files are created, e.g. on a fast local drive.
+        If ``None``, the default temporary directory is used.
+    max_memory : float, optional
+        Approximate memory budget, in GB, for the chunks kept in memory by
+        each stored field. At least one chunk is always kept in memory.
+
+    Notes
+    -----
+    The files are removed when the arrays using them are garbage collected.
+
+    Examples
+    --------
+    Store the fields of a simulation on disk, keeping about 2 GB of each
+    field solution in memory:
+
+    .. code-block:: python
+
+        simulation.fields_storage = ChunkedStorage("/scratch", max_memory=2.0)
+        f = simulation.fields(m)
+    """
+
+    def __init__(self, directory=None, max_memory=1.0):
+        self.directory = directory
+        self.max_memory = max_memory
+
+    @property
+    def directory(self):
+        """Directory where the files are created.
+
+        Returns
+        -------
+        str or None
+        """
+        return self._directory
+
+    @directory.setter
+    def directory(self, value):
+        if value is not None:
+            value = validate_type("directory", value, str)
+        self._directory = value
+
+    @property
+    def max_memory(self):
+        """Approximate memory budget for the chunks kept in memory in GB.
+
+        Returns
+        -------
+        float
+        """
+        return self._max_memory
+
+    @max_memory.setter
+    def max_memory(self, value):
+        self._max_memory = validate_float("max_memory", value, min_val=0.0)
+
+    def create(self, shape, dtype):
+        """Create a new array of zeros.
+
+        Parameters
+        ----------
+        shape : tuple of int
+            Shape of the array. The first dimension runs along each chunk.
+        dtype : numpy.dtype
+            Data type of the array.
+
+        Returns
+        -------
+        _ChunkedArray
+        """
+        return _ChunkedArray(
+            shape, dtype, directory=self.directory, max_memory=self.max_memory
+        )
+
+
+class _ChunkedArray:
+    """Array stored in a memory-mapped file, one chunk per trailing index.
+
+    Supports the indexing used by fields objects, with a full slice (or any
+    basic index) along the first axis and any numpy index along the other
+    axes.
+    """
+
+    def __init__(self, shape, dtype, directory=None, max_memory=1.0):
+        self.shape = tuple(int(n) for n in shape)
+        self.dtype = np.dtype(dtype)
+        self._chunk_ids = np.arange(int(np.prod(self.shape[1:]))).reshape(
+            self.shape[1:]
+        )
+        chunk_nbytes = max(self.shape[0] * self.dtype.itemsize, 1)
+        self._max_chunks = max(int(max_memory * 1024**3 // chunk_nbytes), 1)
+
+        fd, path = tempfile.mkstemp(suffix=".dat", dir=directory)
+        os.close(fd)
+        self._finalizer = weakref.finalize(self, _remove_file, path)
+        self._data = np.memmap(
+            path, dtype=self.dtype, mode="w+", shape=(self._chunk_ids.size, shape[0])
+        )
+        self._cache = OrderedDict()
+        self._dirty = set()
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    def _chunk(self, chunk_id, load=True, write=False):
+        """Return a chunk, reading it from the file if it is not in memory."""
+        chunk = self._cache.get(chunk_id, None)
+        if chunk is not None:
+            self._cache.move_to_end(chunk_id)
+        else:
+            if load:
+                chunk = np.array(self._data[chunk_id])
+            else:
+                chunk = np.empty(self.shape[0], dtype=self.dtype)
+            self._cache[chunk_id] = chunk
+            while len(self._cache) > self._max_chunks:
+                self._evict(next(iter(self._cache)))
+        if write:
+            self._dirty.add(chunk_id)
+        return chunk
+
+    def _evict(self, chunk_id):
+        chunk = self._cache.pop(chunk_id)
+        if chunk_id in self._dirty:
+            self._data[chunk_id] = chunk
+            self._dirty.discard(chunk_id)
+
+    def flush(self):
+        """Write the modified chunks kept in memory to the file."""
+        for chunk_id in self._dirty:
+            self._data[chunk_id] = self._cache[chunk_id]
+        self._dirty.clear()
+        self._data.flush()
+
+    def _split_key(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        key = key + (slice(None),) * (self.ndim - len(key))
+        return key[0], self._chunk_ids[key[1:]]
+
+    def __getitem__(self, key):
+        first, chunk_ids = self._split_key(key)
+        out = np.empty((self.shape[0],) + chunk_ids.shape, dtype=self.dtype)
+        for index, chunk_id in np.ndenumerate(chunk_ids):
+            out[(slice(None),) + index] = self._chunk(chunk_id)
+        if isinstance(first, slice) and first == slice(None):
+            return out
+        return out[first]
+
+    def __setitem__(self, key, value):
+        first, chunk_ids = self._split_key(key)
+        full = isinstance(first, slice) and first == slice(None)
+        first_shape = np.empty(self.shape[0], dtype=bool)[first].shape
+        value = np.broadcast_to(
+            np.asarray(value, dtype=self.dtype), first_shape + chunk_ids.shape
+        )
+        inner = (slice(None),) * len(first_shape)
+        for index, chunk_id in np.ndenumerate(chunk_ids):
+            chunk = self._chunk(chunk_id, load=not full, write=True)
+            chunk[first] = value[inner + index]
+
+    def __array__(self, dtype=None, copy=None):
+        out = self[:]
+        if dtype is not None:
+            out = out.astype(dtype)
+        return out
 
 
 class Fields:
@@ -41,6 +238,10 @@ class Fields:
         Set the Python data type for each numerical field solution that is stored in
         the fields object. E.g. ``float``, ``complex``,
         ``{'eSolution': complex, 'bSolution': complex}``.
+    storage : simpeg.fields.ChunkedStorage, optional
+        Storage for the field solutions. If ``None``, the ``fields_storage`` of
+        the simulation is used, and if the simulation does not have one the
+        field solutions are stored in memory.
 
     Examples
     --------
@@ -69,8 +270,16 @@ class Fields:
     _knownFields = {}
     _aliasFields = {}
 
-    def __init__(self, simulation, knownFields=None, aliasFields=None, dtype=None):
+    def __init__(
+        self,
+        simulation,
+        knownFields=None,
+        aliasFields=None,
+        dtype=None,
+        storage=None,
+    ):
         self.simulation = simulation
+        self.storage = storage
 
         if knownFields is not None:
             knownFields = validate_type("knownFields", knownFields, dict, cast=False)
@@ -168,6 +377,27 @@ class Fields:
         """
         return self._dtype
 
+    @property
+    def storage(self):
+        """Storage for the field solutions.
+
+        If ``None``, the field solutions are stored in memory as
+        :class:`numpy.ndarray`.
+
+        Returns
+        -------
+        simpeg.fields.ChunkedStorage or None
+        """
+        if self._storage is None:
+            return getattr(self.simulation, "fields_storage", None)
+        return self._storage
+
+    @storage.setter
+    def storage(self, value):
+        if value is not None:
+            value = validate_type("storage", value, ChunkedStorage, cast=False)
+        self._storage = value
+
     @property
     def mesh(self):
         """Mesh used by the simulation.
@@ -233,9 +463,13 @@ class Fields:
             dtype = self.dtype[name]
         else:
             dtype = self.dtype
+        if getattr(self.simulation, "field_precision", "double") == "single":
+            dtype = _single_precision_dtype(dtype)
 
-        # field = zarr.create(self._storageShape(loc), dtype=dtype)
-        field = np.zeros(self._storageShape(loc), dtype=dtype)
+        if self.storage is None:
+            field = np.zeros(self._storageShape(loc), dtype=dtype)
+        else:
+            field = self.storage.create(self._storageShape(loc), dtype)
 
         self._fields[name] = field
 
@@ -383,6 +617,10 @@ class TimeFields(Fields):
     dtype : dtype or dict of {str : dtype}, optional
         Set the Python data type for each numerical field solution that is stored in
         the fields object. E.g. ``float``, ``complex``, ``{'eSolution': complex, 'bSolution': complex}``.
+    storage : simpeg.fields.ChunkedStorage, optional
+        Storage for the field solutions. If ``None``, the ``fields_storage`` of
+        the simulation is used, and if the simulation does not have one the
+        field solutions are stored in memory.
 
     Examples
     --------
@@ -479,7 +717,10 @@ class TimeFields(Fields):
             return
         if val.size != np.array(shape).prod():
             raise ValueError("Incorrect size for data.")
-        correctShape = field[:, srcInd, timeInd].shape
+        # shape of the indexed field, without reading it
+        correctShape = (field.shape[0],) + np.empty(field.shape[1:], dtype=bool)[
+            srcInd, timeInd
+        ].shape
         field[:, srcInd, timeInd] = val.reshape(correctShape, order="F")
 
     def _getField(self, name, ind, src_list):
@@ -16,6 +16,7 @@ from ...utils import (
     validate_float,
 )
 from ...props import NestedModeler
+from ...utils.solver_utils import _solver_nbytes
 
 from .empirical import BaseHydraulicConductivity
 from .empirical import BaseWaterRetention
@@ -35,6 +36,8 @@ class SimulationNDCellCentered(BaseTimeSimulation, BasePDESimulation):
         do_newton=False,
         root_finder_max_iter=30,
         root_finder_tol=1e-4,
+        cache_jacobian=False,
+        max_jacobian_memory=None,
         **kwargs,
     ):
         debug = kwargs.pop("debug", None)
@@ -49,6 +52,8 @@ class SimulationNDCellCentered(BaseTimeSimulation, BasePDESimulation):
         self.do_newton = do_newton
         self.root_finder_max_iter = root_finder_max_iter
         self.root_finder_tol = root_finder_tol
+        self.cache_jacobian = cache_jacobian
+        self.max_jacobian_memory = max_jacobian_memory
 
     hydraulic_conductivity = NestedModeler(
         BaseHydraulicConductivity, "hydraulic conductivity function"
@@ -174,6 +179,71 @@ class SimulationNDCellCentered(BaseTimeSimulation, BasePDESimulation):
         if hasattr(self, "_root_finder"):
             del self._root_finder
 
+    @property
+    def cache_jacobian(self):
+        """Store the Jacobian blocks of each time step and their factorizations.
+
+        If ``True``, the blocks computed by :meth:`diagsJacobian` and the
+        factorizations of their diagonal blocks are stored the first time
+        they are needed by :meth:`Jvec` or :meth:`Jtvec`, and reused by the
+        following calls with the same fields until the model is updated.
+
+        Returns
+        -------
+        bool
+        """
+        return self._cache_jacobian
+
+    @cache_jacobian.setter
+    def cache_jacobian(self, value):
+        self._cache_jacobian = validate_type("cache_jacobian", value, bool)
+        self._jacobian_cache = None
+
+    @property
+    def max_jacobian_memory(self):
+        """Approximate memory budget for the stored Jacobian blocks in GB.
+
+        The blocks of the time steps are stored in the order they are first
+        needed until the budget is reached. The blocks of the other time steps
+        are recomputed from the fields every time they are needed, so no
+        forward solve is repeated. If ``None``, the blocks of all the time
+        steps are stored.
+
+        Returns
+        -------
+        float or None
+        """
+        return self._max_jacobian_memory
+
+    @max_jacobian_memory.setter
+    def max_jacobian_memory(self, value):
+        if value is not None:
+            value = validate_float("max_jacobian_memory", value, min_val=0.0)
+        self._max_jacobian_memory = value
+        self._jacobian_cache = None
+
+    @property
+    def _jacobian_cache(self):
+        """Fields and stored :class:`_JacobianStep` of each time step, or None."""
+        return getattr(self, "_jacobian_steps", None)
+
+    @_jacobian_cache.setter
+    def _jacobian_cache(self, value):
+        # clean the solvers of the steps that are replaced
+        previous = getattr(self, "_jacobian_steps", None)
+        if previous is not None and previous is not value:
+            for step in previous[1].values():
+                step.clean()
+        self._jacobian_steps = value
+
+    @_jacobian_cache.deleter
+    def _jacobian_cache(self):
+        self._jacobian_cache = None
+
+    @property
+    def _delete_on_model_update(self):
+        return super()._delete_on_model_update + ["_jacobian_cache"]
+
     def getBoundaryConditions(self, ii, u_ii):
         if isinstance(self.boundary_conditions, np.ndarray):
             return self.boundary_conditions
@@ -391,26 +461,70 @@ class SimulationNDCellCentered(BaseTimeSimulation, BasePDESimulation):
         J = self.survey.deriv(self, f, du_dm_v=du_dm)  # not multiplied by v
         return J
 
+    def _jacobian_step(self, m, f, ii):
+        """Jacobian blocks of a time step, stored or recomputed.
+
+        Parameters
+        ----------
+        m : numpy.ndarray
+            The model.
+        f : list of numpy.ndarray
+            Fields of the simulation for the model.
+        ii : int
+            Index of the time step.
+
+        Returns
+        -------
+        _JacobianStep
+        """
+        cache = getattr(self, "_jacobian_cache", None)
+        if self.cache_jacobian and (cache is None or cache[0] is not f):
+            # new model or fields, start over
+            cache = self._jacobian_cache = (f, {})
+        if cache is not None and ii in cache[1]:
+            return cache[1][ii]
+
+        bc = self.getBoundaryConditions(ii, f[ii])
+        Asub, Adiag, B = self.diagsJacobian(
+            m, f[ii], f[ii + 1], self.time_steps[ii], bc
+        )
+        return _JacobianStep(Asub, Adiag, B, self.solver, self.solver_opts)
+
+    def _store_jacobian_step(self, ii, step):
+        """Store the Jacobian blocks of a time step if they fit in the budget.
+
+        The solvers of the steps that are not stored are cleaned.
+        """
+        cache = getattr(self, "_jacobian_cache", None)
+        if not self.cache_jacobian or cache is None:
+            step.clean()
+            return
+        steps = cache[1]
+        if self.max_jacobian_memory is not None:
+            nbytes = sum(other.nbytes for key, other in steps.items() if key != ii)
+            if nbytes + step.nbytes > self.max_jacobian_memory * 1024**3:
+                steps.pop(ii, None)
+                step.clean()
+                return
+        steps[ii] = step
+
     @utils.timeIt
     def Jvec(self, m, v, f=None):
         if f is None:
             f = self.fields(m)
+        if m is not None:
+            self.model = m
 
         JvC = list(range(len(f) - 1))  # Cell to hold each row of the long vector
 
         # This is done via forward substitution.
-        bc = self.getBoundaryConditions(0, f[0])
-        temp, Adiag, B = self.diagsJacobian(m, f[0], f[1], self.time_steps[0], bc)
-        Adiaginv = self.solver(Adiag, **self.solver_opts)
-        JvC[0] = Adiaginv * (B * v)
-
-        for ii in range(1, len(f) - 1):
-            bc = self.getBoundaryConditions(ii, f[ii])
-            Asub, Adiag, B = self.diagsJacobian(
-                m, f[ii], f[ii + 1], self.time_steps[ii], bc
-            )
-            Adiaginv = self.solver(Adiag, **self.solver_opts)
-            JvC[ii] = Adiaginv * (B * v - Asub * JvC[ii - 1])
+        for ii in range(len(f) - 1):
+            step = self._jacobian_step(m, f, ii)
+            rhs = step.B * v
+            if ii > 0:
+                rhs = rhs - step.Asub * JvC[ii - 1]
+            JvC[ii] = step.Adiaginv * rhs
+            self._store_jacobian_step(ii, step)
 
         du_dm_v = np.concatenate([np.zeros(self.mesh.nC)] + JvC)
         Jv = self.survey.deriv(self, f, du_dm_v=du_dm_v, v=v)
@@ -419,7 +533,9 @@ class SimulationNDCellCentered(BaseTimeSimulation, BasePDESimulation):
     @utils.timeIt
     def Jtvec(self, m, v, f=None):
         if f is None:
-            f = self.field(m)
+            f = self.fields(m)
+        if m is not None:
+            self.model = m
 
         PTv, PTdv = self.survey.derivAdjoint(self, f, v=v)
 
@@ -427,18 +543,80 @@ class SimulationNDCellCentered(BaseTimeSimulation, BasePDESimulation):
         minus = 0
         BJtv = 0
         for ii in range(len(f) - 1, 0, -1):
-            bc = self.getBoundaryConditions(ii - 1, f[ii - 1])
-            Asub, Adiag, B = self.diagsJacobian(
-                m, f[ii - 1], f[ii], self.time_steps[ii - 1], bc
-            )
+            step = self._jacobian_step(m, f, ii - 1)
             # select the correct part of v
-            vpart = list(range((ii) * Adiag.shape[0], (ii + 1) * Adiag.shape[0]))
-            AdiaginvT = self.solver(Adiag.T, **self.solver_opts)
-            JTvC = AdiaginvT * (PTv[vpart] - minus)
-            minus = Asub.T * JTvC  # this is now the super diagonal.
-            BJtv = BJtv + B.T * JTvC
+            n = step.Adiag.shape[0]
+            JTvC = step.AdiaginvT * (PTv[ii * n : (ii + 1) * n] - minus)
+            minus = step.Asub.T * JTvC  # this is now the super diagonal.
+            BJtv = BJtv + step.B.T * JTvC
+            self._store_jacobian_step(ii - 1, step)
 
         return BJtv + PTdv
 
 
+class _JacobianStep:
+    """Jacobian blocks of a time step of a Richards simulation.
+
+    The solvers for the diagonal block and its transpose are created the first
+    time they are needed.
+
+    Parameters
+    ----------
+    Asub, Adiag, B : scipy.sparse.spmatrix
+        Blocks returned by :meth:`SimulationNDCellCentered.diagsJacobian`.
+    solver : type
+        Solver class.
+    solver_opts : dict
+        Options of the solver.
+    """
+
+    def __init__(self, Asub, Adiag, B, solver, solver_opts):
+        self.Asub = Asub
+        self.Adiag = Adiag
+        self.B = B
+        self._solver = solver
+        self._solver_opts = solver_opts
+        self._Adiaginv = None
+        self._AdiaginvT = None
+
+    @property
+    def Adiaginv(self):
+        """Solver for the diagonal block."""
+        if self._Adiaginv is None:
+            self._Adiaginv = self._solver(self.Adiag, **self._solver_opts)
+        return self._Adiaginv
+
+    @property
+    def AdiaginvT(self):
+        """Solver for the transpose of the diagonal block."""
+        if self._AdiaginvT is None:
+            self._AdiaginvT = self._solver(self.Adiag.T, **self._solver_opts)
+        return self._AdiaginvT
+
+    def clean(self):
+        """Clean the solvers, they are created again if they are needed."""
+        for name in ["_Adiaginv", "_AdiaginvT"]:
+            Ainv = getattr(self, name)
+            if Ainv is not None:
+                Ainv.clean()
+                setattr(self, name, None)
+
+    @property
+    def nbytes(self):
+        """Approximate memory used by the blocks and the solvers in bytes."""
+        nbytes = 0
+        for mat in [self.Asub, self.Adiag, self.B]:
+            if not sp.issparse(mat):
+                nbytes += np.asarray(mat).nbytes
+                continue
+            for name in ["data", "indices", "indptr"]:
+                arr = getattr(mat, name, None)
+                if arr is not None:
+                    nbytes += arr.nbytes
+        for Ainv in [self._Adiaginv, self._AdiaginvT]:
+            if Ainv is not None:
+                nbytes += _solver_nbytes(Ainv)
+        return nbytes
+
+
 SimulationNDCellCentred = SimulationNDCellCentered
@@ -21,6 +21,7 @@ from ..utils import (
     validate_float,
 )
 from ..typing import RandomSeed
+from ._operators import ChainedDerivative
 
 
 class IdentityMap:
@@ -377,6 +378,10 @@ class ComboMap(IdentityMap):
     maps : list of simpeg.maps.IdentityMap
         A ``list`` of SimPEG mapping objects. The ordering of the mapping
         objects in the ``list`` is from last applied to first applied!
+    lazy_deriv : bool, optional
+        Whether the derivative is returned as a lazy linear operator instead
+        of the product of the sparse derivatives of the mappings. See
+        :py:attr:`~ComboMap.lazy_deriv`.
 
     Examples
     --------
@@ -412,8 +417,9 @@ class ComboMap(IdentityMap):
 
     """
 
-    def __init__(self, maps, **kwargs):
+    def __init__(self, maps, lazy_deriv=False, **kwargs):
         super().__init__(mesh=None, **kwargs)
+        self.lazy_deriv = lazy_deriv
 
         self.maps = []
         for ii, m in enumerate(maps):
@@ -473,6 +479,28 @@ class ComboMap(IdentityMap):
         """
         return self.maps[-1].nP
 
+    @property
+    def lazy_deriv(self):
+        """Whether the derivative is a lazy linear operator.
+
+        If ``True``, the derivatives of the mappings are composed as a
+        :class:`scipy.sparse.linalg.LinearOperator` instead of being multiplied
+        together as sparse matrices. Diagonal derivatives (e.g. of
+        :class:`ExpMap`) and selections (e.g. of :class:`Projection` or
+        :class:`InjectActiveCells`) are fused into a single scaling and
+        indexing of the vectors. Derivatives that aren't sparse matrices fall
+        back to the product of the derivatives.
+
+        Returns
+        -------
+        bool
+        """
+        return self._lazy_deriv
+
+    @lazy_deriv.setter
+    def lazy_deriv(self, value):
+        self._lazy_deriv = validate_type("lazy_deriv", value, bool)
+
     def _transform(self, m):
         for map_i in reversed(self.maps):
             m = map_i * m
@@ -520,7 +548,14 @@ class ComboMap(IdentityMap):
             \cdots
             \frac{\partial \mathbf{f_2}}{\partial \mathbf{f_{1}}}
             \frac{\partial \mathbf{f_1}}{\partial \mathbf{m}}
+
+        If :py:attr:`~ComboMap.lazy_deriv` is ``True``, the derivative is
+        returned as a :class:`scipy.sparse.linalg.LinearOperator`.
         """
+        if self.lazy_deriv:
+            deriv = self._get_lazy_deriv(m)
+            if deriv is not None:
+                return deriv if v is None else deriv @ v
 
         if v is not None:
             deriv = v
@@ -533,6 +568,18 @@ class ComboMap(IdentityMap):
             mi = map_i * mi
         return deriv
 
+    def _get_lazy_deriv(self, m):
+        """Lazy derivative, or ``None`` if a derivative isn't a sparse matrix."""
+        derivs = []
+        mi = m
+        for map_i in reversed(self.maps):
+            derivs.append(map_i.deriv(mi))
+            mi = map_i * mi
+        try:
+            return ChainedDerivative(derivs)
+        except TypeError:
+            return None
+
     def __str__(self):
         return "ComboMap[{0!s}]({1!s},{2!s})".format(
             " * ".join([m.__str__() for m in self.maps]), self.shape[0], self.shape[1]
@@ -0,0 +1,207 @@
+"""
+Lazy linear operators for the derivatives of chains of mappings.
+
+The derivative of a :class:`~simpeg.maps.ComboMap` is the product of the
+derivatives of its mappings. Instead of multiplying these sparse matrices
+together, each derivative is classified as a diagonal scaling, a selection
+(at most one entry per row, like projections and injections of active cells)
+or a general sparse matrix. Consecutive diagonal and selection factors are
+fused into a single factor applied to vectors with a few array operations,
+and only the general sparse factors are multiplied as sparse matrices.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import LinearOperator
+from discretize.utils import Identity
+
+
+class _Diagonal:
+    """Scaling of the entries of vectors."""
+
+    def __init__(self, diagonal):
+        self.diagonal = np.asarray(diagonal)
+        self.shape = (self.diagonal.size, self.diagonal.size)
+        self.dtype = self.diagonal.dtype
+
+    def apply(self, x):
+        d = self.diagonal if x.ndim == 1 else self.diagonal[:, None]
+        return d * x
+
+    def apply_adjoint(self, x):
+        d = self.diagonal.conj()
+        return (d if x.ndim == 1 else d[:, None]) * x
+
+    def tosparse(self):
+        return sp.diags(self.diagonal, format="csr")
+
+
+class _Selection:
+    """Scaled selection of the entries of vectors, with at most one per row."""
+
+    def __init__(self, rows, cols, values, shape):
+        self.rows = rows
+        self.cols = cols
+        self.values = values
+        self.shape = shape
+        self.dtype = values.dtype
+        self._all_rows = rows.size == shape[0]
+        self._unique_cols = np.unique(cols).size == cols.size
+
+    def apply(self, x):
+        values = self.values if x.ndim == 1 else self.values[:, None]
+        if self._all_rows:
+            return values * x[self.cols]
+        out = np.zeros(
+            (self.shape[0],) + x.shape[1:], dtype=np.result_type(self.dtype, x)
+        )
+        out[self.rows] = values * x[self.cols]
+        return out
+
+    def apply_adjoint(self, x):
+        values = self.values.conj()
+        if x.ndim > 1:
+            values = values[:, None]
+        out = np.zeros(
+            (self.shape[1],) + x.shape[1:], dtype=np.result_type(self.dtype, x)
+        )
+        if self._unique_cols:
+            out[self.cols] = values * x[self.rows]
+        else:
+            np.add.at(out, self.cols, values * x[self.rows])
+        return out
+
+    def tosparse(self):
+        return sp.csr_matrix((self.values, (self.rows, self.cols)), shape=self.shape)
+
+
+class _Sparse:
+    """General sparse matrix."""
+
+    def __init__(self, matrix):
+        self.matrix = matrix
+        self.shape = matrix.shape
+        self.dtype = matrix.dtype
+
+    def apply(self, x):
+        return self.matrix @ x
+
+    def apply_adjoint(self, x):
+        return self.matrix.T.conj() @ x
+
+    def tosparse(self):
+        return self.matrix
+
+
+def _as_factor(deriv):
+    """Classify the derivative of a mapping.
+
+    Returns ``None`` for identities, which are skipped, and raises a
+    ``TypeError`` for derivatives that aren't sparse matrices.
+    """
+    if isinstance(deriv, Identity) and deriv * 1 == 1:
+        return None
+    if not sp.issparse(deriv):
+        raise TypeError(f"Unsupported derivative of type {type(deriv).__name__}.")
+    n_rows, n_cols = deriv.shape
+    if (
+        isinstance(deriv, sp.dia_matrix)
+        and n_rows == n_cols
+        and np.array_equal(deriv.offsets, [0])
+    ):
+        return _Diagonal(deriv.diagonal())
+    deriv = deriv.tocsr()
+    deriv.sum_duplicates()
+    counts = np.diff(deriv.indptr)
+    if counts.max(initial=0) > 1:
+        return _Sparse(deriv)
+    rows = np.flatnonzero(counts)
+    if n_rows == n_cols and rows.size == n_rows and np.array_equal(deriv.indices, rows):
+        return _Diagonal(deriv.data)
+    return _Selection(rows, deriv.indices, deriv.data, deriv.shape)
+
+
+def _fuse(second, first):
+    """Single factor equivalent to applying ``first`` and then ``second``."""
+    if isinstance(first, _Sparse) or isinstance(second, _Sparse):
+        return _Sparse((second.tosparse() @ first.tosparse()).tocsr())
+    if isinstance(first, _Diagonal):
+        if isinstance(second, _Diagonal):
+            return _Diagonal(second.diagonal * first.diagonal)
+        values = second.values * first.diagonal[second.cols]
+        return _Selection(second.rows, second.cols, values, second.shape)
+    if isinstance(second, _Diagonal):
+        values = second.diagonal[first.rows] * first.values
+        return _Selection(first.rows, first.cols, values, first.shape)
+    # position of the entry of each row of the first selection
+    position = np.full(first.shape[0], -1)
+    position[first.rows] = np.arange(first.rows.size)
+    index = position[second.cols]
+    keep = index >= 0
+    index = index[keep]
+    return _Selection(
+        second.rows[keep],
+        first.cols[index],
+        second.values[keep] * first.values[index],
+        (second.shape[0], first.shape[1]),
+    )
+
+
+class ChainedDerivative(LinearOperator):
+    """Lazy product of the derivatives of a chain of mappings.
+
+    Parameters
+    ----------
+    derivs : list
+        Derivatives of the mappings, from the first applied to the last
+        applied. Each is a sparse matrix or :class:`discretize.utils.Identity`.
+    """
+
+    def __init__(self, derivs):
+        factor = None
+        for deriv in derivs:
+            new = _as_factor(deriv)
+            if new is None:
+                continue
+            factor = new if factor is None else _fuse(new, factor)
+        if factor is None:
+            raise TypeError("The chain of derivatives is an identity.")
+        self._factor = factor
+        self._matrix = None
+        super().__init__(factor.dtype, factor.shape)
+
+    def _matvec(self, x):
+        return self._factor.apply(x)
+
+    def _rmatvec(self, x):
+        return self._factor.apply_adjoint(x)
+
+    def _matmat(self, X):
+        if sp.issparse(X):
+            return self.tosparse() @ X
+        return self._factor.apply(X)
+
+    def _rmatmat(self, X):
+        if sp.issparse(X):
+            return self.tosparse().T.conj() @ X
+        return self._factor.apply_adjoint(X)
+
+    def tosparse(self):
+        """Derivative as a sparse matrix.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+        """
+        if self._matrix is None:
+            self._matrix = sp.csr_matrix(self._factor.tosparse())
+        return self._matrix
+
+    def toarray(self):
+        """Derivative as a dense array.
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        return self.tosparse().toarray()
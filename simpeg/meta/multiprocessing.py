@@ -1,10 +1,46 @@
-from multiprocessing import Process, Queue, cpu_count
+from multiprocessing import Process, Queue, cpu_count, resource_tracker
+from multiprocessing.shared_memory import SharedMemory
 from simpeg.meta import MetaSimulation, SumMetaSimulation, RepeatedSimulation
 from simpeg.props import HasModel
+from simpeg.utils import validate_type
 import uuid
 import numpy as np
 
 
+class _SharedArray:
+    """A float64 array stored in a shared memory block.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        Shape of the array.
+    name : str, optional
+        Name of an existing shared memory block to attach to. If ``None``,
+        a new block is created.
+    """
+
+    def __init__(self, shape, name=None):
+        size = max(int(np.prod(shape)) * np.dtype(np.float64).itemsize, 1)
+        self.shm = SharedMemory(name=name, create=name is None, size=size)
+        self.array = np.ndarray(shape, dtype=np.float64, buffer=self.shm.buf)
+
+    @property
+    def spec(self):
+        """Name and shape needed to attach to the array from another process."""
+        return self.shm.name, self.array.shape
+
+    def close(self):
+        """Close the access to the shared memory block from this process."""
+        # the buffer can only be released once no array refers to it
+        del self.array
+        self.shm.close()
+
+    def unlink(self):
+        """Close and destroy the shared memory block."""
+        self.close()
+        self.shm.unlink()
+
+
 class SimpleFuture:
     """Represents an object stored on a seperate simulation process."""
 
@@ -46,6 +82,9 @@ class _SimulationProcess(Process):
         # everything here is local to the process
         # a place to cache items locally
         _cached_items = {}
+        # shared memory buffers, and the parts of them used by this process
+        _buffers = {}
+        data_in = data_out = row = None
 
         # The queues are shared between the head process and the worker processes
         # We use them to communicate between the two.
@@ -56,6 +95,8 @@ class _SimulationProcess(Process):
             task = t_queue.get()
             if task is None:
                 # None is a poison pill message to kill this loop.
+                for buffer in _buffers.values():
+                    buffer.close()
                 break
             op, args = task
             try:
@@ -70,6 +111,35 @@ class _SimulationProcess(Process):
                 elif op == "del_item":
                     (key,) = args
                     _cached_items.pop(key, None)
+                elif op == "attach_buffers":
+                    specs, data_in, data_out, row = args
+                    for buffer in _buffers.values():
+                        buffer.close()
+                    _buffers = {
+                        key: _SharedArray(shape, name=name)
+                        for key, (name, shape) in specs.items()
+                    }
+                elif op == "shared":
+                    # operations whose arrays are passed in shared memory,
+                    # the inputs are copied as the simulations could keep them
+                    name, sim_key, f_key = args
+                    sim = _cached_items[sim_key]
+                    if name == "store_model":
+                        sim.model = _buffers["model"].array.copy()
+                        continue
+                    fields = _cached_items[f_key]
+                    if name == "dpred":
+                        out = _buffers["data_out"].array
+                        out[data_out] = sim.dpred(sim.model, fields)
+                    elif name == "jvec":
+                        v = _buffers["model_in"].array.copy()
+                        out = _buffers["data_out"].array
+                        out[data_out] = sim.Jvec(sim.model, v, fields)
+                    elif name == "jtvec":
+                        v = _buffers["data_in"].array[data_in].copy()
+                        out = _buffers["model_out"].array
+                        out[row] = sim.Jtvec(sim.model, v, fields)
+                    r_queue.put(None)
                 elif op == 0:
                     # store_model
                     sim_key, m = args
@@ -164,6 +234,38 @@ class _SimulationProcess(Process):
             )
         )
 
+    def attach_buffers(self, specs, data_in, data_out, row):
+        """Attach the process to the shared memory buffers.
+
+        Parameters
+        ----------
+        specs : dict
+            Name and shape of each shared buffer.
+        data_in : slice
+            Part of the input data buffer read by this process.
+        data_out : slice
+            Part of the output data buffer written by this process.
+        row : int
+            Row of the output model buffer written by this process.
+        """
+        self._check_closed()
+        self.task_queue.put(("attach_buffers", (specs, data_in, data_out, row)))
+
+    def start_shared(self, op, f_future=None):
+        """Start an operation reading and writing the shared buffers.
+
+        Parameters
+        ----------
+        op : {"store_model", "dpred", "jvec", "jtvec"}
+            The operation.
+        f_future : SimpleFuture, optional
+            The fields to use, not needed to store the model.
+        """
+        self._check_closed()
+        sim = self._my_sim
+        f_key = None if f_future is None else f_future.item_id
+        self.task_queue.put(("shared", (op, sim.item_id, f_key)))
+
     def result(self):
         self._check_closed()
         return self.result_queue.get()
@@ -220,13 +322,19 @@ class MultiprocessingMetaSimulation(MetaSimulation):
         The number of processes to spawn internally. This will default
         to `multiprocessing.cpu_count()`. The number of processes spawned
         will be the minimum of this number and the number of simulations.
+    shared_memory : bool, optional
+        Whether to pass the models, the vectors of the sensitivity products
+        and the predicted data to and from the processes in shared memory
+        buffers, instead of pickling them through the queues.
 
     >>> import multiprocessing as mp
     >>> mp.set_start_method("spawn")
     """
 
-    def __init__(self, simulations, mappings, n_processes=None):
+    def __init__(self, simulations, mappings, n_processes=None, shared_memory=False):
         super().__init__(simulations, mappings)
+        self.shared_memory = validate_type("shared_memory", shared_memory, bool)
+        self._buffers = None
 
         if n_processes is None:
             n_processes = cpu_count()
@@ -241,6 +349,10 @@ class MultiprocessingMetaSimulation(MetaSimulation):
         i_start = 0
         chunk_nd = []
         processes = []
+        if self.shared_memory:
+            # share the tracker of the shared memory blocks with the processes,
+            # so only this process destroys them
+            resource_tracker.ensure_running()
         for chunk in chunk_sizes:
             if chunk == 0:
                 continue
@@ -263,8 +375,58 @@ class MultiprocessingMetaSimulation(MetaSimulation):
         updated = HasModel.model.fset(self, value)
         # Only send the model to the internal simulations if it was updated.
         if updated:
-            for p in self._sim_processes:
-                p.store_model(self._model)
+            if self.shared_memory:
+                buffers = self._shared_buffers(self._model.size)
+                buffers["model"].array[:] = self._model
+                for p in self._sim_processes:
+                    p.start_shared("store_model")
+            else:
+                for p in self._sim_processes:
+                    p.store_model(self._model)
+
+    def _data_in_slice(self, i):
+        """Part of the data vectors read by the i-th process."""
+        return slice(self._data_offsets[i], self._data_offsets[i + 1])
+
+    def _shared_buffers(self, n_model):
+        """Shared memory buffers for models of size `n_model`.
+
+        The buffers are created, and the processes attached to them, the first
+        time they are needed or when the size of the model changes.
+        """
+        buffers = self._buffers
+        if buffers is not None and buffers["model"].array.size == n_model:
+            return buffers
+        self._release_buffers()
+        n_processes = len(self._sim_processes)
+        buffers = {
+            "model": _SharedArray((n_model,)),
+            "model_in": _SharedArray((n_model,)),
+            "data_in": _SharedArray((self.survey.nD,)),
+            "data_out": _SharedArray((self._data_offsets[-1],)),
+            "model_out": _SharedArray((n_processes, n_model)),
+        }
+        specs = {key: buffer.spec for key, buffer in buffers.items()}
+        for i, p in enumerate(self._sim_processes):
+            data_out = slice(self._data_offsets[i], self._data_offsets[i + 1])
+            p.attach_buffers(specs, self._data_in_slice(i), data_out, i)
+        self._buffers = buffers
+        return buffers
+
+    def _release_buffers(self):
+        if self._buffers is not None:
+            for buffer in self._buffers.values():
+                buffer.unlink()
+            self._buffers = None
+
+    def _run_shared(self, op, f):
+        """Run an operation on every process and wait for all of them."""
+        for p, field in zip(self._sim_processes, f):
+            p.start_shared(op, field)
+        errors = [p.result() for p in self._sim_processes]
+        for err in errors:
+            if isinstance(err, Exception):
+                raise err
 
     def fields(self, m):
         """Create fields for every simulation.
@@ -293,6 +455,9 @@ class MultiprocessingMetaSimulation(MetaSimulation):
             if m is None:
                 m = self.model
             f = self.fields(m)
+        if self.shared_memory:
+            self._run_shared("dpred", f)
+            return self._buffers["data_out"].array.copy()
         for p, field in zip(self._sim_processes, f):
             p.start_dpred(field)
 
@@ -305,6 +470,10 @@ class MultiprocessingMetaSimulation(MetaSimulation):
         self.model = m
         if f is None:
             f = self.fields(m)
+        if self.shared_memory:
+            self._buffers["model_in"].array[:] = v
+            self._run_shared("jvec", f)
+            return self._buffers["data_out"].array.copy()
         for p, field in zip(self._sim_processes, f):
             p.start_j_vec(v, field)
         j_vec = []
@@ -316,6 +485,10 @@ class MultiprocessingMetaSimulation(MetaSimulation):
         self.model = m
         if f is None:
             f = self.fields(m)
+        if self.shared_memory:
+            self._buffers["data_in"].array[:] = v
+            self._run_shared("jtvec", f)
+            return self._buffers["model_out"].array.sum(axis=0)
         for i, (p, field) in enumerate(zip(self._sim_processes, f)):
             chunk_v = v[self._data_offsets[i] : self._data_offsets[i + 1]]
             p.start_jt_vec(chunk_v, field)
@@ -347,6 +520,7 @@ class MultiprocessingMetaSimulation(MetaSimulation):
         for p in self._sim_processes:
             if p.is_alive():
                 p.join(timeout=timeout)
+        self._release_buffers()
 
 
 class MultiprocessingSumMetaSimulation(
@@ -370,13 +544,29 @@ class MultiprocessingSumMetaSimulation(
         The number of processes to spawn internally. This will default
         to `multiprocessing.cpu_count()`. The number of processes spawned
         will be the minimum of this number and the number of simulations.
+    shared_memory : bool, optional
+        Whether to pass the models, the vectors of the sensitivity products
+        and the predicted data to and from the processes in shared memory
+        buffers, instead of pickling them through the queues.
     """
 
+    def _data_in_slice(self, i):
+        # every simulation sees the full data vector
+        return slice(0, self.survey.nD)
+
+    def _sum_data_out(self):
+        """Sum the data written by every process."""
+        data_out = self._buffers["data_out"].array
+        return data_out.reshape(len(self._sim_processes), -1).sum(axis=0)
+
     def dpred(self, m=None, f=None):
         if f is None:
             if m is None:
                 m = self.model
             f = self.fields(m)
+        if self.shared_memory:
+            self._run_shared("dpred", f)
+            return self._sum_data_out()
         for p, field in zip(self._sim_processes, f):
             p.start_dpred(field)
 
@@ -389,6 +579,10 @@ class MultiprocessingSumMetaSimulation(
         self.model = m
         if f is None:
             f = self.fields(m)
+        if self.shared_memory:
+            self._buffers["model_in"].array[:] = v
+            self._run_shared("jvec", f)
+            return self._sum_data_out()
         for p, field in zip(self._sim_processes, f):
             p.start_j_vec(v, field)
         j_vec = []
@@ -400,6 +594,10 @@ class MultiprocessingSumMetaSimulation(
         self.model = m
         if f is None:
             f = self.fields(m)
+        if self.shared_memory:
+            self._buffers["data_in"].array[:] = v
+            self._run_shared("jtvec", f)
+            return self._buffers["model_out"].array.sum(axis=0)
         for p, field in zip(self._sim_processes, f):
             p.start_jt_vec(v, field)
 
@@ -444,11 +642,17 @@ class MultiprocessingRepeatedSimulation(
         The number of processes to spawn internally. This will default
         to `multiprocessing.cpu_count()`. The number of processes spawned
         will be the minimum of this number and the number of simulations.
+    shared_memory : bool, optional
+        Whether to pass the models, the vectors of the sensitivity products
+        and the predicted data to and from the processes in shared memory
+        buffers, instead of pickling them through the queues.
     """
 
-    def __init__(self, simulation, mappings, n_processes=None):
+    def __init__(self, simulation, mappings, n_processes=None, shared_memory=False):
         # do this to call the initializer of the Repeated Sim
         super(MultiprocessingMetaSimulation, self).__init__(simulation, mappings)
+        self.shared_memory = validate_type("shared_memory", shared_memory, bool)
+        self._buffers = None
 
         if n_processes is None:
             n_processes = cpu_count()
@@ -460,6 +664,10 @@ class MultiprocessingRepeatedSimulation(
             chunk_sizes[i] += 1
 
         processes = []
+        if self.shared_memory:
+            # share the tracker of the shared memory blocks with the processes,
+            # so only this process destroys them
+            resource_tracker.ensure_running()
         i_start = 0
         chunk_nd = []
         for chunk in chunk_sizes:
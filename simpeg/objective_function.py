@@ -193,6 +193,28 @@ class BaseObjectiveFunction(BaseSimPEG):
             )
         )
 
+    def deriv2_diagonal(self, m):
+        r"""Diagonal of the Hessian of the objective function for the model provided.
+
+        The diagonal is taken from the Hessian returned by :meth:`deriv2`.
+        Subclasses override this method to compute the diagonal without
+        forming the Hessian.
+
+        Parameters
+        ----------
+        m : (n_param, ) numpy.ndarray
+            The model for which the diagonal of the Hessian is evaluated.
+
+        Returns
+        -------
+        (n_param, ) numpy.ndarray or discretize.utils.Zero
+            Diagonal of the Hessian of the objective function.
+        """
+        H = self.deriv2(m)
+        if isinstance(H, Zero):
+            return H
+        return H.diagonal()
+
     def _test_deriv(
         self,
         x=None,
@@ -494,6 +516,15 @@ class ComboObjectiveFunction(BaseObjectiveFunction):
             H = H + multiplier * objfct_H
         return H
 
+    def deriv2_diagonal(self, m):
+        # Docstring inherited from BaseObjectiveFunction
+        diagonal = Zero()
+        for multiplier, objfct in self:
+            if multiplier == 0.0:  # don't evaluate the fct
+                continue
+            diagonal = diagonal + multiplier * objfct.deriv2_diagonal(m)
+        return diagonal
+
     # This assumes all objective functions have a W.
     # The base class currently does not.
     @property
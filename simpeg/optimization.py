@@ -821,7 +821,7 @@ class ProjectedGradient(Minimize, Remember):
         Make sure we are feasible.
 
         """
-        return np.median(np.c_[self.lower, x, self.upper], axis=1)
+        return np.clip(x, self.lower, self.upper)
 
     @count
     def activeSet(self, x):
@@ -862,7 +862,7 @@ class ProjectedGradient(Minimize, Remember):
         Finds the search direction based on either CG or steepest descent.
         """
         self.aSet_prev = self.activeSet(self.xc)
-        allBoundsAreActive = sum(self.aSet_prev) == self.xc.size
+        allBoundsAreActive = np.all(self.aSet_prev)
 
         if self.debug:
             print("findSearchDirection: stopDoingPG: ", self.stopDoingPG)
@@ -891,28 +891,27 @@ class ProjectedGradient(Minimize, Remember):
             self._itType = ".CG."
 
             iSet = self.inactiveSet(self.xc)  # The inactive set (free variables)
-            shape = (self.xc.size, np.sum(iSet))
-            v = np.ones(shape[1])
-            i = np.where(iSet)[0]
-            j = np.arange(shape[1])
+            n_free = np.count_nonzero(iSet)
             if self.debug:
-                print("findSearchDirection.CG: Z.shape", shape)
-            Z = sp.csr_matrix((v, (i, j)), shape=shape)
+                print("findSearchDirection.CG: Z.shape", (self.xc.size, n_free))
+            # full size vector, zero on the active set
+            v_full = np.zeros(self.xc.size)
 
             def reduceHess(v):
-                # Z is tall and skinny
-                return Z.T * (self.H * (Z * v))
+                v_full[iSet] = v.ravel()
+                return (self.H * v_full)[iSet]
 
             operator = sp.linalg.LinearOperator(
-                (shape[1], shape[1]), reduceHess, dtype=self.xc.dtype
+                (n_free, n_free), reduceHess, dtype=self.xc.dtype
             )
 
             # Choose `rtol` or `tol` argument based on installed scipy version
             tol_key = "rtol" if SCIPY_1_12 else "tol"
 
             inp = {tol_key: self.tolCG, "maxiter": self.maxIterCG}
-            p, info = sp.linalg.cg(operator, -Z.T * self.g, **inp)
-            p = Z * p  # bring up to full size
+            p_free, info = sp.linalg.cg(operator, -self.g[iSet], **inp)
+            p = np.zeros(self.xc.size)  # bring up to full size
+            p[iSet] = p_free
             # aSet_after = self.activeSet(self.xc+p)
         return p
 
@@ -1224,7 +1223,7 @@ class ProjectedGNCG(BFGS, Minimize, Remember):
         Make sure we are feasible.
 
         """
-        return np.median(np.c_[self.lower, x, self.upper], axis=1)
+        return np.clip(x, self.lower, self.upper)
 
     @count
     def activeSet(self, x):
@@ -1256,58 +1255,81 @@ class ProjectedGNCG(BFGS, Minimize, Remember):
     def approxHinv(self, value):
         self._approxHinv = value
 
+    def _cg_work_vectors(self):
+        """Work vectors of the projected CG, reused between iterations."""
+        work = getattr(self, "_cg_work", None)
+        if work is None or work[0].size != self.xc.size:
+            work = (np.empty(self.xc.size), np.empty(self.xc.size))
+            self._cg_work = work
+        return work
+
     @timeIt
     def findSearchDirection(self):
         """
         findSearchDirection()
         Finds the search direction based on projected CG
+
+        The CG iterations only update the free variables, the masking and
+        vector updates are done in place in preallocated work vectors.
         """
         self.cg_count = 0
         Active = self.activeSet(self.xc)
-        temp = sum((np.ones_like(self.xc.size) - Active))
+        inactive = ~Active
+        r, work = self._cg_work_vectors()
 
         step = np.zeros(self.g.size)
-        resid = -(1 - Active) * self.g
-
-        r = resid - (1 - Active) * (self.H * step)
+        # residual of the free variables for the initial step of zero
+        np.negative(self.g, out=r)
+        r *= inactive
 
         p = self.approxHinv * r
+        if np.may_share_memory(p, r):
+            p = p.copy()
 
         sold = np.dot(r, p)
 
         count = 0
 
-        while np.all([np.linalg.norm(r) > self.tolCG, count < self.maxIterCG]):
+        while np.linalg.norm(r) > self.tolCG and count < self.maxIterCG:
             count += 1
 
-            q = (1 - Active) * (self.H * p)
+            q = self.H * p
+            if np.may_share_memory(q, p):
+                q = q.copy()
+            q *= inactive
 
             alpha = sold / (np.dot(p, q))
 
-            step += alpha * p
+            np.multiply(p, alpha, out=work)
+            step += work
 
-            r -= alpha * q
+            np.multiply(q, alpha, out=work)
+            r -= work
 
             h = self.approxHinv * r
 
             snew = np.dot(r, h)
 
-            p = h + (snew / sold * p)
+            p *= snew / sold
+            p += h
 
             sold = snew
             # End CG Iterations
         self.cg_count += count
 
         # Take a gradient step on the active cells if exist
-        if temp != self.xc.size:
-            rhs_a = (Active) * -self.g
+        if np.any(Active):
+            rhs_a = work
+            np.negative(self.g, out=rhs_a)
+            rhs_a *= Active
 
-            dm_i = max(abs(step))
-            dm_a = max(abs(rhs_a))
+            dm_i = np.max(np.abs(step))
+            dm_a = np.max(np.abs(rhs_a))
 
             # perturb inactive set off of bounds so that they are included
             # in the step
-            step = step + self.stepOffBoundsFact * (rhs_a * dm_i / dm_a)
+            rhs_a *= self.stepOffBoundsFact * dm_i / dm_a
+            step += rhs_a
 
         # Only keep gradients going in the right direction on the active
         # set
@@ -0,0 +1,320 @@
+"""
+Compressed storage of the sensitivity matrix of integral potential field
+simulations.
+
+The sensitivity matrix is split in tiles: blocks of contiguous rows (data)
+times clusters of spatially close active cells. Each tile is evaluated on its
+own and replaced by a low-rank factorization, up to a relative tolerance,
+whenever that takes less memory than the dense tile. Tiles of receivers and
+cells that are far apart from each other are smooth functions of the
+positions, so they are compressed to very low ranks.
+"""
+
+import numpy as np
+from scipy.sparse.linalg import LinearOperator
+
+
+def cluster_points(points, max_size, max_extent=None):
+    """
+    Group points in spatially compact clusters by recursive bisection.
+
+    Parameters
+    ----------
+    points : (n_points, dim) numpy.ndarray
+        Coordinates of the points.
+    max_size : int
+        Maximum number of points in each cluster.
+    max_extent : float, optional
+        Maximum extent of the points of each cluster along any direction.
+
+    Returns
+    -------
+    list of numpy.ndarray
+        Sorted indices of the points in each cluster.
+    """
+    clusters = []
+    stack = [np.arange(points.shape[0])]
+    while stack:
+        indices = stack.pop()
+        coords = points[indices]
+        extent = coords.max(axis=0) - coords.min(axis=0)
+        if indices.size <= max_size and (
+            max_extent is None or extent.max() <= max_extent or indices.size == 1
+        ):
+            clusters.append(np.sort(indices))
+            continue
+        # split at the median along the direction of largest extent
+        axis = np.argmax(extent)
+        half = indices.size // 2
+        order = np.argpartition(coords[:, axis], half)
+        stack.append(indices[order[half:]])
+        stack.append(indices[order[:half]])
+    return clusters
+
+
+def low_rank_factors(block, tolerance, rng, initial_rank=8, oversampling=4):
+    """
+    Compute a low-rank factorization of a dense block.
+
+    The range of the block is found with a randomized range finder whose rank
+    is doubled until the block is approximated up to the tolerance, and the
+    factors are then truncated with the singular values of the projection.
+
+    Parameters
+    ----------
+    block : (n_rows, n_columns) numpy.ndarray
+        Block to factorize.
+    tolerance : float
+        Maximum error of the factorization, relative to the Frobenius norm of
+        the block.
+    rng : numpy.random.Generator
+        Random number generator for the range finder.
+    initial_rank : int, optional
+        Rank of the first range estimation.
+    oversampling : int, optional
+        Number of extra random vectors used by the range finder.
+
+    Returns
+    -------
+    left : (n_rows, rank) numpy.ndarray or None
+    right : (rank, n_columns) numpy.ndarray or None
+        Factors such that ``left @ right`` approximates the block. Both are
+        None if storing the factors takes more memory than the dense block.
+    """
+    n_rows, n_columns = block.shape
+    max_rank = (n_rows * n_columns) // (n_rows + n_columns)
+    block = block.astype(np.float64, copy=False)
+    norm_squared = np.sum(block**2)
+    if norm_squared == 0.0:
+        return np.zeros((n_rows, 0)), np.zeros((0, n_columns))
+    max_error_squared = tolerance**2 * norm_squared
+
+    rank = min(initial_rank, max_rank)
+    while True:
+        n_samples = min(rank + oversampling, n_rows, n_columns)
+        sketch = block @ rng.standard_normal((n_columns, n_samples))
+        basis, _ = np.linalg.qr(sketch)
+        projection = basis.T @ block
+        # error of the projection onto the estimated range
+        residual_squared = max(norm_squared - np.sum(projection**2), 0.0)
+        if residual_squared <= max_error_squared:
+            break
+        if rank >= max_rank:
+            return None, None
+        rank = min(2 * rank, max_rank)
+
+    u, s, vt = np.linalg.svd(projection, full_matrices=False)
+    # drop the smallest singular values that keep the error below tolerance
+    tail_squared = np.cumsum((s**2)[::-1])[::-1]
+    allowed = max_error_squared - residual_squared
+    rank = int(np.count_nonzero(tail_squared > allowed))
+    if rank > max_rank:
+        return None, None
+    left = basis @ (u[:, :rank] * s[:rank])
+    return left, vt[:rank]
+
+
+class CompressedSensitivity(LinearOperator):
+    r"""
+    Sensitivity matrix stored as low-rank tiles.
+
+    The matrix is split in blocks of contiguous rows :math:`i` and clusters
+    of columns :math:`j`. Each tile is stored either as a dense block or as a
+    product :math:`\mathbf{U}_{ij} \mathbf{V}_{ij}` of two thin matrices.
+    The right factors of all the tiles of a cluster of columns are stacked,
+    so products with a vector need a single matrix-vector product per
+    cluster of columns and per block of rows.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        Shape of the sensitivity matrix.
+    dtype : numpy.dtype
+        Data type of the stored factors.
+    column_clusters : list of numpy.ndarray
+        Indices of the columns in each cluster.
+    """
+
+    def __init__(self, shape, dtype, column_clusters):
+        super().__init__(dtype=np.dtype(dtype), shape=shape)
+        self._column_clusters = column_clusters
+        self._right_factors = [[] for _ in column_clusters]
+        # number of rows in the stacked right factors of each cluster
+        self._right_rows = [0 for _ in column_clusters]
+        self._has_dense_tiles = np.zeros(len(column_clusters), dtype=bool)
+        self._row_blocks = []
+        self._coefficients = None
+
+    def _append_row_block(self, row_start, tiles):
+        """
+        Add a block of rows to the matrix.
+
+        Parameters
+        ----------
+        row_start : int
+            Index of the first row of the block.
+        tiles : list of tuple
+            ``(left, right)`` factors of the tile of each cluster of columns.
+            ``right`` is None for tiles stored as dense blocks in ``left``.
+        """
+        # (cluster, first column in the left factor, width, first row in the
+        # stacked right factors of the cluster or -1 for dense tiles)
+        layout = []
+        column = 0
+        for j, (left, right) in enumerate(tiles):
+            if right is None:
+                self._has_dense_tiles[j] = True
+                layout.append((j, column, left.shape[1], -1))
+            elif right.shape[0] > 0:
+                row = self._right_rows[j]
+                self._right_factors[j].append(right.astype(self.dtype))
+                self._right_rows[j] += right.shape[0]
+                layout.append((j, column, left.shape[1], row))
+            column += left.shape[1]
+        n_rows = tiles[0][0].shape[0]
+        left = np.hstack([left for left, _ in tiles]).astype(self.dtype, copy=False)
+        self._row_blocks.append(
+            [slice(row_start, row_start + n_rows), left, layout, None]
+        )
+        self._coefficients = None
+
+    def _assemble(self):
+        """Stack the right factors and index the coefficients of each block."""
+        if self._coefficients is not None:
+            return
+        # Coefficients are ordered by cluster of columns: first the products
+        # with the stacked right factors, then the values of the model in the
+        # cluster (used by dense tiles).
+        coefficients = []
+        offset = 0
+        for j, columns in enumerate(self._column_clusters):
+            parts = self._right_factors[j]
+            right = (
+                np.vstack(parts)
+                if len(parts) > 1
+                else (parts[0] if parts else np.zeros((0, columns.size), self.dtype))
+            )
+            self._right_factors[j] = [right]
+            dense_offset = offset + right.shape[0]
+            has_dense_tiles = self._has_dense_tiles[j]
+            coefficients.append((columns, right, offset, dense_offset, has_dense_tiles))
+            offset = dense_offset + (columns.size if has_dense_tiles else 0)
+        self._coefficients = coefficients
+        self._n_coefficients = offset
+        for block in self._row_blocks:
+            _, _, layout, _ = block
+            indices = [
+                (
+                    np.arange(width) + coefficients[j][3]
+                    if row < 0
+                    else np.arange(width) + coefficients[j][2] + row
+                )
+                for j, _, width, row in layout
+            ]
+            block[3] = (
+                np.concatenate(indices) if indices else np.zeros(0, dtype=np.int64)
+            )
+
+    @property
+    def nbytes(self):
+        """
+        Memory used by the compressed matrix, in bytes.
+
+        Returns
+        -------
+        int
+        """
+        self._assemble()
+        return sum(
+            left.nbytes + indices.nbytes for _, left, _, indices in self._row_blocks
+        ) + sum(
+            columns.nbytes + right.nbytes for columns, right, *_ in self._coefficients
+        )
+
+    @property
+    def compression_ratio(self):
+        """
+        Ratio between the memory of the dense and the compressed matrices.
+
+        Returns
+        -------
+        float
+        """
+        dense_nbytes = self.shape[0] * self.shape[1] * self.dtype.itemsize
+        return dense_nbytes / max(self.nbytes, 1)
+
+    def _matmat(self, x):
+        self._assemble()
+        dtype = np.result_type(self.dtype, x.dtype)
+        z = np.empty((self._n_coefficients, x.shape[1]), dtype=dtype)
+        for columns, right, offset, dense_offset, has_dense in self._coefficients:
+            x_cluster = x[columns]
+            z[offset:dense_offset] = right @ x_cluster
+            if has_dense:
+                z[dense_offset : dense_offset + columns.size] = x_cluster
+        out = np.empty((self.shape[0], x.shape[1]), dtype=dtype)
+        for rows, left, _, indices in self._row_blocks:
+            out[rows] = left @ z[indices]
+        return out
+
+    def _matvec(self, x):
+        return self._matmat(np.asarray(x).reshape(-1, 1)).ravel()
+
+    def _rmatmat(self, y):
+        self._assemble()
+        dtype = np.result_type(self.dtype, y.dtype)
+        z = np.zeros((self._n_coefficients, y.shape[1]), dtype=dtype)
+        for rows, left, _, indices in self._row_blocks:
+            # indices are unique within a block of rows
+            z[indices] += left.T @ y[rows]
+        out = np.zeros((self.shape[1], y.shape[1]), dtype=dtype)
+        for columns, right, offset, dense_offset, has_dense in self._coefficients:
+            out[columns] = right.T @ z[offset:dense_offset]
+            if has_dense:
+                out[columns] += z[dense_offset : dense_offset + columns.size]
+        return out
+
+    def _rmatvec(self, y):
+        return self._rmatmat(np.asarray(y).reshape(-1, 1)).ravel()
+
+    def toarray(self):
+        """
+        Decompress the matrix into a dense array.
+
+        Returns
+        -------
+        (n_data, n_columns) numpy.ndarray
+        """
+        return self._matmat(np.eye(self.shape[1], dtype=self.dtype))
+
+    def gtg_diagonal(self, weights=None):
+        r"""
+        Diagonal of :math:`\mathbf{G}^T \mathbf{W} \mathbf{G}`.
+
+        Parameters
+        ----------
+        weights : (n_data,) numpy.ndarray, optional
+            Diagonal of :math:`\mathbf{W}`. If None, unit weights are used.
+
+        Returns
+        -------
+        (n_columns,) numpy.ndarray
+        """
+        self._assemble()
+        if weights is None:
+            weights = np.ones(self.shape[0])
+        diagonal = np.zeros(self.shape[1], dtype=np.float64)
+        for rows, left, layout, _ in self._row_blocks:
+            weighted = left * weights[rows, None]
+            for j, start, width, row in layout:
+                columns, right, *_ = self._coefficients[j]
+                u = left[:, start : start + width]
+                w_u = weighted[:, start : start + width]
+                if row < 0:
+                    # dense tile
+                    diagonal[columns] += np.einsum("ij,ij->j", w_u, u)
+                else:
+                    vt = right[row : row + width]
+                    gram = w_u.T @ u
+                    diagonal[columns] += np.einsum("ij,ik,kj->j", vt, gram, vt)
+        return diagonal
@@ -0,0 +1,145 @@
+r"""
+Footprint-truncated storage of the sensitivity matrix of integral potential
+field simulations.
+
+Only the elements of the sensitivity matrix that couple a receiver with the
+cells within a given distance of it (its footprint) are computed exactly.
+The contribution of the cells outside the footprint is approximated by
+grouping the cells in coarse prisms, so the matrix is stored as
+
+.. math::
+
+    \mathbf{G} \approx \mathbf{N} + \mathbf{C} \mathbf{A}
+
+where :math:`\mathbf{C}` holds the sensitivities of the coarse prisms,
+:math:`\mathbf{A}` maps the model into the coarse prisms, and the sparse
+:math:`\mathbf{N}` holds the difference between the exact sensitivities and
+the coarse approximation of the cells in the footprint of each receiver.
+"""
+
+import numpy as np
+from scipy.sparse.linalg import LinearOperator
+
+
+def prisms_nodes(bounds):
+    """
+    Nodes of a set of prisms, in the order used by the choclo kernels.
+
+    Parameters
+    ----------
+    bounds : (n_prisms, 6) numpy.ndarray
+        Boundaries of the prisms, as ``west, east, south, north, bottom, top``.
+
+    Returns
+    -------
+    nodes : (8 * n_prisms, 3) numpy.ndarray
+        Coordinates of the nodes of the prisms.
+    cell_nodes : (n_prisms, 8) numpy.ndarray
+        Indices of the nodes of each prism, with x changing faster than y,
+        and y faster than z.
+    """
+    x = bounds[:, [0, 1, 0, 1, 0, 1, 0, 1]]
+    y = bounds[:, [2, 2, 3, 3, 2, 2, 3, 3]]
+    z = bounds[:, [4, 4, 4, 4, 5, 5, 5, 5]]
+    nodes = np.stack((x, y, z), axis=-1).reshape(-1, 3)
+    cell_nodes = np.arange(nodes.shape[0]).reshape(-1, 8)
+    return nodes, cell_nodes
+
+
+class FootprintSensitivity(LinearOperator):
+    r"""
+    Sensitivity matrix truncated to the footprint of each receiver.
+
+    Parameters
+    ----------
+    near_field : (n_data, n_columns) scipy.sparse.csr_matrix
+        Difference between the exact sensitivities and their coarse
+        approximation, within the footprint of each receiver.
+    coarse : (n_data, n_coarse) numpy.ndarray
+        Sensitivities of the coarse prisms.
+    aggregation : (n_coarse, n_columns) scipy.sparse.csr_matrix
+        Map from the model to the coarse prisms, with a single non-zero
+        element per column.
+    """
+
+    def __init__(self, near_field, coarse, aggregation):
+        super().__init__(dtype=coarse.dtype, shape=near_field.shape)
+        self.near_field = near_field
+        self.coarse = coarse
+        self.aggregation = aggregation
+
+    @property
+    def nbytes(self):
+        """
+        Memory used by the truncated matrix, in bytes.
+
+        Returns
+        -------
+        int
+        """
+        return self.coarse.nbytes + sum(
+            matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+            for matrix in (self.near_field, self.aggregation)
+        )
+
+    def _matmat(self, x):
+        return self.near_field @ x + self.coarse @ (self.aggregation @ x)
+
+    def _matvec(self, x):
+        return self._matmat(np.asarray(x).reshape(-1, 1)).ravel()
+
+    def _rmatmat(self, y):
+        return self.near_field.T @ y + self.aggregation.T @ (self.coarse.T @ y)
+
+    def _rmatvec(self, y):
+        return self._rmatmat(np.asarray(y).reshape(-1, 1)).ravel()
+
+    def toarray(self):
+        """
+        Assemble the matrix as a dense array.
+
+        Returns
+        -------
+        (n_data, n_columns) numpy.ndarray
+        """
+        return self.near_field.toarray() + (self.aggregation.T @ self.coarse.T).T
+
+    def gtg_diagonal(self, weights=None):
+        r"""
+        Diagonal of :math:`\mathbf{G}^T \mathbf{W} \mathbf{G}`.
+
+        Parameters
+        ----------
+        weights : (n_data,) numpy.ndarray, optional
+            Diagonal of :math:`\mathbf{W}`. If None, unit weights are used.
+
+        Returns
+        -------
+        (n_columns,) numpy.ndarray
+        """
+        if weights is None:
+            weights = np.ones(self.shape[0])
+        n_columns = self.shape[1]
+        # coarse prism and weight of each column
+        aggregation = self.aggregation.tocsc()
+        prisms = aggregation.indices
+        factors = aggregation.data.astype(np.float64)
+
+        # Each column of G is N[:, j] + C[:, prism(j)] * a_j
+        near = self.near_field.tocoo()
+        rows, columns = near.row, near.col
+        values = near.data.astype(np.float64)
+        weighted = weights[rows] * values
+        diagonal = np.bincount(columns, weighted * values, minlength=n_columns)
+        diagonal += (
+            2
+            * factors
+            * np.bincount(
+                columns,
+                weighted * self.coarse[rows, prisms[columns]],
+                minlength=n_columns,
+            )
+        )
+        coarse = self.coarse.astype(np.float64, copy=False)
+        diagonal += factors**2 * (weights @ coarse**2)[prisms]
+        return diagonal
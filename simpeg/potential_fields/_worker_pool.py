@@ -0,0 +1,225 @@
+"""
+Persistent pool of processes used to build the linear operator of integral
+potential field simulations with the ``"geoana"`` engine.
+
+The geometry of the simulation (the active nodes and the indices of the nodes
+of each active cell) is copied to shared memory once, when the pool is
+started. On every evaluation, the remaining state of the simulation is pickled
+once into a shared memory block, and each worker writes its block of rows
+straight into the kernel, so only small control messages go through the pool's
+pipes. The kernel is itself a shared memory block, or a memory-mapped ``.npy``
+file when the sensitivities are stored on disk.
+"""
+
+import os
+import pickle
+import weakref
+from multiprocessing import shared_memory
+from multiprocessing.pool import Pool
+
+import numpy as np
+
+# Attributes of the simulation that are never sent to the workers: the
+# geometry is shared once at start up, and the rest are either large or are
+# not needed to evaluate the integrals.
+_EXCLUDED_ATTRIBUTES = (
+    "_mesh",
+    "_nodes",
+    "_unique_inv",
+    "_G",
+    "_gtg_diagonal",
+    "_worker_pool",
+)
+
+# State of each worker process
+_worker_geometry = {}
+_worker_simulation = {}
+
+
+def _share_array(array, blocks):
+    """Copy an array into a new shared memory block and describe it."""
+    array = np.ascontiguousarray(array)
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    blocks.append(shm)
+    return (shm.name, array.shape, array.dtype.str)
+
+
+def _attach_array(spec):
+    """Attach to an array described by `_share_array`."""
+    name, shape, dtype = spec
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+class SharedArray:
+    """Array allocated in a shared memory block the workers can write into.
+
+    The block is freed once the array returned by ``numpy.asarray`` and this
+    object are no longer referenced. On POSIX systems, :meth:`unlink` must be
+    called once the workers are done with it.
+
+    Parameters
+    ----------
+    shape : tuple of int
+    dtype : numpy.dtype
+    """
+
+    def __init__(self, shape, dtype):
+        dtype = np.dtype(dtype)
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+        self._shm = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+        self.spec = (self._shm.name, tuple(shape), dtype.str)
+        # the array interface lets numpy keep this object, and so the shared
+        # memory block, alive without exporting its buffer
+        address = np.frombuffer(self._shm.buf, dtype=np.uint8).ctypes.data
+        self.__array_interface__ = {
+            "shape": tuple(shape),
+            "typestr": dtype.str,
+            "data": (address, False),
+            "version": 3,
+        }
+
+    def unlink(self):
+        """Remove the name of the shared memory block.
+
+        The memory is still mapped in this process until the array is freed.
+        """
+        self._shm.unlink()
+
+    def __del__(self):
+        self._shm.close()
+
+
+def _initialize_worker(geometry):
+    """Attach a new worker to the shared geometry of the simulation."""
+    for key, spec in geometry.items():
+        if spec is None:
+            _worker_geometry[key] = (None, None)
+        else:
+            _worker_geometry[key] = _attach_array(spec)
+
+
+def _get_worker_simulation(state_name, state_size):
+    """Return the simulation for the current evaluation, unpickling it once."""
+    if _worker_simulation.get("name") != state_name:
+        shm = shared_memory.SharedMemory(name=state_name)
+        try:
+            simulation = pickle.loads(bytes(shm.buf[:state_size]))
+        finally:
+            shm.close()
+        simulation._nodes = _worker_geometry["nodes"][1]
+        simulation._unique_inv = _worker_geometry["unique_inv"][1]
+        _worker_simulation["name"] = state_name
+        _worker_simulation["simulation"] = simulation
+    return _worker_simulation["simulation"]
+
+
+def _evaluate_block(state_name, state_size, kernel, row_start, block):
+    """Evaluate a block of rows and write them into the kernel.
+
+    `kernel` is either the path to a ``.npy`` file or the spec of a
+    :class:`SharedArray`.
+    """
+    simulation = _get_worker_simulation(state_name, state_size)
+    if isinstance(kernel, str):
+        shm, array = None, np.load(kernel, mmap_mode="r+")
+    else:
+        shm, array = _attach_array(kernel)
+    try:
+        id0 = row_start
+        for receiver_location, components in block:
+            rows = simulation.evaluate_integral(receiver_location, components)
+            id1 = id0 + rows.shape[0]
+            array[id0:id1] = rows.astype(array.dtype, copy=False)
+            id0 = id1
+        if shm is None:
+            array.flush()
+    finally:
+        # the buffer must be released before closing the shared memory
+        del array
+        if shm is not None:
+            shm.close()
+    return id0 - row_start
+
+
+def _release(pool, blocks):
+    """Terminate the pool and free the shared memory blocks it owns."""
+    pool.terminate()
+    for shm in blocks:
+        shm.close()
+        shm.unlink()
+    blocks.clear()
+
+
+class PFWorkerPool:
+    """Long-lived pool of processes evaluating rows of a linear operator.
+
+    Parameters
+    ----------
+    n_processes : int or None
+        Number of worker processes. If ``None``, the number of CPUs is used.
+    nodes : (n_active_nodes, 3) numpy.ndarray
+        Locations of the active nodes of the simulation.
+    unique_inv : numpy.ndarray or None
+        Indices of the active nodes of each active cell.
+    """
+
+    def __init__(self, n_processes, nodes, unique_inv):
+        self._blocks = []
+        geometry = {
+            "nodes": _share_array(nodes, self._blocks),
+            "unique_inv": (
+                None if unique_inv is None else _share_array(unique_inv, self._blocks)
+            ),
+        }
+        self.n_processes = n_processes
+        self._pool = Pool(
+            processes=n_processes,
+            initializer=_initialize_worker,
+            initargs=(geometry,),
+        )
+        self._finalizer = weakref.finalize(self, _release, self._pool, self._blocks)
+
+    def evaluate(self, simulation, kernel, location_components):
+        """Evaluate the rows of the linear operator into the kernel.
+
+        Parameters
+        ----------
+        simulation : simpeg.potential_fields.base.BasePFSimulation
+            Simulation whose ``evaluate_integral`` method computes the rows.
+        kernel : SharedArray or str
+            Shared array the rows are written into, or path to a ``.npy``
+            file created with ``numpy.lib.format.open_memmap``.
+        location_components : list of tuple
+            Receiver locations and components, in the order of the rows.
+        """
+        state = simulation.__dict__.copy()
+        for attribute in _EXCLUDED_ATTRIBUTES:
+            state.pop(attribute, None)
+        worker_simulation = simulation.__class__.__new__(simulation.__class__)
+        worker_simulation.__dict__.update(state)
+        state = pickle.dumps(worker_simulation, protocol=pickle.HIGHEST_PROTOCOL)
+        state_shm = shared_memory.SharedMemory(create=True, size=len(state))
+        state_shm.buf[: len(state)] = state
+
+        # split the receivers in contiguous blocks of rows, a few per worker
+        n_workers = self.n_processes or os.cpu_count()
+        n_blocks = min(len(location_components), 4 * n_workers)
+        if isinstance(kernel, SharedArray):
+            kernel = kernel.spec
+        tasks = []
+        row_start = 0
+        for block in np.array_split(np.arange(len(location_components)), n_blocks):
+            block = [location_components[i] for i in block]
+            tasks.append((state_shm.name, len(state), kernel, row_start, block))
+            row_start += sum(len(components) for _, components in block)
+        try:
+            self._pool.starmap(_evaluate_block, tasks)
+        finally:
+            state_shm.close()
+            state_shm.unlink()
+
+    def close(self):
+        """Terminate the workers and free the shared memory."""
+        self._finalizer()
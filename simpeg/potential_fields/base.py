@@ -1,6 +1,5 @@
 import os
 import warnings
-from multiprocessing.pool import Pool
 
 import discretize
 import numpy as np
@@ -10,8 +9,16 @@ from scipy.sparse import csr_matrix as csr
 from simpeg.utils import mkvc
 
 from ..simulation import LinearSimulation
-from ..utils import validate_active_indices, validate_integer, validate_string
+from ..utils import (
+    validate_active_indices,
+    validate_float,
+    validate_integer,
+    validate_string,
+)
 from ..utils.code_utils import deprecate_property, validate_type
+from ._compressed import CompressedSensitivity, cluster_points, low_rank_factors
+from ._footprint import FootprintSensitivity, prisms_nodes
+from ._worker_pool import PFWorkerPool, SharedArray
 
 try:
     import choclo
@@ -45,17 +52,26 @@ class BasePFSimulation(LinearSimulation):
         A 3D tensor or tree mesh.
     active_cells : np.ndarray of int or bool
         Indices array denoting the active topography cells.
-    store_sensitivities : {'ram', 'disk', 'forward_only'}
-        Options for storing sensitivities. There are 3 options
+    store_sensitivities : {'ram', 'disk', 'forward_only', 'compressed'}
+        Options for storing sensitivities. There are 4 options
 
         - 'ram': sensitivities are stored in the computer's RAM
         - 'disk': sensitivities are written to a directory
         - 'forward_only': you intend only do perform a forward simulation and sensitivities do not need to be stored
+        - 'compressed': sensitivities are stored in RAM as low-rank tiles,
+          up to ``compression_tolerance``. Only available with the
+          ``"choclo"`` engine.
+        - 'footprint': sensitivities are stored in RAM as a sparse matrix with
+          the cells within ``footprint_radius`` of each receiver, plus a coarse
+          approximation of the cells outside of it. Only available with the
+          ``"choclo"`` engine.
 
     n_processes : None or int, optional
         The number of processes to use in the internal multiprocessing pool for forward
         modeling. The default value of 1 will not use multiprocessing. Any other setting
-        will. `None` implies setting by the number of cpus. If engine is
+        will. `None` implies setting by the number of cpus. The pool is started
+        the first time it is needed and is reused by later calls, until
+        ``n_processes`` changes or :meth:`close_worker_pool` is called. If engine is
         ``"choclo"``, then this argument will be ignored.
     engine : {"geoana", "choclo"}, optional
        Choose which engine should be used to run the forward model.
@@ -63,6 +79,12 @@ class BasePFSimulation(LinearSimulation):
         If True, the simulation will run in parallel. If False, it will
         run in serial. If ``engine`` is not ``"choclo"`` this argument will be
         ignored.
+    compression_tolerance : float, optional
+        Relative tolerance of the low-rank approximation of each tile of the
+        sensitivity matrix when ``store_sensitivities`` is ``"compressed"``.
+    footprint_radius : float, optional
+        Distance from each receiver within which sensitivities are computed
+        exactly when ``store_sensitivities`` is ``"footprint"``.
     ind_active : np.ndarray of int or bool
 
         .. deprecated:: 0.23.0
@@ -96,6 +118,8 @@ class BasePFSimulation(LinearSimulation):
         sensitivity_dtype=np.float32,
         engine="geoana",
         numba_parallel=True,
+        compression_tolerance=1e-4,
+        footprint_radius=None,
         ind_active=None,
         **kwargs,
     ):
@@ -125,6 +149,8 @@ class BasePFSimulation(LinearSimulation):
         self.sensitivity_dtype = sensitivity_dtype
         self.engine = engine
         self.numba_parallel = numba_parallel
+        self.compression_tolerance = compression_tolerance
+        self.footprint_radius = footprint_radius
         super().__init__(**kwargs)
         self.n_processes = n_processes
 
@@ -197,15 +223,18 @@ class BasePFSimulation(LinearSimulation):
     def store_sensitivities(self):
         """Options for storing sensitivities.
 
-        There are 3 options:
+        There are 5 options:
 
         - 'ram': sensitivity matrix stored in RAM
         - 'disk': sensitivities written and stored to disk
         - 'forward_only': sensitivities are not store (only use for forward simulation)
+        - 'compressed': sensitivity matrix stored in RAM as low-rank tiles
+        - 'footprint': sensitivity matrix stored in RAM, truncated to the
+          footprint of each receiver
 
         Returns
         -------
-        {'disk', 'ram', 'forward_only'}
+        {'disk', 'ram', 'forward_only', 'compressed', 'footprint'}
             A string defining the model type for the simulation.
         """
         if self._store_sensitivities is None:
@@ -215,9 +244,60 @@ class BasePFSimulation(LinearSimulation):
     @store_sensitivities.setter
     def store_sensitivities(self, value):
         self._store_sensitivities = validate_string(
-            "store_sensitivities", value, ["disk", "ram", "forward_only"]
+            "store_sensitivities",
+            value,
+            ["disk", "ram", "forward_only", "compressed", "footprint"],
+        )
+
+    @property
+    def compression_tolerance(self):
+        """Relative tolerance of the compressed sensitivity matrix.
+
+        Each tile of the sensitivity matrix is replaced by a low-rank
+        approximation whose error, in Frobenius norm, is below this fraction
+        of the norm of the tile. Only used if ``store_sensitivities`` is
+        ``"compressed"``.
+
+        Returns
+        -------
+        float
+        """
+        return self._compression_tolerance
+
+    @compression_tolerance.setter
+    def compression_tolerance(self, value):
+        self._compression_tolerance = validate_float(
+            "compression_tolerance",
+            value,
+            min_val=0.0,
+            max_val=1.0,
+            inclusive_min=False,
+            inclusive_max=False,
         )
 
+    @property
+    def footprint_radius(self):
+        """Radius of the footprint of each receiver.
+
+        Sensitivities of the cells within this distance of a receiver are
+        computed exactly, while the ones of cells beyond it are approximated by
+        coarse prisms of about a quarter of this size. Only used if
+        ``store_sensitivities`` is ``"footprint"``.
+
+        Returns
+        -------
+        float or None
+        """
+        return self._footprint_radius
+
+    @footprint_radius.setter
+    def footprint_radius(self, value):
+        if value is not None:
+            value = validate_float(
+                "footprint_radius", value, min_val=0.0, inclusive_min=False
+            )
+        self._footprint_radius = value
+
     @property
     def sensitivity_dtype(self):
         """dtype of the sensitivity matrix.
@@ -252,8 +332,36 @@ class BasePFSimulation(LinearSimulation):
     def n_processes(self, value):
         if value is not None:
             value = validate_integer("n_processes", value, min_val=1)
+        if value != getattr(self, "_n_processes", value):
+            self.close_worker_pool()
         self._n_processes = value
 
+    def _get_worker_pool(self):
+        """Return the pool of worker processes, starting it if needed."""
+        if getattr(self, "_worker_pool", None) is None:
+            self._worker_pool = PFWorkerPool(
+                self.n_processes, self._nodes, self._unique_inv
+            )
+        return self._worker_pool
+
+    def close_worker_pool(self):
+        """
+        Terminate the worker processes used to compute the linear operator.
+
+        The pool is started again the next time the linear operator is
+        computed with ``n_processes`` other than 1.
+        """
+        pool = getattr(self, "_worker_pool", None)
+        if pool is not None:
+            pool.close()
+            self._worker_pool = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # worker processes can not be pickled
+        state.pop("_worker_pool", None)
+        return state
+
     @property
     def engine(self) -> str:
         """
@@ -347,8 +455,8 @@ class BasePFSimulation(LinearSimulation):
         else:
             kernel_shape = (self.survey.nD, n_cells)
         dtype = self.sensitivity_dtype
-        kernel = np.empty(kernel_shape, dtype=dtype)
         if self.n_processes == 1:
+            kernel = np.empty(kernel_shape, dtype=dtype)
             id0 = 0
             for args in self.survey._location_component_iterator():
                 rows = self.evaluate_integral(*args)
@@ -356,17 +464,33 @@ class BasePFSimulation(LinearSimulation):
                 id1 = id0 + n_c
                 kernel[id0:id1] = rows.astype(dtype, copy=False)
                 id0 = id1
+        elif self.store_sensitivities == "disk":
+            # workers write their rows straight into the memory-mapped file
+            os.makedirs(self.sensitivity_path, exist_ok=True)
+            kernel = np.lib.format.open_memmap(
+                sens_name, mode="w+", dtype=dtype, shape=kernel_shape
+            )
+            del kernel
+            try:
+                self._get_worker_pool().evaluate(
+                    self, sens_name, list(self.survey._location_component_iterator())
+                )
+            except BaseException:
+                # don't leave a partial file to be reused by the next call
+                os.remove(sens_name)
+                raise
+            print(f"writing sensitivity to {sens_name}")
+            return np.asarray(np.load(sens_name, mmap_mode="r"))
         else:
-            # multiprocessed
-            with Pool(processes=self.n_processes) as pool:
-                id0 = 0
-                for rows in pool.starmap(
-                    self.evaluate_integral, self.survey._location_component_iterator()
-                ):
-                    n_c = rows.shape[0]
-                    id1 = id0 + n_c
-                    kernel[id0:id1] = rows.astype(dtype, copy=False)
-                    id0 = id1
+            # workers write their rows straight into shared memory
+            shared = SharedArray(kernel_shape, dtype)
+            try:
+                self._get_worker_pool().evaluate(
+                    self, shared, list(self.survey._location_component_iterator())
+                )
+            finally:
+                shared.unlink()
+            return np.asarray(shared)
 
         # if self.store_sensitivities != "forward_only":
         #     kernel = np.vstack(kernel)
@@ -433,6 +557,228 @@ class BasePFSimulation(LinearSimulation):
         for receiver_object in self.survey.source_field.receiver_list:
             yield receiver_object.components, receiver_object.locations
 
+    def _get_cluster_nodes(self, cell_clusters):
+        """
+        Return the nodes of each cluster of active cells.
+
+        Parameters
+        ----------
+        cell_clusters : list of numpy.ndarray
+            Indices of the active cells in each cluster.
+
+        Returns
+        -------
+        list of tuple
+            Coordinates of the nodes of the cells in each cluster, and the
+            indices of the nodes of each cell relative to them.
+        """
+        active_nodes, active_cell_nodes = self._get_active_nodes()
+        clusters = []
+        for cells in cell_clusters:
+            cell_nodes = active_cell_nodes[cells]
+            nodes, local_cell_nodes = np.unique(cell_nodes, return_inverse=True)
+            clusters.append(
+                (active_nodes[nodes], local_cell_nodes.reshape(cell_nodes.shape))
+            )
+        return clusters
+
+    def _compressed_sensitivity_matrix(self, max_rows=256, max_cells=1024):
+        """
+        Compute the sensitivity matrix ``G`` as low-rank tiles.
+
+        Each tile couples a block of contiguous rows with a spatially compact
+        cluster of active cells. Tiles are evaluated one at a time with the
+        ``_sensitivity_rows`` method, so the dense matrix is never allocated.
+
+        Parameters
+        ----------
+        max_rows : int, optional
+            Maximum number of rows in each tile.
+        max_cells : int, optional
+            Maximum number of cells in each tile.
+
+        Returns
+        -------
+        simpeg.potential_fields._compressed.CompressedSensitivity
+        """
+        vector_model = getattr(self, "model_type", None) == "vector"
+        n_columns = 3 * self.nC if vector_model else self.nC
+        cell_centers = self.mesh.cell_centers[self.active_cells]
+        cell_clusters = cluster_points(cell_centers, max_cells)
+        clusters = self._get_cluster_nodes(cell_clusters)
+        column_clusters = [
+            (
+                np.concatenate([cells + i * self.nC for i in range(3)])
+                if vector_model
+                else cells
+            )
+            for cells in cell_clusters
+        ]
+        matrix = CompressedSensitivity(
+            (self.survey.nD, n_columns), self.sensitivity_dtype, column_clusters
+        )
+
+        # Use a fixed seed so the compressed matrix is reproducible
+        rng = np.random.default_rng(seed=0)
+        index_offset = 0
+        for components, receivers in self._get_components_and_receivers():
+            n_components = len(components)
+            step = max(max_rows // n_components, 1)
+            for start in range(0, receivers.shape[0], step):
+                block_receivers = receivers[start : start + step]
+                n_rows = n_components * block_receivers.shape[0]
+                tiles = []
+                for (nodes, cell_nodes), columns in zip(clusters, column_clusters):
+                    tile = np.empty((n_rows, columns.size), dtype=np.float64)
+                    self._sensitivity_rows(
+                        components, block_receivers, tile, nodes, cell_nodes
+                    )
+                    left, right = low_rank_factors(
+                        tile, self.compression_tolerance, rng
+                    )
+                    tiles.append((tile, None) if left is None else (left, right))
+                matrix._append_row_block(index_offset + start * n_components, tiles)
+            index_offset += n_components * receivers.shape[0]
+        return matrix
+
+    def _footprint_sensitivity_matrix(self, max_rows=256, max_cells=1024):
+        """
+        Compute the sensitivity matrix ``G`` truncated to receiver footprints.
+
+        The active cells are grouped in clusters no larger than a quarter of the
+        footprint radius, and the sensitivities of the prisms that bound each
+        cluster are used as a coarse approximation of the sensitivities of its
+        cells. Each receiver only gets exact sensitivities for the cells within
+        its footprint, stored as corrections to the coarse approximation.
+
+        Parameters
+        ----------
+        max_rows : int, optional
+            Maximum number of rows computed at once.
+        max_cells : int, optional
+            Maximum number of cells in each cluster.
+
+        Returns
+        -------
+        simpeg.potential_fields._footprint.FootprintSensitivity
+        """
+        radius = self.footprint_radius
+        if radius is None:
+            raise ValueError(
+                "The footprint_radius must be set to use "
+                'store_sensitivities="footprint".'
+            )
+        vector_model = getattr(self, "model_type", None) == "vector"
+        n_model_components = 3 if vector_model else 1
+        n_columns = n_model_components * self.nC
+        cell_centers = self.mesh.cell_centers[self.active_cells]
+        cell_bounds = self.mesh.cell_bounds[self.active_cells]
+        cell_volumes = self.mesh.cell_volumes[self.active_cells]
+
+        cell_clusters = cluster_points(cell_centers, max_cells, max_extent=radius / 4)
+        clusters = self._get_cluster_nodes(cell_clusters)
+        n_prisms = len(cell_clusters)
+
+        # Coarse prisms bounding each cluster, and the map from the model to
+        # them (volume weighted, so a uniform model is kept uniform)
+        prisms = np.empty(self.nC, dtype=np.int64)
+        bounds = np.empty((n_prisms, 6))
+        for i, cells in enumerate(cell_clusters):
+            prisms[cells] = i
+            bounds[i, ::2] = cell_bounds[cells, ::2].min(axis=0)
+            bounds[i, 1::2] = cell_bounds[cells, 1::2].max(axis=0)
+        prism_volumes = np.prod(bounds[:, 1::2] - bounds[:, ::2], axis=1)
+        factors = cell_volumes / prism_volumes[prisms]
+        aggregation = csr(
+            (
+                np.tile(factors, n_model_components),
+                (
+                    np.concatenate(
+                        [prisms + i * n_prisms for i in range(n_model_components)]
+                    ),
+                    np.arange(n_columns),
+                ),
+            ),
+            shape=(n_model_components * n_prisms, n_columns),
+            dtype=self.sensitivity_dtype,
+        )
+        prism_nodes, prism_cell_nodes = prisms_nodes(bounds)
+
+        coarse = np.empty(
+            (self.survey.nD, n_model_components * n_prisms),
+            dtype=self.sensitivity_dtype,
+        )
+        rows, columns, values = [], [], []
+        index_offset = 0
+        for components, receivers in self._get_components_and_receivers():
+            n_components = len(components)
+            step = max(max_rows // n_components, 1)
+            for start in range(0, receivers.shape[0], step):
+                block_receivers = receivers[start : start + step]
+                n_rows = n_components * block_receivers.shape[0]
+                row_start = index_offset + start * n_components
+                block_coarse = np.empty((n_rows, coarse.shape[1]), dtype=np.float64)
+                self._sensitivity_rows(
+                    components,
+                    block_receivers,
+                    block_coarse,
+                    prism_nodes,
+                    prism_cell_nodes,
+                )
+                coarse[row_start : row_start + n_rows] = block_coarse
+
+                # Only clusters close to the block of receivers can intersect
+                # the footprint of any of them
+                gaps = np.maximum(
+                    0,
+                    np.maximum(
+                        bounds[:, ::2] - block_receivers.max(axis=0),
+                        block_receivers.min(axis=0) - bounds[:, 1::2],
+                    ),
+                )
+                for i in np.flatnonzero(np.linalg.norm(gaps, axis=1) <= radius):
+                    cells = cell_clusters[i]
+                    distance = np.linalg.norm(
+                        block_receivers[:, None, :] - cell_centers[None, cells, :],
+                        axis=-1,
+                    )
+                    in_footprint = np.tile(
+                        np.repeat(distance <= radius, n_components, axis=0),
+                        (1, n_model_components),
+                    )
+                    if not in_footprint.any():
+                        continue
+                    nodes, cell_nodes = clusters[i]
+                    tile = np.empty((n_rows, n_model_components * cells.size))
+                    self._sensitivity_rows(
+                        components, block_receivers, tile, nodes, cell_nodes
+                    )
+                    # Store the difference with the coarse approximation
+                    prism_columns = np.repeat(
+                        i + n_prisms * np.arange(n_model_components), cells.size
+                    )
+                    tile -= block_coarse[:, prism_columns] * np.tile(
+                        factors[cells], n_model_components
+                    )
+                    tile_rows, tile_columns = np.nonzero(in_footprint)
+                    model_columns = np.concatenate(
+                        [cells + k * self.nC for k in range(n_model_components)]
+                    )
+                    rows.append(row_start + tile_rows)
+                    columns.append(model_columns[tile_columns])
+                    values.append(tile[tile_rows, tile_columns])
+            index_offset += n_components * receivers.shape[0]
+
+        if values:
+            rows, columns = np.concatenate(rows), np.concatenate(columns)
+            values = np.concatenate(values)
+        near_field = csr(
+            (values, (rows, columns)),
+            shape=(self.survey.nD, n_columns),
+            dtype=self.sensitivity_dtype,
+        )
+        return FootprintSensitivity(near_field, coarse, aggregation)
+
 
 class BaseEquivalentSourceLayerSimulation(BasePFSimulation):
     """Base equivalent source layer simulation class.
@@ -447,6 +793,11 @@ class BaseEquivalentSourceLayerSimulation(BasePFSimulation):
     cell_z_bottom : numpy.ndarray or float
         Define the elevations for the bottom face of all cells in the layer. If an array,
         it should be the same size as the active cell set.
+
+    Notes
+    -----
+    Equivalent source layers only support the ``"ram"``, ``"disk"`` and
+    ``"forward_only"`` options of ``store_sensitivities``.
     """
 
     def __init__(self, mesh, cell_z_top, cell_z_bottom, **kwargs):
@@ -480,6 +831,14 @@ class BaseEquivalentSourceLayerSimulation(BasePFSimulation):
         self._nodes = np.stack(all_nodes, axis=0)
         self._unique_inv = None
 
+    @BasePFSimulation.store_sensitivities.setter
+    def store_sensitivities(self, value):
+        # compressed and footprint sensitivities need the 3D geometry of the
+        # cells, so they are not available for layers
+        self._store_sensitivities = validate_string(
+            "store_sensitivities", value, ["disk", "ram", "forward_only"]
+        )
+
     @property
     def cell_z_top(self) -> np.ndarray:
         """
@@ -164,8 +164,8 @@ class Simulation3DIntegral(BasePFSimulation):
         Model mapping.
     sensitivity_dtype : numpy.dtype, optional
         Data type that will be used to build the sensitivity matrix.
-    store_sensitivities : {"ram", "disk", "forward_only"}
-        Options for storing sensitivity matrix. There are 3 options
+    store_sensitivities : {"ram", "disk", "forward_only", "compressed", "footprint"}
+        Options for storing sensitivity matrix. There are 5 options
 
         - 'ram': sensitivities are stored in the computer's RAM
         - 'disk': sensitivities are written to a directory
@@ -173,6 +173,15 @@ class Simulation3DIntegral(BasePFSimulation):
           sensitivities do not need to be stored. The sensitivity matrix ``G``
           is never created, but it'll be defined as
           a :class:`~scipy.sparse.linalg.LinearOperator`.
+        - 'compressed': the sensitivity matrix ``G`` is stored in RAM as
+          low-rank tiles, up to ``compression_tolerance``, and defined as
+          a :class:`~scipy.sparse.linalg.LinearOperator`. Only available if
+          ``engine`` is ``"choclo"``.
+        - 'footprint': only the sensitivities of the cells within
+          ``footprint_radius`` of each receiver are computed exactly, and the
+          ones of farther cells are approximated by coarse prisms. ``G`` is
+          defined as a :class:`~scipy.sparse.linalg.LinearOperator`. Only
+          available if ``engine`` is ``"choclo"``.
 
     sensitivity_path : str, optional
         Path to store the sensitivity matrix if ``store_sensitivities`` is set
@@ -332,14 +341,17 @@ class Simulation3DIntegral(BasePFSimulation):
         -------
         np.ndarray
         """
-        gtg_diagonal = (
-            self._gtg_diagonal_without_building_g(weights)
-            if self.store_sensitivities == "forward_only"
-            else
-            # In Einstein notation, the j-th element of the diagonal is:
-            #   d_j = w_i * G_{ij} * G_{ij}
-            np.asarray(np.einsum("i,ij,ij->j", weights, self.G, self.G))
-        )
+        match self.store_sensitivities:
+            case "forward_only":
+                gtg_diagonal = self._gtg_diagonal_without_building_g(weights)
+            case "compressed" | "footprint":
+                gtg_diagonal = self.G.gtg_diagonal(weights)
+            case _:
+                # In Einstein notation, the j-th element of the diagonal is:
+                #   d_j = w_i * G_{ij} * G_{ij}
+                gtg_diagonal = np.asarray(
+                    np.einsum("i,ij,ij->j", weights, self.G, self.G)
+                )
         return gtg_diagonal
 
     def getJ(self, m, f=None) -> NDArray[np.float64 | np.float32] | LinearOperator:
@@ -454,6 +466,10 @@ class Simulation3DIntegral(BasePFSimulation):
             match self.engine, self.store_sensitivities:
                 case ("choclo", "forward_only"):
                     self._G = self._sensitivity_matrix_as_operator()
+                case ("choclo", "compressed"):
+                    self._G = self._compressed_sensitivity_matrix()
+                case ("choclo", "footprint"):
+                    self._G = self._footprint_sensitivity_matrix()
                 case ("choclo", _):
                     self._G = self._sensitivity_matrix()
                 case ("geoana", "forward_only"):
@@ -465,6 +481,12 @@ class Simulation3DIntegral(BasePFSimulation):
                         'or another engine, like "choclo".'
                     )
                     raise NotImplementedError(msg)
+                case ("geoana", "compressed" | "footprint"):
+                    msg = (
+                        f'store_sensitivities="{self.store_sensitivities}" is only '
+                        'implemented with engine="choclo".'
+                    )
+                    raise NotImplementedError(msg)
                 case ("geoana", _):
                     self._G = self.linear_operator()
         return self._G
@@ -644,25 +666,50 @@ class Simulation3DIntegral(BasePFSimulation):
         # Start filling the sensitivity matrix
         index_offset = 0
         for components, receivers in self._get_components_and_receivers():
-            n_components = len(components)
-            n_rows = n_components * receivers.shape[0]
-            for i, component in enumerate(components):
-                kernel_func = CHOCLO_KERNELS[component]
-                conversion_factor = _get_conversion_factor(component)
-                matrix_slice = slice(
-                    index_offset + i, index_offset + n_rows, n_components
-                )
-                self._sensitivity_gravity(
-                    receivers,
-                    active_nodes,
-                    sensitivity_matrix[matrix_slice, :],
-                    active_cell_nodes,
-                    kernel_func,
-                    constants.G * conversion_factor,
-                )
+            n_rows = len(components) * receivers.shape[0]
+            self._sensitivity_rows(
+                components,
+                receivers,
+                sensitivity_matrix[index_offset : index_offset + n_rows],
+                active_nodes,
+                active_cell_nodes,
+            )
             index_offset += n_rows
         return sensitivity_matrix
 
+    def _sensitivity_rows(
+        self, components, receivers, sensitivity_matrix, nodes, cell_nodes
+    ):
+        """
+        Fill the rows of the sensitivity matrix for a set of receivers.
+
+        Parameters
+        ----------
+        components : list of str
+            Components measured by the receivers.
+        receivers : (n_receivers, 3) numpy.ndarray
+            Coordinates of the receivers.
+        sensitivity_matrix : (n_receivers * n_components, n_cells) numpy.ndarray
+            Array where the rows will be written, ordered by receiver and then
+            by component.
+        nodes : (n_nodes, 3) numpy.ndarray
+            Coordinates of the nodes of the cells.
+        cell_nodes : (n_cells, 8) numpy.ndarray
+            Indices of the nodes of each one of the cells.
+        """
+        n_components = len(components)
+        for i, component in enumerate(components):
+            kernel_func = CHOCLO_KERNELS[component]
+            conversion_factor = _get_conversion_factor(component)
+            self._sensitivity_gravity(
+                receivers,
+                nodes,
+                sensitivity_matrix[i::n_components, :],
+                cell_nodes,
+                kernel_func,
+                constants.G * conversion_factor,
+            )
+
     def _sensitivity_matrix_transpose_dot_vec(self, vector):
         """
         Compute ``G.T @ v`` without building ``G``.
@@ -177,13 +177,20 @@ class Simulation3DIntegral(BasePFSimulation):
         field. If False, the fields will be returned unmodified.
     sensitivity_dtype : numpy.dtype, optional
         Data type that will be used to build the sensitivity matrix.
-    store_sensitivities : {"ram", "disk", "forward_only"}
-        Options for storing sensitivity matrix. There are 3 options
+    store_sensitivities : {"ram", "disk", "forward_only", "compressed", "footprint"}
+        Options for storing sensitivity matrix. There are 5 options
 
         - 'ram': sensitivities are stored in the computer's RAM
         - 'disk': sensitivities are written to a directory
         - 'forward_only': you intend only do perform a forward simulation and
           sensitivities do not need to be stored
+        - 'compressed': sensitivities are stored in the computer's RAM as
+          low-rank tiles, up to ``compression_tolerance``. Only available if
+          ``engine`` is ``"choclo"``.
+        - 'footprint': only the sensitivities of the cells within
+          ``footprint_radius`` of each receiver are computed exactly, and the
+          ones of farther cells are approximated by coarse prisms. Only
+          available if ``engine`` is ``"choclo"``.
 
     sensitivity_path : str, optional
         Path to store the sensitivity matrix if ``store_sensitivities`` is set
@@ -344,6 +351,10 @@ class Simulation3DIntegral(BasePFSimulation):
             match self.engine, self.store_sensitivities:
                 case ("choclo", "forward_only"):
                     self._G = self._sensitivity_matrix_as_operator()
+                case ("choclo", "compressed"):
+                    self._G = self._compressed_sensitivity_matrix()
+                case ("choclo", "footprint"):
+                    self._G = self._footprint_sensitivity_matrix()
                 case ("choclo", _):
                     self._G = self._sensitivity_matrix()
                 case ("geoana", "forward_only"):
@@ -355,6 +366,12 @@ class Simulation3DIntegral(BasePFSimulation):
                         'or another engine, like "choclo".'
                     )
                     raise NotImplementedError(msg)
+                case ("geoana", "compressed" | "footprint"):
+                    msg = (
+                        f'store_sensitivities="{self.store_sensitivities}" is only '
+                        'implemented with engine="choclo".'
+                    )
+                    raise NotImplementedError(msg)
                 case ("geoana", _):
                     self._G = self.linear_operator()
         return self._G
@@ -520,6 +537,15 @@ class Simulation3DIntegral(BasePFSimulation):
                 raise NotImplementedError(msg)
             case ("choclo", "forward_only", False):
                 gtg_diagonal = self._gtg_diagonal_without_building_g(weights)
+            case ("choclo", "compressed" | "footprint", True):
+                msg = (
+                    "Computing the diagonal of `G.T @ G` using "
+                    f"`'{self.store_sensitivities}'` and `is_amplitude_data` "
+                    "hasn't been implemented yet."
+                )
+                raise NotImplementedError(msg)
+            case ("choclo", "compressed" | "footprint", False):
+                gtg_diagonal = self.G.gtg_diagonal(weights)
             case (_, _, False):
                 # In Einstein notation, the j-th element of the diagonal is:
                 #   d_j = w_i * G_{ij} * G_{ij}
@@ -1014,8 +1040,6 @@ class Simulation3DIntegral(BasePFSimulation):
         """
         # Gather active nodes and the indices of the nodes for each active cell
         active_nodes, active_cell_nodes = self._get_active_nodes()
-        # Get regional field
-        regional_field = self.survey.source_field.b0
         # Allocate sensitivity matrix
         scalar_model = self.model_type == "scalar"
         n_columns = self.nC if scalar_model else 3 * self.nC
@@ -1030,68 +1054,96 @@ class Simulation3DIntegral(BasePFSimulation):
             )
         else:
             sensitivity_matrix = np.empty(shape, dtype=self.sensitivity_dtype)
-        # Define the constant factor
-        constant_factor = 1 / 4 / np.pi
         # Start filling the sensitivity matrix
         index_offset = 0
         for components, receivers in self._get_components_and_receivers():
-            if not CHOCLO_SUPPORTED_COMPONENTS.issuperset(components):
-                raise NotImplementedError(
-                    f"Other components besides {CHOCLO_SUPPORTED_COMPONENTS} "
-                    "aren't implemented yet."
-                )
-            n_components = len(components)
-            n_rows = n_components * receivers.shape[0]
-            for i, component in enumerate(components):
-                matrix_slice = slice(
-                    index_offset + i, index_offset + n_rows, n_components
-                )
-                if component == "tmi":
-                    self._sensitivity_tmi(
-                        receivers,
-                        active_nodes,
-                        sensitivity_matrix[matrix_slice, :],
-                        active_cell_nodes,
-                        regional_field,
-                        constant_factor,
-                        scalar_model,
-                    )
-                elif component in ("tmi_x", "tmi_y", "tmi_z"):
-                    kernel_xx, kernel_yy, kernel_zz, kernel_xy, kernel_xz, kernel_yz = (
-                        CHOCLO_KERNELS[component]
-                    )
-                    self._sensitivity_tmi_derivative(
-                        receivers,
-                        active_nodes,
-                        sensitivity_matrix[matrix_slice, :],
-                        active_cell_nodes,
-                        regional_field,
-                        kernel_xx,
-                        kernel_yy,
-                        kernel_zz,
-                        kernel_xy,
-                        kernel_xz,
-                        kernel_yz,
-                        constant_factor,
-                        scalar_model,
-                    )
-                else:
-                    kernel_x, kernel_y, kernel_z = CHOCLO_KERNELS[component]
-                    self._sensitivity_mag(
-                        receivers,
-                        active_nodes,
-                        sensitivity_matrix[matrix_slice, :],
-                        active_cell_nodes,
-                        regional_field,
-                        kernel_x,
-                        kernel_y,
-                        kernel_z,
-                        constant_factor,
-                        scalar_model,
-                    )
+            n_rows = len(components) * receivers.shape[0]
+            self._sensitivity_rows(
+                components,
+                receivers,
+                sensitivity_matrix[index_offset : index_offset + n_rows],
+                active_nodes,
+                active_cell_nodes,
+            )
             index_offset += n_rows
         return sensitivity_matrix
 
+    def _sensitivity_rows(
+        self, components, receivers, sensitivity_matrix, nodes, cell_nodes
+    ):
+        """
+        Fill the rows of the sensitivity matrix for a set of receivers.
+
+        Parameters
+        ----------
+        components : list of str
+            Components measured by the receivers.
+        receivers : (n_receivers, 3) numpy.ndarray
+            Coordinates of the receivers.
+        sensitivity_matrix : (n_receivers * n_components, n_columns) numpy.ndarray
+            Array where the rows will be written, ordered by receiver and then
+            by component. It has one column per cell for scalar models, and
+            three per cell for vector models.
+        nodes : (n_nodes, 3) numpy.ndarray
+            Coordinates of the nodes of the cells.
+        cell_nodes : (n_cells, 8) numpy.ndarray
+            Indices of the nodes of each one of the cells.
+        """
+        if not CHOCLO_SUPPORTED_COMPONENTS.issuperset(components):
+            raise NotImplementedError(
+                f"Other components besides {CHOCLO_SUPPORTED_COMPONENTS} "
+                "aren't implemented yet."
+            )
+        regional_field = self.survey.source_field.b0
+        constant_factor = 1 / 4 / np.pi
+        scalar_model = self.model_type == "scalar"
+        n_components = len(components)
+        for i, component in enumerate(components):
+            rows = sensitivity_matrix[i::n_components, :]
+            if component == "tmi":
+                self._sensitivity_tmi(
+                    receivers,
+                    nodes,
+                    rows,
+                    cell_nodes,
+                    regional_field,
+                    constant_factor,
+                    scalar_model,
+                )
+            elif component in ("tmi_x", "tmi_y", "tmi_z"):
+                kernel_xx, kernel_yy, kernel_zz, kernel_xy, kernel_xz, kernel_yz = (
+                    CHOCLO_KERNELS[component]
+                )
+                self._sensitivity_tmi_derivative(
+                    receivers,
+                    nodes,
+                    rows,
+                    cell_nodes,
+                    regional_field,
+                    kernel_xx,
+                    kernel_yy,
+                    kernel_zz,
+                    kernel_xy,
+                    kernel_xz,
+                    kernel_yz,
+                    constant_factor,
+                    scalar_model,
+                )
+            else:
+                kernel_x, kernel_y, kernel_z = CHOCLO_KERNELS[component]
+                self._sensitivity_mag(
+                    receivers,
+                    nodes,
+                    rows,
+                    cell_nodes,
+                    regional_field,
+                    kernel_x,
+                    kernel_y,
+                    kernel_z,
+                    constant_factor,
+                    scalar_model,
+                )
+
     def _sensitivity_matrix_as_operator(self):
         """
         Create a LinearOperator for the sensitivity matrix G.
@@ -199,6 +199,16 @@ class SmoothnessFullGradient(BaseRegularization):
 
         return 2 * (m_d.T @ (G.T @ (M_f @ (G @ (m_d @ v)))))
 
+    def deriv2_diagonal(self, m):
+        # Docstring inherited from BaseRegularization
+        m_d = self.mapping.deriv(self._delta_m(m))
+        if hasattr(m_d, "tosparse"):
+            # lazy derivatives of combo maps
+            m_d = m_d.tosparse()
+        B = self.cell_gradient @ m_d
+        # diagonal of B^T M_f B, the sum of the rows of B * (M_f B)
+        return 2 * np.asarray((B.multiply(self.W @ B)).sum(axis=0)).ravel()
+
     @property
     def cell_gradient(self):
         """The (approximate) cell gradient operator
@@ -1,4 +1,5 @@
 import numpy as np
+import scipy.sparse as sp
 from discretize.base import BaseMesh
 from .. import maps
 from ..objective_function import BaseObjectiveFunction, ComboObjectiveFunction
@@ -10,6 +11,36 @@ from simpeg.utils.code_utils import deprecate_property, validate_ndarray_with_sh
 from scipy.sparse import csr_matrix
 
 
+def _diagonal_entries(matrix):
+    """Entries of a diagonal sparse matrix, or ``None`` if it isn't diagonal."""
+    if not sp.issparse(matrix) or matrix.shape[0] != matrix.shape[1]:
+        return None
+    coo = matrix.tocoo()
+    if not np.array_equal(coo.row, coo.col):
+        return None
+    return matrix.diagonal()
+
+
+def _weighted_gram_diagonal(A, W):
+    r"""Diagonal of :math:`\mathbf{A^T W^T W A}` without forming the product.
+
+    Returns ``None`` if ``A`` or ``W`` aren't matrices.
+    """
+    if hasattr(A, "tosparse"):
+        # lazy derivatives of combo maps
+        A = A.tosparse()
+    if not sp.issparse(W) or not (sp.issparse(A) or isinstance(A, np.ndarray)):
+        return None
+    weights = _diagonal_entries(W)
+    if weights is None:
+        A = W @ A
+        weights = np.ones(A.shape[0])
+    else:
+        weights = weights**2
+    squared = A.multiply(A) if sp.issparse(A) else A ** 2
+    return np.asarray(squared.T @ weights).ravel()
+
+
 class BaseRegularization(BaseObjectiveFunction):
     """Base regularization class.
 
@@ -516,6 +547,30 @@ class BaseRegularization(BaseObjectiveFunction):
 
         return 2 * f_m_deriv.T * (self.W.T * (self.W * (f_m_deriv * v)))
 
+    @utils.timeIt
+    def deriv2_diagonal(self, m) -> np.ndarray:
+        r"""Diagonal of the Hessian of the regularization function.
+
+        The diagonal of the Hessian :math:`2 \mathbf{f_m'^T W^T W f_m'}`,
+        where :math:`\mathbf{f_m'}` is the derivative of the regularization
+        kernel function, is the weighted sum of the squares of the columns of
+        :math:`\mathbf{f_m'}`. It is computed without forming the Hessian.
+
+        Parameters
+        ----------
+        m : (n_param, ) numpy.ndarray
+            The model for which the diagonal of the Hessian is evaluated.
+
+        Returns
+        -------
+        (n_param, ) numpy.ndarray
+            Diagonal of the Hessian of the regularization function.
+        """
+        diagonal = _weighted_gram_diagonal(self.f_m_deriv(m), self.W)
+        if diagonal is None:
+            return super().deriv2_diagonal(m)
+        return 2 * diagonal
+
 
 class Smallness(BaseRegularization):
     r"""Smallness regularization for least-squares inversion.
@@ -2280,6 +2335,11 @@ class BaseSimilarityMeasure(BaseRegularization):
             )
         )
 
+    def deriv2_diagonal(self, model):
+        # Docstring inherited from BaseObjectiveFunction
+        # similarity measures don't have a kernel function, use their Hessian
+        return BaseObjectiveFunction.deriv2_diagonal(self, model)
+
     @property
     def _nC_residual(self):
         """
@@ -15,7 +15,12 @@ from ..utils import (
     validate_float,
     validate_ndarray_with_shape,
 )
-from .base import RegularizationMesh, Smallness, WeightedLeastSquares
+from .base import (
+    RegularizationMesh,
+    Smallness,
+    WeightedLeastSquares,
+    _diagonal_entries,
+)
 
 ###############################################################################
 #                                                                             #
@@ -707,6 +712,92 @@ class PGIsmallness(Smallness):
             r = numer / (np.exp(score_vec))
             return 2 * mkvc(mD.T * r)
 
+    def _approx_hessian_terms(self, m):
+        r"""Terms of the Hessian approximated with the covariances of the clusters.
+
+        The approximated Hessian is :math:`2 \mathbf{m_D^T m_D W R W}`, where
+        :math:`\mathbf{R}` is made of the precisions of the cluster each cell
+        belongs to, stored in ``_r_second_deriv``.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+            Derivative :math:`\mathbf{m_D}` of the mappings of the physical properties.
+        """
+        membership = self.compute_quasi_geology_model()
+        modellist = self.wiresmap * m
+        dmmodel = np.c_[[a * b for a, b in zip(self.maplist, modellist)]].T
+        mD = [a.deriv(b) for a, b in zip(self.maplist, modellist)]
+        mD = sp.block_diag(mD)
+        if self._r_second_deriv is None:
+            if self.gmm.covariance_type == "tied":
+                if self.non_linear_relationships:
+                    r = np.r_[
+                        [
+                            self.gmm.cluster_mapping[membership[i]].deriv(
+                                dmmodel[i],
+                                v=(
+                                    self.gmm.cluster_mapping[membership[i]].deriv(
+                                        dmmodel[i], v=self.gmm.precisions_
+                                    )
+                                ).T,
+                            )
+                            for i in range(len(dmmodel))
+                        ]
+                    ]
+                else:
+                    r = self.gmm.precisions_[np.newaxis, :, :][
+                        np.zeros_like(membership)
+                    ]
+            elif (
+                self.gmm.covariance_type == "spherical"
+                or self.gmm.covariance_type == "diag"
+            ):
+                if self.non_linear_relationships:
+                    r = np.r_[
+                        [
+                            self.gmm.cluster_mapping[membership[i]].deriv(
+                                dmmodel[i],
+                                v=(
+                                    self.gmm.cluster_mapping[membership[i]].deriv(
+                                        dmmodel[i],
+                                        v=self.gmm.precisions_[membership[i]]
+                                        * np.eye(len(self.wiresmap.maps)),
+                                    )
+                                ).T,
+                            )
+                            for i in range(len(dmmodel))
+                        ]
+                    ]
+                else:
+                    r = np.r_[
+                        [
+                            self.gmm.precisions_[memb] * np.eye(len(self.wiresmap.maps))
+                            for memb in membership
+                        ]
+                    ]
+            else:
+                if self.non_linear_relationships:
+                    r = np.r_[
+                        [
+                            self.gmm.cluster_mapping[membership[i]].deriv(
+                                dmmodel[i],
+                                v=(
+                                    self.gmm.cluster_mapping[membership[i]].deriv(
+                                        dmmodel[i],
+                                        v=self.gmm.precisions_[membership[i]],
+                                    )
+                                ).T,
+                            )
+                            for i in range(len(dmmodel))
+                        ]
+                    ]
+                else:
+                    r = self.gmm.precisions_[membership]
+
+            self._r_second_deriv = r
+        return mD
+
     @timeIt
     def deriv2(self, m, v=None):
         r"""Hessian of the regularization function evaluated for the model provided.
@@ -742,79 +833,7 @@ class PGIsmallness(Smallness):
         if self.approx_hessian:
             # we approximate it with the covariance of the cluster
             # whose each point belong
-            membership = self.compute_quasi_geology_model()
-            modellist = self.wiresmap * m
-            dmmodel = np.c_[[a * b for a, b in zip(self.maplist, modellist)]].T
-            mD = [a.deriv(b) for a, b in zip(self.maplist, modellist)]
-            mD = sp.block_diag(mD)
-            if self._r_second_deriv is None:
-                if self.gmm.covariance_type == "tied":
-                    if self.non_linear_relationships:
-                        r = np.r_[
-                            [
-                                self.gmm.cluster_mapping[membership[i]].deriv(
-                                    dmmodel[i],
-                                    v=(
-                                        self.gmm.cluster_mapping[membership[i]].deriv(
-                                            dmmodel[i], v=self.gmm.precisions_
-                                        )
-                                    ).T,
-                                )
-                                for i in range(len(dmmodel))
-                            ]
-                        ]
-                    else:
-                        r = self.gmm.precisions_[np.newaxis, :, :][
-                            np.zeros_like(membership)
-                        ]
-                elif (
-                    self.gmm.covariance_type == "spherical"
-                    or self.gmm.covariance_type == "diag"
-                ):
-                    if self.non_linear_relationships:
-                        r = np.r_[
-                            [
-                                self.gmm.cluster_mapping[membership[i]].deriv(
-                                    dmmodel[i],
-                                    v=(
-                                        self.gmm.cluster_mapping[membership[i]].deriv(
-                                            dmmodel[i],
-                                            v=self.gmm.precisions_[membership[i]]
-                                            * np.eye(len(self.wiresmap.maps)),
-                                        )
-                                    ).T,
-                                )
-                                for i in range(len(dmmodel))
-                            ]
-                        ]
-                    else:
-                        r = np.r_[
-                            [
-                                self.gmm.precisions_[memb]
-                                * np.eye(len(self.wiresmap.maps))
-                                for memb in membership
-                            ]
-                        ]
-                else:
-                    if self.non_linear_relationships:
-                        r = np.r_[
-                            [
-                                self.gmm.cluster_mapping[membership[i]].deriv(
-                                    dmmodel[i],
-                                    v=(
-                                        self.gmm.cluster_mapping[membership[i]].deriv(
-                                            dmmodel[i],
-                                            v=self.gmm.precisions_[membership[i]],
-                                        )
-                                    ).T,
-                                )
-                                for i in range(len(dmmodel))
-                            ]
-                        ]
-                    else:
-                        r = self.gmm.precisions_[membership]
-
-                self._r_second_deriv = r
+            mD = self._approx_hessian_terms(m)
 
             if v is not None:
                 mDv = self.wiresmap * (mD * v)
@@ -927,6 +946,42 @@ class PGIsmallness(Smallness):
 
             return Hr
 
+    def deriv2_diagonal(self, m):
+        r"""Diagonal of the Hessian of the regularization function.
+
+        With ``approx_hessian``, the Hessian is
+        :math:`2 \mathbf{m_D^T m_D W R W}`, where :math:`\mathbf{R}` is made
+        of diagonal blocks of the precisions of the clusters of the cells. If
+        :math:`\mathbf{m_D^T m_D}` and :math:`\mathbf{W}` are diagonal, its
+        diagonal is computed from the diagonals of these blocks, without
+        forming the Hessian. Otherwise, it is taken from :meth:`deriv2`.
+
+        Parameters
+        ----------
+        m : (n_param, ) numpy.ndarray
+            The model for which the diagonal of the Hessian is evaluated.
+
+        Returns
+        -------
+        (n_param, ) numpy.ndarray
+            Diagonal of the Hessian of the regularization function.
+        """
+        if not self.approx_hessian:
+            return self.deriv2(m).diagonal()
+
+        if getattr(self, "reference_model", None) is None:
+            self.reference_model = mkvc(self.gmm.means_[self.membership(m)])
+        mD = self._approx_hessian_terms(m)
+        mD_squared = _diagonal_entries(mD.T @ mD)
+        weights = _diagonal_entries(self.W)
+        if mD_squared is None or weights is None:
+            return self.deriv2(m).diagonal()
+
+        precisions = np.concatenate(
+            [self._r_second_deriv[:, i, i] for i in range(len(self.wiresmap.maps))]
+        )
+        return 2 * mD_squared * weights**2 * precisions
+
 
 class PGI(ComboObjectiveFunction):
     r"""Regularization function for petrophysically guided inversion (PGI).
@@ -2,7 +2,7 @@ import scipy.sparse as sp
 import numpy as np
 from .base import Smallness
 from discretize.base import BaseMesh
-from .base import RegularizationMesh, BaseRegularization
+from .base import RegularizationMesh, BaseRegularization, _weighted_gram_diagonal
 from .sparse import Sparse, SparseSmallness, SparseSmoothness
 from scipy.sparse import csr_matrix
 
@@ -475,6 +475,15 @@ class BaseAmplitude(BaseVectorRegularization):
             ).flatten(order="F")
         )
 
+    def deriv2_diagonal(self, m) -> np.ndarray:
+        # Docstring inherited from BaseRegularization
+        diagonal = _weighted_gram_diagonal(
+            self.f_m_deriv(m), sp.block_diag([self.W] * self.n_comp)
+        )
+        if diagonal is None:
+            return self.deriv2(m).diagonal()
+        return 2 * diagonal
+
 
 class AmplitudeSmallness(SparseSmallness, BaseAmplitude):
     r"""Sparse smallness regularization on vector amplitudes.
@@ -0,0 +1,322 @@
+"""
+Lengths of straight rays in the cells of a mesh.
+
+The rays of tensor meshes are traced with a grid traversal (Amanatides-Woo)
+that only visits the cells crossed by each ray. The cells crossed by the rays
+of tree meshes are found by the mesh itself. In both cases the lengths are
+assembled directly into a sparse matrix in CSR format.
+"""
+
+import itertools
+
+import numpy as np
+import scipy.sparse as sp
+from discretize import TreeMesh
+
+try:
+    import numba
+except ImportError:
+    # Define dummy jit decorator
+    def jit(*args, **kwargs):
+        return lambda f: f
+
+    numba = None
+    prange = range
+else:
+    from numba import jit, prange
+
+
+@jit(nopython=True)
+def _clip_segment(origin, end, lower, upper):
+    """
+    Parametric interval of a segment that lies inside a box.
+
+    Parameters
+    ----------
+    origin, end : (3,) numpy.ndarray
+        Ends of the segment.
+    lower, upper : (3,) numpy.ndarray
+        Corners of the box.
+
+    Returns
+    -------
+    t_start, t_stop : float
+        Interval of the segment inside the box, the segment doesn't cross the
+        box if ``t_stop <= t_start``.
+    """
+    t_start, t_stop = 0.0, 1.0
+    for d in range(3):
+        delta = end[d] - origin[d]
+        if delta == 0.0:
+            if origin[d] < lower[d] or origin[d] > upper[d]:
+                return 1.0, 0.0
+        else:
+            t_a = (lower[d] - origin[d]) / delta
+            t_b = (upper[d] - origin[d]) / delta
+            t_start = max(t_start, min(t_a, t_b))
+            t_stop = min(t_stop, max(t_a, t_b))
+    return t_start, t_stop
+
+
+@jit(nopython=True)
+def _traverse_ray(origin, end, nodes, offsets, shape, indices, data, start, fill):
+    """
+    Walk a ray through the cells of a tensor grid.
+
+    Parameters
+    ----------
+    origin, end : (3,) numpy.ndarray
+        Ends of the ray.
+    nodes : numpy.ndarray
+        Nodes of the grid along x, y and z, concatenated.
+    offsets : (4,) numpy.ndarray of int
+        Position of the nodes of each dimension in ``nodes``.
+    shape : (3,) numpy.ndarray of int
+        Number of cells along each dimension.
+    indices, data : numpy.ndarray
+        Arrays where the cell indices and lengths will be stored.
+    start : int
+        Position in ``indices`` and ``data`` of the first cell of the ray.
+    fill : bool
+        If False, the cells are only counted.
+
+    Returns
+    -------
+    int
+        Number of cells crossed by the ray.
+    """
+    lower = np.empty(3)
+    upper = np.empty(3)
+    for d in range(3):
+        lower[d] = nodes[offsets[d]]
+        upper[d] = nodes[offsets[d + 1] - 1]
+    t, t_stop = _clip_segment(origin, end, lower, upper)
+    length = np.sqrt(np.sum((end - origin) ** 2))
+    if t_stop <= t or length == 0.0:
+        return 0
+
+    cell = np.empty(3, dtype=np.int64)
+    step = np.zeros(3, dtype=np.int64)
+    t_next = np.full(3, np.inf)
+    for d in range(3):
+        delta = end[d] - origin[d]
+        node_d = nodes[offsets[d] : offsets[d + 1]]
+        entry = origin[d] + t * delta
+        # rays leaving a node towards negative coordinates start in the cell
+        # below it
+        if delta < 0.0:
+            i = np.searchsorted(node_d, entry, side="left") - 1
+        else:
+            i = np.searchsorted(node_d, entry, side="right") - 1
+        cell[d] = min(max(i, 0), shape[d] - 1)
+        if delta > 0.0:
+            step[d] = 1
+            t_next[d] = (node_d[cell[d] + 1] - origin[d]) / delta
+        elif delta < 0.0:
+            step[d] = -1
+            t_next[d] = (node_d[cell[d]] - origin[d]) / delta
+
+    count = 0
+    while True:
+        d = np.argmin(t_next)
+        t_exit = min(t_next[d], t_stop)
+        if t_exit > t:
+            if fill:
+                indices[start + count] = cell[0] + shape[0] * (
+                    cell[1] + shape[1] * cell[2]
+                )
+                data[start + count] = (t_exit - t) * length
+            count += 1
+        if t_exit >= t_stop:
+            break
+        t = t_exit
+        cell[d] += step[d]
+        if cell[d] < 0 or cell[d] >= shape[d]:
+            break
+        node = cell[d] + 1 if step[d] > 0 else cell[d]
+        t_next[d] = (nodes[offsets[d] + node] - origin[d]) / (end[d] - origin[d])
+    return count
+
+
+def _count_cells(origins, ends, nodes, offsets, shape, counts):
+    """
+    Count the cells crossed by each ray of a tensor grid.
+
+    This function should be used with a `numba.jit` decorator, for example:
+
+    .. code::
+
+        from numba import jit
+
+        jit_count = jit(nopython=True, parallel=True)(_count_cells)
+
+    Parameters
+    ----------
+    origins, ends : (n_rays, 3) numpy.ndarray
+        Ends of the rays.
+    nodes, offsets, shape
+        See :func:`_traverse_ray`.
+    counts : (n_rays,) numpy.ndarray of int
+        Array where the number of cells of each ray will be stored.
+    """
+    indices = np.empty(0, dtype=np.int64)
+    data = np.empty(0)
+    for r in prange(origins.shape[0]):
+        counts[r] = _traverse_ray(
+            origins[r], ends[r], nodes, offsets, shape, indices, data, 0, False
+        )
+
+
+def _fill_cells(origins, ends, nodes, offsets, shape, indptr, indices, data):
+    """
+    Fill the indices and lengths of the cells crossed by each ray.
+
+    This function should be used with a `numba.jit` decorator, for example:
+
+    .. code::
+
+        from numba import jit
+
+        jit_fill = jit(nopython=True, parallel=True)(_fill_cells)
+
+    Parameters
+    ----------
+    origins, ends : (n_rays, 3) numpy.ndarray
+        Ends of the rays.
+    nodes, offsets, shape
+        See :func:`_traverse_ray`.
+    indptr : (n_rays + 1,) numpy.ndarray of int
+        Row pointers of the CSR matrix.
+    indices, data : (indptr[-1],) numpy.ndarray
+        Arrays where the cell indices and lengths will be stored.
+    """
+    for r in prange(origins.shape[0]):
+        _traverse_ray(
+            origins[r], ends[r], nodes, offsets, shape, indices, data, indptr[r], True
+        )
+
+
+_count_cells_parallel = jit(nopython=True, parallel=True)(_count_cells)
+_fill_cells_parallel = jit(nopython=True, parallel=True)(_fill_cells)
+
+
+def _pad_points(points, dim):
+    """Points as 3D coordinates, placing 2D points in the middle of a unit z."""
+    points = np.atleast_2d(np.asarray(points, dtype=np.float64))
+    if dim == 2:
+        points = np.c_[points, np.full(points.shape[0], 0.5)]
+    return np.ascontiguousarray(points)
+
+
+def _tensor_ray_matrix(mesh, origins, ends):
+    """Ray lengths in the cells of a tensor mesh, see :func:`ray_length_matrix`."""
+    node_list = [mesh.nodes_x, mesh.nodes_y]
+    node_list.append(mesh.nodes_z if mesh.dim == 3 else np.r_[0.0, 1.0])
+    nodes = np.concatenate(node_list).astype(np.float64)
+    offsets = np.cumsum([0] + [n.size for n in node_list]).astype(np.int64)
+    shape = np.array([n.size - 1 for n in node_list], dtype=np.int64)
+    origins = _pad_points(origins, mesh.dim)
+    ends = _pad_points(ends, mesh.dim)
+
+    n_rays = origins.shape[0]
+    counts = np.zeros(n_rays, dtype=np.int64)
+    _count_cells_parallel(origins, ends, nodes, offsets, shape, counts)
+    indptr = np.zeros(n_rays + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    indices = np.empty(indptr[-1], dtype=np.int64)
+    data = np.empty(indptr[-1])
+    _fill_cells_parallel(origins, ends, nodes, offsets, shape, indptr, indices, data)
+    return sp.csr_matrix((data, indices, indptr), shape=(n_rays, mesh.n_cells))
+
+
+def _clip_segments(origins, ends, lower, upper, closed_upper):
+    """
+    Parametric intervals of many segments inside many boxes.
+
+    Segments lying on a face of a box are only inside the box if the face is
+    its lower face, or if it is an upper face in ``closed_upper``, so a
+    segment along the face shared by two cells only belongs to one of them.
+    """
+    delta = ends - origins
+    moving = delta != 0.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_a = (lower - origins) / delta
+        t_b = (upper - origins) / delta
+    t_start = np.max(np.where(moving, np.minimum(t_a, t_b), 0.0), axis=1)
+    t_stop = np.min(np.where(moving, np.maximum(t_a, t_b), 1.0), axis=1)
+    t_start = np.maximum(t_start, 0.0)
+    t_stop = np.minimum(t_stop, 1.0)
+    inside = (origins >= lower) & ((origins < upper) | closed_upper)
+    t_stop[np.any(~moving & ~inside, axis=1)] = 0.0
+    return t_start, t_stop
+
+
+def _tree_ray_matrix(mesh, origins, ends):
+    """Ray lengths in the cells of a tree mesh, see :func:`ray_length_matrix`."""
+    origins = np.atleast_2d(np.asarray(origins, dtype=np.float64))
+    ends = np.atleast_2d(np.asarray(ends, dtype=np.float64))
+    n_rays = origins.shape[0]
+    lower = mesh.origin
+    upper = mesh.origin + np.array([h.sum() for h in mesh.h])
+
+    # clip the rays to the mesh before looking for the cells they cross
+    t_start, t_stop = _clip_segments(origins, ends, lower, upper, True)
+    delta = ends - origins
+    starts = np.clip(origins + t_start[:, None] * delta, lower, upper)
+    stops = np.clip(origins + t_stop[:, None] * delta, lower, upper)
+    # rays parallel to the faces could lie on them, and the mesh only returns
+    # the cells on one side, so they are looked up on both sides of the faces
+    shift = 0.25 * mesh.h_gridded.min(axis=0)
+    rows, cells = [], []
+    for r in np.flatnonzero(t_stop > t_start):
+        parallel = np.flatnonzero(delta[r] == 0.0)
+        ray_cells = []
+        for signs in itertools.product([-1.0, 1.0], repeat=parallel.size):
+            offset = np.zeros(mesh.dim)
+            offset[parallel] = np.array(signs) * shift[parallel]
+            ray_cells += mesh.get_cells_along_line(
+                np.clip(starts[r] + offset, lower, upper),
+                np.clip(stops[r] + offset, lower, upper),
+            )
+        ray_cells = np.unique(ray_cells)
+        rows.append(np.full(ray_cells.size, r, dtype=np.int64))
+        cells.append(ray_cells.astype(np.int64))
+    if not rows:
+        return sp.csr_matrix((n_rays, mesh.n_cells))
+    rows = np.concatenate(rows)
+    cells = np.concatenate(cells)
+
+    bounds = mesh.cell_bounds[cells]
+    cell_upper = bounds[:, 1::2]
+    t_start, t_stop = _clip_segments(
+        origins[rows], ends[rows], bounds[:, ::2], cell_upper, cell_upper >= upper
+    )
+    lengths = np.maximum(t_stop - t_start, 0.0) * np.linalg.norm(delta[rows], axis=1)
+    keep = lengths > 0.0
+    return sp.csr_matrix(
+        (lengths[keep], (rows[keep], cells[keep])), shape=(n_rays, mesh.n_cells)
+    )
+
+
+def ray_length_matrix(mesh, origins, ends):
+    """
+    Sparse matrix of the lengths of straight rays in the cells of a mesh.
+
+    Rays lying on a face shared by two cells are assigned to the cell above
+    the face, and the parts of the rays outside the mesh are ignored.
+
+    Parameters
+    ----------
+    mesh : discretize.TensorMesh or discretize.TreeMesh
+        A 2D or 3D mesh.
+    origins, ends : (n_rays, dim) numpy.ndarray
+        Ends of the rays.
+
+    Returns
+    -------
+    (n_rays, n_cells) scipy.sparse.csr_matrix
+        Length of each ray in each cell of the mesh.
+    """
+    if isinstance(mesh, TreeMesh):
+        return _tree_ray_matrix(mesh, origins, ends)
+    return _tensor_ray_matrix(mesh, origins, ends)
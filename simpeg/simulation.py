@@ -22,6 +22,7 @@ from .utils import (
     validate_type,
     validate_string,
     validate_integer,
+    jtj_diagonal,
 )
 import uuid
 
@@ -333,6 +334,140 @@ class BaseSimulation(props.HasModel):
         """
         return self.Jtvec(m, v, f)
 
+    def _Jtvec_block(self, m, V, f=None):
+        r"""Compute the Jacobian transpose times the columns of a matrix.
+
+        Simulations able to solve the adjoint problems of several vectors at
+        once should override this method. By default, ``Jtvec`` is called for
+        each column.
+
+        Parameters
+        ----------
+        m : (n_param, ) numpy.ndarray
+            The model parameters.
+        V : (n_data, n_vectors) numpy.ndarray
+            Vectors we are multiplying, as columns.
+        f : simpeg.fields.Fields, optional
+            If provided, fields will not need to be recomputed.
+
+        Returns
+        -------
+        (n_param, n_vectors) numpy.ndarray
+            The Jacobian transpose times each vector.
+        """
+        if f is None:
+            f = self.fields(m)
+        return np.column_stack([self.Jtvec(m, v, f=f) for v in V.T])
+
+    def getJtJdiag(
+        self,
+        m,
+        W=None,
+        f=None,
+        method=None,
+        n_probes=20,
+        random_seed: RandomSeed | None = None,
+    ):
+        r"""Return the diagonal of :math:`\mathbf{J^T J}`.
+
+        Where :math:`\mathbf{d}` are the data and :math:`\mathbf{m}` are the
+        model parameters, the sensitivity matrix :math:`\mathbf{J}` is defined as:
+
+        .. math::
+            \mathbf{J} = \dfrac{\partial \mathbf{d}}{\partial \mathbf{m}}
+
+        This method returns the diagonal of :math:`\mathbf{J^T J}`. When the
+        *W* input argument is used to include a weighting matrix on the data
+        :math:`\mathbf{W}`, this method returns the diagonal of
+        :math:`\mathbf{J^T W^T W J}`.
+
+        The diagonal can be computed exactly from the full sensitivity matrix,
+        or estimated from products of :math:`\mathbf{J^T W^T}` with random
+        probing vectors :math:`\mathbf{u}_k` of the data space:
+
+        .. math::
+            \textrm{diag} \left( \mathbf{J^T W^T W J} \right) \approx
+            \frac{1}{n_k} \sum_k \left( \mathbf{J^T W^T u}_k \right)^2
+
+        which only needs the fields and one adjoint solve per probing vector,
+        so the sensitivity matrix is never formed. The diagonal is stored
+        until the model changes.
+
+        Parameters
+        ----------
+        m : (n_param, ) numpy.ndarray
+            The model parameters.
+        W : (n_data, n_data) scipy.sparse.csr_matrix, optional
+            A weighting matrix on the data.
+        f : simpeg.fields.Fields, optional
+            If provided, fields will not need to be recomputed.
+        method : {None, "exact", "probing", "hutchinson"}, optional
+            How the diagonal is computed:
+
+            - ``"exact"``: from the sensitivity matrix returned by ``getJ``.
+            - ``"probing"``: the data are split in `n_probes` groups, the
+              data of a group being spread over the survey, and each probing
+              vector has random signs on one group and zeros elsewhere. The
+              estimate is exact if `n_probes` is at least the number of data.
+            - ``"hutchinson"``: each probing vector has random signs on all
+              the data, giving an unbiased estimate.
+
+            If ``None``, ``"exact"`` is used if the simulation has a ``getJ``
+            method, otherwise ``"probing"`` is used.
+        n_probes : int, optional
+            Number of probing vectors for the ``"probing"`` and
+            ``"hutchinson"`` methods.
+        random_seed : None or :class:`~simpeg.typing.RandomSeed`, optional
+            Random seed used for the signs of the probing vectors. It can
+            either be an int or a predefined Numpy random number generator
+            (see ``numpy.random.default_rng``).
+
+        Returns
+        -------
+        (n_param, ) numpy.ndarray
+            The diagonal of :math:`\mathbf{J^T W^T W J}`.
+        """
+        self.model = m
+        if getattr(self, "_gtgdiag", None) is not None:
+            return self._gtgdiag
+
+        if method is None:
+            method = "exact" if hasattr(self, "getJ") else "probing"
+        method = validate_string("method", method, ["exact", "probing", "hutchinson"])
+
+        if method == "exact":
+            if W is not None:
+                W = W.diagonal() ** 2
+            self._gtgdiag = jtj_diagonal(self.getJ(m, f=f), weights=W)
+            return self._gtgdiag
+
+        n_probes = validate_integer("n_probes", n_probes, min_val=1)
+        n_data = self.survey.nD
+        rng = np.random.default_rng(seed=random_seed)
+        if method == "probing":
+            n_probes = min(n_probes, n_data)
+            U = np.zeros((n_data, n_probes))
+            U[np.arange(n_data), np.arange(n_data) % n_probes] = rng.choice(
+                [-1.0, 1.0], size=n_data
+            )
+        else:
+            U = rng.choice([-1.0, 1.0], size=(n_data, n_probes))
+        if W is not None:
+            U = W.T @ U
+
+        if f is None:
+            f = self.fields(m)
+        JtU = self._Jtvec_block(m, U, f=f)
+        jtj_diag = np.sum(JtU**2, axis=1)
+        if method == "hutchinson":
+            jtj_diag /= n_probes
+        self._gtgdiag = jtj_diag
+        return self._gtgdiag
+
+    @property
+    def _delete_on_model_update(self):
+        return super()._delete_on_model_update + ["_gtgdiag"]
+
     @count
     def residual(self, m, dobs, f=None):
         r"""The data residual.
@@ -640,6 +640,52 @@ class BaseSurvey:
             slices[(src, rx)] = slice(start_offset, end_offset)
         return slices
 
+    def save(self, file):
+        """
+        Save the survey to a binary file.
+
+        All the arrays of the sources and receivers (locations, times,
+        orientations, ...) are concatenated into a few columns of a single
+        ``.npz`` file, which is much smaller and faster to write and read
+        than pickling the survey.
+
+        Parameters
+        ----------
+        file : str or pathlib.Path or file-like
+            File where the survey is saved. The ``.npz`` extension is appended
+            to file names that don't have it.
+
+        See also
+        --------
+        .load
+        simpeg.data.Data.save
+        """
+        from .utils.io_utils._columnar import save_columnar
+
+        save_columnar(file, self)
+
+    @classmethod
+    def load(cls, file):
+        """
+        Load a survey saved with :meth:`save`.
+
+        The sources and receivers are rebuilt from the stored arrays without
+        validating them again.
+
+        Parameters
+        ----------
+        file : str or pathlib.Path or file-like
+            File where the survey was saved.
+
+        Returns
+        -------
+        simpeg.survey.BaseSurvey
+            The survey, with the same class as the saved one.
+        """
+        from .utils.io_utils._columnar import load_columnar
+
+        return load_columnar(file, cls)
+
 
 class BaseTimeSurvey(BaseSurvey):
     """Base SimPEG survey class for time-dependent simulations."""
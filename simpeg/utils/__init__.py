@@ -56,6 +56,7 @@ Matrix Utility Functions
   define_plane_from_points
   eigenvalue_by_power_iteration
   estimate_diagonal
+  jtj_diagonal
   spherical2cartesian
   unique_rows
 
@@ -152,8 +153,16 @@ used by SimPEG simulations.
 
   solver_utils.get_default_solver
   solver_utils.set_default_solver
+  solver_utils.SolverCache
+  solver_utils.solve_with_approximate_solver
+  solver_utils.MixedPrecisionSolver
+  solver_utils.SolutionCache
+  solver_utils.BlockKrylovSolver
+  solver_utils.SolverThreadPool
 """
 
+import importlib
+
 from discretize.utils.interpolation_utils import interpolation_matrix
 
 from .code_utils import (
@@ -207,6 +216,7 @@ from .mat_utils import (
     make_property_tensor,
     inverse_property_tensor,
     estimate_diagonal,
+    jtj_diagonal,
     Zero,
     Identity,
     unique_rows,
@@ -231,21 +241,42 @@ from .curv_utils import (
 from .counter_utils import Counter, count, timeIt
 from . import model_builder
 from . import solver_utils
-from . import io_utils
 from .coord_utils import (
     rotation_matrix_from_normals,
     rotate_points_from_normals,
 )
 from .model_utils import depth_weighting, distance_weighting
-from .plot_utils import plot2Ddata, plotLayer, plot_1d_layer_model
-from .io_utils import download
-from .pgi_utils import (
-    GaussianMixture,
-    WeightedGaussianMixture,
-    GaussianMixtureWithPrior,
-    GaussianMixtureWithNonlinearRelationships,
-    GaussianMixtureWithNonlinearRelationshipsWithPrior,
-)
+
+# Submodules importing matplotlib or scikit-learn, and their members, are only
+# imported when first accessed, so importing simpeg doesn't import them.
+_LAZY_SUBMODULES = ("io_utils", "plot_utils", "pgi_utils")
+_LAZY_MEMBERS = {
+    "plot2Ddata": "plot_utils",
+    "plotLayer": "plot_utils",
+    "plot_1d_layer_model": "plot_utils",
+    "download": "io_utils",
+    "GaussianMixture": "pgi_utils",
+    "WeightedGaussianMixture": "pgi_utils",
+    "GaussianMixtureWithPrior": "pgi_utils",
+    "GaussianMixtureWithNonlinearRelationships": "pgi_utils",
+    "GaussianMixtureWithNonlinearRelationshipsWithPrior": "pgi_utils",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    if name in _LAZY_MEMBERS:
+        module = importlib.import_module(f".{_LAZY_MEMBERS[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_SUBMODULES) | set(_LAZY_MEMBERS))
+
 
 # Deprecated imports
 interpmat = deprecate_function(
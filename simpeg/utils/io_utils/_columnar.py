@@ -0,0 +1,323 @@
+"""
+Columnar binary storage of SimPEG objects.
+
+Objects are stored in a single ``.npz`` file as tables: the objects of a class
+sharing the same attributes (e.g. all the dipole receivers of a survey) make a
+table, and each attribute is a column of the table. Numbers, strings, ids of
+other objects and arrays of the same dimension are stored as single arrays,
+so surveys with many sources and receivers are written and read with a few
+array operations instead of one pickled object per receiver. Other values are
+stored as JSON.
+
+Like pickle, objects are rebuilt from their state without calling their
+``__init__`` (and validators), and objects referenced more than once (e.g. the
+sources of a survey also used as keys of dictionaries of its receivers) are
+only stored once.
+"""
+
+import importlib
+import json
+import uuid
+
+import numpy as np
+
+_FORMAT_VERSION = 1
+
+# Attributes holding caches that depend on a mesh, stored as empty
+_CACHED_ATTRIBUTES = ("_Ps",)
+
+_SCALAR_TYPES = (bool, int, float, str)
+
+# Values that can't reference other objects
+_LEAF_TYPES = (np.ndarray, np.generic, uuid.UUID, type(None)) + _SCALAR_TYPES
+
+
+def _is_object(value):
+    """Whether a value is a SimPEG object, stored as a row of a table."""
+    return type(value).__module__.startswith("simpeg.") and hasattr(value, "__dict__")
+
+
+class _Encoder:
+    """Encode objects as tables of columns."""
+
+    def __init__(self):
+        self.ids = {}
+        self.objects = []
+        self.arrays = {}
+
+    def add_array(self, value):
+        name = f"array_{len(self.arrays)}"
+        self.arrays[name] = value
+        return name
+
+    def collect(self, root):
+        """Give an id to every object reachable from the root object."""
+        stack = [root]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, _LEAF_TYPES):
+                continue
+            if isinstance(value, (list, tuple)):
+                stack.extend(value)
+            elif isinstance(value, dict):
+                stack.extend(value.keys())
+                stack.extend(value.values())
+            elif _is_object(value) and id(value) not in self.ids:
+                self.ids[id(value)] = len(self.objects)
+                self.objects.append(value)
+                stack.extend(vars(value).values())
+
+    def encode_value(self, value):
+        """Encode any value as JSON, with arrays stored separately."""
+        if value is None or isinstance(value, _SCALAR_TYPES):
+            return value
+        if isinstance(value, (complex, np.complexfloating)):
+            return {"__complex__": [value.real, value.imag]}
+        if isinstance(value, np.generic):
+            return value.item()
+        if isinstance(value, np.ndarray):
+            if value.dtype.hasobject:
+                raise TypeError("Arrays of Python objects can't be saved.")
+            return {"__array__": self.add_array(value)}
+        if isinstance(value, list):
+            return {"__list__": [self.encode_value(v) for v in value]}
+        if isinstance(value, tuple):
+            return {"__tuple__": [self.encode_value(v) for v in value]}
+        if isinstance(value, dict):
+            items = [
+                [self.encode_value(k), self.encode_value(v)] for k, v in value.items()
+            ]
+            return {"__dict__": items}
+        if isinstance(value, uuid.UUID):
+            return {"__uuid__": value.hex}
+        if _is_object(value):
+            return {"__ref__": self.ids[id(value)]}
+        raise TypeError(f"Objects of type {type(value).__name__} can't be saved.")
+
+    def encode_column(self, values):
+        """Encode the values of an attribute of the objects of a table."""
+        types = {type(v) for v in values}
+        kind = types.pop() if len(types) == 1 else None
+
+        if kind is type(None):
+            return {"kind": "none"}
+        if kind in _SCALAR_TYPES or (kind is not None and issubclass(kind, np.generic)):
+            array = np.array(values)
+            if not array.dtype.hasobject:
+                return {
+                    "kind": "scalar",
+                    "data": self.add_array(array),
+                    "python": kind in _SCALAR_TYPES,
+                }
+        if kind is uuid.UUID:
+            data = np.frombuffer(b"".join(v.bytes for v in values), dtype=np.uint8)
+            return {"kind": "uuid", "data": self.add_array(data)}
+        if kind is np.ndarray:
+            dtypes = {v.dtype for v in values}
+            ndims = {v.ndim for v in values}
+            if len(dtypes) == 1 and len(ndims) == 1 and not dtypes.pop().hasobject:
+                data = np.concatenate([v.ravel() for v in values])
+                shapes = np.array([v.shape for v in values], dtype=np.int64)
+                return {
+                    "kind": "array",
+                    "data": self.add_array(data),
+                    "shapes": self.add_array(shapes.reshape(len(values), -1)),
+                }
+        if kind is not None and _is_object(values[0]):
+            ids = np.array([self.ids[id(v)] for v in values], dtype=np.int64)
+            return {"kind": "ref", "data": self.add_array(ids)}
+        if kind in (list, tuple):
+            counts = np.array([len(v) for v in values], dtype=np.int64)
+            return {
+                "kind": kind.__name__,
+                "counts": self.add_array(counts),
+                "items": self.encode_column([item for v in values for item in v]),
+            }
+        if kind is dict:
+            counts = np.array([len(v) for v in values], dtype=np.int64)
+            return {
+                "kind": "dict",
+                "counts": self.add_array(counts),
+                "keys": self.encode_column([k for v in values for k in v.keys()]),
+                "values": self.encode_column([x for v in values for x in v.values()]),
+            }
+        return {"kind": "json", "data": [self.encode_value(v) for v in values]}
+
+    def encode(self, root):
+        """Encode the root object, and all the objects reachable from it."""
+        self.collect(root)
+        tables = {}
+        for obj in self.objects:
+            state = vars(obj)
+            key = (type(obj), tuple(state.keys()))
+            tables.setdefault(key, []).append(obj)
+
+        header = []
+        for (cls, names), objects in tables.items():
+            columns = []
+            for name in names:
+                values = [vars(obj)[name] for obj in objects]
+                if name in _CACHED_ATTRIBUTES:
+                    values = [type(v)() for v in values]
+                columns.append(self.encode_column(values))
+            ids = np.array([self.ids[id(obj)] for obj in objects], dtype=np.int64)
+            header.append(
+                {
+                    "class": f"{cls.__module__}:{cls.__qualname__}",
+                    "ids": self.add_array(ids),
+                    "names": list(names),
+                    "columns": columns,
+                }
+            )
+        return {
+            "version": _FORMAT_VERSION,
+            "n_objects": len(self.objects),
+            "root": self.encode_value(root),
+            "tables": header,
+        }
+
+
+class _Decoder:
+    """Rebuild the objects encoded by :class:`_Encoder`."""
+
+    def __init__(self, arrays):
+        self.arrays = arrays
+        self.objects = None
+
+    def decode_value(self, value):
+        if not isinstance(value, dict):
+            return value
+        if "__array__" in value:
+            return self.arrays[value["__array__"]]
+        if "__list__" in value:
+            return [self.decode_value(v) for v in value["__list__"]]
+        if "__tuple__" in value:
+            return tuple(self.decode_value(v) for v in value["__tuple__"])
+        if "__dict__" in value:
+            return {
+                self.decode_value(k): self.decode_value(v) for k, v in value["__dict__"]
+            }
+        if "__complex__" in value:
+            return complex(*value["__complex__"])
+        if "__uuid__" in value:
+            return uuid.UUID(hex=value["__uuid__"])
+        return self.objects[value["__ref__"]]
+
+    def decode_column(self, column, n):
+        kind = column["kind"]
+        if kind == "none":
+            return [None] * n
+        if kind == "json":
+            return [self.decode_value(v) for v in column["data"]]
+        if kind in ("list", "tuple", "dict"):
+            counts = self.arrays[column["counts"]].tolist()
+            n_items = sum(counts)
+            if kind == "dict":
+                items = zip(
+                    self.decode_column(column["keys"], n_items),
+                    self.decode_column(column["values"], n_items),
+                )
+                items = list(items)
+                container = dict
+            else:
+                items = self.decode_column(column["items"], n_items)
+                container = list if kind == "list" else tuple
+            values = []
+            start = 0
+            for count in counts:
+                values.append(container(items[start : start + count]))
+                start += count
+            return values
+
+        data = self.arrays[column["data"]]
+        if kind == "scalar":
+            return data.tolist() if column["python"] else list(data)
+        if kind == "uuid":
+            return [uuid.UUID(bytes=row.tobytes()) for row in data.reshape(n, 16)]
+        if kind == "ref":
+            return [self.objects[i] for i in data.tolist()]
+        # arrays with the same dimension
+        shapes = self.arrays[column["shapes"]]
+        ends = np.cumsum(np.prod(shapes, axis=1)).tolist()
+        values = []
+        start = 0
+        for end, shape in zip(ends, shapes.tolist()):
+            values.append(data[start:end].reshape(shape))
+            start = end
+        return values
+
+    def decode(self, header):
+        # create all the objects first, so they can reference each other
+        self.objects = [None] * header["n_objects"]
+        classes = []
+        for table in header["tables"]:
+            module_name, qualname = table["class"].split(":")
+            if not module_name.startswith("simpeg."):
+                raise TypeError(f"Can't load objects of type {table['class']}.")
+            cls = importlib.import_module(module_name)
+            for name in qualname.split("."):
+                cls = getattr(cls, name)
+            ids = self.arrays[table["ids"]].tolist()
+            for i in ids:
+                self.objects[i] = cls.__new__(cls)
+            classes.append(ids)
+
+        # set their state directly, bypassing properties and validation
+        for table, ids in zip(header["tables"], classes):
+            columns = [self.decode_column(c, len(ids)) for c in table["columns"]]
+            names = table["names"]
+            for i, values in zip(ids, zip(*columns)):
+                self.objects[i].__dict__.update(zip(names, values))
+        return self.decode_value(header["root"])
+
+
+def save_columnar(file, obj):
+    """
+    Save an object to a columnar ``.npz`` file.
+
+    Parameters
+    ----------
+    file : str or pathlib.Path or file-like
+        File where the object is saved. The ``.npz`` extension is appended to
+        file names that don't have it.
+    obj : object
+        A SimPEG object, like a survey or a data object.
+    """
+    encoder = _Encoder()
+    header = json.dumps(encoder.encode(obj))
+    np.savez(
+        file,
+        header=np.frombuffer(header.encode("utf-8"), dtype=np.uint8),
+        **encoder.arrays,
+    )
+
+
+def load_columnar(file, expected_type=object):
+    """
+    Load an object saved by :func:`save_columnar`.
+
+    Parameters
+    ----------
+    file : str or pathlib.Path or file-like
+        File where the object was saved.
+    expected_type : type, optional
+        Type the loaded object must have.
+
+    Returns
+    -------
+    object
+    """
+    with np.load(file, allow_pickle=False) as npz:
+        header = json.loads(npz["header"].tobytes().decode("utf-8"))
+        if header["version"] > _FORMAT_VERSION:
+            raise IOError(
+                f"The file was saved with a newer format (version {header['version']})."
+            )
+        arrays = {name: npz[name] for name in npz.files if name != "header"}
+    obj = _Decoder(arrays).decode(header)
+    if not isinstance(obj, expected_type):
+        raise TypeError(
+            f"The file contains a {type(obj).__name__}, "
+            f"not a {expected_type.__name__}."
+        )
+    return obj
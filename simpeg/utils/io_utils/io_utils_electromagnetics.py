@@ -1,7 +1,10 @@
+import itertools
+
 import numpy as np
 from discretize.utils import mkvc
 import warnings
 from ..code_utils import validate_string, validate_type
+from .io_utils_general import _load_rows
 
 
 ########################################################################################
@@ -189,6 +192,117 @@ def read_dcip_xyz(
         return data_object
 
 
+def _read_ubc_lines(file_name):
+    """Non blank lines of a UBC-GIF file, without comments and outer whitespace."""
+    with open(file_name, "r") as fid:
+        lines = [line.split("!")[0].strip() for line in fid]
+    return [line for line in lines if line]
+
+
+def _read_dcip_sources(lines, file_name, dim, data_type):
+    """Read the transmitter blocks of UBC-GIF DC/IP general or surface formats.
+
+    The first line of each block has the locations of the transmitter
+    electrodes and the number of receivers, followed by a line for each
+    receiver. All the receiver lines are parsed at once.
+
+    Parameters
+    ----------
+    lines : list of str
+        Non blank lines of the blocks, see :func:`_read_ubc_lines`.
+    file_name : str
+        The file path to the data file, used in error messages.
+    dim : {2, 3}
+        Dimension of the survey.
+    data_type : str
+        Data type of the receivers.
+
+    Returns
+    -------
+    source_list : list of simpeg.electromagnetics.static.resistivity.sources.BaseSrc
+        Sources of the blocks.
+    d, wd : numpy.ndarray or None
+        Data and uncertainties (or apparent resistivities), if present.
+    is_surface : bool
+        Whether the locations were in surface format, with elevations set to
+        9999 m.
+    """
+    # Prevent circular import
+    from ...electromagnetics.static import resistivity as dc
+
+    blocks = []
+    ii = 0
+    while ii < len(lines):
+        tx_row = np.array(lines[ii].split(), dtype=float)
+        n_rx = int(tx_row[-1])
+        blocks.append((tx_row, ii + 1, n_rx))
+        ii += 1 + n_rx
+    rx_lines = itertools.chain.from_iterable(
+        lines[start : start + n_rx] for _, start, n_rx in blocks
+    )
+    rows = _load_rows(list(rx_lines), file_name, first_line=None)
+
+    # Surface locations don't have elevations
+    n_surface = dim - 1
+    source_list = []
+    d = []
+    wd = []
+
+    # Flags for z value provided
+    is_surface = False
+    is_pole_tx = False
+    is_pole_rx = False
+
+    start = 0
+    for tx_row, _, n_rx in blocks:
+        rx_rows = rows[start : start + n_rx]
+        start += n_rx
+
+        # Check if z value is provided, if False -> 9999
+        if len(tx_row) == 2 * n_surface + 1:
+            a = np.r_[tx_row[:n_surface], 9999]
+            b = np.r_[tx_row[n_surface : 2 * n_surface], 9999]
+            is_surface = True
+        else:
+            a = tx_row[:dim]
+            b = tx_row[dim : 2 * dim]
+        # check if pole|dipole
+        is_pole_tx = is_pole_tx or np.allclose(a, b)
+
+        if is_surface:
+            data_column_index = 2 * n_surface
+            elevation = np.full((rx_rows.shape[0], 1), 9999.0)
+            m = np.c_[rx_rows[:, :n_surface], elevation]
+            n = np.c_[rx_rows[:, n_surface : 2 * n_surface], elevation]
+        else:
+            # Since dpred for dc has app_res
+            data_column_index = 2 * dim
+            m = rx_rows[:, :dim]
+            n = rx_rows[:, dim : 2 * dim]
+
+        # Check if Pole Receiver
+        is_pole_rx = is_pole_rx or np.any(np.all(np.isclose(m, n), axis=1))
+
+        # Predicted/observed data, and uncertainties or apparent resistivities
+        if rx_rows.shape[1] > data_column_index:
+            d.append(rx_rows[:, data_column_index])
+        if rx_rows.shape[1] > data_column_index + 1:
+            wd.append(rx_rows[:, data_column_index + 1])
+
+        if is_pole_rx:
+            Rx = dc.receivers.Pole(m, data_type=data_type)
+        else:
+            Rx = dc.receivers.Dipole(m, n, data_type=data_type)
+        if is_pole_tx:
+            source_list.append(dc.sources.Pole([Rx], a))
+        else:
+            source_list.append(dc.sources.Dipole([Rx], a, b))
+
+    d = np.concatenate(d) if len(d) > 0 else None
+    wd = np.concatenate(wd) if len(wd) > 0 else None
+    return source_list, d, wd, is_surface
+
+
 def read_dcip2d_ubc(file_name, data_type, format_type):
     """Read UBC-GIF DCIP2D formatted survey or data files.
 
@@ -243,7 +357,7 @@ def read_dcip2d_ubc(file_name, data_type, format_type):
     from ...data import Data
 
     # Load file
-    obsfile = np.genfromtxt(file_name, delimiter="\n", dtype=str, comments="!")
+    obsfile = _read_ubc_lines(file_name)
 
     # Find starting data
     start_index = 0
@@ -260,15 +374,9 @@ def read_dcip2d_ubc(file_name, data_type, format_type):
         data_type = "volt"
 
     # Pre-allocate
-    source_list = []
     d = []
     wd = []
 
-    # Flag for z value provided
-    is_surface = False
-    is_pole_tx = False
-    is_pole_rx = False
-
     if format_type == "simple":
         # Load numeric data into an array
         if data_type == "volt":
@@ -321,91 +429,17 @@ def read_dcip2d_ubc(file_name, data_type, format_type):
         )
 
     else:
-        # Countdown for number of obs/tx
-        count = 0
-        for ii in range(obsfile.shape[0]):
-            if not obsfile[ii]:
-                continue
-
-            # Extract transmitter ii and the number of receivers
-            if count == 0:
-                rx = []
-                temp = np.fromstring(obsfile[ii], dtype=float, sep=" ").T
-                count = int(temp[-1])
-
-                # Check if z value is provided, if False -> 9999
-                if len(temp) == 3:
-                    # check if pole|dipole
-                    if np.allclose(temp[0], temp[1]):
-                        tx = np.r_[temp[0], 9999]
-                        is_pole_tx = True
-                    else:
-                        tx = np.r_[temp[0], 9999, temp[1], 9999]
-                    is_surface = True
-
-                else:
-                    # check if pole|dipole
-                    if np.allclose(temp[0:2], temp[2:4]):
-                        tx = np.r_[temp[0:2]]
-                        is_pole_tx = True
-                    else:
-                        tx = temp[:-1]
-
-                continue
-
-            # Extract receivers
-            temp = np.fromstring(obsfile[ii], dtype=float, sep=" ")
-
-            if is_surface:
-                data_column_index = 2
-
-                # Check if Pole Receiver
-                if np.allclose(temp[0], temp[1]):
-                    is_pole_rx = True
-                    rx.append(np.r_[temp[0], 9999])
-                else:
-                    rx.append(np.r_[temp[0], 9999, temp[1], 9999])
-
-            else:
-                data_column_index = 4  # Since dpred for dc has app_res
-
-                # Check if Pole Receiver
-                if np.allclose(temp[0:2], temp[2:4]):
-                    is_pole_rx = True
-                    rx.append(temp[:2])
-                else:
-                    rx.append(temp[:4])
-
-            # Predicted/observed data
-            if len(temp) == data_column_index + 1:
-                d.append(temp[data_column_index])
-
-            # Observed data or predicted DC data (since app res column)
-            elif len(temp) == data_column_index + 2:
-                d.append(temp[data_column_index])
-                wd.append(temp[data_column_index + 1])
-
-            count = count - 1
-
-            # Reach the end of transmitter block
-            if count == 0:
-                rx = np.asarray(rx)
-                if is_pole_rx:
-                    Rx = dc.receivers.Pole(rx[:, :2], data_type=data_type)
-                else:
-                    Rx = dc.receivers.Dipole(rx[:, :2], rx[:, 2:], data_type=data_type)
-                if is_pole_tx:
-                    source_list.append(dc.sources.Pole([Rx], tx[:2]))
-                else:
-                    source_list.append(dc.sources.Dipole([Rx], tx[:2], tx[2:]))
+        source_list, d, wd, is_surface = _read_dcip_sources(
+            obsfile, file_name, 2, data_type
+        )
 
         survey = dc.survey.Survey(source_list)
         data_out = Data(survey=survey)
 
-        if len(d) > 0:
+        if d is not None:
             data_out.dobs = d
 
-        if len(wd) > 0:
+        if wd is not None:
             data_out.standard_deviation = wd
 
         if is_surface:
@@ -460,17 +494,7 @@ def read_dcip3d_ubc(file_name, data_type):
     from ...data import Data
 
     # Load file
-    obsfile = np.genfromtxt(file_name, delimiter="\n", dtype=str, comments="!")
-
-    # Pre-allocate
-    source_list = []
-    d = []
-    wd = []
-
-    # Flag for z value provided
-    is_surface = False
-    is_pole_tx = False
-    is_pole_rx = False
+    obsfile = _read_ubc_lines(file_name)
 
     # IP data for dcip3d has a line with a flag we can remove.
     if obsfile[0][0:6] == "IPTYPE":
@@ -481,91 +505,17 @@ def read_dcip3d_ubc(file_name, data_type):
     if data_type == "secondary_potential":
         data_type = "volt"
 
-    # Countdown for number of obs/tx
-    count = 0
-    for ii in range(obsfile.shape[0]):
-        if not obsfile[ii]:
-            continue
-
-        # Extract transmitter ii and the number of receivers
-        if count == 0:
-            rx = []
-            temp = np.fromstring(obsfile[ii], dtype=float, sep=" ").T
-            count = int(temp[-1])
-
-            # Check if z value is provided, if False -> 9999
-            if len(temp) == 5:
-                # check if pole|dipole
-                if np.allclose(temp[0:2], temp[2:4]):
-                    tx = np.r_[temp[0:2], 9999]
-                    is_pole_tx = True
-                else:
-                    tx = np.r_[temp[0:2], 9999, temp[2:4], 9999]
-                is_surface = True
-
-            else:
-                # check if pole|dipole
-                if np.allclose(temp[0:3], temp[3:6]):
-                    tx = np.r_[temp[0:3]]
-                    is_pole_tx = True
-                else:
-                    tx = temp[:-1]
-
-            continue
-
-        # Extract receivers
-        temp = np.fromstring(obsfile[ii], dtype=float, sep=" ")
-
-        if is_surface:
-            data_column_index = 4  # Since dpred for dc has app_res
-
-            # Check if Pole Receiver
-            if np.allclose(temp[0:2], temp[2:4]):
-                is_pole_rx = True
-                rx.append(temp[:2])
-            else:
-                rx.append(np.r_[temp[0:2], 9999, temp[2:4], 9999])
-
-        else:
-            data_column_index = 6  # Since dpred for dc has app_res
-
-            # Check if Pole Receiver
-            if np.allclose(temp[0:3], temp[3:6]):
-                is_pole_rx = True
-                rx.append(temp[:3])
-            else:
-                rx.append(temp[:6])
-
-        # Predicted/observed data
-        if len(temp) == data_column_index + 1:
-            d.append(temp[data_column_index])
-
-        # Observed data or predicted DC data (since app res column)
-        elif len(temp) == data_column_index + 2:
-            d.append(temp[data_column_index])
-            wd.append(temp[data_column_index + 1])
-
-        count = count - 1
-
-        # Reach the end of transmitter block
-        if count == 0:
-            rx = np.asarray(rx)
-            if is_pole_rx:
-                Rx = dc.receivers.Pole(rx[:, :3], data_type=data_type)
-            else:
-                Rx = dc.receivers.Dipole(rx[:, :3], rx[:, 3:], data_type=data_type)
-            if is_pole_tx:
-                source_list.append(dc.sources.Pole([Rx], tx[:3]))
-            else:
-                source_list.append(dc.sources.Dipole([Rx], tx[:3], tx[3:]))
+    source_list, d, wd, is_surface = _read_dcip_sources(
+        obsfile, file_name, 3, data_type
+    )
 
     survey = dc.survey.Survey(source_list)
     data_out = Data(survey=survey)
 
-    if len(d) > 0:
+    if d is not None:
         data_out.dobs = d
 
-    if len(wd) > 0:
+    if wd is not None:
         data_out.standard_deviation = wd
 
     if is_surface:
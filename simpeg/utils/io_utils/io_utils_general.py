@@ -1,3 +1,5 @@
+import warnings
+
 import numpy as np
 
 
@@ -151,3 +153,78 @@ def download(url, folder=".", overwrite=False, verbose=True):
 
     print("Download completed!")
     return downloadpath if isinstance(url, list) else downloadpath[0]
+
+
+def _stack_rows(rows):
+    """
+    Stack rows, or blocks of rows, with possibly different numbers of columns.
+
+    Rows with fewer columns than the longest one are padded with NaN.
+
+    Parameters
+    ----------
+    rows : list of numpy.ndarray
+        Rows as 1D arrays, or blocks of rows as 2D arrays.
+
+    Returns
+    -------
+    (n_rows, n_columns) numpy.ndarray
+    """
+    rows = [np.atleast_2d(row) for row in rows]
+    n_columns = max((row.shape[1] for row in rows), default=0)
+    if all(row.shape[1] == n_columns for row in rows):
+        return np.concatenate(rows) if rows else np.empty((0, 0))
+    out = np.full((sum(row.shape[0] for row in rows), n_columns), np.nan)
+    start = 0
+    for row in rows:
+        out[start : start + row.shape[0], : row.shape[1]] = row
+        start += row.shape[0]
+    return out
+
+
+def _load_rows(lines, file_name="", first_line=1):
+    """
+    Parse lines of whitespace separated numbers into a 2D array.
+
+    All the lines are parsed in a single call to :func:`numpy.loadtxt`, and
+    they are only parsed one at a time if they don't have the same number of
+    columns. Blank lines and comments starting with ``!`` are skipped.
+
+    Parameters
+    ----------
+    lines : list of str
+        Lines to parse.
+    file_name : str, optional
+        Name of the file the lines were read from, used in error messages.
+    first_line : int or None, optional
+        Line number of the first line in the file, used in error messages. Use
+        None if the lines are not consecutive lines of the file.
+
+    Returns
+    -------
+    (n_rows, n_columns) numpy.ndarray
+        The numbers of each non blank line. Rows with fewer columns than the
+        longest one are padded with NaN.
+    """
+    try:
+        with warnings.catch_warnings():
+            # lines could all be blank
+            warnings.simplefilter("ignore", UserWarning)
+            return np.loadtxt(lines, comments="!", ndmin=2)
+    except ValueError:
+        pass
+
+    rows = []
+    for ii, line in enumerate(lines):
+        line = line.split("!")[0]
+        try:
+            row = np.array(line.split(), dtype=float)
+        except ValueError:
+            where = "a line" if first_line is None else f"line {first_line + ii}"
+            raise IOError(
+                f"Unable to parse {where} of '{file_name}' as a sequence of "
+                + f"floats: '{line.strip()}'."
+            )
+        if row.size > 0:
+            rows.append(row)
+    return _stack_rows(rows)
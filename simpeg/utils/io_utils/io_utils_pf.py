@@ -1,8 +1,84 @@
+import itertools
+
 import numpy as np
-from discretize.utils import mkvc
+
+from ..code_utils import validate_integer
+from .io_utils_general import _load_rows, _stack_rows
+
+# Maximum number of lines of a file parsed at once
+_MAX_PARSED_LINES = 100_000
+
+
+def _read_row_blocks(fid, n_rows, chunk_size, file_name, first_line):
+    """
+    Read the rows of numbers of a UBC-GIF data file in blocks.
+
+    Parameters
+    ----------
+    fid : file object
+        File opened in text mode, positioned at the first row.
+    n_rows : int
+        Number of rows to read. Blank lines are not counted.
+    chunk_size : int or None
+        Number of rows of each block. If None, all the rows are returned in a
+        single block.
+    file_name : str
+        Name of the file, used in error messages.
+    first_line : int
+        Line number of the first row in the file, used in error messages.
+
+    Yields
+    ------
+    (n, n_columns) numpy.ndarray
+        Blocks of rows. Rows with fewer columns than the longest one of their
+        block are padded with NaN.
+    """
+    block_size = n_rows if chunk_size is None else chunk_size
+    line_number = first_line
+    n_read = 0
+    pending, n_pending = [], 0
+    while n_read < n_rows:
+        n_lines = min(block_size - n_pending, n_rows - n_read, _MAX_PARSED_LINES)
+        lines = list(itertools.islice(fid, n_lines))
+        if not lines:
+            raise IOError(
+                f"Found EOF at line {line_number} while reading '{file_name}'."
+            )
+        rows = _load_rows(lines, file_name, line_number)
+        line_number += len(lines)
+        n_read += rows.shape[0]
+        if rows.shape[0] > 0:
+            pending.append(rows)
+            n_pending += rows.shape[0]
+        if n_pending == block_size or n_read == n_rows:
+            yield _stack_rows(pending)
+            pending, n_pending = [], 0
+    if chunk_size is None and n_rows == 0:
+        yield np.empty((0, 3))
+
+
+def _column(rows, index):
+    """Column of a block of rows, or None if it's missing or all zeros."""
+    if rows.shape[1] <= index:
+        return None
+    # missing values of short rows are zeros
+    column = np.nan_to_num(rows[:, index])
+    if np.all(column == 0.0):
+        return None
+    return column
+
+
+def _read_blocks(read_file, obs_file, chunk_size):
+    """Data of the whole file, or a generator over its blocks."""
+    blocks = read_file(obs_file, chunk_size)
+    if chunk_size is not None:
+        return blocks
+    data_object = next(blocks)
+    blocks.close()
+    return data_object
 
 
-def read_mag3d_ubc(obs_file):
+def read_mag3d_ubc(obs_file, chunk_size=None):
     """Read UBC-GIF MAG3D formatted survey or data files.
 
     This method can load survey locations, predicted data or observations
@@ -13,69 +89,50 @@ def read_mag3d_ubc(obs_file):
     ----------
     obs_file : str
         Path to a UBC-GIF MAG3D formatted data file
+    chunk_size : int, optional
+        If provided, the file is streamed in blocks of `chunk_size` locations
+        and a generator over a data object for each block is returned.
 
     Returns
     -------
-    simpeg.data.Data
+    simpeg.data.Data or generator of simpeg.data.Data
         Instance of a SimPEG data class. The `survey` attribute associated with
         the data object is an instance of :class`simpeg.potential_fields.magnetics.survey.Survey`.
     """
+    if chunk_size is not None:
+        chunk_size = validate_integer("chunk_size", chunk_size, min_val=1)
+    return _read_blocks(_read_mag3d_blocks, obs_file, chunk_size)
+
 
+def _read_mag3d_blocks(obs_file, chunk_size):
+    """Generator over the data objects of blocks of a MAG3D file."""
     # Prevent circular import
     from ...potential_fields import magnetics
     from ...data import Data
 
-    fid = open(obs_file, "r")
-
-    # First line has the inclination,declination and amplitude of B0
-    line = fid.readline()
-    B = np.array(line.split()[:3], dtype=float)
-
-    # Second line has the magnetization orientation and a flag.
-    # We are going to ignore those values.
-    line = fid.readline()
-
-    # Third line has the number of rows
-    line = fid.readline()
-    ndat = int(line.split()[0])
-
-    # Pre-allocate space for obsx, obsy, obsz, data, uncert
-    line = fid.readline()
-    temp = np.array(line.split(), dtype=float)
-
-    d = np.zeros(ndat, dtype=float)
-    wd = np.zeros(ndat, dtype=float)
-    locXYZ = np.zeros((ndat, 3), dtype=float)
-
-    ii = 0
-    while ii < ndat:
-        temp = np.array(line.split(), dtype=float)
-        if len(temp) > 0:
-            locXYZ[ii, :] = temp[:3]
-
-            if len(temp) > 3:
-                d[ii] = temp[3]
-
-                if len(temp) == 5:
-                    wd[ii] = temp[4]
-            ii += 1
+    with open(obs_file, "r") as fid:
+        # First line has the inclination,declination and amplitude of B0
         line = fid.readline()
-    fid.close()
-
-    if np.all(wd == 0.0):
-        wd = None
+        B = np.array(line.split()[:3], dtype=float)
 
-    if np.all(d == 0.0):
-        d = None
+        # Second line has the magnetization orientation and a flag.
+        # We are going to ignore those values.
+        line = fid.readline()
 
-    rxLoc = magnetics.receivers.Point(locXYZ)
-    srcField = magnetics.sources.UniformBackgroundField(
-        [rxLoc], amplitude=B[2], inclination=B[0], declination=B[1]
-    )
-    survey = magnetics.survey.Survey(srcField)
-    data_object = Data(survey, dobs=d, standard_deviation=wd)
+        # Third line has the number of rows
+        line = fid.readline()
+        ndat = int(line.split()[0])
 
-    return data_object
+        # Rows have obsx, obsy, obsz and optionally data and uncert
+        for rows in _read_row_blocks(fid, ndat, chunk_size, obs_file, 4):
+            rxLoc = magnetics.receivers.Point(rows[:, :3])
+            srcField = magnetics.sources.UniformBackgroundField(
+                [rxLoc], amplitude=B[2], inclination=B[0], declination=B[1]
+            )
+            survey = magnetics.survey.Survey(srcField)
+            yield Data(
+                survey, dobs=_column(rows, 3), standard_deviation=_column(rows, 4)
+            )
 
 
 def write_mag3d_ubc(filename, data_object):
@@ -122,7 +179,7 @@ def write_mag3d_ubc(filename, data_object):
     print("Observation file saved to: " + filename)
 
 
-def read_grav3d_ubc(obs_file):
+def read_grav3d_ubc(obs_file, chunk_size=None):
     """Read UBC-GIF GRAV3D formatted survey or data files.
 
     This method can load survey locations, predicted data or observations
@@ -133,61 +190,44 @@ def read_grav3d_ubc(obs_file):
     ----------
     obs_file : str
         Path to a UBC-GIF GRAV3D formatted file
+    chunk_size : int, optional
+        If provided, the file is streamed in blocks of `chunk_size` locations
+        and a generator over a data object for each block is returned.
 
     Returns
     -------
-    simpeg.data.Data
+    simpeg.data.Data or generator of simpeg.data.Data
         Instance of a SimPEG data class. The `survey` attribute associated with
         the data object is an instance of :class`simpeg.potential_fields.gravity.survey.Survey`.
     """
+    if chunk_size is not None:
+        chunk_size = validate_integer("chunk_size", chunk_size, min_val=1)
+    return _read_blocks(_read_grav3d_blocks, obs_file, chunk_size)
+
 
+def _read_grav3d_blocks(obs_file, chunk_size):
+    """Generator over the data objects of blocks of a GRAV3D file."""
     # Prevent circular import
     from ...potential_fields import gravity
     from ...data import Data
 
-    fid = open(obs_file, "r")
-
-    # First line has the number of rows
-    line = fid.readline()
-    ndat = int(line.split()[0])
-
-    # Pre-allocate space for obsx, obsy, obsz, data, uncert
-    line = fid.readline()
+    with open(obs_file, "r") as fid:
+        # First line has the number of rows
+        line = fid.readline()
+        ndat = int(line.split()[0])
 
-    d = np.zeros(ndat, dtype=float)
-    wd = np.zeros(ndat, dtype=float)
-    locXYZ = np.zeros((ndat, 3), dtype=float)
+        # Rows have obsx, obsy, obsz and optionally data and uncert
+        for rows in _read_row_blocks(fid, ndat, chunk_size, obs_file, 2):
+            d = _column(rows, 3)
+            # UBC and SimPEG used opposite sign convention for
+            # gravity data so must multiply by -1.
+            if d is not None:
+                d *= -1.0
 
-    ii = 0
-    while ii < ndat:
-        temp = np.array(line.split(), dtype=float)
-        if len(temp) > 0:
-            locXYZ[ii, :] = temp[:3]
-            if len(temp) > 3:
-                d[ii] = temp[3]
-
-                if len(temp) == 5:
-                    wd[ii] = temp[4]
-
-            ii += 1
-        line = fid.readline()
-    fid.close()
-
-    if np.all(wd == 0.0):
-        wd = None
-
-    # UBC and SimPEG used opposite sign convention for
-    # gravity data so must multiply by -1.
-    if np.all(d == 0.0):
-        d = None
-    else:
-        d *= -1.0
-
-    rxLoc = gravity.receivers.Point(locXYZ)
-    srcField = gravity.sources.SourceField([rxLoc])
-    survey = gravity.survey.Survey(srcField)
-    data_object = Data(survey, dobs=d, standard_deviation=wd)
-    return data_object
+            rxLoc = gravity.receivers.Point(rows[:, :3])
+            srcField = gravity.sources.SourceField([rxLoc])
+            survey = gravity.survey.Survey(srcField)
+            yield Data(survey, dobs=d, standard_deviation=_column(rows, 4))
 
 
 def write_grav3d_ubc(filename, data_object):
@@ -230,7 +270,7 @@ def write_grav3d_ubc(filename, data_object):
     print("Observation file saved to: " + filename)
 
 
-def read_gg3d_ubc(obs_file):
+def read_gg3d_ubc(obs_file, chunk_size=None):
     """Read UBC-GIF GG3D formatted survey or data files.
 
     This method can load survey locations, predicted data or observations
@@ -241,14 +281,23 @@ def read_gg3d_ubc(obs_file):
     ----------
     obs_file : str
         Path to a UBC-GIF GG3D formatted file
+    chunk_size : int, optional
+        If provided, the file is streamed in blocks of `chunk_size` locations
+        and a generator over a data object for each block is returned.
 
     Returns
     -------
-    simpeg.data.Data
+    simpeg.data.Data or generator of simpeg.data.Data
         Instance of a SimPEG data class. The `survey` attribute associated with
         the data object is an instance of :class`simpeg.potential_fields.gravity.survey.Survey`.
     """
+    if chunk_size is not None:
+        chunk_size = validate_integer("chunk_size", chunk_size, min_val=1)
+    return _read_blocks(_read_gg3d_blocks, obs_file, chunk_size)
 
+
+def _read_gg3d_blocks(obs_file, chunk_size):
+    """Generator over the data objects of blocks of a GG3D file."""
     # Prevent circular import
     from ...potential_fields import gravity
     from ...data import Data
@@ -276,45 +325,21 @@ def read_gg3d_ubc(obs_file):
         line = fid.readline()
         ndat = int(line.split()[0])
 
-        locXYZ = np.zeros((ndat, 3), dtype=float)
-        d = []
-        wd = []
-
-        ii = 0
-        while ii < ndat:
-            line = fid.readline()
-            if not line:
-                raise IOError(f"Found EOF at line {ii + 3} while reading '{obs_file}'.")
-            try:
-                temp = np.array(line.split(), dtype=float)
-            except IOError:
-                raise IOError(
-                    f"Unable to parse line {ii + 3} of '{obs_file}' as a sequence of "
-                    + f"floats: '{line}'."
-                )
-            locXYZ[ii, :] = temp[:3]
-            if len(temp) == 3 + n_comp:
-                d.append(factor * temp[3:])
-            elif len(temp) == 3 + n_comp * 2:
-                d.append(factor * temp[3 : 3 + n_comp])
-                wd.append(temp[3 + n_comp :])
-            ii += 1
-
-    # Turn into vector. For multiple components, SimPEG orders by rows
-    if len(d) > 0:
-        d = mkvc(np.stack(d).T)
-    else:
-        d = None
-    if len(wd) > 0:
-        wd = mkvc(np.stack(wd).T)
-    else:
-        wd = None
-
-    rxLoc = gravity.receivers.Point(locXYZ, components=components)
-    srcField = gravity.sources.SourceField([rxLoc])
-    survey = gravity.survey.Survey(srcField)
-    data_object = Data(survey, dobs=d, standard_deviation=wd)
-    return data_object
+        for rows in _read_row_blocks(fid, ndat, chunk_size, obs_file, 3):
+            # missing values of short rows are zeros
+            rows = np.nan_to_num(rows)
+
+            # For multiple components, SimPEG orders by rows
+            d = wd = None
+            if rows.shape[1] >= 3 + n_comp:
+                d = (factor * rows[:, 3 : 3 + n_comp]).ravel()
+            if rows.shape[1] >= 3 + 2 * n_comp:
+                wd = rows[:, 3 + n_comp : 3 + 2 * n_comp].ravel()
+
+            rxLoc = gravity.receivers.Point(rows[:, :3], components=components)
+            srcField = gravity.sources.SourceField([rxLoc])
+            survey = gravity.survey.Survey(srcField)
+            yield Data(survey, dobs=d, standard_deviation=wd)
 
 
 def write_gg3d_ubc(filename, data_object):
@@ -1,6 +1,8 @@
 import warnings
+from typing import Literal
+
 import numpy as np
-from .code_utils import deprecate_function
+from .code_utils import deprecate_function, validate_float
 from ..typing import RandomSeed
 from discretize.utils import (  # noqa: F401
     Zero,
@@ -25,6 +27,19 @@ from discretize.utils import (  # noqa: F401
     inverse_property_tensor,
 )
 
+try:
+    import numba
+    from numba import njit, prange
+except ImportError:
+    numba = None
+
+    # Define dummy njit decorator
+    def njit(*args, **kwargs):
+        return lambda f: f
+
+    # Define dummy prange function
+    prange = range
+
 
 def estimate_diagonal(matrix_arg, n, k=None, approach="Probing"):
     r"""Estimate the diagonal of a matrix.
@@ -105,6 +120,115 @@ def estimate_diagonal(matrix_arg, n, k=None, approach="Probing"):
     return d
 
 
+def jtj_diagonal(
+    J,
+    weights=None,
+    max_chunk_size: float = 128.0,
+    engine: Literal["numpy", "numba"] = "numpy",
+):
+    r"""Compute the diagonal of :math:`\mathbf{J^T W J}` for a dense matrix.
+
+    The diagonal is accumulated over blocks of rows of :math:`\mathbf{J}`,
+    so no temporary the size of :math:`\mathbf{J}` is ever created. This makes
+    it suitable for large stored sensitivity matrices, including
+    ``numpy.memmap`` arrays stored on disk, which are only read one block of
+    rows at a time.
+
+    Parameters
+    ----------
+    J : (n_data, n_param) numpy.ndarray or numpy.memmap
+        Dense matrix, typically a sensitivity matrix.
+    weights : (n_data,) numpy.ndarray, optional
+        Diagonal of the weighting matrix :math:`\mathbf{W}`. If ``None``,
+        :math:`\mathbf{W}` is the identity.
+    max_chunk_size : float, optional
+        Maximum size in MB of the block of rows processed at once.
+    engine : {"numpy", "numba"}, optional
+        Implementation used for each block of rows: ``numpy.einsum``, or a
+        compiled kernel parallelized with numba over the columns of
+        :math:`\mathbf{J}`. The ``"numba"`` engine requires numba to be
+        installed.
+
+    Returns
+    -------
+    (n_param,) numpy.ndarray
+        Diagonal of :math:`\mathbf{J^T W J}`.
+
+    Notes
+    -----
+    Each element of the diagonal is given by:
+
+    .. math::
+
+        \left( \mathbf{J^T W J} \right)_{jj} = \sum_i w_i J_{ij}^2
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from simpeg.utils import jtj_diagonal
+    >>> J = np.arange(6.0).reshape(3, 2)
+    >>> jtj_diagonal(J)
+    array([20., 35.])
+    >>> w = np.r_[1.0, 2.0, 3.0]
+    >>> np.allclose(jtj_diagonal(J, weights=w), np.diag(J.T @ np.diag(w) @ J))
+    True
+    """
+    if engine not in ("numpy", "numba"):
+        raise ValueError(
+            f"Invalid engine '{engine}'. Engine should be either 'numpy' or 'numba'."
+        )
+    if engine == "numba" and numba is None:
+        raise ImportError(
+            "Numba is not installed. Please install numba or use engine='numpy'."
+        )
+    max_chunk_size = validate_float(
+        "max_chunk_size", max_chunk_size, min_val=0.0, inclusive_min=False
+    )
+
+    n_rows, n_cols = J.shape
+    if weights is None:
+        weights = np.ones(n_rows)
+    weights = np.asarray(weights, dtype=float)
+    if weights.shape != (n_rows,):
+        raise ValueError(
+            f"weights must have shape ({n_rows},), got {weights.shape} instead."
+        )
+
+    n_block = max(1, int(max_chunk_size * 1e6 / (J.itemsize * max(n_cols, 1))))
+    diagonal = np.zeros(n_cols)
+    for start in range(0, n_rows, n_block):
+        end = min(start + n_block, n_rows)
+        block = np.asarray(J[start:end])
+        if engine == "numba":
+            _jtj_diagonal_numba(
+                np.ascontiguousarray(block, dtype=float), weights[start:end], diagonal
+            )
+        else:
+            diagonal += np.einsum("i,ij,ij->j", weights[start:end], block, block)
+    return diagonal
+
+
+@njit(parallel=True)
+def _jtj_diagonal_numba(block, weights, diagonal):
+    """
+    Accumulate the weighted sum of squares of the columns of a block of rows.
+
+    Columns are split into groups that are processed in parallel, and each
+    group is traversed row by row to follow the C-ordered memory layout of
+    ``block``.
+    """
+    n_rows, n_cols = block.shape
+    group_size = 256
+    n_groups = (n_cols + group_size - 1) // group_size
+    for k in prange(n_groups):
+        start = k * group_size
+        end = min(start + group_size, n_cols)
+        for i in range(n_rows):
+            w = weights[i]
+            for j in range(start, end):
+                diagonal[j] += w * block[i, j] * block[i, j]
+
+
 def unique_rows(M):
     """Return unique rows, row indices and inverse indices.
 
@@ -11,10 +11,31 @@ from pymatsolver import (
     wrap_iterative,
 )
 from pymatsolver.solvers import Base
-from .code_utils import deprecate_function
+from .code_utils import (
+    deprecate_function,
+    validate_float,
+    validate_integer,
+    validate_string,
+    validate_type,
+)
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+import copy
+import hashlib
+import threading
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import LinearOperator, SuperLU, gmres, minres, spilu
 import warnings
 from typing import Type
 
+try:
+    import pyamg
+except ImportError:
+    pyamg = None
+
 __all__ = [
     "Solver",
     "SolverLU",
@@ -27,6 +48,12 @@ __all__ = [
     "wrap_iterative",
     "get_default_solver",
     "set_default_solver",
+    "SolverCache",
+    "solve_with_approximate_solver",
+    "MixedPrecisionSolver",
+    "SolutionCache",
+    "BlockKrylovSolver",
+    "SolverThreadPool",
     "SolverWrapD",
     "SolverWrapI",
     "SolverDiag",
@@ -93,6 +120,963 @@ def set_default_solver(solver_class: Type[Base]):
     _DEFAULT_SOLVER = solver_class
 
 
+def _solver_nbytes(Ainv):
+    """Approximate memory footprint of a solver object in bytes.
+
+    The size of the triangular factors is used when the wrapped solver exposes
+    them (e.g. ``SolverLU``). Otherwise (e.g. ``Pardiso`` or ``Mumps``), the
+    size of the factors isn't available and the size of the factored matrix is
+    used instead. This is only a lower bound: the fill-in of the factors of 3D
+    meshes makes them many times larger than the matrix.
+    """
+    nbytes = 0
+    inner = getattr(Ainv, "solver", None)
+    if isinstance(Ainv, MixedPrecisionSolver):
+        return _solver_nbytes(inner)
+    factors = [getattr(inner, "L", None), getattr(inner, "U", None)]
+    if all(factor is not None for factor in factors):
+        mats = factors
+    else:
+        mats = [getattr(Ainv, "A", None)]
+    for mat in mats:
+        for name in ["data", "indices", "indptr"]:
+            arr = getattr(mat, name, None)
+            if arr is not None:
+                nbytes += arr.nbytes
+    return nbytes
+
+
+class _TransposedSuperLU(Base):
+    """Solver for the transpose of a matrix, sharing the ``SuperLU`` factors of its solver.
+
+    The factors are owned by the solver of the matrix, so cleaning this solver
+    doesn't free them.
+    """
+
+    def __init__(self, Ainv):
+        super().__init__(Ainv.A.T, is_symmetric=False, is_hermitian=False)
+        self._Ainv = Ainv
+
+    def _solve_single(self, rhs):
+        return self._Ainv.solver.solve(rhs.astype(self._Ainv.dtype), trans="T")
+
+    _solve_multiple = _solve_single
+
+    def transpose(self):
+        return self._Ainv
+
+
+def _transposed_solver(Ainv):
+    """Solver for the transpose of a matrix, reusing the factors of its solver.
+
+    ``Pardiso`` and ``Mumps`` solve the transposed system with their own
+    factors, and the ``SuperLU`` factors of ``SolverLU`` are solved with
+    ``trans="T"``. Other solvers fall back to their ``transpose`` method, which
+    may factor the transposed matrix.
+
+    Parameters
+    ----------
+    Ainv : pymatsolver.solvers.Base or MixedPrecisionSolver
+        Solver for the matrix.
+
+    Returns
+    -------
+    pymatsolver.solvers.Base or MixedPrecisionSolver
+        Solver for the transposed matrix.
+    """
+    if isinstance(Ainv, MixedPrecisionSolver):
+        return Ainv.transpose()
+    if Ainv.is_symmetric:
+        return Ainv
+    if isinstance(getattr(Ainv, "solver", None), SuperLU):
+        return _TransposedSuperLU(Ainv)
+    return Ainv.transpose()
+
+
+class SolverCache:
+    """Least-recently-used cache of factored solvers.
+
+    Stores factored solver objects under hashable keys (e.g. a time-step
+    length or a frequency) so they can be reused across forward and
+    sensitivity computations. When the approximate memory used by the stored
+    factors exceeds ``max_memory``, the least recently used factors are
+    cleaned and evicted.
+
+    Factors that no longer match their system matrices (e.g. after a model
+    update) can be retired with :meth:`retire` instead of being cleaned. Retired
+    factors are only returned by :meth:`get_retired`, to be used as
+    approximate solvers, and they are the first ones evicted when the memory
+    budget is exceeded.
+
+    Solvers in use can be pinned with :meth:`pin`: they can still be evicted,
+    but they are only cleaned once they are unpinned with :meth:`unpin`. The
+    cache isn't thread safe: threads sharing it must guard every call with a
+    lock, e.g. the ``lock`` of a :class:`SolverThreadPool`.
+
+    Parameters
+    ----------
+    max_memory : float, optional
+        Approximate memory budget for the stored factors in GB. If ``None``,
+        the size of the cache is unbounded. The most recently requested
+        factorization is always kept, regardless of the budget.
+
+    Examples
+    --------
+    >>> from simpeg.utils.solver_utils import SolverCache, SolverLU
+    >>> import scipy.sparse as sp
+    >>> cache = SolverCache(max_memory=1.0)
+    >>> Ainv = cache.get("key", lambda: SolverLU(sp.eye(5, format="csc")))
+    >>> "key" in cache
+    True
+    """
+
+    def __init__(self, max_memory=None):
+        self.max_memory = max_memory
+        self._solvers = OrderedDict()
+        self._retired = OrderedDict()
+        self._nbytes = {}
+        # pinned solvers, by id: [solver, pin count, cleaning deferred]
+        self._pins = {}
+
+    @property
+    def max_memory(self):
+        """Approximate memory budget for the stored factors in GB.
+
+        Returns
+        -------
+        float or None
+        """
+        return self._max_memory
+
+    @max_memory.setter
+    def max_memory(self, value):
+        if value is not None:
+            value = validate_float("max_memory", value, min_val=0.0)
+        self._max_memory = value
+        if hasattr(self, "_solvers"):
+            self._evict()
+
+    @property
+    def nbytes(self):
+        """Approximate memory used by the stored factors in bytes.
+
+        Includes the memory used by the retired factors.
+
+        Returns
+        -------
+        int
+        """
+        return sum(self._nbytes.values())
+
+    def __contains__(self, key):
+        return key in self._solvers
+
+    def __len__(self):
+        return len(self._solvers)
+
+    def keys(self):
+        """Keys of the stored factors, from least to most recently used.
+
+        Returns
+        -------
+        list
+        """
+        return list(self._solvers.keys())
+
+    def get(self, key, factory):
+        """Return the solver stored under `key`, creating it if needed.
+
+        Parameters
+        ----------
+        key : hashable
+            Key identifying the factorization.
+        factory : callable
+            Function taking no arguments that returns a new solver object.
+            It is only called when `key` is not in the cache.
+
+        Returns
+        -------
+        pymatsolver.solvers.Base
+        """
+        if key in self._solvers:
+            self._solvers.move_to_end(key)
+            return self._solvers[key]
+        # free the retired factors of this key before factoring again
+        if key in self._retired:
+            self._pop_retired(key)
+        Ainv = factory()
+        self._solvers[key] = Ainv
+        self._nbytes[key, False] = _solver_nbytes(Ainv)
+        self._evict()
+        return Ainv
+
+    def add(self, key, Ainv):
+        """Store a solver created outside of the cache under `key`.
+
+        If a solver is already stored under `key`, e.g. one factored at the
+        same time by another thread, `Ainv` is cleaned and the stored solver
+        is returned instead.
+
+        Parameters
+        ----------
+        key : hashable
+            Key identifying the factorization.
+        Ainv : pymatsolver.solvers.Base
+            The new solver.
+
+        Returns
+        -------
+        pymatsolver.solvers.Base
+            The solver stored under `key`.
+        """
+        if key in self._solvers:
+            Ainv.clean()
+        return self.get(key, lambda: Ainv)
+
+    def pin(self, Ainv):
+        """Mark a solver as in use, so it isn't cleaned until it is unpinned.
+
+        Parameters
+        ----------
+        Ainv : pymatsolver.solvers.Base
+
+        Returns
+        -------
+        pymatsolver.solvers.Base
+            The pinned solver.
+        """
+        self._pins.setdefault(id(Ainv), [Ainv, 0, False])[1] += 1
+        return Ainv
+
+    def unpin(self, Ainv):
+        """Release a solver pinned with :meth:`pin`.
+
+        The solver is cleaned if it was removed from the cache while pinned,
+        and if this was its last pin.
+
+        Parameters
+        ----------
+        Ainv : pymatsolver.solvers.Base
+        """
+        pin = self._pins[id(Ainv)]
+        pin[1] -= 1
+        if pin[1] == 0:
+            del self._pins[id(Ainv)]
+            if pin[2]:
+                Ainv.clean()
+
+    def _clean_solver(self, Ainv):
+        """Clean a removed solver, or defer it until the solver is unpinned."""
+        pin = self._pins.get(id(Ainv))
+        if pin is None:
+            Ainv.clean()
+        else:
+            pin[2] = True
+
+    def get_retired(self, key):
+        """Return the retired solver stored under `key`, if any.
+
+        Parameters
+        ----------
+        key : hashable
+
+        Returns
+        -------
+        pymatsolver.solvers.Base or None
+        """
+        if key not in self._retired:
+            return None
+        self._retired.move_to_end(key)
+        return self._retired[key]
+
+    def retire(self):
+        """Retire all current solvers, cleaning the previously retired ones.
+
+        Retired solvers are kept, within the memory budget, so they can be
+        used as approximate solvers for nearby system matrices.
+        """
+        for key in list(self._retired):
+            self._pop_retired(key)
+        for key, Ainv in self._solvers.items():
+            self._retired[key] = Ainv
+            self._nbytes[key, True] = self._nbytes.pop((key, False))
+        self._solvers.clear()
+
+    def pop(self, key):
+        """Clean and remove the solver stored under `key`.
+
+        Cleaning a pinned solver is deferred until it is unpinned.
+
+        Parameters
+        ----------
+        key : hashable
+        """
+        Ainv = self._solvers.pop(key)
+        del self._nbytes[key, False]
+        self._clean_solver(Ainv)
+
+    def _pop_retired(self, key):
+        Ainv = self._retired.pop(key)
+        del self._nbytes[key, True]
+        self._clean_solver(Ainv)
+
+    def clean(self):
+        """Clean and remove all stored solvers, including the retired ones."""
+        for key in self.keys():
+            self.pop(key)
+        for key in list(self._retired):
+            self._pop_retired(key)
+
+    def _evict(self):
+        if self.max_memory is None:
+            return
+        max_bytes = self.max_memory * 1024**3
+        while self._retired and self.nbytes > max_bytes:
+            self._pop_retired(next(iter(self._retired)))
+        while len(self._solvers) > 1 and self.nbytes > max_bytes:
+            self.pop(next(iter(self._solvers)))
+
+
+def solve_with_approximate_solver(A, Ainv, rhs, rtol=1e-8, maxiter=20):
+    r"""Solve a linear system by iterative refinement with an approximate solver.
+
+    Starting from :math:`\mathbf{x}_0 = \mathbf{M} \mathbf{b}`, the solution is
+    refined as
+
+    .. math::
+        \mathbf{x}_{k+1} = \mathbf{x}_k +
+        \mathbf{M} (\mathbf{b} - \mathbf{A} \mathbf{x}_k)
+
+    where :math:`\mathbf{M}` is the inverse of a matrix close to
+    :math:`\mathbf{A}`, e.g. the factorization of the system matrix for a
+    previous model. Each iteration costs a single solve with the existing
+    factors, so this is much cheaper than a new factorization when the matrices
+    are close enough for the refinement to converge in a few iterations.
+
+    Parameters
+    ----------
+    A : (n, n) scipy.sparse.spmatrix
+        The system matrix.
+    Ainv : pymatsolver.solvers.Base
+        Solver for a matrix close to `A`.
+    rhs : (n,) or (n, n_rhs) numpy.ndarray
+        Right hand side(s) of the system.
+    rtol : float, optional
+        Tolerance on the norm of the residual of each right hand side, relative
+        to the norm of the right hand side.
+    maxiter : int, optional
+        Maximum number of refinement iterations.
+
+    Returns
+    -------
+    x : (n,) or (n, n_rhs) numpy.ndarray
+        The refined solution.
+    converged : bool
+        Whether all the residuals are below the tolerance. Iterations are
+        stopped early if any residual stops decreasing.
+    """
+    rhs_norm = np.linalg.norm(rhs.reshape(rhs.shape[0], -1), axis=0)
+    tolerance = rtol * rhs_norm
+    # solvers factored in lower precision return lower precision solutions
+    dtype = np.result_type(rhs.dtype, A.dtype)
+    x = np.reshape(Ainv * rhs, rhs.shape).astype(dtype, copy=False)
+    previous = None
+    for _ in range(maxiter + 1):
+        residual = rhs - A @ x
+        norm = np.linalg.norm(residual.reshape(residual.shape[0], -1), axis=0)
+        if np.all(norm <= tolerance):
+            return x, True
+        # stop if the refinement stagnates or diverges
+        if previous is not None and np.any(
+            (norm > tolerance) & (norm > 0.5 * previous)
+        ):
+            return x, False
+        previous = norm
+        x = x + np.reshape(Ainv * residual, rhs.shape)
+    return x, False
+
+
+def _single_precision_dtype(dtype):
+    """Single precision counterpart of a floating point or complex dtype."""
+    if np.issubdtype(dtype, np.complexfloating):
+        return np.dtype(np.complex64)
+    if np.issubdtype(dtype, np.floating):
+        return np.dtype(np.float32)
+    return np.dtype(dtype)
+
+
+class MixedPrecisionSolver:
+    r"""Solver factoring a matrix in single precision, refined in double precision.
+
+    The matrix is factored in single precision, which halves the memory used
+    by the factors, and every solve is refined with
+    :func:`solve_with_approximate_solver` against the double precision matrix
+    until the residual reaches `rtol`. If the refinement does not converge,
+    e.g. for badly conditioned matrices, the matrix is factored again in
+    double precision and used for all the following solves.
+
+    Parameters
+    ----------
+    solver : type
+        Solver class used for the factorization. It must support single
+        precision matrices, e.g. ``SolverLU``.
+    A : (n, n) scipy.sparse.spmatrix
+        The matrix.
+    rtol : float, optional
+        Tolerance on the norm of the residual of each right hand side, relative
+        to the norm of the right hand side.
+    maxiter : int, optional
+        Maximum number of refinement iterations.
+    **kwargs
+        Keyword arguments passed to the solver.
+
+    Examples
+    --------
+    >>> from simpeg.utils.solver_utils import MixedPrecisionSolver, SolverLU
+    >>> import scipy.sparse as sp
+    >>> import numpy as np
+    >>> A = sp.diags([1.0, 2.0, 3.0], format="csc")
+    >>> Ainv = MixedPrecisionSolver(SolverLU, A)
+    >>> x = Ainv * np.ones(3)
+    >>> bool(np.allclose(A @ x, 1.0, rtol=1e-12))
+    True
+    """
+
+    def __init__(self, solver, A, rtol=1e-10, maxiter=20, **kwargs):
+        self.A = A
+        self.rtol = validate_float("rtol", rtol, min_val=0.0, inclusive_min=False)
+        self.maxiter = validate_integer("maxiter", maxiter, min_val=1)
+        self._solver_class = solver
+        self._solver_kwargs = kwargs
+        self.solver = solver(A.astype(_single_precision_dtype(A.dtype)), **kwargs)
+        self.is_single_precision = True
+
+    @property
+    def shape(self):
+        return self.A.shape
+
+    def solve(self, rhs):
+        """Solve the system for one or several right hand sides.
+
+        Parameters
+        ----------
+        rhs : (n,) or (n, n_rhs) numpy.ndarray
+
+        Returns
+        -------
+        (n,) or (n, n_rhs) numpy.ndarray
+        """
+        rhs = np.asarray(rhs)
+        if rhs.ndim == 2 and rhs.shape[1] == 1:
+            # like the pymatsolver solvers, return a flat solution
+            rhs = rhs[:, 0]
+        if not self.is_single_precision:
+            return self.solver * rhs
+        x, converged = solve_with_approximate_solver(
+            self.A, self.solver, rhs, rtol=self.rtol, maxiter=self.maxiter
+        )
+        if converged:
+            return x
+        warnings.warn(
+            "Iterative refinement of the single precision factors did not "
+            "converge, factoring the matrix in double precision.",
+            stacklevel=2,
+        )
+        self.solver.clean()
+        self.solver = self._solver_class(self.A, **self._solver_kwargs)
+        self.is_single_precision = False
+        return self.solver * rhs
+
+    def __mul__(self, rhs):
+        return self.solve(rhs)
+
+    def __matmul__(self, rhs):
+        return self.solve(rhs)
+
+    def transpose(self):
+        """Return the solver for the transposed matrix, sharing the factors.
+
+        Returns
+        -------
+        MixedPrecisionSolver
+        """
+        trans = copy.copy(self)
+        trans.A = self.A.T
+        trans.solver = _transposed_solver(self.solver)
+        return trans
+
+    @property
+    def T(self):
+        """The solver for the transposed matrix.
+
+        Returns
+        -------
+        MixedPrecisionSolver
+        """
+        return self.transpose()
+
+    def clean(self):
+        """Clean the factors."""
+        self.solver.clean()
+
+
+class SolutionCache:
+    """Least-recently-used cache of solutions, used to warm start iterative solvers.
+
+    Solutions are stored under a digest of their right hand sides, so a
+    :class:`BlockKrylovSolver` of the next model can start from the solution
+    of the previous model for the same right hand sides, e.g. the sources of
+    a survey. When the memory used by the stored solutions exceeds
+    ``max_memory``, the least recently used solutions are evicted.
+
+    Parameters
+    ----------
+    max_memory : float, optional
+        Approximate memory budget for the stored solutions in GB. If ``None``,
+        the size of the cache is unbounded.
+
+    Examples
+    --------
+    >>> from simpeg.utils.solver_utils import BlockKrylovSolver, SolutionCache
+    >>> import scipy.sparse as sp
+    >>> import numpy as np
+    >>> cache = SolutionCache(max_memory=1.0)
+    >>> A = sp.diags([1.0, 2.0, 3.0], format="csr")
+    >>> x = BlockKrylovSolver(A, warm_start=cache) * np.ones(3)
+    >>> len(cache)
+    1
+    """
+
+    def __init__(self, max_memory=1.0):
+        self.max_memory = max_memory
+        self._solutions = OrderedDict()
+
+    @property
+    def max_memory(self):
+        """Approximate memory budget for the stored solutions in GB.
+
+        Returns
+        -------
+        float or None
+        """
+        return self._max_memory
+
+    @max_memory.setter
+    def max_memory(self, value):
+        if value is not None:
+            value = validate_float("max_memory", value, min_val=0.0)
+        self._max_memory = value
+        if hasattr(self, "_solutions"):
+            self._evict()
+
+    @property
+    def nbytes(self):
+        """Memory used by the stored solutions in bytes.
+
+        Returns
+        -------
+        int
+        """
+        return sum(x.nbytes for x in self._solutions.values())
+
+    def __len__(self):
+        return len(self._solutions)
+
+    @staticmethod
+    def _key(rhs):
+        rhs = np.ascontiguousarray(rhs)
+        digest = hashlib.blake2b(rhs.view(np.uint8).ravel(), digest_size=16)
+        return rhs.shape, rhs.dtype.str, digest.hexdigest()
+
+    def get(self, rhs):
+        """Return the solution stored for the right hand sides, if any.
+
+        Parameters
+        ----------
+        rhs : (n, n_rhs) numpy.ndarray
+
+        Returns
+        -------
+        (n, n_rhs) numpy.ndarray or None
+        """
+        key = self._key(rhs)
+        if key not in self._solutions:
+            return None
+        self._solutions.move_to_end(key)
+        return self._solutions[key]
+
+    def set(self, rhs, x):
+        """Store the solution for the right hand sides.
+
+        Parameters
+        ----------
+        rhs, x : (n, n_rhs) numpy.ndarray
+        """
+        key = self._key(rhs)
+        self._solutions[key] = x
+        self._solutions.move_to_end(key)
+        self._evict()
+
+    def clear(self):
+        """Remove all stored solutions."""
+        self._solutions.clear()
+
+    def _evict(self):
+        if self.max_memory is None:
+            return
+        max_bytes = self.max_memory * 1024**3
+        while self._solutions and self.nbytes > max_bytes:
+            self._solutions.popitem(last=False)
+
+
+class BlockKrylovSolver(Base):
+    r"""Preconditioned iterative solver handling several right hand sides at once.
+
+    The memory used by Krylov solvers scales linearly with the size of the
+    system, so they can be used for meshes too large to be factored by direct
+    solvers. Symmetric systems are solved with block conjugate gradients:
+    all the right hand sides share a single Krylov space, so each iteration
+    costs one product of the matrix with a block of vectors, and converge in
+    fewer iterations than separate solves. Real symmetric and Hermitian
+    systems use the Hermitian inner product, complex symmetric systems (e.g.
+    frequency domain EM systems) use the conjugate orthogonal variant.
+    Right hand sides that have converged are removed from the block. Other
+    systems are solved one right hand side at a time with ``minres`` or
+    ``gmres``. The number of iterations of the last solve is stored in
+    ``n_iterations``.
+
+    Parameters
+    ----------
+    A : (n, n) scipy.sparse.spmatrix
+        The matrix.
+    method : {"auto", "cg", "minres", "gmres"}
+        Krylov method. ``"auto"`` uses block conjugate gradients for
+        symmetric or Hermitian matrices, and ``"gmres"`` otherwise. ``"cg"``
+        requires a positive definite (or complex symmetric) matrix, and
+        ``"minres"`` a Hermitian one.
+    preconditioner : {"jacobi", "ilu", "amg"}, scipy.sparse.linalg.LinearOperator or None
+        Preconditioner: the inverse of the diagonal of `A`, an incomplete LU
+        factorization of `A` (for ``"gmres"``), a smoothed aggregation
+        algebraic multigrid V-cycle (requires ``pyamg``), an operator
+        approximating the inverse of `A`, or ``None`` for no preconditioner.
+        The preconditioners of conjugate gradients and ``minres`` must be
+        symmetric.
+    rtol : float, optional
+        Tolerance on the norm of the residual of each right hand side,
+        relative to the norm of the right hand side.
+    maxiter : int, optional
+        Maximum number of iterations.
+    warm_start : SolutionCache, optional
+        Cache of solutions shared by the solvers of successive models. The
+        stored solution for the same right hand sides is used as initial
+        guess, for the right hand sides whose initial residual is smaller
+        than with a zero initial guess.
+    **kwargs
+        Keyword arguments passed to ``pymatsolver.solvers.Base``.
+
+    Examples
+    --------
+    >>> from simpeg.utils.solver_utils import BlockKrylovSolver
+    >>> import scipy.sparse as sp
+    >>> import numpy as np
+    >>> A = sp.diags([-1.0, 2.5, -1.0], [-1, 0, 1], shape=(50, 50), format="csr")
+    >>> Ainv = BlockKrylovSolver(A, rtol=1e-10)
+    >>> x = Ainv * np.ones((50, 3))
+    >>> bool(np.allclose(A @ x, 1.0))
+    True
+    """
+
+    def __init__(
+        self,
+        A,
+        method="auto",
+        preconditioner="jacobi",
+        rtol=1e-8,
+        maxiter=1000,
+        warm_start=None,
+        **kwargs,
+    ):
+        super().__init__(A, **kwargs)
+        method = validate_string("method", method, ["auto", "cg", "minres", "gmres"])
+        if method == "auto":
+            method = "cg" if self.is_symmetric or self.is_hermitian else "gmres"
+        if method == "cg" and not (self.is_symmetric or self.is_hermitian):
+            raise ValueError("Conjugate gradients require a symmetric matrix.")
+        if method == "minres" and not self.is_hermitian:
+            raise ValueError("minres requires a Hermitian matrix.")
+        self.method = method
+        self.rtol = validate_float("rtol", rtol, min_val=0.0, inclusive_min=False)
+        self.maxiter = validate_integer("maxiter", maxiter, min_val=1)
+        if warm_start is not None:
+            warm_start = validate_type("warm_start", warm_start, SolutionCache, False)
+        self.warm_start = warm_start
+        self._preconditioner_option = preconditioner
+        self.preconditioner = self._make_preconditioner(preconditioner)
+        self.n_iterations = 0
+
+    def _make_preconditioner(self, preconditioner):
+        if preconditioner is None or isinstance(preconditioner, LinearOperator):
+            return preconditioner
+        preconditioner = validate_string(
+            "preconditioner", preconditioner, ["jacobi", "ilu", "amg"]
+        )
+        shape, dtype = self.A.shape, self.A.dtype
+        if preconditioner == "jacobi":
+            diagonal = self.A.diagonal()
+            inv_diagonal = np.ones_like(diagonal)
+            nonzero = diagonal != 0
+            inv_diagonal[nonzero] = 1.0 / diagonal[nonzero]
+
+            def apply(x):
+                if x.ndim == 1:
+                    return inv_diagonal * x
+                return inv_diagonal[:, None] * x
+
+            return LinearOperator(shape, matvec=apply, matmat=apply, dtype=dtype)
+        if preconditioner == "ilu":
+            ilu = spilu(sp.csc_matrix(self.A))
+            return LinearOperator(
+                shape, matvec=ilu.solve, matmat=ilu.solve, dtype=dtype
+            )
+        if pyamg is None:
+            raise ImportError(
+                "The pyamg package couldn't be found."
+                "Using the 'amg' preconditioner needs pyamg to be installed."
+                "\nTry installing pyamg with:"
+                "\n    pip install pyamg"
+                "\nor:"
+                "\n    conda install pyamg"
+            )
+        multigrid = pyamg.smoothed_aggregation_solver(sp.csr_matrix(self.A))
+        return multigrid.aspreconditioner(cycle="V")
+
+    def get_attributes(self):
+        attributes = super().get_attributes()
+        attributes.update(
+            method=self.method,
+            preconditioner=self._preconditioner_option,
+            rtol=self.rtol,
+            maxiter=self.maxiter,
+            warm_start=self.warm_start,
+        )
+        return attributes
+
+    def _solve_single(self, rhs):
+        return self._solve_multiple(rhs[:, None])[:, 0]
+
+    def _solve_multiple(self, rhs):
+        rhs = np.asarray(rhs)
+        self.n_iterations = 0
+        dtype = np.result_type(rhs.dtype, self.A.dtype, np.float64)
+        x = self._initial_guess(rhs, dtype)
+        if self.method == "cg":
+            converged = self._block_cg(rhs, x)
+        else:
+            converged = self._solve_columns(rhs, x)
+        if not converged:
+            warnings.warn(
+                f"{type(self).__name__} did not converge to rtol={self.rtol} "
+                f"in {self.maxiter} iterations.",
+                stacklevel=3,
+            )
+        if self.warm_start is not None:
+            self.warm_start.set(rhs, x.copy())
+        return x
+
+    def _initial_guess(self, rhs, dtype):
+        x = np.zeros(rhs.shape, dtype=dtype)
+        previous = None if self.warm_start is None else self.warm_start.get(rhs)
+        if previous is None:
+            return x
+        # only keep the previous solutions that are better than zero
+        residual = np.linalg.norm(rhs - self.A @ previous, axis=0)
+        better = residual < np.linalg.norm(rhs, axis=0)
+        x[:, better] = previous[:, better]
+        return x
+
+    def _block_cg(self, rhs, x):
+        """Block (conjugate orthogonal) conjugate gradients, updating `x`."""
+        A, M = self.A, self.preconditioner
+        if self.is_hermitian:
+
+            def inner(u, v):
+                return u.conj().T @ v
+
+        else:
+
+            def inner(u, v):
+                return u.T @ v
+
+        tolerance = self.rtol * np.linalg.norm(rhs, axis=0)
+        residual = rhs - A @ x
+        active = np.linalg.norm(residual, axis=0) > tolerance
+        p = q = pq = None
+        for _ in range(self.maxiter):
+            if not np.any(active):
+                return True
+            self.n_iterations += 1
+            z = residual[:, active]
+            if M is not None:
+                z = M @ z
+            if p is None:
+                p = z
+            else:
+                # keep the new directions conjugate to the previous ones
+                p = z - p @ np.linalg.solve(pq, inner(q, z))
+            p = _orthonormal_columns(p)
+            if p.shape[1] == 0:
+                break
+            q = A @ p
+            pq = inner(p, q)
+            alpha = np.linalg.solve(pq, inner(p, residual[:, active]))
+            x[:, active] += p @ alpha
+            residual[:, active] -= q @ alpha
+            active[active] = (
+                np.linalg.norm(residual[:, active], axis=0) > tolerance[active]
+            )
+        return not np.any(active)
+
+    def _solve_columns(self, rhs, x):
+        """Solve each right hand side with ``minres`` or ``gmres``, updating `x`."""
+        # imported here since simpeg.optimization imports simpeg.utils
+        from ..optimization import SCIPY_1_12
+
+        # Choose `rtol` or `tol` argument based on installed scipy version
+        tol_key = "rtol" if SCIPY_1_12 else "tol"
+        if self.method == "minres":
+            krylov = minres
+        else:
+            krylov = partial(gmres, callback_type="pr_norm")
+        converged = True
+
+        def count(_):
+            self.n_iterations += 1
+
+        for i in range(rhs.shape[1]):
+            x[:, i], info = krylov(
+                self.A,
+                rhs[:, i],
+                x0=x[:, i],
+                maxiter=self.maxiter,
+                M=self.preconditioner,
+                callback=count,
+                **{tol_key: self.rtol},
+            )
+            converged = converged and info == 0
+        return converged
+
+
+def _orthonormal_columns(p):
+    """Orthonormal basis of the columns of `p`, dropping dependent columns."""
+    q, r = np.linalg.qr(p)
+    diagonal = np.abs(np.diag(r))
+    if diagonal.size == 0:
+        return q
+    return q[:, diagonal > diagonal.max() * np.finfo(r.dtype).eps * p.shape[0]]
+
+
+class SolverThreadPool:
+    """Pool of threads to factor and solve independent systems concurrently.
+
+    Direct solvers release the GIL while factoring and solving, so independent
+    systems (e.g. one per frequency or per wavenumber) can be processed in
+    parallel by threads sharing the mesh and the survey. The number of
+    factorizations running at the same time can be capped separately from the
+    number of threads, to bound the peak memory used by the solvers.
+
+    Parameters
+    ----------
+    n_threads : int, optional
+        Number of threads. If 1, tasks run sequentially in the calling thread.
+    max_concurrent_factorizations : int, optional
+        Maximum number of factorizations running at the same time. If ``None``,
+        it is equal to `n_threads`.
+
+    Examples
+    --------
+    >>> from simpeg.utils.solver_utils import SolverThreadPool, SolverLU
+    >>> import scipy.sparse as sp
+    >>> import numpy as np
+    >>> matrices = [k * sp.eye(5, format="csc") for k in range(1, 4)]
+    >>> with SolverThreadPool(n_threads=3) as pool:
+    ...     solutions = pool.map(
+    ...         lambda A: pool.factor(SolverLU, A) * np.ones(5), matrices
+    ...     )
+    >>> [float(x[0]) for x in solutions]
+    [1.0, 0.5, 0.3333333333333333]
+    """
+
+    def __init__(self, n_threads=1, max_concurrent_factorizations=None):
+        self.n_threads = validate_integer("n_threads", n_threads, min_val=1)
+        if max_concurrent_factorizations is None:
+            max_concurrent_factorizations = self.n_threads
+        self.max_concurrent_factorizations = validate_integer(
+            "max_concurrent_factorizations", max_concurrent_factorizations, min_val=1
+        )
+        if self.n_threads > 1:
+            self._lock = threading.Lock()
+            self._slots = threading.BoundedSemaphore(self.max_concurrent_factorizations)
+        else:
+            self._lock = self._slots = nullcontext()
+        self._executor = None
+
+    @property
+    def lock(self):
+        """Lock to guard state shared between the tasks.
+
+        Returns
+        -------
+        threading.Lock or contextlib.nullcontext
+        """
+        return self._lock
+
+    def factor(self, solver, A, **kwargs):
+        """Factor a matrix, waiting for a free factorization slot.
+
+        Parameters
+        ----------
+        solver : type
+            Solver class, e.g. a ``pymatsolver.solvers.Base`` subclass.
+        A : scipy.sparse.spmatrix
+            The matrix to factor.
+        **kwargs
+            Keyword arguments passed to the solver.
+
+        Returns
+        -------
+        pymatsolver.solvers.Base
+        """
+        with self._slots:
+            return solver(A, **kwargs)
+
+    def map(self, func, items):
+        """Apply a function to each item, in parallel if there are several threads.
+
+        Parameters
+        ----------
+        func : callable
+        items : iterable
+
+        Returns
+        -------
+        list
+            Results of `func` in the order of `items`.
+        """
+        if self._executor is None:
+            return [func(item) for item in items]
+        return list(self._executor.map(func, items))
+
+    def __enter__(self):
+        if self.n_threads > 1:
+            self._executor = ThreadPoolExecutor(max_workers=self.n_threads)
+        return self
+
+    def __exit__(self, *args):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
 # should likely deprecate these classes in favor of the pymatsolver versions.
 SolverWrapD = deprecate_function(
     wrap_direct,
@@ -6,7 +6,7 @@ import numpy as np
 from scipy.stats import multivariate_normal
 
 from simpeg import regularization
-from simpeg.maps import Wires
+from simpeg.maps import IdentityMap, Wires
 from simpeg.utils import WeightedGaussianMixture, mkvc
 from simpeg.utils.solver_utils import get_default_solver
 
@@ -486,6 +486,38 @@ def test_removed_mref():
         pgi.mref
 
 
+@pytest.mark.parametrize("approx_hessian", [True, False])
+@pytest.mark.parametrize("covariance_type", ["full", "tied", "diag", "spherical"])
+def test_deriv2_diagonal(approx_hessian, covariance_type):
+    """Test ``PGIsmallness.deriv2_diagonal`` against the diagonal of ``deriv2``."""
+    pytest.importorskip("sklearn")
+    rng = np.random.default_rng(seed=42)
+    mesh = discretize.TensorMesh([[(1.0, 30)]])
+    wires = Wires(("s0", mesh.nC), ("s1", mesh.nC))
+    samples = np.r_[
+        rng.normal(loc=[-1.0, 2.0], scale=[0.5, 0.2], size=(15, 2)),
+        rng.normal(loc=[2.0, -1.0], scale=[0.3, 0.6], size=(15, 2)),
+    ]
+    gmm = WeightedGaussianMixture(
+        mesh=mesh, n_components=2, covariance_type=covariance_type, random_state=0
+    )
+    gmm.fit(samples)
+    reg = regularization.PGIsmallness(
+        gmm,
+        mesh=mesh,
+        wiresmap=wires,
+        maplist=[IdentityMap(nP=mesh.nC), IdentityMap(nP=mesh.nC)],
+        approx_hessian=approx_hessian,
+        weights={"cell_weights": rng.uniform(0.5, 2.0, size=2 * mesh.nC)},
+    )
+    m = mkvc(samples) + 0.1 * rng.normal(size=2 * mesh.nC)
+    expected = reg.deriv2(m).diagonal()
+    if approx_hessian:
+        # the diagonal is computed without forming the Hessian
+        reg.deriv2 = lambda *args, **kwargs: pytest.fail("formed the Hessian")
+    np.testing.assert_allclose(reg.deriv2_diagonal(m), expected, rtol=1e-10)
+
+
 class TestCheckWeights:
     """Test the ``WeightedGaussianMixture._check_weights`` method."""
 
@@ -673,6 +673,60 @@ def test_smoothness_first_order_coterminal_angle(orientation):
     assert np.all(reg.f_m(angles) == 0)
 
 
+def deriv2_diagonal_cases():
+    mesh = discretize.TensorMesh([5, 4, 3])
+    active_cells = mesh.cell_centers[:, -1] < 0.7
+    n_active = int(active_cells.sum())
+    lazy_map = maps.ComboMap(
+        [maps.ExpMap(nP=n_active), maps.IdentityMap(nP=n_active)], lazy_deriv=True
+    )
+    wires = maps.Wires(("m1", n_active), ("m2", n_active))
+    cases = {
+        "smallness": Smallness(mesh, active_cells=active_cells),
+        "smoothness": SmoothnessFirstOrder(
+            mesh, active_cells=active_cells, orientation="y"
+        ),
+        "second_order": SmoothnessSecondOrder(
+            mesh, active_cells=active_cells, orientation="z"
+        ),
+        "exp_map": WeightedLeastSquares(
+            mesh, active_cells=active_cells, mapping=maps.ExpMap(nP=n_active)
+        ),
+        "lazy_map": WeightedLeastSquares(
+            mesh, active_cells=active_cells, mapping=lazy_map
+        ),
+        "sparse": Sparse(mesh, active_cells=active_cells, norms=[0, 1, 1, 2]),
+        "full_gradient": regularization.SmoothnessFullGradient(
+            mesh, alphas=[1.0, 2.0, 3.0], active_cells=active_cells
+        ),
+        "cross_reference": regularization.CrossReferenceRegularization(
+            mesh, [1.0, 0.5, 0.2], active_cells=active_cells
+        ),
+        "vector_amplitude": regularization.VectorAmplitude(
+            mesh, maps.IdentityMap(nP=3 * n_active), active_cells=active_cells
+        ),
+        "cross_gradient": regularization.CrossGradient(
+            mesh, wire_map=wires, active_cells=active_cells
+        ),
+    }
+    return cases
+
+
+@pytest.mark.parametrize("name", deriv2_diagonal_cases().keys())
+def test_deriv2_diagonal(name):
+    reg = deriv2_diagonal_cases()[name]
+    rng = np.random.default_rng(seed=42)
+    reg.set_weights(cell_weights=rng.uniform(0.5, 2.0, size=reg.regularization_mesh.nC))
+    n_param = reg.nP if reg.nP != "*" else reg.regularization_mesh.nC
+    m = rng.normal(size=n_param)
+    if isinstance(reg, Sparse):
+        # update the IRLS weights of the sparse norms
+        reg.update_weights(m)
+    np.testing.assert_allclose(
+        reg.deriv2_diagonal(m), reg.deriv2(m).diagonal(), rtol=1e-10, atol=1e-12
+    )
+
+
 class TestParent:
     """Test parent property of regularizations."""
 
@@ -0,0 +1,135 @@
+"""
+Test saving and loading surveys and data to columnar binary files.
+"""
+
+import numpy as np
+import pytest
+
+from simpeg.data import Data, SyntheticData
+from simpeg.survey import BaseSurvey
+from simpeg.electromagnetics import frequency_domain as fdem
+from simpeg.electromagnetics import time_domain as tdem
+from simpeg.electromagnetics.static import resistivity as dc
+
+
+@pytest.fixture
+def dc_survey():
+    rng = np.random.default_rng(seed=42)
+    source_list = []
+    for a in np.linspace(-50.0, 50.0, 5):
+        m = rng.uniform(-100.0, 100.0, size=(4, 3))
+        receivers = [
+            dc.receivers.Dipole(m, m + 10.0, data_type="apparent_resistivity"),
+            dc.receivers.Pole(m),
+        ]
+        source_list.append(
+            dc.sources.Dipole(receivers, np.r_[a, 0.0, 0.0], np.r_[a + 5, 0.0, 0.0])
+        )
+    survey = dc.Survey(source_list)
+    survey.set_geometric_factor()
+    return survey
+
+
+@pytest.fixture
+def tdem_survey():
+    receivers = [
+        tdem.receivers.PointMagneticFluxTimeDerivative(
+            np.array([[10.0, 0.0, 1.0]]), times=np.logspace(-5, -3, 4), orientation=o
+        )
+        for o in "xz"
+    ]
+    waveform = tdem.sources.TrapezoidWaveform(
+        ramp_on=np.r_[-1e-3, -9e-4], ramp_off=np.r_[-1e-4, 0.0]
+    )
+    source = tdem.sources.CircularLoop(
+        receivers, location=np.zeros(3), radius=10.0, waveform=waveform
+    )
+    return tdem.Survey([source])
+
+
+def assert_same_survey(survey, loaded):
+    assert type(loaded) is type(survey)
+    assert loaded.nD == survey.nD
+    for src, new_src in zip(survey.source_list, loaded.source_list):
+        assert type(new_src) is type(src)
+        assert new_src.uid == src.uid
+        np.testing.assert_array_equal(new_src.location, src.location)
+        for rx, new_rx in zip(src.receiver_list, new_src.receiver_list):
+            assert type(new_rx) is type(rx)
+            np.testing.assert_array_equal(new_rx.locations, rx.locations)
+            assert loaded.get_slice(new_src, new_rx) == survey.get_slice(src, rx)
+
+
+def test_survey(dc_survey, tmp_path):
+    dc_survey.save(tmp_path / "survey.npz")
+    loaded = BaseSurvey.load(tmp_path / "survey.npz")
+    assert_same_survey(dc_survey, loaded)
+
+    # sources used as keys of the receivers are the loaded ones
+    src = loaded.source_list[2]
+    rx = src.receiver_list[0]
+    np.testing.assert_array_equal(
+        rx.geometric_factor[src],
+        dc_survey.source_list[2]
+        .receiver_list[0]
+        .geometric_factor[dc_survey.source_list[2]],
+    )
+
+
+def test_time_survey(tdem_survey, tmp_path):
+    tdem_survey.save(tmp_path / "survey")
+    loaded = tdem.Survey.load(tmp_path / "survey.npz")
+    assert_same_survey(tdem_survey, loaded)
+    waveform = loaded.source_list[0].waveform
+    assert isinstance(waveform, tdem.sources.TrapezoidWaveform)
+    for time in np.linspace(-1e-3, 0.0, 7):
+        assert waveform.eval(time) == tdem_survey.source_list[0].waveform.eval(time)
+    for rx, new_rx in zip(
+        tdem_survey.source_list[0].receiver_list, loaded.source_list[0].receiver_list
+    ):
+        np.testing.assert_array_equal(new_rx.times, rx.times)
+        np.testing.assert_array_equal(new_rx.orientation, rx.orientation)
+
+
+def test_data(dc_survey, tmp_path):
+    rng = np.random.default_rng(seed=42)
+    data = Data(
+        dc_survey,
+        dobs=rng.normal(size=dc_survey.nD),
+        relative_error=0.05,
+        noise_floor=1e-3,
+    )
+    data.save(tmp_path / "data.npz")
+    loaded = Data.load(tmp_path / "data.npz")
+    assert_same_survey(dc_survey, loaded.survey)
+    np.testing.assert_array_equal(loaded.dobs, data.dobs)
+    np.testing.assert_array_equal(loaded.standard_deviation, data.standard_deviation)
+
+    with pytest.raises(TypeError):
+        BaseSurvey.load(tmp_path / "data.npz")
+
+
+def test_synthetic_data(tmp_path):
+    rx = fdem.receivers.PointMagneticFluxDensity(
+        np.array([[0.0, 0.0, 10.0]]), orientation="z", component="imag"
+    )
+    survey = fdem.Survey(
+        [
+            fdem.sources.MagDipole([rx], frequency=f, location=np.zeros(3))
+            for f in [1, 10]
+        ]
+    )
+    data = SyntheticData(survey, dobs=np.r_[1.0, 2.0], dclean=np.r_[1.5, 2.5])
+    data.save(tmp_path / "data.npz")
+    loaded = Data.load(tmp_path / "data.npz")
+    assert isinstance(loaded, SyntheticData)
+    np.testing.assert_array_equal(loaded.dclean, data.dclean)
+    assert loaded.survey.frequencies == survey.frequencies
+    # sources grouped by frequency are the sources of the loaded survey
+    assert loaded.survey.get_sources_by_frequency(10)[0] is loaded.survey.source_list[1]
+
+
+def test_unsupported_object(dc_survey, tmp_path):
+    dc_survey.source_list[0].receiver_list[0]._unsupported = object()
+    with pytest.raises(TypeError):
+        dc_survey.save(tmp_path / "survey.npz")
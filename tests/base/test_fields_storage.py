@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from simpeg.fields import ChunkedStorage
+
+
+@pytest.fixture(params=[float, complex])
+def arrays(request, tmp_path):
+    shape = (7, 3, 5)
+    rng = np.random.default_rng(seed=42)
+    values = rng.normal(size=shape).astype(request.param)
+    # budget of two chunks, so most of them live in the file
+    storage = ChunkedStorage(
+        str(tmp_path), max_memory=2 * 7 * np.dtype(request.param).itemsize / 1024**3
+    )
+    chunked = storage.create(shape, request.param)
+    chunked[:, :, :] = values
+    return chunked, values
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        (slice(None), 1, 2),
+        (slice(None), slice(None), 3),
+        (slice(None), [0, 2], 4),
+        (slice(None), slice(0, 2), slice(1, 4)),
+        (slice(None), 1),
+        (slice(2, 5), 0, np.r_[1, 3]),
+        (slice(None), np.r_[True, False, True], -1),
+    ],
+)
+def test_indexing(arrays, key):
+    chunked, values = arrays
+    np.testing.assert_array_equal(chunked[key], values[key])
+
+    new_values = values.copy()
+    new_values[key] = -values[key]
+    chunked[key] = -values[key]
+    np.testing.assert_array_equal(chunked[:, :, :], new_values)
+
+
+def test_scalar_assignment(arrays):
+    chunked, values = arrays
+    chunked[:, 1, :] = 0.0
+    values[:, 1, :] = 0.0
+    np.testing.assert_array_equal(np.asarray(chunked), values)
+    assert len(chunked._cache) == 2
+
+
+def test_file_removed(tmp_path):
+    chunked = ChunkedStorage(str(tmp_path)).create((4, 2), float)
+    assert len(list(tmp_path.iterdir())) == 1
+    del chunked
+    assert len(list(tmp_path.iterdir())) == 0
+
+
+def test_bad_memory():
+    with pytest.raises(ValueError):
+        ChunkedStorage(max_memory=-1.0)
@@ -0,0 +1,85 @@
+"""
+Test that importing simpeg doesn't import optional heavy dependencies.
+
+The modules imported by ``import simpeg`` are listed in a new interpreter,
+run with ``python -X importtime`` to report the import time on failures.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+# Modules that must only be imported when used
+HEAVY_MODULES = [
+    "matplotlib",
+    "sklearn",
+    "simpeg.utils.io_utils",
+    "simpeg.utils.plot_utils",
+    "simpeg.utils.pgi_utils",
+    "simpeg.electromagnetics.time_domain",
+    "simpeg.electromagnetics.frequency_domain",
+    "simpeg.electromagnetics.natural_source",
+    "simpeg.electromagnetics.static",
+    "simpeg.electromagnetics.analytics",
+]
+
+
+def run_import(statement):
+    """Modules imported by a statement, and the import time of simpeg in seconds."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"{statement}; import sys; print(' '.join(sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    import_time = 0.0
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and line.split("|")[-1].strip() == "simpeg":
+            import_time = int(line.split("|")[1]) * 1e-6
+    return result.stdout.split(), import_time
+
+
+@pytest.mark.parametrize(
+    "statement", ["import simpeg", "import simpeg.electromagnetics"]
+)
+def test_heavy_modules_not_imported(statement):
+    modules, import_time = run_import(statement)
+    imported = [module for module in HEAVY_MODULES if module in modules]
+    assert (
+        not imported
+    ), f"'{statement}' imported {imported} and took {import_time:.2f} s."
+
+
+def test_lazy_attributes():
+    statement = "; ".join(
+        [
+            "import sys",
+            "import simpeg",
+            "from simpeg.utils import plot2Ddata, WeightedGaussianMixture",
+            "from simpeg.utils.plot_utils import plot2Ddata as f",
+            "assert plot2Ddata is f",
+            "assert 'simpeg.utils.pgi_utils' in sys.modules",
+            "assert simpeg.utils.io_utils.download is simpeg.utils.download",
+            "import simpeg.electromagnetics as em",
+            "assert em.resistivity is em.static.resistivity",
+            "assert 'frequency_domain' in dir(em) and 'pgi_utils' in dir(simpeg.utils)",
+        ]
+    )
+    subprocess.run([sys.executable, "-c", statement], check=True)
+
+
+def test_unknown_attributes():
+    import simpeg.electromagnetics
+    import simpeg.utils
+
+    with pytest.raises(AttributeError, match="no attribute 'not_a_module'"):
+        simpeg.utils.not_a_module
+    with pytest.raises(AttributeError, match="no attribute 'not_a_module'"):
+        simpeg.electromagnetics.not_a_module
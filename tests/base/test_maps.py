@@ -4,6 +4,7 @@ import unittest
 import discretize
 import pytest
 import scipy.sparse as sp
+from scipy.sparse.linalg import LinearOperator
 
 from simpeg import maps, models, utils
 from discretize.utils import mesh_builder_xyz, refine_tree_xyz, active_from_xyz
@@ -1026,5 +1027,110 @@ class TestParametric(DeprecatedIndActive):
         np.testing.assert_allclose(mapping.active_cells, new_active_cells)
 
 
+class TestLazyComboMap:
+    """Test the lazy derivatives of combo maps."""
+
+    @pytest.fixture
+    def mesh(self):
+        return discretize.TensorMesh([5, 4, 3])
+
+    @pytest.fixture
+    def active_cells(self, mesh):
+        return mesh.cell_centers[:, 2] < 0.6
+
+    def chains(self, mesh, active_cells):
+        n_active = int(active_cells.sum())
+        wires = maps.Wires(("a", n_active), ("b", n_active))
+        A = sp.random(mesh.n_cells, mesh.n_cells, density=0.1, random_state=0)
+        return [
+            [maps.ExpMap(mesh), maps.InjectActiveCells(mesh, active_cells, -8.0)],
+            [
+                maps.ExpMap(mesh),
+                maps.InjectActiveCells(mesh, active_cells, -8.0),
+                maps.ReciprocalMap(nP=n_active),
+                maps.ExpMap(nP=n_active),
+                wires.b,
+            ],
+            [maps.ExpMap(nP=5), maps.Projection(2, np.r_[0, 1, 1, 0, 1])],
+            [
+                maps.ExpMap(mesh),
+                maps.LinearMap(A),
+                maps.InjectActiveCells(mesh, active_cells, -8.0),
+                wires.a,
+            ],
+        ]
+
+    def test_deriv(self, mesh, active_cells):
+        rng = np.random.default_rng(seed=42)
+        for chain in self.chains(mesh, active_cells):
+            eager = maps.ComboMap(chain)
+            lazy = maps.ComboMap(chain, lazy_deriv=True)
+            m = rng.normal(size=eager.shape[1])
+            v = rng.normal(size=eager.shape[1])
+            w = rng.normal(size=eager.shape[0])
+            J = eager.deriv(m)
+            deriv = lazy.deriv(m)
+            assert isinstance(deriv, LinearOperator)
+            np.testing.assert_allclose(deriv.toarray(), J.toarray())
+            np.testing.assert_allclose(deriv @ v, J @ v)
+            np.testing.assert_allclose(lazy.deriv(m, v), J @ v)
+            np.testing.assert_allclose(deriv.T @ w, J.T @ w)
+            np.testing.assert_allclose(deriv @ np.c_[v, v], J @ np.c_[v, v])
+            np.testing.assert_allclose(
+                (sp.diags(w) @ deriv).toarray(), (sp.diags(w) @ J).toarray()
+            )
+            assert lazy.test(m, random_seed=rng)
+
+    def test_mutated_map(self, mesh, active_cells):
+        # the derivative follows changes of the parameters of the mappings
+        A = sp.random(mesh.n_cells, mesh.n_cells, density=0.1, random_state=0)
+        linear = maps.LinearMap(A)
+        combo = maps.ComboMap([linear, maps.ExpMap(mesh)], lazy_deriv=True)
+        m = np.ones(combo.shape[1])
+        combo.deriv(m)
+        linear.A = 2 * A
+        np.testing.assert_allclose(
+            combo.deriv(m).toarray(), (2 * A @ sp.diags(np.exp(m))).toarray()
+        )
+
+    def test_simulation(self, mesh, active_cells):
+        # the lazy derivative of the conductivity through the mass matrices
+        from simpeg.electromagnetics import resistivity as dc
+
+        n_active = int(active_cells.sum())
+        rng = np.random.default_rng(seed=42)
+        model = np.log(1e-2) + rng.normal(size=n_active)
+        u = rng.normal(size=mesh.n_edges)
+        v = rng.normal(size=n_active)
+        w = rng.normal(size=mesh.n_edges)
+        results = []
+        for lazy_deriv in [False, True]:
+            sigma_map = maps.ComboMap(
+                [maps.ExpMap(mesh), maps.InjectActiveCells(mesh, active_cells, -8.0)],
+                lazy_deriv=lazy_deriv,
+            )
+            simulation = dc.Simulation3DNodal(
+                mesh, survey=dc.Survey([]), sigmaMap=sigma_map
+            )
+            simulation.model = model
+            assert isinstance(simulation.sigmaDeriv, LinearOperator) == lazy_deriv
+            deriv = simulation.MeSigmaDeriv(u)
+            results.append(
+                (
+                    deriv.toarray(),
+                    simulation.MeSigmaDeriv(u, v),
+                    simulation.MeSigmaDeriv(u, w, adjoint=True),
+                )
+            )
+        for eager, lazy in zip(*results):
+            np.testing.assert_allclose(lazy, eager)
+
+    def test_fallback(self):
+        combo = maps.ComboMap([maps.IdentityMap(), maps.IdentityMap()], lazy_deriv=True)
+        m = np.ones(3)
+        np.testing.assert_array_equal(combo.deriv(m, m), m)
+        assert not isinstance(combo.deriv(m), LinearOperator)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -48,6 +48,27 @@ class TestOptimizers(unittest.TestCase):
         print("x_true: ", x_true)
         self.assertTrue(np.linalg.norm(xopt - x_true, 2) < TOL, True)
 
+    def test_ProjGNCG_quadraticBounded(self):
+        myB = np.array([-5, 1])
+        GNCG = optimization.ProjectedGNCG(maxIterCG=10)
+        GNCG.lower, GNCG.upper = -2, 2
+        xopt = GNCG.minimize(get_quadratic(self.A, myB), np.array([0.0, 0.0]))
+        x_true = np.array([2.0, -1.0])
+        print("xopt: ", xopt)
+        print("x_true: ", x_true)
+        self.assertTrue(np.linalg.norm(xopt - x_true, 2) < TOL, True)
+
+    def test_projection(self):
+        rng = np.random.default_rng(seed=42)
+        x = rng.normal(size=50)
+        lower = rng.uniform(-1.0, 0.0, size=50)
+        upper = rng.uniform(0.0, 1.0, size=50)
+        for opt in [optimization.ProjectedGradient(), optimization.ProjectedGNCG()]:
+            opt.lower, opt.upper = lower, upper
+            np.testing.assert_array_equal(
+                opt.projection(x), np.median(np.c_[lower, x, upper], axis=1)
+            )
+
     def test_NewtonRoot(self):
         def fun(x, return_g=True):
             if return_g:
@@ -3,6 +3,7 @@ import unittest
 import numpy as np
 import discretize
 import pytest
+import scipy.sparse as sp
 
 from simpeg import maps, simulation
 
@@ -87,5 +88,49 @@ class TestTimeSimulation(unittest.TestCase):
         self.assertTrue(np.all(self.sim.times == np.r_[1, true_time_steps].cumsum()))
 
 
+class TestJtJdiag:
+    @pytest.fixture
+    def sim(self):
+        mesh = discretize.TensorMesh([50])
+        return simulation.ExponentialSinusoidSimulation(
+            mesh=mesh, model_map=maps.ExpMap(mesh), n_kernels=30
+        )
+
+    @pytest.fixture
+    def model(self):
+        return np.random.default_rng(seed=42).normal(size=50)
+
+    def exact(self, sim, model, weights):
+        return np.sum((weights[:, None] * sim.getJ(model)) ** 2, axis=0)
+
+    def test_default_exact(self, sim, model):
+        weights = np.linspace(1.0, 2.0, 30)
+        jtj_diag = sim.getJtJdiag(model, W=sp.diags(weights))
+        np.testing.assert_allclose(jtj_diag, self.exact(sim, model, weights))
+
+    def test_probing(self, sim, model):
+        weights = np.linspace(1.0, 2.0, 30)
+        exact = self.exact(sim, model, weights)
+        W = sp.diags(weights)
+        jtj_diag = sim.getJtJdiag(model, W=W, method="probing", n_probes=30)
+        np.testing.assert_allclose(jtj_diag, exact)
+
+        del sim._gtgdiag
+        jtj_diag = sim.getJtJdiag(
+            model, W=W, method="hutchinson", n_probes=2000, random_seed=0
+        )
+        np.testing.assert_allclose(jtj_diag, exact, rtol=0.15)
+
+    def test_cached(self, sim, model):
+        jtj_diag = sim.getJtJdiag(model, method="probing", n_probes=5)
+        assert sim.getJtJdiag(model) is jtj_diag
+        new_diag = sim.getJtJdiag(model + 1.0, method="probing", n_probes=5)
+        assert new_diag is not jtj_diag
+
+    def test_bad_method(self, sim, model):
+        with pytest.raises(ValueError):
+            sim.getJtJdiag(model, method="random")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,100 @@
+"""
+Test the cache of the time transforms of the 1D TDEM simulations.
+"""
+
+import numpy as np
+import pytest
+import simpeg.electromagnetics.time_domain as tdem
+from simpeg import maps
+
+THICKNESSES = np.array([10.0, 20.0])
+MODEL = np.log(np.r_[0.01, 0.1, 0.001])
+
+
+def get_survey(waveform, height=30.0):
+    location = np.r_[0.0, 0.0, height]
+    times = np.logspace(-5, -3, 11)
+    receivers = [
+        tdem.receivers.PointMagneticFluxTimeDerivative(
+            location, times, orientation="z"
+        ),
+        tdem.receivers.PointMagneticFluxDensity(location, times, orientation="z"),
+    ]
+    source = tdem.sources.CircularLoop(
+        receivers, location=location, radius=10.0, waveform=waveform
+    )
+    return tdem.Survey([source])
+
+
+def get_simulation(survey, cache):
+    return tdem.Simulation1DLayered(
+        survey=survey,
+        thicknesses=THICKNESSES,
+        sigmaMap=maps.ExpMap(),
+        time_transform_cache=cache,
+    )
+
+
+@pytest.fixture(
+    params=["step_off", "ramp_off"],
+)
+def waveform(request):
+    if request.param == "step_off":
+        return tdem.sources.StepOffWaveform()
+    return tdem.sources.RampOffWaveform(off_time=1e-5)
+
+
+def test_shared_transforms(waveform):
+    cache = tdem.TimeTransformCache()
+    simulation = get_simulation(get_survey(waveform), cache)
+    dpred = simulation.dpred(MODEL)
+    assert len(cache) == 2
+
+    # another sounding of the same system reuses the matrices
+    other = get_simulation(get_survey(waveform, height=40.0), cache)
+    other.dpred(MODEL)
+    assert len(cache) == 2
+    for A, other_A in zip(simulation._As, other._As):
+        assert A is other_A
+        assert not A.flags.writeable
+
+    # results don't depend on the cache
+    uncached = get_simulation(get_survey(waveform), tdem.TimeTransformCache())
+    np.testing.assert_allclose(uncached.dpred(MODEL), dpred)
+
+
+def test_different_waveforms():
+    cache = tdem.TimeTransformCache()
+    for off_time in [1e-5, 2e-5]:
+        waveform = tdem.sources.RampOffWaveform(off_time=off_time)
+        get_simulation(get_survey(waveform), cache).dpred(MODEL)
+    assert len(cache) == 4
+
+
+def test_directory(waveform, tmp_path):
+    cache = tdem.TimeTransformCache(directory=tmp_path / "transforms")
+    simulation = get_simulation(get_survey(waveform), cache)
+    dpred = simulation.dpred(MODEL)
+    assert len(list((tmp_path / "transforms").glob("*.npy"))) == 2
+
+    # a new session loads the saved matrices
+    cache = tdem.TimeTransformCache(directory=tmp_path / "transforms")
+    simulation = get_simulation(get_survey(waveform), cache)
+    assert len(cache) == 0
+    np.testing.assert_allclose(simulation.dpred(MODEL), dpred)
+    assert len(cache) == 2
+
+
+def test_eviction():
+    cache = tdem.TimeTransformCache()
+    for i in range(3):
+        cache.set(("transform", i), np.ones((10, 10)))
+    assert len(cache) == 3
+    # most recently used transform is kept
+    cache.get(("transform", 0))
+    cache.max_memory = 1.5 * 800 / 1024**3
+    assert len(cache) == 1
+    assert cache.get(("transform", 0)) is not None
+    assert cache.get(("transform", 1)) is None
+    cache.clear()
+    assert len(cache) == 0
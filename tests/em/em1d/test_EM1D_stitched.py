@@ -0,0 +1,225 @@
+"""
+Test the stitched 1D simulations against one 1D simulation per sounding.
+"""
+
+import pytest
+import numpy as np
+import scipy.sparse as sp
+import simpeg.electromagnetics.frequency_domain as fdem
+import simpeg.electromagnetics.time_domain as tdem
+from simpeg import maps
+from simpeg.utils import sdiag
+from discretize.tests import check_derivative
+
+THICKNESSES = np.array([10.0, 20.0, 30.0])
+N_LAYER = THICKNESSES.size + 1
+
+
+def fdem_soundings():
+    """Soundings of a frequency domain survey, the last one with another offset."""
+    heights = [30.0, 35.0, 42.0, 30.0]
+    offsets = [8.0, 8.0, 8.0, 12.0]
+    soundings = []
+    for i, (height, offset) in enumerate(zip(heights, offsets)):
+        location = np.r_[20.0 * i, 0.0, height]
+        receivers = [
+            fdem.receivers.PointMagneticFieldSecondary(
+                location + np.r_[offset, 0.0, 0.0],
+                orientation="z",
+                component=component,
+                data_type="ppm",
+            )
+            for component in ["real", "imag"]
+        ] + [
+            fdem.receivers.PointMagneticField(
+                location + np.r_[offset, 0.0, 1.0], orientation="x", component="both"
+            )
+        ]
+        soundings.append(
+            [
+                fdem.sources.MagDipole(receivers, frequency=f, location=location)
+                for f in [900.0, 7200.0, 56000.0]
+            ]
+        )
+    return soundings
+
+
+def tdem_soundings():
+    """Dual moment soundings of a time domain survey."""
+    step_off = tdem.sources.StepOffWaveform()
+    ramp_off = tdem.sources.RampOffWaveform(off_time=1e-5)
+    soundings = []
+    for i, height in enumerate([25.0, 30.0, 40.0]):
+        location = np.r_[20.0 * i, 0.0, height]
+        sources = []
+        for waveform, times in [
+            (step_off, np.logspace(-5, -3, 6)),
+            (ramp_off, np.logspace(-4, -2, 6)),
+        ]:
+            receivers = [
+                tdem.receivers.PointMagneticFluxTimeDerivative(
+                    location, times, orientation="z"
+                ),
+                tdem.receivers.PointMagneticFluxDensity(
+                    location, times, orientation="z"
+                ),
+            ]
+            sources.append(
+                tdem.sources.CircularLoop(
+                    receivers, location=location, radius=10.0, waveform=waveform
+                )
+            )
+        soundings.append(sources)
+    return soundings
+
+
+@pytest.fixture(params=["fdem", "tdem"])
+def case(request):
+    module = fdem if request.param == "fdem" else tdem
+    soundings = fdem_soundings() if request.param == "fdem" else tdem_soundings()
+    n_sounding = len(soundings)
+    rng = np.random.default_rng(seed=42)
+    model = np.log(10 ** rng.uniform(-3, -1, size=n_sounding * N_LAYER))
+    topo = np.c_[np.zeros((n_sounding, 2)), rng.uniform(-5, 5, size=n_sounding)]
+    return module, soundings, model, topo
+
+
+def test_forward_and_sensitivities(case):
+    module, soundings, model, topo = case
+    survey = module.Survey([src for sources in soundings for src in sources])
+    simulation = module.Simulation1DLayeredStitched(
+        survey=survey,
+        thicknesses=THICKNESSES,
+        sigmaMap=maps.ExpMap(),
+        topo=topo,
+    )
+    assert simulation.n_sounding == len(soundings)
+    dpred = simulation.dpred(model)
+    J = simulation.getJ(model)
+    assert sp.issparse(J)
+
+    start = 0
+    for i, sources in enumerate(soundings):
+        m = model[i * N_LAYER : (i + 1) * N_LAYER]
+        simulation_1d = module.Simulation1DLayered(
+            survey=module.Survey(sources),
+            thicknesses=THICKNESSES,
+            sigmaMap=maps.ExpMap(),
+            topo=topo[i],
+        )
+        d = simulation_1d.dpred(m)
+        stop = start + d.size
+        np.testing.assert_allclose(dpred[start:stop], d, rtol=1e-6, atol=1e-12)
+
+        J_1d = simulation_1d.getJ(m)
+        J_block = J[start:stop].toarray()
+        np.testing.assert_allclose(
+            J_block[:, i * N_LAYER : (i + 1) * N_LAYER],
+            J_1d,
+            rtol=1e-6,
+            atol=1e-6 * np.abs(J_1d).max(),
+        )
+        J_block[:, i * N_LAYER : (i + 1) * N_LAYER] = 0.0
+        np.testing.assert_array_equal(J_block, 0.0)
+        start = stop
+    assert start == survey.nD
+
+
+def test_shared_coefficients():
+    survey = fdem.Survey([src for sources in fdem_soundings() for src in sources])
+    simulation = fdem.Simulation1DLayeredStitched(
+        survey=survey, thicknesses=THICKNESSES, sigma=np.ones(4 * N_LAYER)
+    )
+    assert simulation.n_sounding == 4
+    soundings = [group.soundings for group in simulation._sounding_groups]
+    np.testing.assert_array_equal(soundings[0], [0, 1, 2])
+    np.testing.assert_array_equal(soundings[1], [3])
+
+
+def test_chunks(case):
+    module, soundings, model, topo = case
+    survey = module.Survey([src for sources in soundings for src in sources])
+    kwargs = dict(
+        survey=survey, thicknesses=THICKNESSES, sigmaMap=maps.ExpMap(), topo=topo
+    )
+    simulation = module.Simulation1DLayeredStitched(**kwargs)
+    small_chunks = module.Simulation1DLayeredStitched(max_chunk_size=1e-3, **kwargs)
+    np.testing.assert_allclose(small_chunks.dpred(model), simulation.dpred(model))
+    np.testing.assert_allclose(
+        small_chunks.getJ(model).toarray(), simulation.getJ(model).toarray()
+    )
+
+
+def test_derivatives(case):
+    module, soundings, model, topo = case
+    survey = module.Survey([src for sources in soundings for src in sources])
+    simulation = module.Simulation1DLayeredStitched(
+        survey=survey,
+        thicknesses=THICKNESSES,
+        rhoMap=maps.ExpMap(),
+        topo=topo,
+    )
+    rng = np.random.default_rng(seed=0)
+
+    def fun(m):
+        return simulation.dpred(m), lambda v: simulation.Jvec(m, v)
+
+    assert check_derivative(fun, -model, plotIt=False, num=3, random_seed=rng)
+
+    v = rng.normal(size=model.size)
+    w = rng.normal(size=survey.nD)
+    np.testing.assert_allclose(
+        w @ simulation.Jvec(-model, v), v @ simulation.Jtvec(-model, w)
+    )
+
+    W = sdiag(rng.uniform(1, 2, size=survey.nD))
+    J = simulation.getJ(-model).toarray()
+    np.testing.assert_allclose(
+        simulation.getJtJdiag(-model, W=W), np.sum((W @ J) ** 2, axis=0)
+    )
+
+
+def test_source_below_topography():
+    survey = fdem.Survey(fdem_soundings()[0])
+    simulation = fdem.Simulation1DLayeredStitched(
+        survey=survey,
+        thicknesses=THICKNESSES,
+        sigma=np.ones(N_LAYER),
+        topo=np.r_[0.0, 0.0, 50.0],
+    )
+    with pytest.raises(ValueError, match="above the topography"):
+        simulation.dpred(simulation.sigma)
+
+
+@pytest.mark.parametrize("use_numba", [True, False])
+def test_reflection_coefficients(use_numba):
+    from geoana.kernels.tranverse_electric_reflections import (
+        rTE_forward,
+        rTE_gradient,
+    )
+    from scipy.constants import mu_0
+    from simpeg.electromagnetics import _rte_stitched
+
+    if use_numba:
+        pytest.importorskip("numba")
+        forward = _rte_stitched.rTE_forward_stitched
+        gradient = _rte_stitched.rTE_sigma_gradient_stitched
+    else:
+        forward = _rte_stitched._rTE_forward_numpy
+        gradient = _rte_stitched._rTE_sigma_gradient_numpy
+
+    rng = np.random.default_rng(seed=0)
+    frequencies = np.logspace(1, 5, 7)
+    lamb = np.logspace(-4, 2, 33)
+    sigma = 10 ** rng.uniform(-4, 0, size=(5, N_LAYER))
+    rTE = forward(frequencies, lamb, sigma, THICKNESSES)
+    rTE_ds = gradient(frequencies, lamb, sigma, THICKNESSES)
+    mu = np.full((N_LAYER, frequencies.size), mu_0, dtype=complex)
+    for i, s in enumerate(sigma):
+        s = np.tile(s[:, None], (1, frequencies.size)).astype(complex)
+        expected = rTE_forward(frequencies, lamb, s, mu, THICKNESSES)
+        np.testing.assert_allclose(rTE[i], expected, rtol=1e-8, atol=1e-10)
+        expected = rTE_gradient(frequencies, lamb, s, mu, THICKNESSES)[0]
+        np.testing.assert_allclose(
+            rTE_ds[i], expected, rtol=1e-8, atol=1e-8 * np.abs(expected).max()
+        )
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+import discretize
+from pymatsolver import SolverLU
+
+from simpeg import maps
+from simpeg.electromagnetics import frequency_domain as fdem
+
+
+class CountingSolver(SolverLU):
+    n_factors = 0
+
+    def __init__(self, A, **kwargs):
+        type(self).n_factors += 1
+        super().__init__(A, **kwargs)
+
+
+def get_simulation(formulation="MagneticFluxDensity", **kwargs):
+    mesh = discretize.TensorMesh([[(20.0, 6)], [(20.0, 6)], [(20.0, 6)]], "CCC")
+    rx = fdem.Rx.PointMagneticFluxDensitySecondary(
+        np.array([[0.0, 0.0, 30.0]]), orientation="z", component="real"
+    )
+    source_list = [
+        fdem.Src.MagDipole([rx], frequency=frequency, location=np.r_[0.0, 0.0, 40.0])
+        for frequency in [10.0, 100.0, 1000.0]
+    ]
+    kwargs.setdefault("solver", CountingSolver)
+    return getattr(fdem, f"Simulation3D{formulation}")(
+        mesh, survey=fdem.Survey(source_list), sigmaMap=maps.ExpMap(mesh), **kwargs
+    )
+
+
+@pytest.fixture
+def model():
+    rng = np.random.default_rng(seed=42)
+    return np.log(1e-2) + 0.1 * rng.normal(size=216)
+
+
+def test_factor_reuse(model):
+    sim = get_simulation()
+    rng = np.random.default_rng(seed=42)
+    v = rng.normal(size=model.size)
+
+    CountingSolver.n_factors = 0
+    f = sim.fields(model)
+    assert CountingSolver.n_factors == 3
+
+    sim.Jvec(model, v, f=f)
+    sim.Jtvec(model, rng.normal(size=sim.survey.nD), f=f)
+    sim.fields(model)
+    assert CountingSolver.n_factors == 3
+
+    # updating the model discards the factors
+    sim.fields(model + 0.01)
+    assert CountingSolver.n_factors == 6
+
+
+@pytest.mark.parametrize("forward_only", [True, False])
+def test_previous_factors(model, forward_only):
+    """Small model updates should be solved with the previous factors."""
+    sim = get_simulation(forward_only=forward_only, factor_reuse_rtol=1e-10)
+    reference = get_simulation(solver=SolverLU)
+    rng = np.random.default_rng(seed=42)
+    v = rng.normal(size=model.size)
+    new_model = model + 0.01 * rng.normal(size=model.size)
+
+    sim.fields(model)
+    CountingSolver.n_factors = 0
+    f = sim.fields(new_model)
+    assert CountingSolver.n_factors == 0
+    np.testing.assert_allclose(
+        sim.dpred(new_model, f=f), reference.dpred(new_model), rtol=1e-8
+    )
+
+    # sensitivities need the factors for the current model
+    jv = sim.Jvec(new_model, v, f=f)
+    assert CountingSolver.n_factors == 3
+    np.testing.assert_allclose(jv, reference.Jvec(new_model, v), rtol=1e-8)
+
+    # large updates fall back to new factorizations
+    CountingSolver.n_factors = 0
+    sim.fields(new_model + 2.0)
+    assert CountingSolver.n_factors == 3
+
+
+def test_memory_budget(model):
+    rng = np.random.default_rng(seed=42)
+    v = rng.normal(size=model.size)
+    jv = get_simulation(solver=SolverLU).Jvec(model, v)
+
+    sim = get_simulation(max_factor_memory=0.0)
+    CountingSolver.n_factors = 0
+    f = sim.fields(model)
+    assert CountingSolver.n_factors == 3
+    assert len(sim._factors) == 1
+    np.testing.assert_allclose(sim.Jvec(model, v, f=f), jv)
+    assert CountingSolver.n_factors == 6
+
+
+def test_ainv_sequence(model):
+    sim = get_simulation()
+    sim.model = model
+    assert len(sim.Ainv) == 3
+    assert sim.Ainv[1] is sim._get_Ainv(100.0)
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"factor_reuse_rtol": 0.0}, {"max_factor_memory": -1.0}]
+)
+def test_bad_arguments(kwargs):
+    with pytest.raises(ValueError):
+        get_simulation(**kwargs)
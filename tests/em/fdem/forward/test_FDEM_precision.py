@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+import discretize
+from pymatsolver import SolverLU
+
+from simpeg import maps
+from simpeg.utils.solver_utils import MixedPrecisionSolver
+from simpeg.electromagnetics import frequency_domain as fdem
+
+
+def get_simulation(formulation, **kwargs):
+    mesh = discretize.TensorMesh([[(20.0, 6)], [(20.0, 6)], [(20.0, 6)]], "CCC")
+    rx = fdem.Rx.PointMagneticFluxDensitySecondary(
+        np.array([[0.0, 0.0, 30.0]]), orientation="z", component="real"
+    )
+    source_list = [
+        fdem.Src.MagDipole([rx], frequency=frequency, location=np.r_[0.0, 0.0, 40.0])
+        for frequency in [10.0, 1000.0]
+    ]
+    return getattr(fdem, f"Simulation3D{formulation}")(
+        mesh,
+        survey=fdem.Survey(source_list),
+        sigmaMap=maps.ExpMap(mesh),
+        solver=SolverLU,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("formulation", ["MagneticFluxDensity", "ElectricField"])
+@pytest.mark.parametrize(
+    "kwargs, rtol",
+    [
+        ({"field_precision": "single"}, 1e-5),
+        ({"solver_precision": "mixed"}, 1e-8),
+        ({"field_precision": "single", "solver_precision": "mixed"}, 1e-5),
+    ],
+)
+def test_precision(formulation, kwargs, rtol):
+    reference = get_simulation(formulation)
+    sim = get_simulation(formulation, **kwargs)
+    rng = np.random.default_rng(seed=42)
+    m = np.log(1e-2) + 0.1 * rng.normal(size=sim.mesh.n_cells)
+    v = rng.normal(size=m.size)
+    w = rng.normal(size=sim.survey.nD)
+
+    f = sim.fields(m)
+    single = kwargs.get("field_precision") == "single"
+    for field in f._fields.values():
+        assert field.dtype == (np.complex64 if single else np.complex128)
+    if "solver_precision" in kwargs:
+        assert all(isinstance(Ainv, MixedPrecisionSolver) for Ainv in sim.Ainv)
+
+    d = reference.dpred(m)
+    np.testing.assert_allclose(
+        sim.dpred(m, f=f), d, rtol=rtol, atol=rtol * np.abs(d).max()
+    )
+    jv = reference.Jvec(m, v)
+    np.testing.assert_allclose(
+        sim.Jvec(m, v, f=f), jv, rtol=rtol, atol=rtol * np.abs(jv).max()
+    )
+    jtw = reference.Jtvec(m, w)
+    np.testing.assert_allclose(
+        sim.Jtvec(m, w, f=f), jtw, rtol=rtol, atol=rtol * np.abs(jtw).max()
+    )
+
+
+def test_bad_precision():
+    with pytest.raises(ValueError):
+        get_simulation("ElectricField", field_precision="half")
+    with pytest.raises(ValueError):
+        get_simulation("ElectricField", solver_precision="single")
@@ -0,0 +1,102 @@
+import time
+
+import numpy as np
+import pytest
+import discretize
+from pymatsolver import SolverLU
+
+from simpeg import maps
+from simpeg.electromagnetics import frequency_domain as fdem
+
+
+def get_simulation(formulation, **kwargs):
+    mesh = discretize.TensorMesh([[(20.0, 6)], [(20.0, 6)], [(20.0, 6)]], "CCC")
+    rx_list = [
+        fdem.Rx.PointMagneticFluxDensity(
+            np.array([[0.0, 0.0, 30.0], [20.0, 0.0, 30.0]]),
+            orientation="z",
+            component=component,
+        )
+        for component in ["real", "imag"]
+    ]
+    source_list = [
+        fdem.Src.MagDipole(rx_list, frequency=frequency, location=location)
+        for frequency in [10.0, 100.0, 1000.0, 5000.0]
+        for location in [np.r_[0.0, 0.0, 40.0], np.r_[20.0, 0.0, 40.0]]
+    ]
+    return getattr(fdem, f"Simulation3D{formulation}")(
+        mesh,
+        survey=fdem.Survey(source_list),
+        sigmaMap=maps.ExpMap(mesh),
+        **{"solver": SolverLU, **kwargs},
+    )
+
+
+@pytest.mark.parametrize("formulation", ["MagneticFluxDensity", "CurrentDensity"])
+@pytest.mark.parametrize("max_concurrent_factorizations", [None, 1])
+def test_threads_match_serial(formulation, max_concurrent_factorizations):
+    serial = get_simulation(formulation)
+    threaded = get_simulation(
+        formulation,
+        n_threads=3,
+        max_concurrent_factorizations=max_concurrent_factorizations,
+    )
+    rng = np.random.default_rng(seed=42)
+    m = np.log(1e-2) + 0.1 * rng.normal(size=serial.mesh.n_cells)
+    v = rng.normal(size=m.size)
+    w = rng.normal(size=serial.survey.nD)
+
+    np.testing.assert_allclose(threaded.dpred(m), serial.dpred(m))
+    np.testing.assert_allclose(threaded.Jvec(m, v), serial.Jvec(m, v))
+    np.testing.assert_allclose(threaded.Jtvec(m, w), serial.Jtvec(m, w))
+
+
+class CheckedSolverLU(SolverLU):
+    """SolverLU failing when it is used after being cleaned."""
+
+    def __init__(self, A, **kwargs):
+        super().__init__(A, **kwargs)
+        self.cleaned = False
+
+    def _solve_multiple(self, rhs):
+        # leave time for other threads to evict the factors
+        time.sleep(0.01)
+        assert not self.cleaned, "solver used after being cleaned"
+        return super()._solve_multiple(rhs)
+
+    def _solve_single(self, rhs):
+        time.sleep(0.01)
+        assert not self.cleaned, "solver used after being cleaned"
+        return super()._solve_single(rhs)
+
+    def clean(self):
+        self.cleaned = True
+        super().clean()
+
+
+@pytest.mark.parametrize("formulation", ["MagneticFluxDensity", "CurrentDensity"])
+def test_threads_with_eviction(formulation):
+    # a memory budget of zero evicts the factors of the other frequencies as
+    # soon as a new one is factored, while other threads still use them
+    serial = get_simulation(formulation)
+    threaded = get_simulation(
+        formulation, n_threads=3, max_factor_memory=0.0, solver=CheckedSolverLU
+    )
+    rng = np.random.default_rng(seed=42)
+    m = np.log(1e-2) + 0.1 * rng.normal(size=serial.mesh.n_cells)
+    v = rng.normal(size=m.size)
+    w = rng.normal(size=serial.survey.nD)
+
+    np.testing.assert_allclose(threaded.dpred(m), serial.dpred(m))
+    np.testing.assert_allclose(threaded.Jvec(m, v), serial.Jvec(m, v))
+    np.testing.assert_allclose(threaded.Jtvec(m, w), serial.Jtvec(m, w))
+    assert len(threaded._factors) == 1
+    assert not threaded._factors._pins
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"n_threads": 0}, {"max_concurrent_factorizations": 0}]
+)
+def test_bad_arguments(kwargs):
+    with pytest.raises(ValueError):
+        get_simulation("MagneticFluxDensity", **kwargs)
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+import discretize
+
+from simpeg import maps
+from simpeg.electromagnetics import frequency_domain as fdem
+
+
+@pytest.mark.parametrize(
+    "formulation", ["ElectricField", "MagneticFluxDensity", "CurrentDensity"]
+)
+def test_jtj_diag(formulation):
+    mesh = discretize.TensorMesh([[(20.0, 6)], [(20.0, 6)], [(20.0, 6)]], "CCC")
+    locations = np.c_[np.linspace(-40.0, 40.0, 4), np.zeros(4), np.full(4, 30.0)]
+    receivers = [
+        fdem.Rx.PointMagneticFluxDensity(locations, orientation="z", component=c)
+        for c in ["real", "imag"]
+    ]
+    source_list = [
+        fdem.Src.MagDipole(receivers, frequency=frequency, location=np.r_[0, 0, 40.0])
+        for frequency in [10.0, 100.0]
+    ]
+    sim = getattr(fdem, f"Simulation3D{formulation}")(
+        mesh, survey=fdem.Survey(source_list), sigmaMap=maps.ExpMap(mesh)
+    )
+    rng = np.random.default_rng(seed=42)
+    model = np.log(1e-2) + 0.1 * rng.normal(size=mesh.n_cells)
+    fields = sim.fields(model)
+
+    # adjoint products of several vectors at once
+    V = rng.normal(size=(sim.survey.nD, 3))
+    np.testing.assert_allclose(
+        sim._Jtvec_block(model, V, f=fields),
+        np.column_stack([sim.Jtvec(model, v, f=fields) for v in V.T]),
+    )
+
+    # probing doesn't form J, and is exact with one probing vector per datum
+    jtj_diag = sim.getJtJdiag(model, f=fields, method="probing", n_probes=sim.survey.nD)
+    assert getattr(sim, "_Jmatrix", None) is None
+    Jt = np.column_stack([sim.Jtvec(model, v, f=fields) for v in np.eye(sim.survey.nD)])
+    np.testing.assert_allclose(jtj_diag, np.sum(Jt**2, axis=1))
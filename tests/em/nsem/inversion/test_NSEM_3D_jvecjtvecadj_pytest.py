@@ -250,3 +250,35 @@ class TestDerivatives:
             rtol=ADJ_RTOL,
             random_seed=32,
         )
+
+    def test_jtvec_block(
+        self,
+        survey_type,
+        orientations,
+        components,
+        locations,
+        frequencies,
+        mesh,
+        active_cells,
+        mapping,
+        sigma_hs,
+    ):
+        m0, dmis = self.get_setup_objects(
+            survey_type,
+            orientations,
+            components,
+            locations,
+            frequencies,
+            mesh,
+            active_cells,
+            mapping,
+            sigma_hs,
+        )
+        sim = dmis.simulation
+
+        f = sim.fields(m0)
+        V = np.random.default_rng(32).normal(size=(sim.survey.nD, 3))
+        np.testing.assert_allclose(
+            sim._Jtvec_block(m0, V, f=f),
+            np.column_stack([sim.Jtvec(m0, v, f=f) for v in V.T]),
+        )
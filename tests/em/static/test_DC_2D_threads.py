@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+import discretize
+from pymatsolver import SolverLU
+
+from simpeg import maps
+from simpeg.electromagnetics import resistivity as dc
+
+
+def get_simulation(formulation, bc_type="Robin", **kwargs):
+    mesh = discretize.TensorMesh([[(10.0, 24)], [(10.0, 10)]], origin="CN")
+    x = np.linspace(-80.0, 80.0, 9)
+    M = np.c_[x - 5.0, np.zeros_like(x)]
+    N = np.c_[x + 5.0, np.zeros_like(x)]
+    source_list = [
+        dc.sources.Dipole(
+            [dc.receivers.Dipole(M, N)], np.r_[a, 0.0], np.r_[a + 20.0, 0.0]
+        )
+        for a in [-100.0, 60.0]
+    ]
+    return getattr(dc, f"Simulation2D{formulation}")(
+        mesh,
+        survey=dc.Survey(source_list),
+        sigmaMap=maps.ExpMap(mesh),
+        bc_type=bc_type,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize(
+    "formulation, bc_type",
+    [("CellCentered", "Robin"), ("Nodal", "Robin"), ("Nodal", "Neumann")],
+)
+def test_threaded_wavenumbers(formulation, bc_type):
+    serial = get_simulation(formulation, bc_type)
+    threaded = get_simulation(
+        formulation, bc_type, n_threads=3, max_concurrent_factorizations=2
+    )
+    rng = np.random.default_rng(seed=42)
+    model = np.log(1e-2) + 0.1 * rng.normal(size=serial.mesh.n_cells)
+    v = rng.normal(size=model.size)
+    w = rng.normal(size=serial.survey.nD)
+
+    f_serial = serial.fields(model)
+    f_threaded = threaded.fields(model)
+    assert all(Ainv is not None for Ainv in threaded.Ainv)
+    np.testing.assert_allclose(
+        threaded.dpred(model, f=f_threaded), serial.dpred(model, f=f_serial)
+    )
+    np.testing.assert_allclose(
+        threaded.Jvec(model, v, f=f_threaded), serial.Jvec(model, v, f=f_serial)
+    )
+    np.testing.assert_allclose(
+        threaded.Jtvec(model, w, f=f_threaded), serial.Jtvec(model, w, f=f_serial)
+    )
+    np.testing.assert_allclose(
+        threaded.getJ(model, f=f_threaded), serial.getJ(model, f=f_serial)
+    )
+
+
+class TrackedSolverLU(SolverLU):
+    """SolverLU recording whether it was cleaned."""
+
+    def clean(self):
+        self.cleaned = True
+        super().clean()
+
+
+@pytest.mark.parametrize("n_threads", [1, 3])
+def test_fields_clean_previous_factors(n_threads):
+    simulation = get_simulation("Nodal", n_threads=n_threads, solver=TrackedSolverLU)
+    model = np.full(simulation.mesh.n_cells, np.log(1e-2))
+    simulation.fields(model)
+    previous = list(simulation.Ainv)
+    simulation.fields(model + 0.1)
+    assert all(getattr(Ainv, "cleaned", False) for Ainv in previous)
+    assert not any(getattr(Ainv, "cleaned", False) for Ainv in simulation.Ainv)
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"n_threads": 0}, {"max_concurrent_factorizations": 0}]
+)
+def test_bad_arguments(kwargs):
+    with pytest.raises(ValueError):
+        get_simulation("CellCentered", **kwargs)
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+import discretize
+
+from simpeg import maps
+from simpeg.electromagnetics.static import resistivity as dc
+from simpeg.electromagnetics.static import induced_polarization as ip
+from simpeg.electromagnetics.static.utils.static_utils import generate_dcip_sources_line
+
+
+def get_survey(dimension, data_type="volt"):
+    source_list = generate_dcip_sources_line(
+        "dipole-dipole",
+        data_type,
+        dimension,
+        np.r_[-40.0, 40.0] if dimension == "2D" else np.r_[-40.0, 40.0, 0.0, 0.0],
+        0.0,
+        4,
+        20.0,
+    )
+    survey = dc.Survey(source_list)
+    if data_type == "apparent_resistivity":
+        survey.set_geometric_factor()
+    return survey
+
+
+def check_jtvec_block(sim, model):
+    fields = sim.fields(model)
+
+    # adjoint products of several vectors at once
+    rng = np.random.default_rng(seed=42)
+    V = rng.normal(size=(sim.survey.nD, 3))
+    JtV = sim._Jtvec_block(model, V, f=fields)
+    assert JtV.shape == (model.size, 3)
+    np.testing.assert_allclose(
+        JtV, np.column_stack([sim.Jtvec(model, v, f=fields) for v in V.T])
+    )
+    return fields
+
+
+def check_probing(sim, model):
+    fields = check_jtvec_block(sim, model)
+
+    # probing is exact with one probing vector per datum
+    jtj_diag = sim.getJtJdiag(model, f=fields, method="probing", n_probes=sim.survey.nD)
+    Jt = np.column_stack([sim.Jtvec(model, v, f=fields) for v in np.eye(sim.survey.nD)])
+    np.testing.assert_allclose(jtj_diag, np.sum(Jt**2, axis=1))
+
+
+@pytest.mark.parametrize("formulation", ["CellCentered", "Nodal"])
+@pytest.mark.parametrize("storeJ", [False, True])
+@pytest.mark.parametrize("miniaturize", [False, True])
+@pytest.mark.parametrize("data_type", ["volt", "apparent_resistivity"])
+def test_jtvec_block_3d(formulation, storeJ, miniaturize, data_type):
+    mesh = discretize.TensorMesh([[(20.0, 8)], [(20.0, 4)], [(20.0, 4)]], "CCN")
+    sim = getattr(dc, f"Simulation3D{formulation}")(
+        mesh,
+        survey=get_survey("3D", data_type),
+        sigmaMap=maps.ExpMap(mesh),
+        storeJ=storeJ,
+        miniaturize=miniaturize,
+    )
+    rng = np.random.default_rng(seed=0)
+    check_probing(sim, np.log(1e-2) + 0.1 * rng.normal(size=mesh.n_cells))
+
+
+@pytest.mark.parametrize("formulation", ["CellCentered", "Nodal"])
+@pytest.mark.parametrize("storeJ", [False, True])
+@pytest.mark.parametrize("miniaturize", [False, True])
+def test_jtvec_block_2d(formulation, storeJ, miniaturize):
+    mesh = discretize.TensorMesh([[(10.0, 16)], [(10.0, 8)]], "CN")
+    sim = getattr(dc, f"Simulation2D{formulation}")(
+        mesh,
+        survey=get_survey("2D"),
+        sigmaMap=maps.ExpMap(mesh),
+        storeJ=storeJ,
+        miniaturize=miniaturize,
+    )
+    rng = np.random.default_rng(seed=0)
+    check_probing(sim, np.log(1e-2) + 0.1 * rng.normal(size=mesh.n_cells))
+
+
+@pytest.mark.parametrize("storeJ", [False, True])
+def test_jtvec_block_ip(storeJ):
+    mesh = discretize.TensorMesh([[(20.0, 8)], [(20.0, 4)], [(20.0, 4)]], "CCN")
+    sim = ip.Simulation3DNodal(
+        mesh,
+        survey=get_survey("3D", "apparent_chargeability"),
+        sigma=np.full(mesh.n_cells, 1e-2),
+        etaMap=maps.IdentityMap(mesh),
+        storeJ=storeJ,
+    )
+    rng = np.random.default_rng(seed=0)
+    check_jtvec_block(sim, 0.1 * rng.uniform(size=mesh.n_cells))
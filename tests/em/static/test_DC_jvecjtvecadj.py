@@ -576,5 +576,63 @@ class DCProblemTestsN_storeJ_Robin(unittest.TestCase):
             pass
 
 
+class DCProblemTestsRHSChunks(unittest.TestCase):
+    def setUp(self):
+        cs = 0.25
+        mesh = discretize.TensorMesh(
+            [[(cs, 10, -1.3), (cs, 40), (cs, 10, 1.3)], [(cs, 3, -1.3), (cs, 3, 1.3)]],
+            "CN",
+        )
+        source_list = dc.utils.WennerSrcList(5, 2.5, in2D=True)
+        self.survey = dc.survey.Survey(source_list)
+        self.mesh = mesh
+        rng = np.random.default_rng(seed=42)
+        self.m0 = 1.0 + 0.1 * rng.uniform(size=mesh.nC)
+        self.v = rng.uniform(size=mesh.nC)
+        self.w = rng.uniform(size=self.survey.nD)
+
+    def get_simulation(self, formulation, **kwargs):
+        return getattr(dc.simulation, f"Simulation3D{formulation}")(
+            mesh=self.mesh, survey=self.survey, rhoMap=maps.IdentityMap(), **kwargs
+        )
+
+    def test_chunks(self):
+        for formulation in ["CellCentered", "Nodal"]:
+            # solve all the right-hand sides in a single block
+            sim = self.get_simulation(formulation, rhs_chunk_size=None)
+            jv = sim.Jvec(self.m0, self.v)
+            jtw = sim.Jtvec(self.m0, self.w)
+            J = sim._Jtvec(self.m0, v=None, f=sim.fields(self.m0)).T
+            for kwargs in [{}, {"rhs_chunk_size": 1}, {"rhs_chunk_size": 2}]:
+                sim_chunk = self.get_simulation(formulation, **kwargs)
+                f = sim_chunk.fields(self.m0)
+                np.testing.assert_allclose(sim_chunk.Jvec(self.m0, self.v, f=f), jv)
+                np.testing.assert_allclose(sim_chunk.Jtvec(self.m0, self.w, f=f), jtw)
+                np.testing.assert_allclose(sim_chunk._Jtvec(self.m0, v=None, f=f).T, J)
+            np.testing.assert_allclose(J @ self.v, jv)
+
+    def test_default_chunk_size(self):
+        rx = dc.receivers.Dipole(
+            locations_m=np.array([[0.5, 0.0]]), locations_n=np.array([[1.0, 0.0]])
+        )
+        source_list = [
+            dc.sources.Pole([rx], location=np.r_[x, 0.0])
+            for x in np.linspace(-4.0, 4.0, 40)
+        ]
+        self.survey = dc.survey.Survey(source_list)
+        sim = self.get_simulation("Nodal")
+        # the default bounds the size of the blocks
+        assert sim.rhs_chunk_size < len(source_list)
+        f = sim.fields(self.m0)
+        J = sim._Jtvec(self.m0, v=None, f=f).T
+        sim_single = self.get_simulation("Nodal", rhs_chunk_size=None)
+        f = sim_single.fields(self.m0)
+        np.testing.assert_allclose(sim_single._Jtvec(self.m0, v=None, f=f).T, J)
+
+    def test_bad_chunk_size(self):
+        with self.assertRaises(ValueError):
+            self.get_simulation("Nodal", rhs_chunk_size=0)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+import discretize
+from pymatsolver import SolverLU
+
+from simpeg import maps
+from simpeg.electromagnetics import time_domain as tdem
+
+
+class CountingSolver(SolverLU):
+    n_factors = 0
+
+    def __init__(self, A, **kwargs):
+        type(self).n_factors += 1
+        super().__init__(A, **kwargs)
+
+
+def get_simulation(formulation, **kwargs):
+    mesh = discretize.TensorMesh([[(10.0, 6)], [(10.0, 6)], [(10.0, 6)]], "CCC")
+    mapping = maps.ExpMap(mesh)
+    rx = tdem.Rx.PointMagneticFluxTimeDerivative(
+        np.array([[0.0, 0.0, 5.0]]), np.logspace(-5, -4.5, 3), "z"
+    )
+    source_list = [
+        tdem.Src.MagDipole([rx], location=np.r_[0.0, 0.0, z]) for z in [10.0, 15.0]
+    ]
+    sim = getattr(tdem, f"Simulation3D{formulation}")(
+        mesh,
+        survey=tdem.Survey(source_list),
+        sigmaMap=mapping,
+        solver=CountingSolver,
+        **kwargs,
+    )
+    sim.time_steps = [(1e-6, 4), (1e-5, 4), (1e-6, 2)]
+    return sim
+
+
+@pytest.mark.parametrize("formulation", ["MagneticFluxDensity", "ElectricField"])
+def test_factor_reuse(formulation):
+    sim = get_simulation(formulation, store_factors=True)
+    rng = np.random.default_rng(seed=42)
+    m = np.log(1e-2) + 0.1 * rng.normal(size=sim.mesh.n_cells)
+    v = rng.normal(size=sim.mesh.n_cells)
+
+    CountingSolver.n_factors = 0
+    f = sim.fields(m)
+    # one factorization per unique time-step length
+    assert CountingSolver.n_factors == 2
+
+    sim.Jvec(m, v, f=f)
+    sim.fields(m)
+    assert CountingSolver.n_factors == 2
+
+    # adjoint solves use the transpose of the same factors
+    sim.Jtvec(m, rng.normal(size=sim.survey.nD), f=f)
+    sim.Jtvec(m, rng.normal(size=sim.survey.nD), f=f)
+    assert CountingSolver.n_factors == 2
+
+    # updating the model discards the factors
+    sim.fields(m + 0.1)
+    assert CountingSolver.n_factors == 4
+
+
+@pytest.mark.parametrize("formulation", ["MagneticFluxDensity", "ElectricField"])
+def test_factors_cleaned_by_default(formulation):
+    sim = get_simulation(formulation)
+    rng = np.random.default_rng(seed=42)
+    m = np.log(1e-2) + 0.1 * rng.normal(size=sim.mesh.n_cells)
+
+    CountingSolver.n_factors = 0
+    f = sim.fields(m)
+    assert CountingSolver.n_factors == 2
+    assert getattr(sim, "_factor_cache", None) is None
+
+    sim.Jtvec(m, rng.normal(size=sim.survey.nD), f=f)
+    assert CountingSolver.n_factors == 4
+    assert getattr(sim, "_factor_cache", None) is None
+
+
+@pytest.mark.parametrize("formulation", ["MagneticFluxDensity", "ElectricField"])
+def test_adjoint_with_shared_factors(formulation):
+    """Jtvec with the transposed factors must be the adjoint of Jvec."""
+    sim = get_simulation(formulation, store_factors=True)
+    rng = np.random.default_rng(seed=42)
+    m = np.log(1e-2) + 0.1 * rng.normal(size=sim.mesh.n_cells)
+    v = rng.normal(size=sim.mesh.n_cells)
+    w = rng.normal(size=sim.survey.nD)
+
+    f = sim.fields(m)
+    wJv = w @ sim.Jvec(m, v, f=f)
+    vJtw = v @ sim.Jtvec(m, w, f=f)
+    np.testing.assert_allclose(wJv, vJtw, rtol=1e-8)
+
+
+def test_memory_budget():
+    rng = np.random.default_rng(seed=42)
+    m = np.log(1e-2) + 0.1 * rng.normal(size=216)
+    v = rng.normal(size=216)
+
+    sim = get_simulation("MagneticFluxDensity")
+    jv = sim.Jvec(m, v)
+
+    sim_lean = get_simulation("MagneticFluxDensity", max_factor_memory=0.0)
+    CountingSolver.n_factors = 0
+    f = sim_lean.fields(m)
+    # returning to a previous time-step length refactors with no budget
+    assert CountingSolver.n_factors == 3
+    np.testing.assert_allclose(sim_lean.Jvec(m, v, f=f), jv)
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+import discretize
+
+from simpeg import maps
+from simpeg.fields import ChunkedStorage
+from simpeg.electromagnetics import time_domain as tdem
+
+
+def get_simulation(formulation, **kwargs):
+    mesh = discretize.TensorMesh([[(10.0, 6)], [(10.0, 6)], [(10.0, 6)]], "CCC")
+    rx = tdem.Rx.PointMagneticFluxTimeDerivative(
+        np.array([[0.0, 0.0, 5.0]]), np.logspace(-5, -4.5, 3), "z"
+    )
+    source_list = [
+        tdem.Src.MagDipole([rx], location=np.r_[0.0, 0.0, z]) for z in [10.0, 15.0]
+    ]
+    sim = getattr(tdem, f"Simulation3D{formulation}")(
+        mesh, survey=tdem.Survey(source_list), sigmaMap=maps.ExpMap(mesh), **kwargs
+    )
+    sim.time_steps = [(1e-6, 4), (1e-5, 4), (1e-6, 2)]
+    return sim
+
+
+@pytest.mark.parametrize("formulation", ["MagneticFluxDensity", "ElectricField"])
+def test_chunked_fields(formulation, tmp_path):
+    reference = get_simulation(formulation)
+    # keep about three solutions in memory
+    storage = ChunkedStorage(str(tmp_path), max_memory=3 * 8 * 600 / 1024**3)
+    sim = get_simulation(formulation, fields_storage=storage)
+    rng = np.random.default_rng(seed=42)
+    m = np.log(1e-2) + 0.1 * rng.normal(size=sim.mesh.n_cells)
+    v = rng.normal(size=sim.mesh.n_cells)
+    w = rng.normal(size=sim.survey.nD)
+
+    f_reference = reference.fields(m)
+    f = sim.fields(m)
+    assert all(not isinstance(field, np.ndarray) for field in f._fields.values())
+    np.testing.assert_allclose(sim.dpred(m, f=f), reference.dpred(m, f=f_reference))
+    np.testing.assert_allclose(sim.Jvec(m, v, f=f), reference.Jvec(m, v, f=f_reference))
+    np.testing.assert_allclose(
+        sim.Jtvec(m, w, f=f), reference.Jtvec(m, w, f=f_reference)
+    )
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+import discretize
+from pymatsolver import SolverLU
+
+from simpeg import maps
+from simpeg.electromagnetics import time_domain as tdem
+
+
+def get_simulation(formulation, **kwargs):
+    mesh = discretize.TensorMesh([[(10.0, 6)], [(10.0, 6)], [(10.0, 6)]], "CCC")
+    rx = tdem.Rx.PointMagneticFluxTimeDerivative(
+        np.array([[0.0, 0.0, 5.0]]), np.logspace(-5, -4.5, 3), "z"
+    )
+    source_list = [
+        tdem.Src.MagDipole([rx], location=np.r_[0.0, 0.0, z]) for z in [10.0, 15.0]
+    ]
+    sim = getattr(tdem, f"Simulation3D{formulation}")(
+        mesh,
+        survey=tdem.Survey(source_list),
+        sigmaMap=maps.ExpMap(mesh),
+        solver=SolverLU,
+        **kwargs,
+    )
+    sim.time_steps = [(1e-6, 4), (1e-5, 4), (1e-6, 2)]
+    return sim
+
+
+@pytest.mark.parametrize("formulation", ["MagneticFluxDensity", "ElectricField"])
+def test_precision(formulation):
+    reference = get_simulation(formulation)
+    sim = get_simulation(
+        formulation, field_precision="single", solver_precision="mixed"
+    )
+    rng = np.random.default_rng(seed=42)
+    m = np.log(1e-2) + 0.1 * rng.normal(size=sim.mesh.n_cells)
+    v = rng.normal(size=m.size)
+    w = rng.normal(size=sim.survey.nD)
+
+    f = sim.fields(m)
+    assert all(field.dtype == np.float32 for field in f._fields.values())
+    for actual, expected in [
+        (sim.dpred(m, f=f), reference.dpred(m)),
+        (sim.Jvec(m, v, f=f), reference.Jvec(m, v)),
+        (sim.Jtvec(m, w, f=f), reference.Jtvec(m, w)),
+    ]:
+        np.testing.assert_allclose(
+            actual, expected, rtol=1e-4, atol=1e-4 * np.abs(expected).max()
+        )
@@ -0,0 +1,112 @@
+"""
+Test the numba engine and the forward only mode of VRM simulations.
+"""
+
+import numpy as np
+import pytest
+import discretize
+from simpeg.electromagnetics import viscous_remanent_magnetization as vrm
+
+
+@pytest.fixture
+def mesh():
+    h = [(0.5, 6)]
+    return discretize.TensorMesh((h, h, h), origin="CCN")
+
+
+@pytest.fixture
+def survey():
+    rng = np.random.default_rng(seed=42)
+    locations = np.c_[rng.uniform(-2.0, 2.0, size=(4, 2)), np.full(4, 0.5)]
+    times = np.logspace(-4, -2, 3)
+    waveform = vrm.waveforms.SquarePulse(delt=0.02)
+
+    receivers = []
+    for orientation in "xyz":
+        receivers.append(
+            vrm.receivers.Point(
+                locations, times=times, field_type="dhdt", orientation=orientation
+            )
+        )
+        receivers.append(
+            vrm.receivers.SquareLoop(
+                locations,
+                times=times,
+                width=0.2,
+                n_turns=10,
+                quadrature_order=3,
+                field_type="dhdt",
+                orientation=orientation,
+            )
+        )
+    sources = [
+        vrm.sources.MagDipole(
+            receivers, np.r_[0.1, 0.2, 0.6], [0.0, 0.0, 1.0], waveform
+        ),
+        vrm.sources.CircLoop(
+            receivers, np.r_[-0.3, 0.1, 0.5], 1.0, np.r_[0.2, 0.3], 1.0, waveform
+        ),
+    ]
+    return vrm.Survey(sources)
+
+
+def get_simulation(mesh, survey, cls=vrm.Simulation3DLinear, **kwargs):
+    return cls(
+        mesh,
+        survey=survey,
+        refinement_factor=2,
+        refinement_distance=[1.0, 2.0],
+        **kwargs,
+    )
+
+
+def test_geometry_operator(mesh, survey):
+    """Numba operator should match the numpy one, also computed in chunks."""
+    expected = get_simulation(mesh, survey).A
+    simulation = get_simulation(mesh, survey, engine="numba", numba_parallel=False)
+    simulation._max_sub_cells = 100
+    np.testing.assert_allclose(simulation.A, expected, rtol=1e-10, atol=1e-14)
+
+
+def test_linear_forward_only(mesh, survey):
+    rng = np.random.default_rng(seed=42)
+    model = rng.uniform(0.0, 1e-3, size=mesh.n_cells)
+    v = rng.normal(size=mesh.n_cells)
+    expected = get_simulation(mesh, survey)
+
+    simulation = get_simulation(mesh, survey, engine="numba", forward_only=True)
+    np.testing.assert_allclose(
+        simulation.fields(model), expected.fields(model), rtol=1e-10
+    )
+    assert simulation._A is None
+    # sensitivities still build the operator
+    np.testing.assert_allclose(
+        simulation.Jvec(model, v), expected.Jvec(model, v), rtol=1e-10
+    )
+
+
+@pytest.mark.parametrize("engine", ["numpy", "numba"])
+def test_log_uniform_forward_only(mesh, survey, engine):
+    n = mesh.n_cells
+    kwargs = dict(
+        chi0=np.zeros(n),
+        dchi=0.01 * np.ones(n),
+        tau1=1e-8 * np.ones(n),
+        tau2=np.ones(n),
+    )
+    expected = get_simulation(mesh, survey, vrm.Simulation3DLogUniform, **kwargs)
+    simulation = get_simulation(
+        mesh,
+        survey,
+        vrm.Simulation3DLogUniform,
+        engine=engine,
+        forward_only=True,
+        **kwargs,
+    )
+    np.testing.assert_allclose(simulation.fields(), expected.fields(), rtol=1e-10)
+    assert simulation._A is None
+
+
+def test_invalid_engine(mesh, survey):
+    with pytest.raises(ValueError):
+        get_simulation(mesh, survey, engine="fortran")
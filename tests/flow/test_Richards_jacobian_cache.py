@@ -0,0 +1,130 @@
+import numpy as np
+import pytest
+import discretize
+from pymatsolver import SolverLU
+
+from simpeg import maps
+from simpeg.flow import richards
+
+
+class CountingSolver(SolverLU):
+    n_factors = 0
+    instances = []
+
+    def __init__(self, A, **kwargs):
+        type(self).n_factors += 1
+        type(self).instances.append(self)
+        super().__init__(A, **kwargs)
+        self.cleaned = False
+
+    def clean(self):
+        self.cleaned = True
+        super().clean()
+
+
+def cached_solvers(simulation):
+    steps = simulation._jacobian_cache[1].values()
+    return [step._Adiaginv for step in steps] + [step._AdiaginvT for step in steps]
+
+
+def get_simulation(**kwargs):
+    mesh = discretize.TensorMesh([np.ones(20)])
+    mesh.set_cell_gradient_BC("dirichlet")
+    params = richards.empirical.HaverkampParams().celia1990
+    k_fun, theta_fun = richards.empirical.haverkamp(mesh, **params)
+    k_fun.KsMap = maps.ExpMap(nP=mesh.nC)
+
+    bc = np.array([-61.5, -20.7])
+    time_steps = [(40, 3), (60, 3)]
+    times = discretize.TensorMesh([time_steps]).nodes_x
+    locations = np.array([[5.0], [10], [15]])
+    survey = richards.Survey(
+        [
+            richards.receivers.Saturation(locations=locations, times=times),
+            richards.receivers.Pressure(locations=locations, times=times),
+        ]
+    )
+    kwargs.setdefault("solver", CountingSolver)
+    simulation = richards.SimulationNDCellCentered(
+        mesh,
+        survey=survey,
+        hydraulic_conductivity=k_fun,
+        water_retention=theta_fun,
+        boundary_conditions=bc,
+        initial_conditions=np.full(mesh.nC, bc[0]),
+        root_finder_tol=1e-6,
+        **kwargs,
+    )
+    simulation.time_steps = time_steps
+    model = np.log(params["Ks"] * np.ones(mesh.nC))
+    return simulation, model
+
+
+@pytest.mark.parametrize("max_jacobian_memory", [None, 0.0])
+def test_jacobian_cache(max_jacobian_memory):
+    reference, model = get_simulation(solver=SolverLU)
+    simulation, _ = get_simulation(
+        cache_jacobian=True, max_jacobian_memory=max_jacobian_memory
+    )
+    rng = np.random.default_rng(seed=42)
+    v = rng.normal(size=model.size)
+    w = rng.normal(size=simulation.survey.nD)
+
+    f_reference = reference.fields(model)
+    f = simulation.fields(model)
+    CountingSolver.n_factors = 0
+    CountingSolver.instances = []
+    for _ in range(2):
+        np.testing.assert_allclose(
+            simulation.Jvec(model, v, f=f), reference.Jvec(model, v, f=f_reference)
+        )
+        np.testing.assert_allclose(
+            simulation.Jtvec(model, w, f=f), reference.Jtvec(model, w, f=f_reference)
+        )
+    n_steps = simulation.nT
+    if max_jacobian_memory is None:
+        # each diagonal block and its transpose are factored once
+        assert CountingSolver.n_factors == 2 * n_steps
+        assert not any(Ainv.cleaned for Ainv in CountingSolver.instances)
+        assert len(simulation._jacobian_cache[1]) == n_steps
+    else:
+        # nothing fits in the budget, all the steps are recomputed and their
+        # solvers are cleaned after use
+        assert CountingSolver.n_factors == 4 * n_steps
+        assert all(Ainv.cleaned for Ainv in CountingSolver.instances)
+        assert len(simulation._jacobian_cache[1]) == 0
+
+
+def test_jacobian_cache_model_update():
+    simulation, model = get_simulation(cache_jacobian=True)
+    v = np.ones(model.size)
+    simulation.Jvec(model, v, f=simulation.fields(model))
+    assert len(simulation._jacobian_cache[1]) == simulation.nT
+
+    solvers = cached_solvers(simulation)
+    new_model = model + 0.1
+    f = simulation.fields(new_model)
+    assert getattr(simulation, "_jacobian_cache", None) is None
+    # the solvers of the previous model are cleaned
+    assert all(Ainv.cleaned for Ainv in solvers if Ainv is not None)
+    CountingSolver.n_factors = 0
+    simulation.Jvec(new_model, v, f=f)
+    assert CountingSolver.n_factors == simulation.nT
+
+
+def test_jacobian_cache_new_fields():
+    simulation, model = get_simulation(cache_jacobian=True)
+    v = np.ones(model.size)
+    simulation.Jvec(model, v, f=simulation.fields(model))
+    solvers = [Ainv for Ainv in cached_solvers(simulation) if Ainv is not None]
+    assert len(solvers) == simulation.nT
+    # new fields for the same model replace the stored steps
+    simulation.Jvec(model, v, f=simulation.fields(model))
+    assert all(Ainv.cleaned for Ainv in solvers)
+    solvers = [Ainv for Ainv in cached_solvers(simulation) if Ainv is not None]
+    assert not any(Ainv.cleaned for Ainv in solvers)
+
+
+def test_bad_memory_budget():
+    with pytest.raises(ValueError):
+        get_simulation(max_jacobian_memory=-1.0)
@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 
 from simpeg.potential_fields import gravity
 from simpeg.electromagnetics.static import resistivity as dc
@@ -16,7 +17,8 @@ from simpeg.meta import (
 )
 
 
-def test_meta_correctness():
+@pytest.mark.parametrize("shared_memory", [False, True])
+def test_meta_correctness(shared_memory):
     mesh = TensorMesh([16, 16, 16], origin="CCN")
 
     rx_locs = np.mgrid[-0.25:0.25:5j, -0.25:0.25:5j, 0:1:1j]
@@ -54,7 +56,9 @@ def test_meta_correctness():
         dc_mappings.append(maps.IdentityMap())
 
     serial_sim = MetaSimulation(dc_sims, dc_mappings)
-    parallel_sim = MultiprocessingMetaSimulation(dc_sims2, dc_mappings, n_processes=12)
+    parallel_sim = MultiprocessingMetaSimulation(
+        dc_sims2, dc_mappings, n_processes=12, shared_memory=shared_memory
+    )
 
     rng = np.random.default_rng(seed=0)
 
@@ -109,7 +113,8 @@ def test_meta_correctness():
         parallel_sim.join()
 
 
-def test_sum_correctness():
+@pytest.mark.parametrize("shared_memory", [False, True])
+def test_sum_correctness(shared_memory):
     mesh = TensorMesh([16, 16, 16], origin="CCN")
     # Create gravity sum sims
     rx_locs = np.mgrid[-0.25:0.25:5j, -0.25:0.25:5j, 0:1:1j].reshape(3, -1).T
@@ -137,7 +142,9 @@ def test_sum_correctness():
     m_test = np.arange(mesh.n_cells) / mesh.n_cells + 0.1
 
     serial_sim = SumMetaSimulation(g_sims, g_mappings)
-    parallel_sim = MultiprocessingSumMetaSimulation(g_sims, g_mappings, n_processes=2)
+    parallel_sim = MultiprocessingSumMetaSimulation(
+        g_sims, g_mappings, n_processes=2, shared_memory=shared_memory
+    )
 
     rng = np.random.default_rng(0)
     try:
@@ -192,7 +199,8 @@ def test_sum_correctness():
         parallel_sim.join()
 
 
-def test_repeat_correctness():
+@pytest.mark.parametrize("shared_memory", [False, True])
+def test_repeat_correctness(shared_memory):
     mesh = TensorMesh([16, 16, 16], origin="CCN")
     rx_locs = np.mgrid[-0.25:0.25:5j, -0.25:0.25:5j, 0:1:1j].reshape(3, -1).T
     rx = gravity.Point(rx_locs, components=["gz"])
@@ -213,7 +221,7 @@ def test_repeat_correctness():
 
     serial_sim = RepeatedSimulation(grav_sim, repeat_mappings)
     parallel_sim = MultiprocessingRepeatedSimulation(
-        grav_sim, repeat_mappings, n_processes=2
+        grav_sim, repeat_mappings, n_processes=2, shared_memory=shared_memory
     )
 
     rng = np.random.default_rng(0)
@@ -2,6 +2,7 @@
 Test BasePFSimulation class
 """
 
+import os
 import re
 import pytest
 import numpy as np
@@ -346,3 +347,104 @@ class TestDeprecationIndActive:
         simulation = mock_simulation_class(tensor_mesh, active_cells=ind_active)
         with pytest.warns(FutureWarning):
             simulation.ind_active
+
+
+class FailingSimulation(gravity.Simulation3DIntegral):
+    """Gravity simulation whose rows can't be computed."""
+
+    def evaluate_integral(self, receiver_location, components):
+        raise ValueError("Failing simulation.")
+
+
+class TestWorkerPool:
+    """
+    Test the persistent pool of processes used by the geoana engine.
+    """
+
+    @pytest.fixture
+    def survey(self):
+        x, y = np.meshgrid(np.linspace(-1, 1, 4), np.linspace(-1, 1, 3))
+        locations = np.c_[x.ravel(), y.ravel(), np.full(x.size, 2.0)]
+        receivers = gravity.receivers.Point(locations, components=["gz", "gxz"])
+        source_field = gravity.sources.SourceField(receiver_list=[receivers])
+        return gravity.survey.Survey(source_field)
+
+    def build_simulation(self, mesh, survey, n_processes, **kwargs):
+        return gravity.Simulation3DIntegral(
+            mesh,
+            survey=survey,
+            rhoMap=simpeg.maps.IdentityMap(nP=mesh.n_cells),
+            engine="geoana",
+            n_processes=n_processes,
+            **kwargs,
+        )
+
+    @pytest.mark.parametrize("store_sensitivities", ["ram", "disk", "forward_only"])
+    def test_matches_serial(self, tree_mesh, survey, store_sensitivities, tmp_path):
+        model = np.linspace(-1, 1, tree_mesh.n_cells)
+        kwargs = dict(store_sensitivities=store_sensitivities)
+        serial = self.build_simulation(
+            tree_mesh, survey, 1, sensitivity_path=str(tmp_path / "serial"), **kwargs
+        )
+        parallel = self.build_simulation(
+            tree_mesh, survey, 2, sensitivity_path=str(tmp_path / "pool"), **kwargs
+        )
+        serial.model = parallel.model = model
+        try:
+            np.testing.assert_allclose(
+                parallel.linear_operator(), serial.linear_operator(), rtol=1e-6
+            )
+            np.testing.assert_allclose(
+                parallel.dpred(model), serial.dpred(model), rtol=1e-5, atol=1e-12
+            )
+        finally:
+            parallel.close_worker_pool()
+
+    @pytest.mark.parametrize("store_sensitivities", ["ram", "disk"])
+    def test_cleanup_on_failure(
+        self, tensor_mesh, survey, store_sensitivities, tmp_path
+    ):
+        """Failing workers should leave no files or shared memory behind."""
+        simulation = FailingSimulation(
+            tensor_mesh,
+            survey=survey,
+            rhoMap=simpeg.maps.IdentityMap(nP=tensor_mesh.n_cells),
+            engine="geoana",
+            n_processes=2,
+            store_sensitivities=store_sensitivities,
+            sensitivity_path=str(tmp_path / "sensitivities"),
+        )
+        shm_dir = "/dev/shm"
+        shared_before = set(os.listdir(shm_dir)) if os.path.isdir(shm_dir) else None
+        try:
+            with pytest.raises(ValueError, match="Failing simulation"):
+                simulation.linear_operator()
+        finally:
+            simulation.close_worker_pool()
+        assert not os.path.exists(tmp_path / "sensitivities" / "sensitivity.npy")
+        if shared_before is not None:
+            assert set(os.listdir(shm_dir)) <= shared_before
+
+    def test_pool_is_reused(self, tensor_mesh, survey):
+        simulation = self.build_simulation(tensor_mesh, survey, 2)
+        try:
+            simulation.linear_operator()
+            pool = simulation._worker_pool
+            simulation.linear_operator()
+            assert simulation._worker_pool is pool
+            # changing the number of processes restarts the pool
+            simulation.n_processes = 3
+            assert simulation._worker_pool is None
+        finally:
+            simulation.close_worker_pool()
+
+    def test_pickle(self, tensor_mesh, survey):
+        import pickle
+
+        simulation = self.build_simulation(tensor_mesh, survey, 2)
+        try:
+            simulation.linear_operator()
+            copy = pickle.loads(pickle.dumps(simulation))
+            assert getattr(copy, "_worker_pool", None) is None
+        finally:
+            simulation.close_worker_pool()
@@ -0,0 +1,173 @@
+"""
+Test the compressed storage of sensitivity matrices of potential field
+simulations.
+"""
+
+import numpy as np
+import pytest
+from discretize import TensorMesh
+from scipy.sparse import diags
+from scipy.sparse.linalg import LinearOperator
+
+from simpeg import maps
+from simpeg.potential_fields import gravity, magnetics
+from simpeg.potential_fields._compressed import cluster_points, low_rank_factors
+
+
+@pytest.fixture
+def mesh():
+    """Sample mesh below the surface."""
+    hx = [(5.0, 16)]
+    hz = [(5.0, 8)]
+    return TensorMesh([hx, hx, hz], origin="CCN")
+
+
+@pytest.fixture
+def receivers_locations():
+    """Sample grid of receivers above the mesh."""
+    x = np.linspace(-35.0, 35.0, 12)
+    x, y = np.meshgrid(x, x)
+    return np.c_[x.ravel(), y.ravel(), np.full(x.size, 5.0)]
+
+
+def build_gravity_simulation(mesh, locations, **kwargs):
+    receivers = gravity.receivers.Point(locations, components=["gz", "gzz"])
+    source_field = gravity.sources.SourceField(receiver_list=[receivers])
+    survey = gravity.survey.Survey(source_field)
+    return gravity.Simulation3DIntegral(
+        mesh,
+        survey=survey,
+        rhoMap=maps.IdentityMap(nP=mesh.n_cells),
+        engine="choclo",
+        **kwargs,
+    )
+
+
+def build_magnetic_simulation(mesh, locations, model_type, **kwargs):
+    receivers = magnetics.receivers.Point(locations, components=["tmi", "bz"])
+    source_field = magnetics.sources.UniformBackgroundField(
+        receiver_list=[receivers], amplitude=50_000, inclination=60, declination=10
+    )
+    survey = magnetics.survey.Survey(source_field)
+    n_params = mesh.n_cells if model_type == "scalar" else 3 * mesh.n_cells
+    return magnetics.Simulation3DIntegral(
+        mesh,
+        survey=survey,
+        chiMap=maps.IdentityMap(nP=n_params),
+        model_type=model_type,
+        engine="choclo",
+        **kwargs,
+    )
+
+
+class TestLowRankFactors:
+    """Test the compression of single tiles."""
+
+    def test_smooth_block(self):
+        """Blocks of well separated points should have a low rank."""
+        rng = np.random.default_rng(seed=42)
+        sources = rng.uniform(-1, 1, size=(200, 3))
+        receivers = rng.uniform(-1, 1, size=(100, 3)) + [20.0, 0, 0]
+        distance = np.linalg.norm(receivers[:, None] - sources[None, :], axis=-1)
+        block = 1 / distance
+        left, right = low_rank_factors(block, 1e-6, rng)
+        assert left.shape[1] < 20
+        error = np.linalg.norm(left @ right - block) / np.linalg.norm(block)
+        assert error <= 1e-6
+
+    def test_random_block(self):
+        """Blocks without structure should be kept dense."""
+        rng = np.random.default_rng(seed=42)
+        block = rng.normal(size=(20, 30))
+        left, right = low_rank_factors(block, 1e-6, rng)
+        assert left is None and right is None
+
+    def test_zero_block(self):
+        """Blocks of zeros are stored with rank zero."""
+        rng = np.random.default_rng(seed=42)
+        left, right = low_rank_factors(np.zeros((5, 7)), 1e-6, rng)
+        assert left.shape == (5, 0)
+        assert right.shape == (0, 7)
+
+
+def test_cluster_points():
+    """Clusters should be a partition of the points."""
+    rng = np.random.default_rng(seed=42)
+    points = rng.uniform(size=(1000, 3))
+    clusters = cluster_points(points, 64)
+    assert all(cluster.size <= 64 for cluster in clusters)
+    np.testing.assert_equal(np.sort(np.concatenate(clusters)), np.arange(1000))
+
+
+class TestCompressedSensitivity:
+    """Compare compressed sensitivities with dense ones."""
+
+    rtol = 1e-4
+
+    def check_simulations(self, dense, compressed, n_params):
+        rng = np.random.default_rng(seed=42)
+        model = rng.uniform(-1, 1, size=n_params)
+        vector = rng.normal(size=dense.survey.nD)
+        weights = diags(rng.uniform(1, 2, size=dense.survey.nD))
+
+        assert isinstance(compressed.G, LinearOperator)
+        assert compressed.G.compression_ratio > 1
+        G = np.asarray(dense.G)
+        error = np.linalg.norm(compressed.G.toarray() - G) / np.linalg.norm(G)
+        # allow for the rounding of the float32 factors
+        assert error < 1.1 * self.rtol
+
+        for method, args in (
+            ("dpred", (model,)),
+            ("Jvec", (model, model)),
+            ("Jtvec", (model, vector)),
+        ):
+            expected = getattr(dense, method)(*args)
+            result = getattr(compressed, method)(*args)
+            np.testing.assert_allclose(
+                result, expected, atol=10 * self.rtol * np.abs(expected).max()
+            )
+        expected = dense.getJtJdiag(model, W=weights)
+        np.testing.assert_allclose(
+            compressed.getJtJdiag(model, W=weights),
+            expected,
+            atol=10 * self.rtol * expected.max(),
+        )
+
+    def test_gravity(self, mesh, receivers_locations):
+        dense = build_gravity_simulation(mesh, receivers_locations)
+        compressed = build_gravity_simulation(
+            mesh,
+            receivers_locations,
+            store_sensitivities="compressed",
+            compression_tolerance=self.rtol,
+        )
+        self.check_simulations(dense, compressed, mesh.n_cells)
+
+    @pytest.mark.parametrize("model_type", ["scalar", "vector"])
+    def test_magnetics(self, mesh, receivers_locations, model_type):
+        dense = build_magnetic_simulation(mesh, receivers_locations, model_type)
+        compressed = build_magnetic_simulation(
+            mesh,
+            receivers_locations,
+            model_type,
+            store_sensitivities="compressed",
+            compression_tolerance=self.rtol,
+        )
+        n_params = mesh.n_cells if model_type == "scalar" else 3 * mesh.n_cells
+        self.check_simulations(dense, compressed, n_params)
+
+    def test_geoana_engine(self, mesh, receivers_locations):
+        simulation = build_gravity_simulation(
+            mesh, receivers_locations, store_sensitivities="compressed"
+        )
+        simulation.engine = "geoana"
+        with pytest.raises(NotImplementedError, match="compressed"):
+            simulation.G
+
+    @pytest.mark.parametrize("tolerance", [0.0, 1.0, -1e-3])
+    def test_invalid_tolerance(self, mesh, receivers_locations, tolerance):
+        with pytest.raises(ValueError):
+            build_gravity_simulation(
+                mesh, receivers_locations, compression_tolerance=tolerance
+            )
@@ -238,6 +238,29 @@ class Test3DMeshError:
             )
 
 
+@pytest.mark.parametrize("store_sensitivities", ("compressed", "footprint"))
+@pytest.mark.parametrize(
+    "simulation_class",
+    (
+        gravity.SimulationEquivalentSourceLayer,
+        magnetics.SimulationEquivalentSourceLayer,
+    ),
+)
+def test_unsupported_store_sensitivities(
+    tensor_mesh, mesh_top, mesh_bottom, simulation_class, store_sensitivities
+):
+    """
+    Test error is raised for the storage options not available for layers.
+    """
+    with pytest.raises(ValueError, match="store_sensitivities"):
+        simulation_class(
+            mesh=tensor_mesh,
+            cell_z_top=mesh_top,
+            cell_z_bottom=mesh_bottom,
+            store_sensitivities=store_sensitivities,
+        )
+
+
 class TestGravityEquivalentSourcesForward:
     """
     Test the forward capabilities of the gravity equivalent sources.
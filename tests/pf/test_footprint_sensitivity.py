@@ -0,0 +1,172 @@
+"""
+Test the footprint-truncated storage of sensitivity matrices of potential field
+simulations.
+"""
+
+import numpy as np
+import pytest
+from discretize import TensorMesh
+from scipy.sparse import diags
+from scipy.sparse.linalg import LinearOperator
+
+from simpeg import maps
+from simpeg.potential_fields import gravity, magnetics
+from simpeg.potential_fields._compressed import cluster_points
+from simpeg.potential_fields._footprint import prisms_nodes
+
+
+@pytest.fixture
+def mesh():
+    """Sample mesh below the surface."""
+    hx = [(5.0, 16)]
+    hz = [(5.0, 8)]
+    return TensorMesh([hx, hx, hz], origin="CCN")
+
+
+@pytest.fixture
+def receivers_locations():
+    """Sample grid of receivers above the mesh."""
+    x = np.linspace(-35.0, 35.0, 12)
+    x, y = np.meshgrid(x, x)
+    return np.c_[x.ravel(), y.ravel(), np.full(x.size, 5.0)]
+
+
+def build_gravity_simulation(mesh, locations, **kwargs):
+    receivers = gravity.receivers.Point(locations, components=["gz", "gzz"])
+    source_field = gravity.sources.SourceField(receiver_list=[receivers])
+    survey = gravity.survey.Survey(source_field)
+    return gravity.Simulation3DIntegral(
+        mesh,
+        survey=survey,
+        rhoMap=maps.IdentityMap(nP=mesh.n_cells),
+        engine="choclo",
+        **kwargs,
+    )
+
+
+def build_magnetic_simulation(mesh, locations, model_type, **kwargs):
+    receivers = magnetics.receivers.Point(locations, components=["tmi", "bz"])
+    source_field = magnetics.sources.UniformBackgroundField(
+        receiver_list=[receivers], amplitude=50_000, inclination=60, declination=10
+    )
+    survey = magnetics.survey.Survey(source_field)
+    n_params = mesh.n_cells if model_type == "scalar" else 3 * mesh.n_cells
+    return magnetics.Simulation3DIntegral(
+        mesh,
+        survey=survey,
+        chiMap=maps.IdentityMap(nP=n_params),
+        model_type=model_type,
+        engine="choclo",
+        **kwargs,
+    )
+
+
+def test_prisms_nodes(mesh):
+    """Nodes of single cell prisms should match the ones of the mesh."""
+    nodes, cell_nodes = prisms_nodes(mesh.cell_bounds)
+    np.testing.assert_allclose(
+        nodes[cell_nodes], mesh.nodes[mesh.cell_nodes], atol=1e-12
+    )
+
+
+def test_cluster_points_max_extent():
+    """Clusters should be smaller than the maximum extent."""
+    rng = np.random.default_rng(seed=42)
+    points = rng.uniform(size=(1000, 3))
+    clusters = cluster_points(points, 1000, max_extent=0.25)
+    for cluster in clusters:
+        extent = np.ptp(points[cluster], axis=0)
+        assert extent.max() <= 0.25
+    np.testing.assert_equal(np.sort(np.concatenate(clusters)), np.arange(1000))
+
+
+class TestFootprintSensitivity:
+    """Compare footprint-truncated sensitivities with dense ones."""
+
+    def check_operator(self, simulation, n_params):
+        """The simulation should be consistent with the assembled operator."""
+        rng = np.random.default_rng(seed=42)
+        model = rng.uniform(-1, 1, size=n_params)
+        vector = rng.normal(size=simulation.survey.nD)
+        weights = rng.uniform(1, 2, size=simulation.survey.nD)
+
+        assert isinstance(simulation.G, LinearOperator)
+        G = simulation.G.toarray().astype(np.float64)
+        for result, expected in (
+            (simulation.dpred(model), G @ model),
+            (simulation.Jvec(model, model), G @ model),
+            (simulation.Jtvec(model, vector), G.T @ vector),
+            (
+                simulation.getJtJdiag(model, W=diags(np.sqrt(weights))),
+                np.einsum("i,ij,ij->j", weights, G, G),
+            ),
+        ):
+            # allow for the rounding of the float32 sensitivities
+            np.testing.assert_allclose(
+                result, expected, atol=1e-5 * np.abs(expected).max()
+            )
+        return G
+
+    def test_large_radius(self, mesh, receivers_locations):
+        """Footprints covering the whole mesh should give the exact matrix."""
+        dense = build_gravity_simulation(mesh, receivers_locations)
+        footprint = build_gravity_simulation(
+            mesh,
+            receivers_locations,
+            store_sensitivities="footprint",
+            footprint_radius=500.0,
+        )
+        G = self.check_operator(footprint, mesh.n_cells)
+        np.testing.assert_allclose(G, dense.G, atol=1e-5 * np.abs(G).max())
+
+    def test_gravity(self, mesh, receivers_locations):
+        """Smaller footprints should approximate the exact matrix."""
+        dense = build_gravity_simulation(mesh, receivers_locations)
+        footprint = build_gravity_simulation(
+            mesh,
+            receivers_locations,
+            store_sensitivities="footprint",
+            footprint_radius=40.0,
+        )
+        G = self.check_operator(footprint, mesh.n_cells)
+        assert footprint.G.near_field.nnz < G.size
+        error = np.linalg.norm(G - dense.G) / np.linalg.norm(dense.G)
+        assert error < 0.05
+
+    @pytest.mark.parametrize("model_type", ["scalar", "vector"])
+    def test_magnetics(self, mesh, receivers_locations, model_type):
+        dense = build_magnetic_simulation(mesh, receivers_locations, model_type)
+        footprint = build_magnetic_simulation(
+            mesh,
+            receivers_locations,
+            model_type,
+            store_sensitivities="footprint",
+            footprint_radius=40.0,
+        )
+        n_params = mesh.n_cells if model_type == "scalar" else 3 * mesh.n_cells
+        G = self.check_operator(footprint, n_params)
+        error = np.linalg.norm(G - dense.G) / np.linalg.norm(dense.G)
+        assert error < 0.05
+
+    def test_missing_radius(self, mesh, receivers_locations):
+        simulation = build_gravity_simulation(
+            mesh, receivers_locations, store_sensitivities="footprint"
+        )
+        with pytest.raises(ValueError, match="footprint_radius"):
+            simulation.G
+
+    def test_geoana_engine(self, mesh, receivers_locations):
+        simulation = build_gravity_simulation(
+            mesh,
+            receivers_locations,
+            store_sensitivities="footprint",
+            footprint_radius=40.0,
+        )
+        simulation.engine = "geoana"
+        with pytest.raises(NotImplementedError, match="footprint"):
+            simulation.G
+
+    @pytest.mark.parametrize("radius", [0.0, -10.0])
+    def test_invalid_radius(self, mesh, receivers_locations, radius):
+        with pytest.raises(ValueError):
+            build_gravity_simulation(mesh, receivers_locations, footprint_radius=radius)
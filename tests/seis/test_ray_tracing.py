@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+import discretize
+
+from simpeg.seismic import straight_ray_tomography as tomo
+from simpeg.seismic.straight_ray_tomography._ray_tracing import ray_length_matrix
+
+
+def brute_force_lengths(mesh, origins, ends):
+    """Clip every ray against every cell of the mesh."""
+    bounds = mesh.cell_bounds
+    lower, upper = bounds[:, ::2], bounds[:, 1::2]
+    lengths = np.zeros((origins.shape[0], mesh.n_cells))
+    for r, (origin, end) in enumerate(zip(origins, ends)):
+        delta = end - origin
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t_a = (lower - origin) / delta
+            t_b = (upper - origin) / delta
+        t_start = np.max(np.minimum(t_a, t_b), axis=1).clip(0.0, 1.0)
+        t_stop = np.min(np.maximum(t_a, t_b), axis=1).clip(0.0, 1.0)
+        lengths[r] = np.maximum(t_stop - t_start, 0.0) * np.linalg.norm(delta)
+    return lengths
+
+
+def random_rays(dim, n_rays=40):
+    rng = np.random.default_rng(seed=42)
+    # some of the rays start or end outside the mesh
+    origins = rng.uniform(-0.2, 1.2, size=(n_rays, dim))
+    ends = rng.uniform(-0.2, 1.2, size=(n_rays, dim))
+    return origins, ends
+
+
+def get_meshes(dim):
+    h = [np.r_[0.1, 0.15, 0.25, 0.2, 0.3], np.full(8, 0.125), np.r_[0.4, 0.6]]
+    tensor = discretize.TensorMesh(h[:dim])
+    tree = discretize.TreeMesh([np.full(16, 1 / 16)] * dim, diagonal_balance=False)
+    tree.refine(2, finalize=False)
+    tree.refine_ball(np.full(dim, 0.4), 0.2, 4)
+    return tensor, tree
+
+
+@pytest.mark.parametrize("dim", [2, 3])
+@pytest.mark.parametrize("mesh_type", ["tensor", "tree"])
+def test_ray_lengths(dim, mesh_type):
+    mesh = get_meshes(dim)[mesh_type == "tree"]
+    origins, ends = random_rays(dim)
+    A = ray_length_matrix(mesh, origins, ends)
+    assert A.format == "csr"
+    np.testing.assert_allclose(
+        A.toarray(), brute_force_lengths(mesh, origins, ends), atol=1e-12
+    )
+
+
+@pytest.mark.parametrize("dim", [2, 3])
+def test_rays_on_faces(dim):
+    """Rays along the faces between cells should only be counted once."""
+    tensor, tree = get_meshes(dim)
+    origins = np.zeros((3, dim))
+    origins[:, 1] = [0.0, 0.5, 1.0]
+    ends = origins.copy()
+    ends[:, 0] = 1.0
+    for mesh in [tensor, tree]:
+        A = ray_length_matrix(mesh, origins, ends)
+        np.testing.assert_allclose(A.sum(axis=1), 1.0)
+        np.testing.assert_allclose(
+            A.toarray(), ray_length_matrix(mesh, ends, origins).toarray()
+        )
+
+
+def test_simulation_3d():
+    mesh = discretize.TensorMesh([[(0.25, 4)], [(0.25, 4)], [(0.25, 4)]])
+    tree = discretize.TreeMesh(
+        [[(0.25, 4)], [(0.25, 4)], [(0.25, 4)]], diagonal_balance=False
+    )
+    tree.refine(2)
+    rx = tomo.Rx(
+        locations=np.c_[np.full(3, 1.0), np.linspace(0.1, 0.9, 3), np.full(3, 0.3)]
+    )
+    source_list = [
+        tomo.Src(location=np.r_[0.0, y, 0.6], receiver_list=[rx]) for y in [0.2, 0.7]
+    ]
+    survey = tomo.Survey(source_list)
+    slowness = np.random.default_rng(seed=42).uniform(1.0, 2.0, size=mesh.n_cells)
+
+    sim = tomo.Simulation3DIntegral(mesh, survey=survey, slowness=slowness)
+    d = sim.dpred()
+    assert sim.A.shape == (6, mesh.n_cells)
+    lengths = np.linalg.norm(
+        rx.locations[None] - np.array([src.location for src in source_list])[:, None],
+        axis=-1,
+    )
+    np.testing.assert_allclose(np.asarray(sim.A.sum(axis=1)).ravel(), lengths.ravel())
+
+    # the uniform tree mesh holds the same cells in a different order
+    tree_sim = tomo.Simulation3DIntegral(
+        tree,
+        survey=survey,
+        slowness=slowness[mesh.point2index(tree.cell_centers)],
+    )
+    np.testing.assert_allclose(tree_sim.dpred(), d)
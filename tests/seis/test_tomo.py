@@ -53,7 +53,7 @@ def test_required_mesh_arg():
 
 def test_bad_mesh_type():
     mesh = discretize.CylindricalMesh([3, 3, 3])
-    msg = "mesh must be an instance of TensorMesh, not CylindricalMesh"
+    msg = "mesh must be an instance of TensorMesh or TreeMesh, not CylindricalMesh"
     with pytest.raises(TypeError, match=msg):
         Simulation2DIntegral(mesh)
 
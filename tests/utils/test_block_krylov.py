@@ -0,0 +1,147 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+import discretize
+
+import simpeg.optimization
+from simpeg import maps
+from simpeg.utils import solver_utils
+from simpeg.electromagnetics.static import resistivity as dc
+from simpeg.utils.solver_utils import (
+    BlockKrylovSolver,
+    SolutionCache,
+    SolverLU,
+    pyamg,
+)
+
+
+def laplacian(n=30, shift=0.1):
+    mesh = discretize.TensorMesh([n, n])
+    G = mesh.cell_gradient
+    return (G.T @ G + shift * sp.eye(mesh.n_cells)).tocsr()
+
+
+@pytest.fixture
+def rhs():
+    return np.random.default_rng(seed=42).normal(size=(900, 4))
+
+
+@pytest.mark.parametrize("preconditioner", ["jacobi", None])
+def test_block_cg(rhs, preconditioner):
+    A = laplacian()
+    Ainv = BlockKrylovSolver(A, preconditioner=preconditioner, rtol=1e-10)
+    assert Ainv.method == "cg"
+    x = Ainv * rhs
+    np.testing.assert_allclose(A @ x, rhs, atol=1e-8)
+    # a single right hand side needs more iterations than a block
+    n_block = Ainv.n_iterations
+    Ainv * rhs[:, 0]
+    assert Ainv.n_iterations > n_block
+
+
+def test_complex_symmetric(rhs):
+    A = (laplacian() + 1j * sp.diags(np.linspace(0.1, 1.0, 900))).tocsr()
+    Ainv = BlockKrylovSolver(A, rtol=1e-10)
+    assert Ainv.method == "cg" and not Ainv.is_hermitian
+    x = Ainv * rhs
+    np.testing.assert_allclose(A @ x, rhs, atol=1e-8)
+
+
+@pytest.mark.parametrize("preconditioner", ["jacobi", "ilu"])
+def test_gmres(rhs, preconditioner):
+    A = laplacian() + sp.diags(np.full(899, 0.5), 1)
+    Ainv = BlockKrylovSolver(A, preconditioner=preconditioner, rtol=1e-10)
+    assert Ainv.method == "gmres"
+    x = Ainv * rhs
+    np.testing.assert_allclose(A @ x, rhs, atol=1e-7)
+    np.testing.assert_allclose(A.T @ (Ainv.T * rhs), rhs, atol=1e-7)
+
+
+def test_minres(rhs):
+    A = laplacian(shift=-0.5)
+    x = BlockKrylovSolver(A, method="minres", rtol=1e-10) * rhs
+    np.testing.assert_allclose(A @ x, rhs, atol=1e-7)
+
+
+@pytest.mark.parametrize("scipy_1_12", [True, False])
+@pytest.mark.parametrize("method", ["minres", "gmres"])
+def test_tolerance_keyword(rhs, monkeypatch, method, scipy_1_12):
+    # scipy < 1.12 only accepts `tol`, later versions `rtol`
+    krylov = getattr(solver_utils, method)
+    tol_key = "rtol" if scipy_1_12 else "tol"
+    used = []
+
+    def checked(*args, **kwargs):
+        assert {"rtol", "tol"} & kwargs.keys() == {tol_key}
+        used.append(tol_key)
+        return krylov(*args, rtol=kwargs.pop(tol_key), **kwargs)
+
+    monkeypatch.setattr(simpeg.optimization, "SCIPY_1_12", scipy_1_12)
+    monkeypatch.setattr(solver_utils, method, checked)
+    x = BlockKrylovSolver(laplacian(), method=method, rtol=1e-10) * rhs
+    np.testing.assert_allclose(laplacian() @ x, rhs, atol=1e-7)
+    assert used == rhs.shape[1] * [tol_key]
+
+
+@pytest.mark.skipif(pyamg is None, reason="pyamg is not installed")
+def test_amg(rhs):
+    A = laplacian()
+    x = BlockKrylovSolver(A, preconditioner="amg", rtol=1e-10) * rhs
+    np.testing.assert_allclose(A @ x, rhs, atol=1e-8)
+
+
+def test_bad_arguments():
+    A = laplacian() + sp.diags(np.full(899, 0.5), 1)
+    with pytest.raises(ValueError):
+        BlockKrylovSolver(A, method="cg")
+    with pytest.raises(ValueError):
+        BlockKrylovSolver(A, method="bicg")
+    with pytest.raises(ValueError):
+        BlockKrylovSolver(A, preconditioner="multigrid")
+
+
+def test_not_converged(rhs):
+    with pytest.warns(UserWarning, match="did not converge"):
+        BlockKrylovSolver(laplacian(), maxiter=2) * rhs
+
+
+def test_warm_start(rhs):
+    cache = SolutionCache()
+    A = laplacian()
+    x = BlockKrylovSolver(A, rtol=1e-10, warm_start=cache) * rhs
+    assert len(cache) == 1
+
+    # same matrix and right hand sides: no iterations needed
+    Ainv = BlockKrylovSolver(A, rtol=1e-10, warm_start=cache)
+    np.testing.assert_array_equal(Ainv * rhs, x)
+    assert Ainv.n_iterations == 0
+
+    cache.max_memory = 0.0
+    assert len(cache) == 0
+
+
+def test_dc_simulation():
+    mesh = discretize.TensorMesh([[(10.0, 4, -1.3), (10.0, 8), (10.0, 4, 1.3)]] * 3)
+    mesh.origin = -mesh.h[0].sum() / 2 * np.ones(3)
+    locations = np.c_[np.linspace(-30, 30, 5), np.zeros(5), np.zeros(5)]
+    source_list = [
+        dc.sources.Dipole(
+            [dc.receivers.Pole(locations)], np.r_[x, 0, 0], np.r_[x + 10, 0, 0]
+        )
+        for x in [-20.0, 0.0]
+    ]
+    model = np.full(mesh.n_cells, np.log(1e-2))
+    dpred = []
+    for solver, solver_opts in [
+        (SolverLU, {}),
+        (BlockKrylovSolver, {"rtol": 1e-10, "warm_start": SolutionCache()}),
+    ]:
+        sim = dc.Simulation3DNodal(
+            mesh,
+            survey=dc.Survey(source_list),
+            sigmaMap=maps.ExpMap(mesh),
+            solver=solver,
+            solver_opts=solver_opts,
+        )
+        dpred.append(sim.dpred(model))
+    np.testing.assert_allclose(dpred[1], dpred[0], rtol=1e-7)
@@ -114,6 +114,24 @@ class TestIO_GRAV3D(unittest.TestCase):
 
         print("OBSERVED DATA FILE IO FOR GRAV3D PASSED")
 
+    def test_io_blank_and_short_rows(self):
+        filename = "short_rows.grv"
+        with open(filename, "w") as fid:
+            fid.write("3\n1 2 3 4\n\n4 5 6\n7 8 9 1 0.5\n")
+        data_loaded = read_grav3d_ubc(filename)
+
+        np.testing.assert_allclose(
+            data_loaded.survey.receiver_locations, [[1, 2, 3], [4, 5, 6], [7, 8, 9]]
+        )
+        np.testing.assert_allclose(data_loaded.dobs, [-4, 0, -1])
+        np.testing.assert_allclose(data_loaded.standard_deviation, [0, 0, 0.5])
+
+        with open(filename, "w") as fid:
+            fid.write("3\n1 2 3 4\n4 5 6 1\n")
+        with self.assertRaises(IOError):
+            read_grav3d_ubc(filename)
+        os.remove(filename)
+
     def test_bad_write(self):
         data_object = Data(survey=self.survey_bad)
         with self.assertRaises(NotImplementedError):
@@ -215,6 +233,28 @@ class TestIO_GG3D(unittest.TestCase):
 
         print("OBSERVED DATA FILE IO FOR GG3D PASSED")
 
+    def test_io_chunks(self):
+        data_object = Data(
+            survey=self.survey, dobs=self.dobs, standard_deviation=self.std
+        )
+        filename = "dobs_chunks.gg"
+
+        write_gg3d_ubc(filename, data_object)
+        blocks = list(read_gg3d_ubc(filename, chunk_size=2))
+        os.remove(filename)
+
+        self.assertEqual(
+            [d.survey.receiver_locations.shape[0] for d in blocks], [2, 2, 1]
+        )
+        locations = np.vstack([d.survey.receiver_locations for d in blocks])
+        np.testing.assert_allclose(locations, self.survey.receiver_locations, rtol=1e-5)
+        np.testing.assert_allclose(
+            np.hstack([d.dobs for d in blocks]), self.dobs, rtol=1e-5
+        )
+        np.testing.assert_allclose(
+            np.hstack([d.standard_deviation for d in blocks]), self.std, rtol=1e-5
+        )
+
     def test_bad_write(self):
         data_object = Data(survey=self.survey_bad)
         with self.assertRaises(NotImplementedError):
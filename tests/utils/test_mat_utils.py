@@ -7,7 +7,7 @@ from simpeg.objective_function import BaseObjectiveFunction
 from simpeg import simulation, data_misfit
 from simpeg.maps import IdentityMap
 from simpeg.regularization import WeightedLeastSquares
-from simpeg.utils.mat_utils import eigenvalue_by_power_iteration
+from simpeg.utils.mat_utils import eigenvalue_by_power_iteration, jtj_diagonal
 
 
 class TestEigenvalues(unittest.TestCase):
@@ -184,5 +184,47 @@ class TestDeprecatedSeed:
             )
 
 
+class TestJtJDiagonal:
+    """Test the chunked computation of the diagonal of J^T W J."""
+
+    @pytest.fixture
+    def jacobian(self):
+        rng = np.random.default_rng(seed=42)
+        return rng.normal(size=(300, 70))
+
+    @pytest.fixture
+    def weights(self):
+        rng = np.random.default_rng(seed=41)
+        return rng.uniform(size=300)
+
+    @pytest.mark.parametrize("engine", ["numpy", "numba"])
+    @pytest.mark.parametrize("max_chunk_size", [1e-3, 0.05, 128.0])
+    def test_weighted(self, jacobian, weights, engine, max_chunk_size):
+        expected = np.diag(jacobian.T @ np.diag(weights) @ jacobian)
+        result = jtj_diagonal(
+            jacobian, weights=weights, max_chunk_size=max_chunk_size, engine=engine
+        )
+        np.testing.assert_allclose(result, expected)
+
+    def test_unweighted(self, jacobian):
+        np.testing.assert_allclose(jtj_diagonal(jacobian), (jacobian**2).sum(axis=0))
+
+    def test_memmap(self, jacobian, weights, tmp_path):
+        J = np.memmap(tmp_path / "J.bin", dtype=float, mode="w+", shape=jacobian.shape)
+        J[:] = jacobian
+        np.testing.assert_allclose(
+            jtj_diagonal(J, weights=weights, max_chunk_size=0.01),
+            jtj_diagonal(jacobian, weights=weights),
+        )
+
+    def test_invalid_engine(self, jacobian):
+        with pytest.raises(ValueError, match="Invalid engine"):
+            jtj_diagonal(jacobian, engine="dask")
+
+    def test_invalid_weights(self, jacobian):
+        with pytest.raises(ValueError, match="weights must have shape"):
+            jtj_diagonal(jacobian, weights=np.ones(3))
+
+
 if __name__ == "__main__":
     unittest.main()
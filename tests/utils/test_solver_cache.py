@@ -0,0 +1,209 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from simpeg.utils.solver_utils import (
+    MixedPrecisionSolver,
+    SolverCache,
+    SolverLU,
+    SolverThreadPool,
+    solve_with_approximate_solver,
+    _transposed_solver,
+)
+
+
+def factory(n=10):
+    A = sp.diags(np.arange(1, n + 1, dtype=float), format="csc")
+    return lambda: SolverLU(A)
+
+
+def test_reuse():
+    cache = SolverCache()
+    Ainv = cache.get("a", factory())
+    assert cache.get("a", lambda: pytest.fail("should not refactor")) is Ainv
+    assert len(cache) == 1
+    assert cache.nbytes > 0
+
+
+def test_lru_eviction():
+    cache = SolverCache()
+    for key in ["a", "b", "c"]:
+        cache.get(key, factory())
+    # touch "a" so that "b" is the least recently used
+    cache.get("a", factory())
+    per_factor = cache.nbytes / 3
+    cache.max_memory = 2.5 * per_factor / 1024**3
+    assert cache.keys() == ["c", "a"]
+
+
+def test_always_keeps_latest():
+    cache = SolverCache(max_memory=0.0)
+    cache.get("a", factory())
+    cache.get("b", factory())
+    assert cache.keys() == ["b"]
+
+
+def test_clean():
+    cache = SolverCache()
+    cache.get("a", factory())
+    cache.get("b", factory())
+    cache.clean()
+    assert len(cache) == 0
+    assert cache.nbytes == 0
+
+
+def tracked(Ainv, cleaned):
+    """Record the cleaning of `Ainv` in the `cleaned` list."""
+    clean = Ainv.clean
+
+    def record():
+        cleaned.append(Ainv)
+        clean()
+
+    Ainv.clean = record
+    return Ainv
+
+
+def test_add_cleans_duplicate():
+    cleaned = []
+    cache = SolverCache()
+    Ainv = cache.add("a", tracked(factory()(), cleaned))
+    duplicate = tracked(factory()(), cleaned)
+    assert cache.add("a", duplicate) is Ainv
+    assert cleaned == [duplicate]
+
+
+def test_pin_defers_clean():
+    cleaned = []
+    cache = SolverCache(max_memory=0.0)
+    Ainv = cache.pin(cache.get("a", lambda: tracked(factory()(), cleaned)))
+    cache.pin(Ainv)
+    # evicting a pinned solver doesn't clean it
+    cache.get("b", factory())
+    assert cache.keys() == ["b"]
+    assert cleaned == []
+    cache.unpin(Ainv)
+    assert cleaned == []
+    cache.unpin(Ainv)
+    assert cleaned == [Ainv]
+
+    # unpinning a solver still in the cache doesn't clean it
+    Binv = cache.pin(cache.get("c", lambda: tracked(factory()(), cleaned)))
+    cache.unpin(Binv)
+    assert cleaned == [Ainv]
+    cache.clean()
+    assert cleaned == [Ainv, Binv]
+
+
+def test_bad_memory():
+    with pytest.raises(ValueError):
+        SolverCache(max_memory=-1.0)
+
+
+def test_retire():
+    cache = SolverCache()
+    Ainv = cache.get("a", factory())
+    nbytes = cache.nbytes
+    cache.retire()
+    assert "a" not in cache
+    assert cache.get_retired("a") is Ainv
+    assert cache.nbytes == nbytes
+    # a new factorization replaces the retired one
+    cache.get("a", factory())
+    assert cache.get_retired("a") is None
+    assert cache.nbytes == nbytes
+
+
+def test_retired_evicted_first():
+    cache = SolverCache()
+    cache.get("a", factory())
+    cache.retire()
+    cache.get("b", factory())
+    cache.get("c", factory())
+    cache.max_memory = 2.5 * cache.nbytes / 3 / 1024**3
+    assert cache.get_retired("a") is None
+    assert cache.keys() == ["b", "c"]
+
+
+def test_approximate_solver():
+    rng = np.random.default_rng(seed=42)
+    A = sp.diags(np.arange(1, 11, dtype=float), format="csc")
+    perturbed = A + sp.diags(0.01 * rng.uniform(size=10))
+    rhs = rng.normal(size=(10, 2))
+    x, converged = solve_with_approximate_solver(perturbed, SolverLU(A), rhs, 1e-12)
+    assert converged
+    np.testing.assert_allclose(perturbed @ x, rhs)
+
+    # far away matrices do not converge
+    x, converged = solve_with_approximate_solver(3 * A, SolverLU(A), rhs, 1e-12)
+    assert not converged
+
+
+@pytest.mark.parametrize("symmetric", [True, False])
+def test_transposed_solver(symmetric):
+    rng = np.random.default_rng(seed=42)
+    A = sp.random(20, 20, density=0.2, random_state=0) + 5 * sp.eye(20)
+    if symmetric:
+        A = A + A.T
+    A = A.tocsc()
+    Ainv = SolverLU(A)
+    ATinv = _transposed_solver(Ainv)
+    # the transposed solver shares the factors
+    assert ATinv is Ainv if symmetric else ATinv._Ainv is Ainv
+    rhs = rng.normal(size=(20, 2))
+    np.testing.assert_allclose(A.T @ (ATinv * rhs), rhs)
+    np.testing.assert_allclose(A.T @ (ATinv * rhs[:, 0]), rhs[:, 0])
+
+    mixed = MixedPrecisionSolver(SolverLU, A, rtol=1e-12)
+    np.testing.assert_allclose(A.T @ (mixed.T * rhs), rhs, atol=1e-10)
+
+
+@pytest.mark.parametrize("max_concurrent_factorizations", [1, 2])
+def test_thread_pool(max_concurrent_factorizations):
+    active, peak = [0], [0]
+
+    def slow_solver(A):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return SolverLU(A)
+
+    lock = threading.Lock()
+    matrices = [k * sp.eye(5, format="csc") for k in range(1, 7)]
+    with SolverThreadPool(4, max_concurrent_factorizations) as pool:
+        solutions = pool.map(
+            lambda A: pool.factor(slow_solver, A) * np.ones(5), matrices
+        )
+    for k, x in enumerate(solutions, start=1):
+        np.testing.assert_allclose(x, 1 / k)
+    assert peak[0] <= max_concurrent_factorizations
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.complex128])
+def test_mixed_precision_solver(dtype):
+    rng = np.random.default_rng(seed=42)
+    A = (sp.random(40, 40, density=0.1, random_state=0) + 5 * sp.eye(40)).astype(dtype)
+    A = A.tocsc()
+    rhs = rng.normal(size=(40, 2)).astype(dtype)
+    Ainv = MixedPrecisionSolver(SolverLU, A, rtol=1e-12)
+    assert Ainv.solver.A.dtype == (np.float32 if dtype is np.float64 else np.complex64)
+    x = Ainv * rhs
+    assert x.dtype == dtype
+    np.testing.assert_allclose(A @ x, rhs, atol=1e-11)
+    assert Ainv.is_single_precision
+
+
+def test_mixed_precision_fallback():
+    # a matrix that can't be represented in single precision
+    A = sp.csc_matrix(np.array([[1.0, 1.0], [1.0, 1.0 + 1e-6]]))
+    Ainv = MixedPrecisionSolver(SolverLU, A, rtol=1e-12, maxiter=3)
+    with pytest.warns(UserWarning, match="did not converge"):
+        x = Ainv * np.r_[1.0, 2.0]
+    assert not Ainv.is_single_precision
+    np.testing.assert_allclose(A @ x, [1.0, 2.0])